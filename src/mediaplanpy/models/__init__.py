@@ -18,6 +18,8 @@ from mediaplanpy.models.dictionary import (
     CustomMetricConfig
 )
 from mediaplanpy.models.mediaplan import MediaPlan, Meta
+from mediaplanpy.models.flighting import FlightingCurve, register_flighting_curve
+from mediaplanpy.models.interval_index import LineItemIntervalIndex
 
 # Storage integration now uses StorageMixin inheritance (no monkey patching needed)
 # JSON integration now uses JsonMixin inheritance (no monkey patching needed)
@@ -35,5 +37,8 @@ __all__ = [
     'MetricFormulaConfig',
     'CustomMetricConfig',
     'MediaPlan',
-    'Meta'
+    'Meta',
+    'FlightingCurve',
+    'register_flighting_curve',
+    'LineItemIntervalIndex'
 ]
\ No newline at end of file
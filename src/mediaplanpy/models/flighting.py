@@ -0,0 +1,200 @@
+"""
+Flighting (pacing) expansion of line items.
+
+This module spreads line item values (cost, metrics) over the days between
+each line item's start and end date and sums them by day, ISO week or month.
+How a value is spread is set by a weighting curve: a function of the
+relative position t in [0, 1] of each day within the flight (t is taken at
+the middle of the day), whose weights are normalized to sum to 1 per line
+item. Built-in curves:
+
+- ``even``: the same amount every day
+- ``front_loaded``: weight 1.5 - t (three times as much on the first day as on the last)
+- ``back_loaded``: weight 0.5 + t
+- ``bell``: weight sin(pi * t), peaking mid-flight
+
+Further curves are added with register_flighting_curve(). A curve can also
+carry a SQL expression of ``{t}``, which lets WorkspaceManager.expand_flighting()
+compute it inside DuckDB instead of in pandas.
+
+The expansion is vectorized with NumPy: one array operation per step for all
+line items together, with no Python loop over line items or days.
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from mediaplanpy.exceptions import ValidationError
+
+# Values of grain
+FLIGHTING_GRAINS = ("day", "week", "month")
+
+# Columns identifying the line item of each expanded row
+FLIGHTING_KEY_COLUMNS = ["campaign_id", "meta_id", "lineitem_id", "lineitem_name"]
+
+
+class FlightingCurve(NamedTuple):
+    """
+    A weighting curve for flighting expansion.
+
+    weights maps a NumPy array of relative positions t in [0, 1] to
+    non-negative weights; sql is the same function as a SQL expression of
+    "{t}", or None if it can only be evaluated in Python.
+    """
+    name: str
+    weights: Callable[[np.ndarray], np.ndarray]
+    sql: Optional[str] = None
+
+
+FLIGHTING_CURVES: Dict[str, FlightingCurve] = {}
+
+
+def register_flighting_curve(name: str, weights: Callable[[np.ndarray], np.ndarray],
+                             sql: Optional[str] = None) -> FlightingCurve:
+    """
+    Register a weighting curve for expand_flighting().
+
+    Example:
+        >>> register_flighting_curve("weekend_heavy", lambda t: 1 + 0.5 * np.sin(2 * np.pi * t))
+
+    Args:
+        name: Curve name used as expand_flighting(curve=name)
+        weights: Vectorized function mapping relative positions t in [0, 1]
+                 to non-negative weights
+        sql: Optional SQL expression of "{t}" computing the same weights
+
+    Returns:
+        The registered FlightingCurve.
+    """
+    curve = FlightingCurve(name, weights, sql)
+    FLIGHTING_CURVES[name] = curve
+    return curve
+
+
+register_flighting_curve("even", lambda t: np.ones_like(t), "1.0")
+register_flighting_curve("front_loaded", lambda t: 1.5 - t, "(1.5 - {t})")
+register_flighting_curve("back_loaded", lambda t: 0.5 + t, "(0.5 + {t})")
+register_flighting_curve("bell", lambda t: np.sin(np.pi * t), "SIN(PI() * {t})")
+
+
+def get_flighting_curve(curve) -> FlightingCurve:
+    """
+    Look up a weighting curve.
+
+    Args:
+        curve: Registered curve name, FlightingCurve, or a vectorized weights function
+
+    Returns:
+        The FlightingCurve.
+
+    Raises:
+        ValidationError: If the name is not registered.
+    """
+    if isinstance(curve, FlightingCurve):
+        return curve
+    if callable(curve):
+        return FlightingCurve(getattr(curve, "__name__", "custom"), curve)
+    if curve not in FLIGHTING_CURVES:
+        raise ValidationError(
+            f"Unknown flighting curve '{curve}'. Registered curves: {', '.join(FLIGHTING_CURVES)}"
+        )
+    return FLIGHTING_CURVES[curve]
+
+
+def validate_grain(grain: str) -> None:
+    """Raise ValidationError unless grain is one of FLIGHTING_GRAINS."""
+    if grain not in FLIGHTING_GRAINS:
+        raise ValidationError(f"Invalid grain '{grain}'. Must be one of: {', '.join(FLIGHTING_GRAINS)}")
+
+
+def period_start(days: np.ndarray, grain: str) -> np.ndarray:
+    """
+    Get the first day of the period each day falls in.
+
+    Args:
+        days: datetime64[D] array
+        grain: One of FLIGHTING_GRAINS (weeks start on Monday)
+
+    Returns:
+        datetime64[D] array.
+    """
+    if grain == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    if grain == "week":
+        # 1970-01-01 was a Thursday: Monday is 3 days before day 0 modulo 7
+        return days - ((days.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    return days
+
+
+def expand_flights(lineitems: pd.DataFrame, measures: Sequence[str], grain: str = "day",
+                   curve="even") -> pd.DataFrame:
+    """
+    Spread line item values over their flights.
+
+    Args:
+        lineitems: One row per line item with start_date and end_date columns,
+                   a column per measure and any of FLIGHTING_KEY_COLUMNS
+        measures: Columns of lineitems to spread
+        grain: "day", "week" or "month"
+        curve: Weighting curve (see get_flighting_curve())
+
+    Returns:
+        Long-format DataFrame with the key columns, period (first day of the
+        period), days_active (flight days in the period) and one column per
+        measure. Line items without dates, or ending before they start, are
+        left out.
+
+    Raises:
+        ValidationError: If grain or curve is invalid.
+    """
+    validate_grain(grain)
+    curve = get_flighting_curve(curve)
+    key_columns = [column for column in FLIGHTING_KEY_COLUMNS if column in lineitems.columns]
+    output_columns = key_columns + ["period", "days_active"] + list(measures)
+
+    start = pd.to_datetime(lineitems["start_date"], errors="coerce").to_numpy().astype("datetime64[D]")
+    end = pd.to_datetime(lineitems["end_date"], errors="coerce").to_numpy().astype("datetime64[D]")
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end >= start)
+    lineitems, start, end = lineitems[valid], start[valid], end[valid]
+    if not len(lineitems):
+        return pd.DataFrame(columns=output_columns)
+
+    # One row per line item and flight day
+    day_counts = (end - start).astype(np.int64) + 1
+    item = np.repeat(np.arange(len(lineitems)), day_counts)
+    offset = np.arange(item.size) - np.repeat(np.cumsum(day_counts) - day_counts, day_counts)
+    days = start[item] + offset.astype("timedelta64[D]")
+
+    # Curve weights at the middle of each day, normalized per line item
+    weights = np.asarray(curve.weights((offset + 0.5) / day_counts[item]), dtype=float)
+    shares = weights / np.bincount(item, weights=weights)[item]
+
+    expanded = pd.DataFrame({"item": item, "period": period_start(days, grain), "days_active": 1})
+    for measure in measures:
+        values = pd.to_numeric(lineitems[measure], errors="coerce").to_numpy(dtype=float)
+        expanded[measure] = values[item] * shares
+
+    if grain != "day":
+        expanded = expanded.groupby(["item", "period"], sort=False, as_index=False).sum(min_count=1)
+        expanded["days_active"] = expanded["days_active"].astype(np.int64)
+
+    keys = lineitems[key_columns].reset_index(drop=True)
+    result = pd.concat([keys.iloc[expanded["item"].to_numpy()].reset_index(drop=True),
+                        expanded.drop(columns="item").reset_index(drop=True)], axis=1)
+    return result[output_columns]
+
+
+def measure_attribute(measure: str) -> str:
+    """
+    Get the LineItem attribute of a measure name ("cost_total" or "lineitem_cost_total").
+
+    Args:
+        measure: Measure name
+
+    Returns:
+        LineItem attribute name.
+    """
+    return measure[len("lineitem_"):] if measure.startswith("lineitem_") else measure
+
@@ -0,0 +1,191 @@
+"""
+Interval index over line item flight dates.
+
+This module provides LineItemIntervalIndex, a static index of the closed
+date ranges [start_date, end_date] of a set of line items. Flights are
+stored as NumPy arrays sorted by start date together with the longest flight
+length, so "which line items are live between X and Y" is answered with two
+binary searches that bound the candidate rows to those starting between
+X - longest flight and Y, followed by one vectorized end date check on that
+slice. Counting live line items needs no scan at all: it is the number of
+flights starting on or before Y minus the number ending before X.
+
+The index is built once (dates are parsed once) and is read-only; rebuild it
+after line items change. MediaPlan.get_lineitem_index() and
+WorkspaceManager.get_lineitem_index() build and cache it for a plan or a
+whole workspace.
+"""
+
+from datetime import date
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+DateLike = Union[str, date, pd.Timestamp, np.datetime64]
+
+
+def _to_days(values) -> np.ndarray:
+    """Parse dates to a datetime64[D] array (unparseable values become NaT)."""
+    return pd.to_datetime(pd.Series(values), errors="coerce").to_numpy().astype("datetime64[D]")
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    """Parse a single date to datetime64[D]."""
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+class LineItemIntervalIndex:
+    """
+    Read-only index of line item flights answering date range queries in logarithmic time.
+
+    Positions returned by the query methods refer to the rows the index was
+    built from. Rows without a start or end date, or ending before they start,
+    are not indexed.
+
+    Example:
+        >>> index = LineItemIntervalIndex(df["start_date"], df["end_date"], items=df)
+        >>> live = index.active_between("2025-03-01", "2025-03-31")
+        >>> index.count_active_on("2025-03-15")
+    """
+
+    def __init__(self, starts: Sequence[Any], ends: Sequence[Any], items: Optional[Any] = None,
+                 groups: Optional[Sequence[Any]] = None):
+        """
+        Build the index.
+
+        Args:
+            starts: Flight start dates, one per row
+            ends: Flight end dates, one per row
+            items: Optional sequence or DataFrame of the rows, returned by
+                   active_between() and active_on()
+            groups: Optional group of each row (e.g. vehicle), used by overlapping_pairs()
+        """
+        start_days = _to_days(starts)
+        end_days = _to_days(ends)
+        if len(start_days) != len(end_days):
+            raise ValueError("starts and ends must have the same length")
+
+        valid = ~np.isnat(start_days) & ~np.isnat(end_days) & (end_days >= start_days)
+        positions = np.flatnonzero(valid)
+        order = np.argsort(start_days[positions], kind="stable")
+
+        self.items = items
+        self.size = len(start_days)
+        self._positions = positions[order]
+        self._starts = start_days[self._positions]
+        self._ends = end_days[self._positions]
+        self._sorted_ends = np.sort(self._ends)
+        self._max_length = (self._ends - self._starts).max() if len(self._positions) else np.timedelta64(0, "D")
+        self._groups = None if groups is None else pd.Series(groups).to_numpy(dtype=object)[self._positions]
+
+    def __len__(self) -> int:
+        """Number of indexed (valid) flights."""
+        return len(self._positions)
+
+    def positions_between(self, start_date: DateLike, end_date: Optional[DateLike] = None) -> np.ndarray:
+        """
+        Get the rows whose flights overlap a date range.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (default: start_date)
+
+        Returns:
+            Sorted array of row positions.
+        """
+        first = _to_day(start_date)
+        last = first if end_date is None else _to_day(end_date)
+        if last < first or not len(self._positions):
+            return np.empty(0, dtype=np.int64)
+
+        # Only flights starting in [first - longest flight, last] can reach into the range
+        lo = np.searchsorted(self._starts, first - self._max_length, side="left")
+        hi = np.searchsorted(self._starts, last, side="right")
+        live = lo + np.flatnonzero(self._ends[lo:hi] >= first)
+        return np.sort(self._positions[live])
+
+    def active_between(self, start_date: DateLike, end_date: Optional[DateLike] = None) -> Any:
+        """
+        Get the items whose flights overlap a date range.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (default: start_date)
+
+        Returns:
+            The matching rows of items in their original order: a DataFrame
+            if items is a DataFrame, otherwise a list. Row positions if the
+            index was built without items.
+        """
+        positions = self.positions_between(start_date, end_date)
+        if self.items is None:
+            return positions
+        if isinstance(self.items, pd.DataFrame):
+            return self.items.iloc[positions]
+        return [self.items[position] for position in positions]
+
+    def active_on(self, day: DateLike) -> Any:
+        """Get the items live on a given day (see active_between())."""
+        return self.active_between(day)
+
+    def count_active_between(self, start_date: DateLike, end_date: Optional[DateLike] = None) -> int:
+        """
+        Count the flights overlapping a date range with two binary searches.
+
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range (default: start_date)
+
+        Returns:
+            Number of overlapping flights.
+        """
+        first = _to_day(start_date)
+        last = first if end_date is None else _to_day(end_date)
+        if last < first:
+            return 0
+        started = np.searchsorted(self._starts, last, side="right")
+        ended = np.searchsorted(self._sorted_ends, first, side="left")
+        return int(started - ended)
+
+    def count_active_on(self, day: DateLike) -> int:
+        """Count the flights live on a given day."""
+        return self.count_active_between(day)
+
+    def overlapping_pairs(self) -> np.ndarray:
+        """
+        Find every pair of flights in the same group that overlap.
+
+        Rows are grouped by the groups given when building the index (all
+        rows form one group otherwise). Rows with a missing group are skipped.
+
+        Returns:
+            Array of shape (n, 2) with the row positions of each overlapping
+            pair, the earlier-starting row first.
+        """
+        if self._groups is None:
+            codes = np.zeros(len(self._positions), dtype=np.int64)
+        else:
+            codes = pd.factorize(self._groups)[0].astype(np.int64)
+        keep = codes >= 0
+        if not keep.any():
+            return np.empty((0, 2), dtype=np.int64)
+
+        # Sort by (group, start) on one integer key, then every flight overlaps the
+        # flights after it in its group that start on or before its end date
+        starts = self._starts[keep].astype(np.int64)
+        ends = self._ends[keep].astype(np.int64)
+        positions = self._positions[keep]
+        origin = starts.min()
+        span = ends.max() - origin + 1
+        keys = codes[keep] * span + (starts - origin)
+        order = np.argsort(keys, kind="stable")
+        keys, positions = keys[order], positions[order]
+        limits = (codes[keep] * span + (ends - origin))[order]
+
+        first = np.arange(len(keys))
+        last = np.searchsorted(keys, limits, side="right")
+        counts = last - first - 1
+        left = np.repeat(first, counts)
+        right = left + 1 + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        return np.column_stack([positions[left], positions[right]])
@@ -12,7 +12,7 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Set, Union, ClassVar
 
-from pydantic import Field, field_validator, model_validator
+from pydantic import Field, PrivateAttr, field_validator, model_validator
 from pydantic import ValidationError as PydanticValidationError
 
 from mediaplanpy.models.base import BaseModel
@@ -25,6 +25,7 @@ from mediaplanpy.models.mediaplan_storage import StorageMixin
 from mediaplanpy.models.mediaplan_excel import ExcelMixin
 from mediaplanpy.models.mediaplan_database import DatabaseMixin
 from mediaplanpy.models.mediaplan_formulas import FormulasMixin
+from mediaplanpy.models.mediaplan_flighting import FlightingMixin
 from mediaplanpy.exceptions import ValidationError, SchemaVersionError, SchemaError, MediaPlanError, StorageError
 from mediaplanpy.schema import get_current_version, SchemaValidator, SchemaMigrator
 
@@ -100,7 +101,7 @@ class Meta(BaseModel):
         return errors
 
 
-class MediaPlan(JsonMixin, StorageMixin, ExcelMixin, DatabaseMixin, FormulasMixin, BaseModel):
+class MediaPlan(JsonMixin, StorageMixin, ExcelMixin, DatabaseMixin, FormulasMixin, FlightingMixin, BaseModel):
     """
     Represents a complete media plan following the Media Plan Open Data Standard v3.0.
 
@@ -123,6 +124,9 @@ class MediaPlan(JsonMixin, StorageMixin, ExcelMixin, DatabaseMixin, FormulasMixi
     # NEW v2.0 FIELD: Dictionary for custom field configuration
     dictionary: Optional[Dictionary] = Field(None, description="Configuration dictionary defining custom field settings and captions")
 
+    # Cached (signature, LineItemIntervalIndex) of get_lineitem_index()
+    _lineitem_index: Optional[Any] = PrivateAttr(default=None)
+
     def model_post_init(self, __context: Any) -> None:
         """
         Post-initialization hook to set parent references on child objects.
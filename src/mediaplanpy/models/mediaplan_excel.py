@@ -7,6 +7,7 @@ media plans to Excel format and importing media plans from Excel files.
 
 import os
 import logging
+import shutil
 import tempfile
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
 
@@ -258,10 +259,9 @@ class ExcelMixin:
                     tmp_path = tmp.name
 
                 try:
-                    # Read content and write to temp file
-                    content = storage_backend.read_file(full_path, binary=True)
-                    with open(tmp_path, 'wb') as f:
-                        f.write(content)
+                    # Stream content to the temp file
+                    with storage_backend.open_file(full_path, 'rb') as source, open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(source, f)
 
                     # Import from the temp file using the importer module
                     data = importer.import_from_excel(tmp_path, **format_options)
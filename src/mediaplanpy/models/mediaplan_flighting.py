@@ -0,0 +1,136 @@
+"""
+Flighting methods for MediaPlan.
+Provides daily, weekly or monthly pacing of the plan's line items and
+date range lookups of live line items.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from mediaplanpy.models.flighting import expand_flights, measure_attribute, validate_grain
+from mediaplanpy.models.interval_index import LineItemIntervalIndex
+
+if TYPE_CHECKING:
+    from mediaplanpy.models.lineitem import LineItem
+
+
+class FlightingMixin:
+    """Mixin providing flighting expansion methods for MediaPlan."""
+
+    def expand_flighting(self, grain: str = "day", measures: Optional[Sequence[str]] = None,
+                         curve="even") -> pd.DataFrame:
+        """
+        Spread the plan's line item values over their flight dates.
+
+        Each line item's values are allocated to the days between its
+        start_date and end_date according to a weighting curve and summed per
+        period. WorkspaceManager.expand_flighting() does the same for all plans
+        of a workspace inside DuckDB.
+
+        Args:
+            grain: "day", "week" (periods start on Monday) or "month"
+            measures: Line item columns to spread, e.g. "cost_total",
+                      "metric_impressions" (default: ["cost_total"])
+            curve: Name of a registered curve ("even", "front_loaded",
+                   "back_loaded", "bell"), a FlightingCurve, or a vectorized
+                   function of the relative flight position t in [0, 1]
+
+        Returns:
+            Long-format DataFrame with campaign_id, meta_id, lineitem_id,
+            lineitem_name, period, days_active and one column per measure.
+
+        Raises:
+            ValidationError: If grain or curve is invalid.
+
+        Example:
+            # Weekly spend, front-loaded
+            weekly = mediaplan.expand_flighting(grain="week", curve="front_loaded")
+        """
+        validate_grain(grain)
+        measures = list(measures) if measures else ["cost_total"]
+
+        rows = []
+        for lineitem in self.lineitems:
+            row = {
+                "campaign_id": self.campaign.id,
+                "meta_id": self.meta.id,
+                "lineitem_id": lineitem.id,
+                "lineitem_name": lineitem.name,
+                "start_date": lineitem.start_date,
+                "end_date": lineitem.end_date
+            }
+            for measure in measures:
+                row[measure] = getattr(lineitem, measure_attribute(measure))
+            rows.append(row)
+
+        lineitems = pd.DataFrame(rows, columns=["campaign_id", "meta_id", "lineitem_id", "lineitem_name",
+                                                "start_date", "end_date"] + measures)
+        return expand_flights(lineitems, measures, grain=grain, curve=curve)
+
+    def get_lineitem_index(self, group_by: Optional[str] = "vehicle") -> LineItemIntervalIndex:
+        """
+        Get the interval index of the plan's line item flights.
+
+        The index is cached on the plan and rebuilt when line items are
+        added, removed, or their dates or group field change.
+
+        Args:
+            group_by: LineItem field grouping flights for overlapping_pairs()
+                      (default "vehicle"); None for a single group
+
+        Returns:
+            LineItemIntervalIndex whose items are the plan's LineItem objects.
+        """
+        signature = (group_by, tuple(
+            (id(lineitem), lineitem.start_date, lineitem.end_date,
+             getattr(lineitem, group_by, None) if group_by else None)
+            for lineitem in self.lineitems
+        ))
+        cached = self._lineitem_index
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        lineitems = list(self.lineitems)
+        index = LineItemIntervalIndex(
+            [lineitem.start_date for lineitem in lineitems],
+            [lineitem.end_date for lineitem in lineitems],
+            items=lineitems,
+            groups=[getattr(lineitem, group_by, None) for lineitem in lineitems] if group_by else None
+        )
+        self._lineitem_index = (signature, index)
+        return index
+
+    def lineitems_active_between(self, start_date, end_date=None) -> List["LineItem"]:
+        """
+        Get the line items whose flights overlap a date range.
+
+        Args:
+            start_date: First day of the range (date or YYYY-MM-DD string)
+            end_date: Last day of the range (default: start_date, i.e. live on that day)
+
+        Returns:
+            List of LineItem objects in plan order.
+
+        Example:
+            live_in_march = mediaplan.lineitems_active_between("2025-03-01", "2025-03-31")
+        """
+        return self.get_lineitem_index(group_by=None).active_between(start_date, end_date)
+
+    def overlapping_lineitems(self, by: Optional[str] = "vehicle") -> List[Tuple["LineItem", "LineItem"]]:
+        """
+        Find line items whose flights overlap another line item's flight.
+
+        Args:
+            by: LineItem field whose values must match for two flights to be
+                compared (default "vehicle"); None compares all line items
+
+        Returns:
+            List of (earlier-starting line item, other line item) pairs.
+
+        Example:
+            for first, second in mediaplan.overlapping_lineitems(by="vehicle"):
+                print(f"{first.vehicle}: {first.name} overlaps {second.name}")
+        """
+        index = self.get_lineitem_index(group_by=by)
+        return [(index.items[left], index.items[right]) for left, right in index.overlapping_pairs()]
@@ -6,9 +6,10 @@ loading, and deleting media plans from various storage backends.
 """
 
 import os
+import json
 import logging
 import uuid
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from datetime import datetime, timezone
 
 from mediaplanpy.exceptions import (
@@ -20,10 +21,18 @@ from mediaplanpy.exceptions import (
     MediaPlanNotFoundError
 )
 from mediaplanpy.storage import (
+    StorageBackend,
     read_mediaplan as storage_read_mediaplan,
     write_mediaplan as storage_write_mediaplan,
     get_format_handler_instance
 )
+from mediaplanpy.storage.partitioning import (
+    PARQUET_LAYOUT_PARTITIONED,
+    PARTITION_GLOB,
+    get_parquet_layout,
+    get_partition_values,
+    get_partition_dir
+)
 from mediaplanpy.workspace import WorkspaceManager
 
 if TYPE_CHECKING:
@@ -35,7 +44,8 @@ logger = logging.getLogger("mediaplanpy.models.mediaplan_storage")
 MEDIAPLANS_SUBDIR = "mediaplans"
 
 
-def _media_plan_file_exists(workspace_config: Dict[str, Any], media_plan_id: str) -> bool:
+def _media_plan_file_exists(workspace_config: Dict[str, Any], media_plan_id: str,
+                            storage_backend: Optional[StorageBackend] = None) -> bool:
     """
     Check if a media plan file with the given ID already exists in storage.
 
@@ -44,13 +54,16 @@ def _media_plan_file_exists(workspace_config: Dict[str, Any], media_plan_id: str
     Args:
         workspace_config: The resolved workspace configuration
         media_plan_id: The media plan ID to check for
+        storage_backend: Optional existing backend to reuse. If not provided,
+                         a new one is created from workspace_config.
 
     Returns:
         True if a file exists for this media plan ID, False otherwise
     """
     try:
-        from mediaplanpy.storage import get_storage_backend
-        storage_backend = get_storage_backend(workspace_config)
+        if storage_backend is None:
+            from mediaplanpy.storage import get_storage_backend
+            storage_backend = get_storage_backend(workspace_config)
 
         # Sanitize media plan ID for use as filename
         safe_id = media_plan_id.replace('/', '_').replace('\\', '_')
@@ -132,8 +145,9 @@ class StorageMixin:
             logger.debug(f"set_as_current=False: Will set media plan '{self.meta.id}' as non-current")
         # If set_as_current is None, do nothing to is_current
 
-        # Get resolved workspace config
+        # Get resolved workspace config and the workspace's shared storage backend
         workspace_config = workspace_manager.get_resolved_config()
+        storage_backend = workspace_manager.get_storage_backend()
 
         # Validate schema version before saving
         if validate_version:
@@ -178,7 +192,7 @@ class StorageMixin:
 
         # Determine if this is a first save or subsequent save
         current_id = self.meta.id
-        is_first_save = not _media_plan_file_exists(workspace_config, current_id)
+        is_first_save = not _media_plan_file_exists(workspace_config, current_id, storage_backend)
 
         # Handle media plan ID and parent_id based on overwrite parameter and existence
         if not overwrite:
@@ -247,24 +261,28 @@ class StorageMixin:
             except Exception as e:
                 logger.warning(f"Could not validate media plan structure: {e}")
 
-        # Get storage backend to create subdirectory
+        # Create mediaplans subdirectory if needed
         try:
-            from mediaplanpy.storage import get_storage_backend
-            storage_backend = get_storage_backend(workspace_config)
-
-            # Create mediaplans subdirectory if needed
             if hasattr(storage_backend, 'create_directory'):
                 storage_backend.create_directory(MEDIAPLANS_SUBDIR)
         except Exception as e:
             logger.warning(f"Could not ensure mediaplans directory exists: {e}")
 
+        # With the partitioned Parquet layout, an overwrite may move the plan to a
+        # different partition - remember where the previous Parquet copy lives
+        partitioned = get_parquet_layout(workspace_config) == PARQUET_LAYOUT_PARTITIONED
+        stale_parquet_paths = []
+        if partitioned and include_parquet and overwrite and not is_first_save:
+            stale_parquet_paths = self._get_previous_parquet_paths(storage_backend, path)
+
         # Write to storage with version validation
         try:
             format_options_copy = format_options.copy()
             if validate_version:
                 format_options_copy['validate_version'] = True
 
-            storage_write_mediaplan(workspace_config, data, path, format_name, **format_options_copy)
+            storage_write_mediaplan(workspace_config, data, path, format_name,
+                                    storage_backend=storage_backend, **format_options_copy)
             logger.info(f"Media plan saved to {path}")
         except SchemaVersionError:
             # Re-raise version errors
@@ -275,6 +293,8 @@ class StorageMixin:
         # Also save Parquet file for v1.0+ schemas
         if include_parquet and self._should_save_parquet():
             parquet_path = self._get_parquet_path(path)
+            if partitioned:
+                parquet_path = self._get_partitioned_parquet_path(parquet_path, data)
 
             # Create separate options for Parquet with version validation
             parquet_options = {k: v for k, v in format_options.items()
@@ -286,14 +306,30 @@ class StorageMixin:
                 # Write Parquet file
                 storage_write_mediaplan(
                     workspace_config, data, parquet_path,
-                    format_name="parquet", **parquet_options
+                    format_name="parquet", storage_backend=storage_backend, **parquet_options
                 )
                 logger.info(f"Also saved Parquet file: {parquet_path}")
+
+                # Remove the copy left in the plan's previous partition
+                for stale_path in stale_parquet_paths:
+                    if stale_path != parquet_path and storage_backend.exists(stale_path):
+                        storage_backend.delete_file(stale_path)
+                        logger.debug(f"Removed previous Parquet copy: {stale_path}")
+
+                # Replace this plan's row in the per-plan summary read by the list_* methods
+                try:
+                    workspace_manager.get_plan_summary().record_save(
+                        self.meta.id, parquet_path, [p for p in stale_parquet_paths if p != parquet_path])
+                except Exception as e:
+                    logger.warning(f"Failed to update plan summary (it will be rebuilt on next use): {e}")
             except SchemaVersionError as e:
                 logger.warning(f"Parquet save failed due to version issue: {e}")
             except Exception as e:
                 logger.warning(f"Parquet save failed: {e}")
 
+        # Cached query results may include this plan's previous version
+        workspace_manager.clear_query_cache()
+
         # Save to database if configured and enabled
         if include_database:
             try:
@@ -418,9 +454,8 @@ class StorageMixin:
             mediaplans_path = os.path.join(MEDIAPLANS_SUBDIR, os.path.basename(path))
 
             try:
-                # Get storage backend to check if file exists in new location
-                from mediaplanpy.storage import get_storage_backend
-                storage_backend = get_storage_backend(workspace_config)
+                # Check if file exists in new location
+                storage_backend = workspace_manager.get_storage_backend()
 
                 if storage_backend.exists(mediaplans_path):
                     path = mediaplans_path
@@ -435,7 +470,8 @@ class StorageMixin:
             if validate_version:
                 format_options['validate_version'] = True
 
-            data = storage_read_mediaplan(workspace_config, path, format_name)
+            data = storage_read_mediaplan(workspace_config, path, format_name,
+                                          storage_backend=workspace_manager.get_storage_backend())
 
             # Extract and validate schema version
             file_version = data.get("meta", {}).get("schema_version")
@@ -543,7 +579,8 @@ class StorageMixin:
                     if validate_version:
                         format_options['validate_version'] = True
 
-                    data = storage_read_mediaplan(workspace_config, legacy_path, format_name)
+                    data = storage_read_mediaplan(workspace_config, legacy_path, format_name,
+                                                  storage_backend=workspace_manager.get_storage_backend())
 
                     # Apply same version handling as above
                     if validate_version:
@@ -614,8 +651,7 @@ class StorageMixin:
         workspace_config = workspace_manager.get_resolved_config()
 
         try:
-            from mediaplanpy.storage import get_storage_backend
-            storage_backend = get_storage_backend(workspace_config)
+            storage_backend = workspace_manager.get_storage_backend()
         except Exception as e:
             raise StorageError(f"Failed to get storage backend: {e}")
 
@@ -657,10 +693,15 @@ class StorageMixin:
         # Sanitize media plan ID for use as filename
         safe_mediaplan_id = self.meta.id.replace('/', '_').replace('\\', '_')
 
-        for extension in extensions:
-            # Construct the file path in mediaplans subdirectory
-            file_path = os.path.join(MEDIAPLANS_SUBDIR, f"{safe_mediaplan_id}.{extension}")
+        # Construct the file paths in mediaplans subdirectory
+        file_paths = [os.path.join(MEDIAPLANS_SUBDIR, f"{safe_mediaplan_id}.{extension}")
+                      for extension in extensions]
+
+        # Partitioned layout: the Parquet copy lives in a partition directory
+        if get_parquet_layout(workspace_config) == PARQUET_LAYOUT_PARTITIONED:
+            file_paths.extend(self._find_partitioned_parquet_files(storage_backend, safe_mediaplan_id))
 
+        for file_path in file_paths:
             try:
                 # Check if file exists
                 if storage_backend.exists(file_path):
@@ -684,6 +725,24 @@ class StorageMixin:
                 result["errors"].append(error_msg)
                 logger.error(error_msg)
 
+        # Hide the plan's rows in the compacted catalog until the next compaction
+        if not dry_run:
+            workspace_manager.clear_query_cache()
+            try:
+                from mediaplanpy.workspace.catalog import WorkspaceCatalog
+                if WorkspaceCatalog(workspace_manager).record_deletion(self.meta.id):
+                    logger.info(f"Marked media plan {self.meta.id} as deleted in workspace catalog")
+            except Exception as e:
+                error_msg = f"Failed to update workspace catalog: {str(e)}"
+                result["errors"].append(error_msg)
+                logger.error(error_msg)
+
+            try:
+                deleted_parquet_paths = [p for p in result["deleted_files"] if p.endswith(".parquet")]
+                workspace_manager.get_plan_summary().record_deletion(self.meta.id, deleted_parquet_paths)
+            except Exception as e:
+                logger.warning(f"Failed to update plan summary (it will be rebuilt on next use): {e}")
+
         # Handle database deletion if enabled and version compatible
         if include_database and result["version_compatible"]:
             try:
@@ -788,6 +847,64 @@ class StorageMixin:
         base, _ = os.path.splitext(json_path)
         return f"{base}.parquet"
 
+    def _get_partitioned_parquet_path(self, parquet_path: str, data: Dict[str, Any]) -> str:
+        """
+        Get the Parquet path for the partitioned layout.
+
+        Args:
+            parquet_path: The flat Parquet path (mediaplans/<name>.parquet).
+            data: The media plan dictionary, used for the partition values.
+
+        Returns:
+            Path of the form mediaplans/<partition directories>/<name>.parquet.
+        """
+        partition_dir = get_partition_dir(get_partition_values(data))
+        return f"{MEDIAPLANS_SUBDIR}/{partition_dir}/{os.path.basename(parquet_path)}"
+
+    def _find_partitioned_parquet_files(self, storage_backend: StorageBackend, safe_mediaplan_id: str) -> List[str]:
+        """
+        Find this plan's Parquet copies in the partitioned layout.
+
+        Checks the partition derived from the plan's current fields first and
+        falls back to searching every partition (the stored copy may be in a
+        different partition if the plan was modified without being saved).
+
+        Args:
+            storage_backend: The workspace storage backend.
+            safe_mediaplan_id: The media plan ID sanitized for use as a filename.
+
+        Returns:
+            List of existing Parquet paths for this plan.
+        """
+        expected_path = self._get_partitioned_parquet_path(f"{safe_mediaplan_id}.parquet", self.to_dict())
+        if storage_backend.exists(expected_path):
+            return [expected_path]
+        return storage_backend.list_files(MEDIAPLANS_SUBDIR, f"{PARTITION_GLOB}/{safe_mediaplan_id}.parquet")
+
+    def _get_previous_parquet_paths(self, storage_backend: StorageBackend, json_path: str) -> List[str]:
+        """
+        Get the Parquet paths a previously saved version of this plan may occupy.
+
+        Reads the stored JSON (before it is overwritten) to find the plan's
+        previous partition, and includes the flat-layout path left by saves
+        made before the workspace switched to the partitioned layout.
+
+        Args:
+            storage_backend: The workspace storage backend.
+            json_path: Path of the stored JSON file.
+
+        Returns:
+            List of candidate Parquet paths.
+        """
+        flat_path = self._get_parquet_path(json_path)
+        paths = [flat_path]
+        try:
+            previous_data = json.loads(storage_backend.read_file(json_path))
+            paths.append(self._get_partitioned_parquet_path(flat_path, previous_data))
+        except Exception as e:
+            logger.debug(f"Could not determine previous partition for {json_path}: {e}")
+        return paths
+
     def get_version_info(self) -> Dict[str, Any]:
         """
         Get comprehensive version information for this media plan.
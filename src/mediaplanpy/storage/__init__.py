@@ -69,7 +69,8 @@ def get_storage_backend(workspace_config: Dict[str, Any]) -> StorageBackend:
         raise StorageError(f"Failed to initialize {mode} storage backend: {e}")
 
 
-def read_mediaplan(workspace_config: Dict[str, Any], path: str, format_name: Optional[str] = None) -> Dict[str, Any]:
+def read_mediaplan(workspace_config: Dict[str, Any], path: str, format_name: Optional[str] = None,
+                   storage_backend: Optional[StorageBackend] = None) -> Dict[str, Any]:
     """
     Read a media plan from storage.
 
@@ -77,6 +78,8 @@ def read_mediaplan(workspace_config: Dict[str, Any], path: str, format_name: Opt
         workspace_config: The resolved workspace configuration dictionary.
         path: The path to the media plan file.
         format_name: Optional format name to use. If not specified, inferred from path.
+        storage_backend: Optional existing backend to reuse (e.g. the one cached by
+                         WorkspaceManager). If not provided, a new one is created.
 
     Returns:
         The media plan data as a dictionary.
@@ -86,7 +89,7 @@ def read_mediaplan(workspace_config: Dict[str, Any], path: str, format_name: Opt
         StorageError: If the media plan cannot be read.
     """
     # Get storage backend
-    backend = get_storage_backend(workspace_config)
+    backend = storage_backend or get_storage_backend(workspace_config)
 
     # Check existence up front so a genuinely missing plan is distinguishable
     # from other storage failures (permission, corruption, network).
@@ -108,12 +111,25 @@ def read_mediaplan(workspace_config: Dict[str, Any], path: str, format_name: Opt
 
 
 def write_mediaplan(workspace_config: Dict[str, Any], data: Dict[str, Any], path: str,
-                    format_name: Optional[str] = None, **format_options) -> None:
+                    format_name: Optional[str] = None, storage_backend: Optional[StorageBackend] = None,
+                    **format_options) -> None:
     """
     Write a media plan to storage.
+
+    Args:
+        workspace_config: The resolved workspace configuration dictionary.
+        data: The media plan data to write.
+        path: The path where the media plan should be written.
+        format_name: Optional format name to use. If not specified, inferred from path.
+        storage_backend: Optional existing backend to reuse (e.g. the one cached by
+                         WorkspaceManager). If not provided, a new one is created.
+        **format_options: Additional format-specific options.
+
+    Raises:
+        StorageError: If the media plan cannot be written.
     """
     # Get storage backend
-    backend = get_storage_backend(workspace_config)
+    backend = storage_backend or get_storage_backend(workspace_config)
 
     # Get format handler
     if format_name:
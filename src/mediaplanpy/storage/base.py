@@ -61,6 +61,41 @@ class StorageBackend(abc.ABC):
         """
         pass
 
+    def read_files(self, paths: List[str], binary: bool = False, max_workers: Optional[int] = None,
+                   return_exceptions: bool = False) -> Dict[str, Union[str, bytes, FileReadError]]:
+        """
+        Read several files from the storage location.
+
+        The default implementation reads the files one after another with
+        read_file(), which is the fastest option for local disks. Backends
+        where every read is a network round trip override it to read
+        concurrently.
+
+        Args:
+            paths: The paths of the files to read.
+            binary: If True, read the files in binary mode.
+            max_workers: Maximum number of concurrent reads (ignored by
+                         sequential backends; backends default to their
+                         configured concurrency).
+            return_exceptions: If True, a file that cannot be read maps to its
+                               FileReadError instead of failing the whole call.
+
+        Returns:
+            Dictionary mapping each path to its contents, in the order of paths.
+
+        Raises:
+            FileReadError: If a file cannot be read and return_exceptions is False.
+        """
+        contents: Dict[str, Union[str, bytes, FileReadError]] = {}
+        for path in paths:
+            try:
+                contents[path] = self.read_file(path, binary=binary)
+            except FileReadError as e:
+                if not return_exceptions:
+                    raise
+                contents[path] = e
+        return contents
+
     @abc.abstractmethod
     def write_file(self, path: str, content: Union[str, bytes]) -> None:
         """
@@ -92,6 +127,31 @@ class StorageBackend(abc.ABC):
         """
         pass
 
+    def get_file_versions(self, path: str, pattern: Optional[str] = None) -> Dict[str, str]:
+        """
+        List files at the specified path together with a version token.
+
+        The token changes whenever a file's content is replaced, so the
+        returned mapping can be used to detect changes to a set of files.
+        The default implementation derives it from get_file_info(); backends
+        override it when their listing already carries version information.
+
+        Args:
+            path: The path to list files from.
+            pattern: Optional glob pattern to filter files.
+
+        Returns:
+            Dictionary mapping file paths to version tokens.
+
+        Raises:
+            StorageError: If the files cannot be listed.
+        """
+        versions = {}
+        for file_path in self.list_files(path, pattern):
+            info = self.get_file_info(file_path)
+            versions[file_path] = f"{info.get('size')}:{info.get('modified')}"
+        return versions
+
     @abc.abstractmethod
     def delete_file(self, path: str) -> None:
         """
@@ -105,6 +165,41 @@ class StorageBackend(abc.ABC):
         """
         pass
 
+    def delete_files(self, paths: List[str], max_workers: Optional[int] = None,
+                     return_exceptions: bool = False) -> Dict[str, Optional[StorageError]]:
+        """
+        Delete several files.
+
+        The default implementation deletes the files one after another with
+        delete_file(). Backends override it to delete concurrently or in
+        batched requests. Files that do not exist are not an error.
+
+        Args:
+            paths: The paths of the files to delete.
+            max_workers: Maximum number of concurrent deletions (ignored by
+                         sequential backends; backends default to their
+                         configured concurrency).
+            return_exceptions: If True, a file that cannot be deleted maps to
+                               its StorageError instead of failing the whole call.
+
+        Returns:
+            Dictionary mapping each path to None if it was deleted, or to its
+            StorageError, in the order of paths.
+
+        Raises:
+            StorageError: If a file cannot be deleted and return_exceptions is False.
+        """
+        results: Dict[str, Optional[StorageError]] = {}
+        for path in paths:
+            try:
+                self.delete_file(path)
+                results[path] = None
+            except StorageError as e:
+                if not return_exceptions:
+                    raise
+                results[path] = e
+        return results
+
     @abc.abstractmethod
     def get_file_info(self, path: str) -> Dict[str, Any]:
         """
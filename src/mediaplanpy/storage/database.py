@@ -25,7 +25,8 @@ Version Compatibility:
 
 import os
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import uuid
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from decimal import Decimal
 import pandas as pd
 
@@ -33,6 +34,9 @@ from mediaplanpy.exceptions import StorageError, DatabaseError
 
 logger = logging.getLogger("mediaplanpy.storage.database")
 
+# Default number of rows fetched per round trip by server-side cursors
+DEFAULT_FETCH_SIZE = 10000
+
 class PostgreSQLBackend:
     """
     PostgreSQL backend for storing flattened media plan data with version support.
@@ -75,6 +79,7 @@ class PostgreSQLBackend:
         self.ssl = db_config.get('ssl', True)
         self.connection_timeout = db_config.get('connection_timeout', 30)
         self.auto_create_table = db_config.get('auto_create_table', True)
+        self.fetch_size = db_config.get('fetch_size', DEFAULT_FETCH_SIZE)
 
         # Get password from environment variable
         self.password = None
@@ -147,6 +152,52 @@ class PostgreSQLBackend:
         except Exception as e:
             raise DatabaseError(f"Failed to connect to PostgreSQL database: {e}")
 
+    def iter_query_chunks(self, query: str, fetch_size: Optional[int] = None,
+                          params: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Run a read-only query through a server-side cursor and yield its rows in chunks.
+
+        A named cursor keeps the result set on the server, so only one chunk
+        of rows is held in client memory at a time instead of the whole result.
+        The connection is opened for the duration of the iteration and closed
+        when it ends or the iterator is closed.
+
+        Args:
+            query: SQL query to execute.
+            fetch_size: Rows per chunk (default: the backend's fetch_size).
+            params: Values for the query's %(name)s placeholders, if any.
+
+        Yields:
+            Tuples of (column names, list of row tuples). A query without rows
+            yields a single chunk with no rows, so the columns are still known.
+
+        Raises:
+            DatabaseError: If the connection fails.
+        """
+        fetch_size = fetch_size or self.fetch_size
+        connection = self.connect()
+        try:
+            cursor = connection.cursor(name=f"mediaplanpy_{uuid.uuid4().hex}")
+            cursor.itersize = fetch_size
+            try:
+                cursor.execute(query, params)
+
+                chunks = 0
+                while True:
+                    records = cursor.fetchmany(fetch_size)
+                    # Named cursors only populate description after the first fetch
+                    if records or chunks == 0:
+                        chunks += 1
+                        yield [desc[0] for desc in cursor.description], records
+                    if len(records) < fetch_size:
+                        break
+            finally:
+                cursor.close()
+        finally:
+            # Read-only query: nothing to commit
+            connection.rollback()
+            connection.close()
+
     def test_connection(self) -> bool:
         """
         Test database connection.
@@ -661,6 +712,41 @@ class PostgreSQLBackend:
         except Exception as e:
             raise DatabaseError(f"Failed to delete media plan {meta_id}: {e}")
 
+    def delete_media_plans(self, meta_ids: List[str], workspace_id: str) -> int:
+        """
+        Delete the records of several media plans with a single statement.
+
+        Args:
+            meta_ids: The media plan IDs to delete.
+            workspace_id: The workspace ID.
+
+        Returns:
+            Number of rows deleted.
+
+        Raises:
+            DatabaseError: If deletion fails.
+        """
+        if not meta_ids:
+            return 0
+
+        try:
+            delete_sql = f"""
+            DELETE FROM {self.schema}.{self.table_name}
+            WHERE workspace_id = %s AND meta_id = ANY(%s)
+            """
+
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(delete_sql, (workspace_id, list(meta_ids)))
+                    rows_deleted = cursor.rowcount
+                    conn.commit()
+
+            logger.debug(f"Deleted {rows_deleted} rows for {len(meta_ids)} media plans")
+            return rows_deleted
+
+        except Exception as e:
+            raise DatabaseError(f"Failed to delete {len(meta_ids)} media plans: {e}")
+
     def insert_media_plan(self, flattened_data: pd.DataFrame, workspace_id: str, workspace_name: str) -> int:
         """
         Insert media plan data with enhanced v2.0 version validation and field support.
@@ -0,0 +1,250 @@
+"""
+Local disk cache for remote storage objects.
+
+This module provides DiskCache, a size-bounded LRU cache of object contents
+on local disk used by S3StorageBackend (storage.s3.cache_dir). Every entry
+records the ETag of the object version it holds, so the backend can serve it
+without a request when a listing already reports that ETag, or revalidate
+it with a conditional GET (If-None-Match) that transfers no content when the
+object is unchanged. Media plan files are written once per plan version and
+rarely change, so repeated loads and queries of the same plans are served
+from disk.
+
+Entries are stored as ``<namespace>/<hash[:2]>/<hash><extension>`` (hash of
+the object key, extension kept so tools that look at file names still
+recognise e.g. Parquet files) with the ETag in a ``.etag`` file next to
+them. Files are written to a temporary name and renamed into place, so
+several processes can share a cache directory; the size budget is enforced
+per process.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger("mediaplanpy.storage.disk_cache")
+
+# Default size budget of the cache
+DEFAULT_DISK_CACHE_MB = 1024
+
+ETAG_SUFFIX = ".etag"
+
+
+class DiskCache:
+    """
+    Size-bounded LRU cache of remote objects on local disk, keyed by namespace (e.g. bucket) and key.
+
+    Entries are evicted least recently used first once the cached files
+    exceed max_bytes. The entry just stored is never evicted by its own
+    store, so a single object larger than the budget stays cached until the
+    next store.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        """
+        Create a cache over a directory (created if missing).
+
+        Args:
+            directory: Cache directory; existing entries are reused.
+            max_bytes: Size budget in bytes (default DEFAULT_DISK_CACHE_MB).
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = DEFAULT_DISK_CACHE_MB * 1024 * 1024 if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        # Entry path -> size, least recently used first; loaded on first use
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def entry_path(self, namespace: str, key: str) -> str:
+        """
+        Get the local path of an object's entry.
+
+        Args:
+            namespace: Namespace of the key (e.g. the bucket)
+            key: Object key
+
+        Returns:
+            Absolute path of the cached file (which may not exist).
+        """
+        digest = hashlib.sha256(f"{namespace}/{key}".encode('utf-8')).hexdigest()
+        extension = posixpath.splitext(key)[1]
+        return os.path.join(self.directory, namespace, digest[:2], digest + extension)
+
+    def lookup(self, namespace: str, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the cached copy of an object, if any.
+
+        Args:
+            namespace: Namespace of the key
+            key: Object key
+
+        Returns:
+            Tuple of (local path, ETag of the cached version), or None.
+        """
+        path = self.entry_path(namespace, key)
+        try:
+            with open(path + ETAG_SUFFIX, 'r', encoding='utf-8') as f:
+                etag = f.read()
+        except OSError:
+            return None
+        if not os.path.exists(path):
+            return None
+        return path, etag
+
+    def touch(self, path: str) -> None:
+        """Record a hit on an entry, making it the most recently used."""
+        with self._lock:
+            entries = self._load_entries()
+            self.hits += 1
+            if path in entries:
+                entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def store(self, namespace: str, key: str, etag: str, content: Union[bytes, BinaryIO]) -> str:
+        """
+        Store a version of an object, replacing any cached version.
+
+        Args:
+            namespace: Namespace of the key
+            key: Object key
+            etag: ETag of the version being stored
+            content: Object contents, or a readable binary stream copied in chunks
+
+        Returns:
+            Local path of the cached file.
+        """
+        path = self.entry_path(namespace, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Drop the old ETag first, so a crash never pairs it with new content
+        try:
+            os.remove(path + ETAG_SUFFIX)
+        except OSError:
+            pass
+
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                if isinstance(content, (bytes, bytearray)):
+                    f.write(content)
+                else:
+                    shutil.copyfileobj(content, f)
+            os.replace(temp_path, path)
+            self._write_etag(path, etag)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        size = os.path.getsize(path)
+        with self._lock:
+            entries = self._load_entries()
+            self._current_bytes += size - entries.pop(path, 0)
+            entries[path] = size
+            self.stores += 1
+            self._evict(keep=path)
+        return path
+
+    def discard(self, namespace: str, key: str) -> None:
+        """Remove an object's entry, if cached."""
+        path = self.entry_path(namespace, key)
+        with self._lock:
+            entries = self._load_entries()
+            self._current_bytes -= entries.pop(path, 0)
+            self._remove_files(path)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            entries = self._load_entries()
+            for path in list(entries):
+                self._remove_files(path)
+            entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with the directory, entry count, bytes used, budget,
+            and the hit, store and eviction counters.
+        """
+        with self._lock:
+            entries = self._load_entries()
+            return {
+                'directory': self.directory,
+                'entries': len(entries),
+                'current_bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'stores': self.stores,
+                'evictions': self.evictions
+            }
+
+    def _load_entries(self) -> "OrderedDict[str, int]":
+        """Index the entries already on disk, least recently used first (call with the lock held)."""
+        if self._entries is None:
+            found = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(ETAG_SUFFIX) or name.startswith(".tmp-"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    found.append((stat.st_mtime, path, stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((path, size) for _, path, size in found)
+            self._current_bytes = sum(self._entries.values())
+            if found:
+                logger.debug(f"Disk cache {self.directory}: {len(found)} entries, {self._current_bytes} bytes")
+        return self._entries
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used entries until within budget (call with the lock held)."""
+        entries = self._entries
+        for path in list(entries):
+            if self._current_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._current_bytes -= entries.pop(path)
+            self._remove_files(path)
+            self.evictions += 1
+
+    @staticmethod
+    def _write_etag(path: str, etag: str) -> None:
+        """Atomically write the ETag file of an entry."""
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            f.write(etag)
+        os.replace(temp_path, path + ETAG_SUFFIX)
+
+    @staticmethod
+    def _remove_files(path: str) -> None:
+        """Remove an entry's files, ignoring files already gone."""
+        for file_path in (path + ETAG_SUFFIX, path):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
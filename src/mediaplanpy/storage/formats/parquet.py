@@ -157,21 +157,10 @@ class ParquetFormatHandler(FormatHandler):
             SchemaVersionError: If version validation fails.
         """
         try:
-            # Validate version before serialization
-            self.validate_schema_version(data)
-
-            # Normalize version format
-            data = self.normalize_version_in_data(data)
-
-            # Convert to flattened DataFrame
-            df = self._flatten_media_plan(data)
-
             # Convert to Parquet bytes
             buffer = io.BytesIO()
-            table = pa.Table.from_pandas(df, schema=self._get_arrow_schema())
-
             pq.write_table(
-                table,
+                self._to_table(data),
                 buffer,
                 compression=kwargs.get('compression', self.compression)
             )
@@ -184,6 +173,30 @@ class ParquetFormatHandler(FormatHandler):
         except Exception as e:
             raise StorageError(f"Failed to serialize data to Parquet: {e}")
 
+    def _to_table(self, data: Dict[str, Any]) -> pa.Table:
+        """
+        Validate media plan data and convert it to a flattened Arrow table.
+
+        Args:
+            data: The media plan data to convert.
+
+        Returns:
+            Arrow table with one row per line item.
+
+        Raises:
+            SchemaVersionError: If version validation fails.
+        """
+        # Validate version before serialization
+        self.validate_schema_version(data)
+
+        # Normalize version format
+        data = self.normalize_version_in_data(data)
+
+        # Convert to flattened DataFrame
+        df = self._flatten_media_plan(data)
+
+        return pa.Table.from_pandas(df, schema=self._get_arrow_schema())
+
     def deserialize(self, content: bytes, **kwargs) -> Dict[str, Any]:
         """
         Deserialize content from Parquet binary format.
@@ -220,12 +233,15 @@ class ParquetFormatHandler(FormatHandler):
             SchemaVersionError: If version validation fails.
         """
         try:
-            content = self.serialize(data, **kwargs)
-
             # Check if file is opened in binary mode
             if hasattr(file_obj, 'mode') and 'b' in file_obj.mode:
-                # Binary mode - write directly
-                file_obj.write(content)
+                # Binary mode - write directly, so the file receives the data
+                # as it is encoded rather than as one serialized copy
+                pq.write_table(
+                    self._to_table(data),
+                    file_obj,
+                    compression=kwargs.get('compression', self.compression)
+                )
             else:
                 # Text mode - this shouldn't happen for Parquet
                 raise StorageError("Parquet files must be opened in binary mode")
@@ -10,6 +10,7 @@ import logging
 import shutil
 import glob
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union, BinaryIO, TextIO
 
@@ -18,6 +19,9 @@ from mediaplanpy.storage.base import StorageBackend
 
 logger = logging.getLogger("mediaplanpy.storage.local")
 
+# Default number of concurrent unlinks of delete_files()
+DEFAULT_LOCAL_DELETE_WORKERS = 8
+
 
 class LocalStorageBackend(StorageBackend):
     """
@@ -246,6 +250,30 @@ class LocalStorageBackend(StorageBackend):
         except Exception as e:
             raise StorageError(f"Failed to list files in {full_path}: {e}")
 
+    def get_file_versions(self, path: str, pattern: Optional[str] = None) -> Dict[str, str]:
+        """
+        List files in a directory together with their size and modification time.
+
+        Args:
+            path: The directory path to list files from.
+            pattern: Optional glob pattern to filter files.
+
+        Returns:
+            Dictionary mapping file paths to "<size>:<mtime_ns>" tokens.
+
+        Raises:
+            StorageError: If the directory cannot be listed.
+        """
+        versions = {}
+        for file_path in self.list_files(path, pattern):
+            try:
+                stat_info = os.stat(self.resolve_path(file_path))
+            except FileNotFoundError:
+                # Removed between listing and stat
+                continue
+            versions[file_path] = f"{stat_info.st_size}:{stat_info.st_mtime_ns}"
+        return versions
+
     def delete_file(self, path: str) -> None:
         """
         Delete a file on the local filesystem.
@@ -264,6 +292,45 @@ class LocalStorageBackend(StorageBackend):
         except Exception as e:
             raise StorageError(f"Failed to delete file {full_path}: {e}")
 
+    def delete_files(self, paths: List[str], max_workers: Optional[int] = None,
+                     return_exceptions: bool = False) -> Dict[str, Optional[StorageError]]:
+        """
+        Delete several files on the local filesystem with concurrent unlinks.
+
+        Unlinks on network file systems and large directories are dominated
+        by per-call latency, so they are spread over a small thread pool.
+
+        Args:
+            paths: The paths of the files to delete.
+            max_workers: Maximum number of concurrent unlinks (default 8).
+            return_exceptions: If True, a file that cannot be deleted maps to
+                               its StorageError instead of failing the whole call.
+
+        Returns:
+            Dictionary mapping each path to None if it was deleted, or to its
+            StorageError, in the order of paths.
+
+        Raises:
+            StorageError: If a file cannot be deleted and return_exceptions is False.
+        """
+        paths = list(paths)
+        workers = min(max_workers or DEFAULT_LOCAL_DELETE_WORKERS, len(paths))
+        if workers <= 1:
+            return super().delete_files(paths, return_exceptions=return_exceptions)
+
+        def delete(path):
+            try:
+                self.delete_file(path)
+            except StorageError as e:
+                if not return_exceptions:
+                    raise
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mediaplanpy-delete") as executor:
+            # map() yields in submission order and re-raises the first failure
+            return dict(zip(paths, executor.map(delete, paths)))
+
     def get_file_info(self, path: str) -> Dict[str, Any]:
         """
         Get information about a file on the local filesystem.
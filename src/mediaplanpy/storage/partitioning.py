@@ -0,0 +1,189 @@
+"""
+Hive-style partitioned layout for media plan Parquet files.
+
+By default ("flat" layout) the Parquet copy of each media plan is written next
+to its JSON file as ``mediaplans/<id>.parquet``. The optional "partitioned"
+layout writes it under partition directories instead::
+
+    mediaplans/campaign_id=<id>/year=<campaign start year>/meta_is_archived=<true|false>/<id>.parquet
+
+so queries filtering on campaign, campaign start year or archive status can
+skip whole directories without listing or opening the files inside them.
+Partition directories only drive file selection - the partition columns are
+already part of every file's data, so files are always read with DuckDB's
+hive partitioning disabled.
+
+The layout is selected with ``storage.parquet_layout`` in the workspace
+configuration.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger("mediaplanpy.storage.partitioning")
+
+PARQUET_LAYOUT_FLAT = "flat"
+PARQUET_LAYOUT_PARTITIONED = "partitioned"
+PARQUET_LAYOUTS = (PARQUET_LAYOUT_FLAT, PARQUET_LAYOUT_PARTITIONED)
+
+# Partition keys, outermost first
+PARTITION_KEYS = ("campaign_id", "year", "meta_is_archived")
+
+# Directory value used when a partition value is missing
+NULL_PARTITION_VALUE = "__HIVE_DEFAULT_PARTITION__"
+
+# Glob matching every partition directory (relative to mediaplans/)
+PARTITION_GLOB = "/".join(f"{key}=*" for key in PARTITION_KEYS)
+
+
+def get_parquet_layout(workspace_config: Dict[str, Any]) -> str:
+    """
+    Get the Parquet layout configured for a workspace.
+
+    Args:
+        workspace_config: The resolved workspace configuration.
+
+    Returns:
+        "flat" (default) or "partitioned".
+    """
+    layout = workspace_config.get('storage', {}).get('parquet_layout', PARQUET_LAYOUT_FLAT)
+    if layout not in PARQUET_LAYOUTS:
+        logger.warning(f"Unknown parquet_layout '{layout}', using '{PARQUET_LAYOUT_FLAT}'")
+        return PARQUET_LAYOUT_FLAT
+    return layout
+
+
+def encode_partition_value(value: Any) -> str:
+    """Encode a value for use in a partition directory name."""
+    if value is None or value == "":
+        return NULL_PARTITION_VALUE
+    return quote(str(value), safe="-_.")
+
+
+def decode_partition_value(text: str) -> Optional[str]:
+    """Decode a partition directory value (None for the null partition)."""
+    if text == NULL_PARTITION_VALUE:
+        return None
+    return unquote(text)
+
+
+def get_partition_values(media_plan_data: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Get the partition values for a media plan.
+
+    Args:
+        media_plan_data: Media plan dictionary (as produced by MediaPlan.to_dict()).
+
+    Returns:
+        Dictionary of partition key to (unencoded) string value.
+    """
+    campaign = media_plan_data.get('campaign', {}) or {}
+    meta = media_plan_data.get('meta', {}) or {}
+
+    start_date = campaign.get('start_date')
+    if isinstance(start_date, (date, datetime)):
+        year = str(start_date.year)
+    elif start_date:
+        year = str(start_date)[:4]
+    else:
+        year = None
+
+    return {
+        "campaign_id": campaign.get('id'),
+        "year": year,
+        "meta_is_archived": "true" if meta.get('is_archived') is True else "false"
+    }
+
+
+def get_partition_dir(partition_values: Dict[str, Optional[str]]) -> str:
+    """
+    Build the partition directory (relative to mediaplans/) for partition values.
+
+    Args:
+        partition_values: Dictionary as returned by get_partition_values().
+
+    Returns:
+        Path such as "campaign_id=abc/year=2025/meta_is_archived=false".
+    """
+    return "/".join(f"{key}={encode_partition_value(partition_values.get(key))}" for key in PARTITION_KEYS)
+
+
+def parse_partition_path(path: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Extract partition values from a file path.
+
+    Args:
+        path: File path containing partition directories.
+
+    Returns:
+        Dictionary of partition key to decoded value, or None if the path is
+        not inside a complete set of partition directories.
+    """
+    values = {}
+    for part in path.replace('\\', '/').split('/'):
+        key, sep, value = part.partition('=')
+        if sep and key in PARTITION_KEYS:
+            values[key] = decode_partition_value(value)
+
+    if len(values) != len(PARTITION_KEYS):
+        return None
+    return values
+
+
+def partition_matches(partition_values: Dict[str, Optional[str]],
+                      partition_filters: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether a partition can contain rows matching the partition filters.
+
+    Args:
+        partition_values: Dictionary as returned by parse_partition_path().
+        partition_filters: Dictionary with any of:
+            - "campaign_id": list of allowed campaign IDs
+            - "year": {"min": int, "max": int} (either bound optional)
+            - "meta_is_archived": list of allowed values ("true"/"false")
+
+    Returns:
+        False only if the partition provably holds no matching rows.
+    """
+    if not partition_filters:
+        return True
+
+    campaign_ids = partition_filters.get('campaign_id')
+    if campaign_ids is not None and partition_values.get('campaign_id') not in campaign_ids:
+        return False
+
+    archived = partition_filters.get('meta_is_archived')
+    if archived is not None and partition_values.get('meta_is_archived') not in archived:
+        return False
+
+    year_range = partition_filters.get('year')
+    if year_range and partition_values.get('year') is not None:
+        try:
+            year = int(partition_values['year'])
+        except ValueError:
+            return True
+        if 'min' in year_range and year < year_range['min']:
+            return False
+        if 'max' in year_range and year > year_range['max']:
+            return False
+
+    return True
+
+
+def get_partition_listing_dirs(partition_filters: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+    """
+    Get the campaign-level directories to list for the partition filters.
+
+    Args:
+        partition_filters: Partition filters (see partition_matches()).
+
+    Returns:
+        List of "campaign_id=..." directories, or None if every campaign
+        directory has to be listed.
+    """
+    if not partition_filters or partition_filters.get('campaign_id') is None:
+        return None
+    return [f"campaign_id={encode_partition_value(campaign_id)}"
+            for campaign_id in sorted(partition_filters['campaign_id'])]
@@ -9,16 +9,45 @@ import os
 from typing import Dict, Any, Optional, List, Union, BinaryIO, TextIO
 import io
 import posixpath
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import boto3
 import botocore
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 
 from mediaplanpy.exceptions import StorageError, FileReadError, FileWriteError
 from mediaplanpy.storage.base import StorageBackend
+from mediaplanpy.storage.disk_cache import DiskCache, DEFAULT_DISK_CACHE_MB
 
 logger = logging.getLogger("mediaplanpy.storage.s3")
 
+# Default number of concurrent requests of bulk operations (read_files(),
+# multipart part uploads)
+DEFAULT_S3_MAX_CONCURRENCY = 16
+
+# Default size of multipart upload parts and ranged GETs of streamed files,
+# and the size above which open_file() writers switch to multipart uploads
+DEFAULT_S3_CHUNK_SIZE_MB = 8
+
+# Smallest part S3 accepts in a multipart upload (except the last part)
+MIN_MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+
+# Most keys S3 accepts in one DeleteObjects request
+MAX_DELETE_BATCH_SIZE = 1000
+
+# Default seconds a listing is reused by later list_files() calls
+DEFAULT_S3_LIST_CACHE_TTL = 5
+
+# Most listings (one per S3 prefix) kept in the listing cache
+MAX_CACHED_LISTINGS = 64
+
+# Glob characters of fnmatch patterns; the text before the first one is a literal key prefix
+GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
 
 class S3StorageBackend(StorageBackend):
     """
@@ -28,6 +57,9 @@ class S3StorageBackend(StorageBackend):
     - AWS credential chain: profile -> environment variables -> default
     - Configurable bucket, region, and prefix
     - S3-compatible services via custom endpoint URLs
+    - Optional read-through local disk cache (storage.s3.cache_dir)
+    - Listings narrowed to the literal prefix of glob patterns and reused for
+      storage.s3.list_cache_ttl seconds, kept current with this backend's writes
     """
 
     def __init__(self, workspace_config: Dict[str, Any]):
@@ -71,6 +103,26 @@ class S3StorageBackend(StorageBackend):
         self.endpoint_url = s3_config.get('endpoint_url')
         self.use_ssl = s3_config.get('use_ssl', True)
 
+        # Bound on concurrent requests of bulk operations; the client's
+        # connection pool is sized to match
+        self.max_concurrency = max(1, int(s3_config.get('max_concurrency', DEFAULT_S3_MAX_CONCURRENCY)))
+
+        # Part size of streamed uploads and range size of streamed reads
+        self.chunk_size = max(MIN_MULTIPART_CHUNK_SIZE,
+                              int(float(s3_config.get('chunk_size_mb', DEFAULT_S3_CHUNK_SIZE_MB)) * 1024 * 1024))
+
+        # Optional local copies of objects, revalidated by ETag
+        cache_dir = s3_config.get('cache_dir')
+        self.disk_cache = None
+        if cache_dir:
+            cache_max_mb = float(s3_config.get('cache_max_mb', DEFAULT_DISK_CACHE_MB))
+            self.disk_cache = DiskCache(cache_dir, max_bytes=int(cache_max_mb * 1024 * 1024))
+
+        # Listings by S3 prefix: prefix -> (monotonic time listed, {key: ListObjectsV2 entry})
+        self.list_cache_ttl = float(s3_config.get('list_cache_ttl', DEFAULT_S3_LIST_CACHE_TTL))
+        self._listings: Dict[str, Any] = {}
+        self._listings_lock = threading.Lock()
+
         # Initialize S3 client
         self.s3_client = self._create_s3_client()
 
@@ -93,7 +145,8 @@ class S3StorageBackend(StorageBackend):
             # Build client configuration
             client_config = {
                 'region_name': self.region,
-                'use_ssl': self.use_ssl
+                'use_ssl': self.use_ssl,
+                'config': Config(max_pool_connections=max(10, self.max_concurrency))
             }
 
             # Add endpoint URL if specified (for S3-compatible services)
@@ -108,12 +161,12 @@ class S3StorageBackend(StorageBackend):
             if self.profile:
                 # Use specific AWS profile
                 logger.debug(f"Using AWS profile: {self.profile}")
-                session = boto3.Session(profile_name=self.profile)
-                return session.client('s3', **client_config)
+                self.session = boto3.Session(profile_name=self.profile)
             else:
                 # Use default credentials chain
                 logger.debug("Using default AWS credentials chain")
-                return boto3.client('s3', **client_config)
+                self.session = boto3.Session()
+            return self.session.client('s3', **client_config)
 
         except NoCredentialsError as e:
             raise StorageError(
@@ -127,6 +180,24 @@ class S3StorageBackend(StorageBackend):
         except Exception as e:
             raise StorageError(f"Failed to create S3 client: {e}")
 
+    def get_credentials(self):
+        """
+        Get the current credentials of the backend's AWS session.
+
+        Temporary credentials (STS, assumed roles, instance metadata) are
+        refreshed by botocore shortly before they expire, so callers that
+        pass credentials to other clients (DuckDB, pyarrow) should call this
+        again rather than keep the result.
+
+        Returns:
+            botocore ReadOnlyCredentials (access_key, secret_key, token), or
+            None if no credentials are configured.
+        """
+        credentials = self.session.get_credentials()
+        if credentials is None:
+            return None
+        return credentials.get_frozen_credentials()
+
     def _test_connection(self):
         """
         Test the S3 connection and bucket accessibility.
@@ -266,11 +337,16 @@ class S3StorageBackend(StorageBackend):
         s3_key = self.resolve_s3_key(path)
 
         try:
-            # Download the object from S3
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key)
+            if self.disk_cache is not None:
+                # Serve the local copy, downloading it only if it changed
+                with open(self.cached_path(path), 'rb') as f:
+                    content_bytes = f.read()
+            else:
+                # Download the object from S3
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key)
 
-            # Read the content from the streaming body
-            content_bytes = response['Body'].read()
+                # Read the content from the streaming body
+                content_bytes = response['Body'].read()
 
             if binary:
                 return content_bytes
@@ -294,9 +370,131 @@ class S3StorageBackend(StorageBackend):
             else:
                 raise FileReadError(f"Failed to read file {path} from S3: {e}")
 
+        except FileReadError:
+            raise
+
         except Exception as e:
             raise FileReadError(f"Failed to read file {path}: {e}")
 
+    def cached_path(self, path: str, etag: Optional[str] = None) -> str:
+        """
+        Get a local copy of a file from the disk cache, downloading it if needed.
+
+        A cached copy whose ETag equals etag (e.g. from get_file_versions())
+        is used without any request. Otherwise the copy is revalidated with a
+        conditional GET (If-None-Match), which transfers no content if the
+        object is unchanged; changed or uncached objects are downloaded into
+        the cache.
+
+        Args:
+            path: The path to the file
+            etag: ETag the object is known to have, if any
+
+        Returns:
+            Local path of the cached copy. It may be evicted or replaced by
+            later reads, so open it right away.
+
+        Raises:
+            FileReadError: If the disk cache is disabled
+            ClientError: If the object cannot be fetched (e.g. NoSuchKey)
+        """
+        if self.disk_cache is None:
+            raise FileReadError("No disk cache configured for S3 storage (storage.s3.cache_dir)")
+
+        s3_key = self.resolve_s3_key(path)
+        cached = self.disk_cache.lookup(self.bucket, s3_key)
+        if cached is not None:
+            local_path, cached_etag = cached
+            if etag is not None and etag.strip('"') == cached_etag:
+                self.disk_cache.touch(local_path)
+                return local_path
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key,
+                                                     IfNoneMatch=f'"{cached_etag}"')
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in ('304', 'NotModified'):
+                    raise
+                self.disk_cache.touch(local_path)
+                return local_path
+        else:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key)
+
+        logger.debug(f"Caching s3://{self.bucket}/{s3_key} ({response.get('ContentLength', 0)} bytes)")
+        return self.disk_cache.store(self.bucket, s3_key, response.get('ETag', '').strip('"'), response['Body'])
+
+    def cache_files(self, file_versions: Dict[str, Optional[str]],
+                    max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Bring several files into the disk cache concurrently (see cached_path()).
+
+        Args:
+            file_versions: Dictionary mapping file paths to their known ETag
+                           (or None), e.g. from get_file_versions()
+            max_workers: Maximum number of concurrent downloads
+                         (default: storage.s3.max_concurrency, 16)
+
+        Returns:
+            Dictionary mapping each path to its local copy
+
+        Raises:
+            FileReadError: If the disk cache is disabled or a file cannot be fetched
+        """
+        def fetch(item):
+            path, etag = item
+            try:
+                return self.cached_path(path, etag)
+            except FileReadError:
+                raise
+            except Exception as e:
+                raise FileReadError(f"Failed to cache file {path} from S3: {e}")
+
+        items = list(file_versions.items())
+        workers = min(max_workers or self.max_concurrency, len(items))
+        if workers <= 1:
+            return {path: fetch((path, etag)) for path, etag in items}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mediaplanpy-s3-cache") as executor:
+            return dict(zip((path for path, _ in items), executor.map(fetch, items)))
+
+    def read_files(self, paths: List[str], binary: bool = False, max_workers: Optional[int] = None,
+                   return_exceptions: bool = False) -> Dict[str, Union[str, bytes, FileReadError]]:
+        """
+        Read several files from S3 concurrently.
+
+        Each read is a full round trip, so the files are fetched by a bounded
+        thread pool sharing this backend's (thread-safe) client; scans of
+        thousands of plans are then limited by bandwidth rather than latency.
+
+        Args:
+            paths: The paths of the files to read
+            binary: If True, read the files in binary mode
+            max_workers: Maximum number of concurrent reads
+                         (default: storage.s3.max_concurrency, 16)
+            return_exceptions: If True, a file that cannot be read maps to its
+                               FileReadError instead of failing the whole call
+
+        Returns:
+            Dictionary mapping each path to its contents, in the order of paths
+
+        Raises:
+            FileReadError: If a file cannot be read and return_exceptions is False
+        """
+        paths = list(paths)
+        workers = min(max_workers or self.max_concurrency, len(paths))
+        if workers <= 1:
+            return super().read_files(paths, binary=binary, return_exceptions=return_exceptions)
+
+        def read(path):
+            try:
+                return self.read_file(path, binary=binary)
+            except FileReadError as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mediaplanpy-s3-read") as executor:
+            # map() yields in submission order and re-raises the first failure
+            return dict(zip(paths, executor.map(read, paths)))
+
     def write_file(self, path: str, content: Union[str, bytes]) -> None:
         """
         Write content to a file in S3.
@@ -314,20 +512,23 @@ class S3StorageBackend(StorageBackend):
             # Convert string content to bytes if needed
             if isinstance(content, str):
                 content_bytes = content.encode('utf-8')
-                content_type = 'text/plain; charset=utf-8'
             else:
                 content_bytes = content
-                # Try to infer content type from file extension
-                content_type = self._infer_content_type(path)
+            content_type = self._content_type(path, is_text=isinstance(content, str))
 
             # Upload to S3
-            self.s3_client.put_object(
+            response = self.s3_client.put_object(
                 Bucket=self.bucket,
                 Key=s3_key,
                 Body=content_bytes,
                 ContentType=content_type
             )
 
+            self._record_listing(s3_key, response.get('ETag'), len(content_bytes))
+            if self.disk_cache is not None:
+                # Write through, so reading back what was just saved needs no download
+                self.disk_cache.store(self.bucket, s3_key, response.get('ETag', '').strip('"'), content_bytes)
+
             logger.debug(f"Successfully wrote {len(content_bytes)} bytes to s3://{self.bucket}/{s3_key}")
 
         except ClientError as e:
@@ -352,6 +553,43 @@ class S3StorageBackend(StorageBackend):
         Returns:
             A list of file paths relative to the storage root
 
+        Raises:
+            StorageError: If the files cannot be listed
+        """
+        return sorted(self._list_objects(path, pattern))
+
+    def get_file_versions(self, path: str, pattern: Optional[str] = None) -> Dict[str, str]:
+        """
+        List files at the specified path in S3 together with their ETags.
+
+        Uses the same ListObjectsV2 calls as list_files(), so no per-object
+        HEAD requests are made.
+
+        Args:
+            path: The directory path to list files from
+            pattern: Optional glob pattern to filter files
+
+        Returns:
+            Dictionary mapping file paths to their ETag
+
+        Raises:
+            StorageError: If the files cannot be listed
+        """
+        objects = self._list_objects(path, pattern)
+        return {file_path: objects[file_path].get('ETag', '').strip('"') for file_path in sorted(objects)}
+
+    def _list_objects(self, path: str, pattern: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        List objects at the specified path in S3.
+
+        Args:
+            path: The directory path to list files from
+            pattern: Optional glob pattern to filter files
+
+        Returns:
+            Dictionary mapping file paths (relative to the storage root) to
+            their ListObjectsV2 entries
+
         Raises:
             StorageError: If the files cannot be listed
         """
@@ -363,25 +601,23 @@ class S3StorageBackend(StorageBackend):
         else:
             s3_prefix = self.prefix if self.prefix else ''
 
+        # Keys matching the pattern start with its literal part, so only those are listed
+        if pattern:
+            s3_prefix += GLOB_CHARACTERS.split(pattern, 1)[0]
+
         try:
             # List objects with the specified prefix
-            files = []
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-
-            for page in paginator.paginate(Bucket=self.bucket, Prefix=s3_prefix):
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        s3_key = obj['Key']
-
-                        # Convert S3 key back to relative path
-                        if self.prefix and s3_key.startswith(self.prefix):
-                            relative_path = s3_key[len(self.prefix):]
-                        else:
-                            relative_path = s3_key
+            objects = {}
+            for s3_key, obj in self._list_prefix(s3_prefix).items():
+                # Convert S3 key back to relative path
+                if self.prefix and s3_key.startswith(self.prefix):
+                    relative_path = s3_key[len(self.prefix):]
+                else:
+                    relative_path = s3_key
 
-                        # Skip if it's just the prefix (directory marker)
-                        if relative_path and not relative_path.endswith('/'):
-                            files.append(relative_path)
+                # Skip if it's just the prefix (directory marker)
+                if relative_path and not relative_path.endswith('/'):
+                    objects[relative_path] = obj
 
             # Apply pattern filter if specified
             if pattern:
@@ -391,30 +627,27 @@ class S3StorageBackend(StorageBackend):
                 if path:
                     # When searching within a specific directory, match pattern against just the filename
                     # Extract directory and filename parts
-                    filtered_files = []
-                    for file_path in files:
+                    filtered_objects = {}
+                    for file_path, obj in objects.items():
                         if file_path.startswith(path):
                             # Extract just the filename part after the directory
                             filename_part = file_path[len(path):].lstrip('/')
 
                             # Match pattern against filename only
                             if fnmatch.fnmatch(filename_part, pattern):
-                                filtered_files.append(file_path)
+                                filtered_objects[file_path] = obj
                         else:
                             # File not in the expected directory - match against full path
                             if fnmatch.fnmatch(file_path, pattern):
-                                filtered_files.append(file_path)
+                                filtered_objects[file_path] = obj
 
-                    files = filtered_files
+                    objects = filtered_objects
                 else:
                     # When searching in root, match pattern against full relative path
-                    files = [f for f in files if fnmatch.fnmatch(f, pattern)]
+                    objects = {f: obj for f, obj in objects.items() if fnmatch.fnmatch(f, pattern)}
 
-            # Sort files for consistent ordering
-            files.sort()
-
-            logger.debug(f"Listed {len(files)} files from s3://{self.bucket}/{s3_prefix}")
-            return files
+            logger.debug(f"Listed {len(objects)} files from s3://{self.bucket}/{s3_prefix}")
+            return objects
 
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', 'Unknown')
@@ -427,6 +660,68 @@ class S3StorageBackend(StorageBackend):
         except Exception as e:
             raise StorageError(f"Failed to list files at {path}: {e}")
 
+    def _list_prefix(self, s3_prefix: str) -> Dict[str, Dict[str, Any]]:
+        """
+        List every object under an S3 prefix, reusing a recent listing.
+
+        A listing of the prefix or of any shorter prefix made in the last
+        list_cache_ttl seconds answers the call without a request.
+
+        Args:
+            s3_prefix: S3 key prefix
+
+        Returns:
+            Dictionary mapping S3 keys to their ListObjectsV2 entries
+        """
+        if self.list_cache_ttl > 0:
+            now = time.monotonic()
+            with self._listings_lock:
+                for cached_prefix, (listed_at, entries) in self._listings.items():
+                    if now - listed_at < self.list_cache_ttl and s3_prefix.startswith(cached_prefix):
+                        return {key: obj for key, obj in entries.items() if key.startswith(s3_prefix)}
+
+        listed_at = time.monotonic()
+        entries = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=s3_prefix):
+            for obj in page.get('Contents', []):
+                entries[obj['Key']] = obj
+
+        if self.list_cache_ttl > 0:
+            with self._listings_lock:
+                # Drop expired listings and those the new one covers, then the oldest
+                self._listings = {
+                    cached_prefix: listing for cached_prefix, listing in self._listings.items()
+                    if listed_at - listing[0] < self.list_cache_ttl and not cached_prefix.startswith(s3_prefix)
+                }
+                while len(self._listings) >= MAX_CACHED_LISTINGS:
+                    del self._listings[min(self._listings, key=lambda prefix: self._listings[prefix][0])]
+                self._listings[s3_prefix] = (listed_at, entries)
+        return dict(entries)
+
+    def _record_listing(self, s3_key: str, etag: Optional[str], size: int = 0) -> None:
+        """
+        Update the cached listings after this backend wrote or deleted an object.
+
+        Args:
+            s3_key: S3 key of the object
+            etag: ETag of the written object, or None if it was deleted
+            size: Size of the written object in bytes
+        """
+        with self._listings_lock:
+            for cached_prefix, (_, entries) in self._listings.items():
+                if not s3_key.startswith(cached_prefix):
+                    continue
+                if etag is None:
+                    entries.pop(s3_key, None)
+                else:
+                    entries[s3_key] = {'Key': s3_key, 'ETag': etag, 'Size': size}
+
+    def clear_listing_cache(self) -> None:
+        """Forget cached listings, so the next list_files() lists S3 again."""
+        with self._listings_lock:
+            self._listings = {}
+
     def delete_file(self, path: str) -> None:
         """
         Delete a file at the specified path in S3.
@@ -442,6 +737,9 @@ class S3StorageBackend(StorageBackend):
         try:
             # Delete the object from S3
             self.s3_client.delete_object(Bucket=self.bucket, Key=s3_key)
+            self._record_listing(s3_key, None)
+            if self.disk_cache is not None:
+                self.disk_cache.discard(self.bucket, s3_key)
             logger.debug(f"Successfully deleted s3://{self.bucket}/{s3_key}")
 
         except ClientError as e:
@@ -455,6 +753,68 @@ class S3StorageBackend(StorageBackend):
         except Exception as e:
             raise StorageError(f"Failed to delete file {path}: {e}")
 
+    def delete_files(self, paths: List[str], max_workers: Optional[int] = None,
+                     return_exceptions: bool = False) -> Dict[str, Optional[StorageError]]:
+        """
+        Delete several files from S3 with batched DeleteObjects requests.
+
+        Keys are deleted in batches of up to 1000 per request, with the
+        batches sent concurrently, so purging thousands of files takes a few
+        requests instead of one round trip per file.
+
+        Args:
+            paths: The paths of the files to delete
+            max_workers: Maximum number of concurrent batch requests
+                         (default: storage.s3.max_concurrency, 16)
+            return_exceptions: If True, a file that cannot be deleted maps to
+                               its StorageError instead of failing the whole call
+
+        Returns:
+            Dictionary mapping each path to None if it was deleted, or to its
+            StorageError, in the order of paths
+
+        Raises:
+            StorageError: If a file cannot be deleted and return_exceptions is False
+        """
+        paths = list(paths)
+        keys = {self.resolve_s3_key(path): path for path in paths}
+        key_list = list(keys)
+        batches = [key_list[i:i + MAX_DELETE_BATCH_SIZE] for i in range(0, len(key_list), MAX_DELETE_BATCH_SIZE)]
+
+        def delete_batch(batch):
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            except Exception as e:
+                return {key: StorageError(f"Failed to delete file {keys[key]} from S3: {e}") for key in batch}
+            return {error['Key']: StorageError(f"Failed to delete file {keys[error['Key']]} from S3: "
+                                               f"{error.get('Code')} {error.get('Message', '')}".rstrip())
+                    for error in response.get('Errors', [])}
+
+        errors = {}
+        workers = min(max_workers or self.max_concurrency, len(batches))
+        if workers <= 1:
+            for batch in batches:
+                errors.update(delete_batch(batch))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mediaplanpy-s3-delete") as executor:
+                for batch_errors in executor.map(delete_batch, batches):
+                    errors.update(batch_errors)
+
+        for s3_key in key_list:
+            if s3_key not in errors:
+                self._record_listing(s3_key, None)
+                if self.disk_cache is not None:
+                    self.disk_cache.discard(self.bucket, s3_key)
+        logger.debug(f"Deleted {len(key_list) - len(errors)} of {len(key_list)} objects "
+                     f"from s3://{self.bucket}/{self.prefix} in {len(batches)} requests")
+
+        if errors and not return_exceptions:
+            raise next(iter(errors.values()))
+        return {path: errors.get(self.resolve_s3_key(path)) for path in paths}
+
     def get_file_info(self, path: str) -> Dict[str, Any]:
         """
         Get information about a file in S3.
@@ -532,21 +892,46 @@ class S3StorageBackend(StorageBackend):
         is_append = 'a' in mode
 
         if is_write:
-            # Write modes: return a file-like object that uploads on close
+            # Write modes: return a file-like object that streams a multipart
+            # upload once the content outgrows one chunk
             return S3WriteWrapper(self, path, is_binary, is_append)
+        elif self.disk_cache is not None:
+            # Read modes with the disk cache: open the (revalidated) local copy
+            try:
+                return open(self.cached_path(path), mode, **({} if is_binary else {'encoding': 'utf-8'}))
+            except Exception as e:
+                raise StorageError(f"Failed to open file {path} for reading: {e}")
         else:
-            # Read modes: download content and return StringIO/BytesIO
+            # Read modes: stream the object with ranged GETs, so format handlers
+            # can consume it incrementally (and seek, e.g. to a Parquet footer)
             try:
-                content = self.read_file(path, binary=is_binary)
-
-                if is_binary:
-                    return io.BytesIO(content)
-                else:
-                    return io.StringIO(content)
-
+                raw = S3ReadStream(self, path)
             except FileReadError as e:
                 raise StorageError(f"Failed to open file {path} for reading: {e}")
 
+            reader = io.BufferedReader(raw, buffer_size=self.chunk_size)
+            if is_binary:
+                return reader
+            text = io.TextIOWrapper(reader, encoding='utf-8')
+            text.mode = mode
+            return text
+
+    def _content_type(self, path: str, is_text: bool) -> str:
+        """
+        Get the content type to store an object with.
+
+        Args:
+            path: File path
+            is_text: Whether the content was written as text
+
+        Returns:
+            MIME content type string
+        """
+        if is_text:
+            return 'text/plain; charset=utf-8'
+        # Try to infer content type from file extension
+        return self._infer_content_type(path)
+
     def _infer_content_type(self, path: str) -> str:
         """
         Infer the MIME content type from file extension.
@@ -581,12 +966,134 @@ class S3StorageBackend(StorageBackend):
         return type_mappings.get(ext, 'application/octet-stream')
 
 
-class S3WriteWrapper:
+class S3ReadStream(io.RawIOBase):
+    """
+    A seekable, read-only raw stream over an S3 object using ranged GETs.
+
+    The first chunk is fetched when the stream is opened, which also checks
+    that the object exists and learns its size; objects smaller than one
+    chunk therefore cost a single request, as read_file() does. Further
+    reads fetch exactly the requested byte ranges, so wrapping the stream in
+    io.BufferedReader (as S3StorageBackend.open_file() does) reads large
+    objects chunk by chunk without holding the whole object in memory.
     """
-    A file-like wrapper that accumulates writes and uploads to S3 on close.
 
-    This allows the storage backend to support the standard file interface
-    while efficiently handling S3 uploads.
+    def __init__(self, backend: 'S3StorageBackend', path: str):
+        """
+        Open the stream.
+
+        Args:
+            backend: S3 storage backend
+            path: The path to the file
+
+        Raises:
+            FileReadError: If the object does not exist or cannot be read.
+        """
+        super().__init__()
+        self.backend = backend
+        self.path = path
+        self.mode = 'rb'
+        self._key = backend.resolve_s3_key(path)
+        self._position = 0
+        self._first_chunk = self._fetch_first_chunk()
+
+    @property
+    def name(self) -> str:
+        """Return the file path."""
+        return self.path
+
+    def _fetch_first_chunk(self) -> bytes:
+        """Fetch the first chunk of the object and record its size."""
+        try:
+            response = self.backend.s3_client.get_object(
+                Bucket=self.backend.bucket, Key=self._key, Range=f"bytes=0-{self.backend.chunk_size - 1}")
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            if error_code == 'InvalidRange':
+                # Empty objects have no byte 0
+                self.size = 0
+                return b''
+            if error_code == 'NoSuchKey':
+                raise FileReadError(f"File not found: {self.path} (s3://{self.backend.bucket}/{self._key})")
+            raise FileReadError(f"Failed to read file {self.path} from S3: {e}")
+        except Exception as e:
+            raise FileReadError(f"Failed to read file {self.path}: {e}")
+
+        content = response['Body'].read()
+        content_range = response.get('ContentRange')
+        # S3-compatible services may ignore the range and return the whole object
+        self.size = int(content_range.rsplit('/', 1)[1]) if content_range else len(content)
+        return content
+
+    def _read_range(self, start: int, length: int) -> bytes:
+        """Read length bytes from offset start, from the first chunk if it holds them."""
+        if start + length <= len(self._first_chunk):
+            return self._first_chunk[start:start + length]
+        try:
+            response = self.backend.s3_client.get_object(
+                Bucket=self.backend.bucket, Key=self._key, Range=f"bytes={start}-{start + length - 1}")
+            return response['Body'].read()
+        except Exception as e:
+            raise FileReadError(f"Failed to read bytes {start}-{start + length - 1} of {self.path}: {e}")
+
+    def readable(self) -> bool:
+        """Return whether the file supports reading."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return whether the file supports seeking."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read up to len(buffer) bytes from the current position into buffer."""
+        length = min(len(buffer), self.size - self._position)
+        if length <= 0:
+            return 0
+        data = self._read_range(self._position, length)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        """Read the rest of the object with one request."""
+        length = self.size - self._position
+        if length <= 0:
+            return b''
+        data = self._read_range(self._position, length)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a new position (whence as for io.IOBase.seek())."""
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        """Return the current position."""
+        return self._position
+
+
+class S3WriteWrapper:
+    """
+    A file-like writer that streams content to S3.
+
+    Writes are buffered until they reach the backend's chunk size; from then
+    on the content is sent as a multipart upload whose parts are uploaded in
+    parallel (at most max_concurrency at a time, which also bounds the memory
+    held by parts in flight) while the caller keeps writing. Smaller content
+    is uploaded with a single put_object on close. The object only appears
+    in S3 when the writer is closed; leaving a ``with`` block with an
+    exception discards the upload.
     """
 
     def __init__(self, backend: 'S3StorageBackend', path: str, is_binary: bool, is_append: bool):
@@ -596,57 +1103,144 @@ class S3WriteWrapper:
         self.is_append = is_append
         self.closed = False
 
-        if is_binary:
-            self._buffer = io.BytesIO()
-        else:
-            self._buffer = io.StringIO()
+        self._buffer = bytearray()
+        self._written = 0
+        self._key = backend.resolve_s3_key(path)
+        self._upload_id = None
+        self._parts = []
+        self._next_part_number = 1
+        self._pending = set()
+        self._executor = None
+        self._lock = threading.Lock()
 
         # For append mode, pre-load existing content
         if is_append and backend.exists(path):
             try:
                 existing_content = backend.read_file(path, binary=is_binary)
-                self._buffer.write(existing_content)
+                self.write(existing_content)
             except FileReadError:
                 # If we can't read existing content, start fresh
                 pass
 
     def write(self, data: Union[str, bytes]) -> int:
-        """Write data to the buffer."""
+        """Write data, uploading full chunks once the content outgrows one chunk."""
         if self.closed:
             raise ValueError("I/O operation on closed file")
 
-        return self._buffer.write(data)
+        content = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+        self._buffer += content
+        self._written += len(content)
 
-    def writelines(self, lines):
-        """Write a list of lines to the buffer."""
-        if self.closed:
-            raise ValueError("I/O operation on closed file")
+        # Upload only while more than a chunk is buffered, so the last part is never empty
+        chunk_size = self.backend.chunk_size
+        while len(self._buffer) > chunk_size:
+            part = bytes(self._buffer[:chunk_size])
+            del self._buffer[:chunk_size]
+            self._upload_part(part)
+        return len(data)
 
-        self._buffer.writelines(lines)
+    def writelines(self, lines):
+        """Write a list of lines."""
+        for line in lines:
+            self.write(line)
 
     def flush(self):
-        """Flush the buffer (no-op for this implementation)."""
+        """Flush the buffer (parts are uploaded as soon as they are full)."""
         if self.closed:
             raise ValueError("I/O operation on closed file")
 
-        self._buffer.flush()
+    def tell(self) -> int:
+        """Return the number of bytes written so far."""
+        return self._written
+
+    def _upload_part(self, part: bytes) -> None:
+        """Start the multipart upload if needed and upload part in the background."""
+        client = self.backend.s3_client
+        if self._upload_id is None:
+            response = client.create_multipart_upload(
+                Bucket=self.backend.bucket, Key=self._key,
+                ContentType=self.backend._content_type(self.path, is_text=not self.is_binary))
+            self._upload_id = response['UploadId']
+            self._executor = ThreadPoolExecutor(max_workers=self.backend.max_concurrency,
+                                                thread_name_prefix="mediaplanpy-s3-upload")
+            logger.debug(f"Started multipart upload to s3://{self.backend.bucket}/{self._key}")
+
+        # Bound the parts held in memory: wait for a slot before queueing another
+        while len(self._pending) >= self.backend.max_concurrency:
+            done, self._pending = wait(self._pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+
+        # Numbered in the writing thread, so numbers follow the content order
+        # whatever order the uploads finish in
+        part_number = self._next_part_number
+        self._next_part_number += 1
+        self._pending.add(self._executor.submit(self._send_part, part_number, part))
+
+    def _send_part(self, part_number: int, part: bytes) -> None:
+        """Upload one part and record its ETag."""
+        response = self.backend.s3_client.upload_part(
+            Bucket=self.backend.bucket, Key=self._key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=part)
+        with self._lock:
+            self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
+    def _complete(self) -> None:
+        """Upload the remaining content and finish the upload."""
+        if self._upload_id is None:
+            content = bytes(self._buffer)
+            self.backend.write_file(self.path, content if self.is_binary else content.decode('utf-8'))
+            return
+
+        if self._buffer:
+            self._upload_part(bytes(self._buffer))
+            self._buffer = bytearray()
+        for future in self._pending:
+            future.result()
+        self._pending = set()
+
+        response = self.backend.s3_client.complete_multipart_upload(
+            Bucket=self.backend.bucket, Key=self._key, UploadId=self._upload_id,
+            MultipartUpload={'Parts': sorted(self._parts, key=lambda part: part['PartNumber'])})
+        self.backend._record_listing(self._key, response.get('ETag'), self._written)
+        if self.backend.disk_cache is not None:
+            # The content was not kept, so drop any stale copy; the next read caches it
+            self.backend.disk_cache.discard(self.backend.bucket, self._key)
+        logger.debug(f"Completed multipart upload of {self._written} bytes in {len(self._parts)} parts "
+                     f"to s3://{self.backend.bucket}/{self._key}")
+
+    def abort(self) -> None:
+        """Discard everything written and close the file without creating the object."""
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer = bytearray()
+        if self._upload_id is not None:
+            for future in self._pending:
+                future.cancel()
+            try:
+                self.backend.s3_client.abort_multipart_upload(
+                    Bucket=self.backend.bucket, Key=self._key, UploadId=self._upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload of {self.path}: {e}")
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        """Stop the part upload threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def close(self):
-        """Close the file and upload content to S3."""
+        """Close the file and finish the upload to S3."""
         if not self.closed:
             try:
-                # Get all content from buffer
-                content = self._buffer.getvalue()
-
-                # Upload to S3
-                self.backend.write_file(self.path, content)
-
-                # Close the buffer
-                self._buffer.close()
+                self._complete()
                 self.closed = True
+                self._shutdown()
 
             except Exception as e:
-                self.closed = True
+                self.abort()
                 raise StorageError(f"Failed to upload file {self.path} to S3: {e}")
 
     def __enter__(self):
@@ -654,8 +1248,11 @@ class S3WriteWrapper:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.close()
+        """Context manager exit: upload on success, discard on error."""
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
 
     @property
     def mode(self) -> str:
@@ -680,4 +1277,4 @@ class S3WriteWrapper:
 
     def seekable(self) -> bool:
         """Return whether the file supports seeking."""
-        return not self.closed
\ No newline at end of file
+        return False
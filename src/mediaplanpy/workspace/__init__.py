@@ -15,8 +15,12 @@ from mediaplanpy.exceptions import (
 from mediaplanpy.workspace.loader import WorkspaceManager
 from mediaplanpy.workspace.validator import validate_workspace, WORKSPACE_SCHEMA
 
-# Import query module to patch methods into WorkspaceManager
+# Import query modules to patch methods into WorkspaceManager
 import mediaplanpy.workspace.query
+import mediaplanpy.workspace.async_query
+import mediaplanpy.workspace.aggregate
+import mediaplanpy.workspace.flighting
+import mediaplanpy.workspace.maintenance
 
 __all__ = [
     'WorkspaceManager',
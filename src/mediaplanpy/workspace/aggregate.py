@@ -0,0 +1,250 @@
+"""
+Grouped aggregation of workspace line items.
+
+This module adds WorkspaceManager.aggregate(), which compiles a report
+request - measures, grouping dimensions, filters and an optional time grain
+- into a single grouped SQL statement. The statement runs on the engine the
+query router picks (DuckDB over Parquet or PostgreSQL, with the usual
+workspace isolation), so only the aggregated rows reach Python instead of
+every column of every line item.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mediaplanpy.exceptions import SQLQueryError
+from mediaplanpy.workspace.query import _profiled, _resolve_result_format
+from mediaplanpy.workspace.query_profile import profile_stage
+from mediaplanpy.workspace.query_router import list_query_shape
+
+logger = logging.getLogger("mediaplanpy.workspace.aggregate")
+
+# Aggregate functions accepted as "<function>:<column>" measures
+MEASURE_FUNCTIONS = {
+    "sum": "SUM({column})",
+    "avg": "AVG({column})",
+    "min": "MIN({column})",
+    "max": "MAX({column})",
+    "count_distinct": "COUNT(DISTINCT {column})"
+}
+
+# Functions that only apply to numeric columns
+_NUMERIC_FUNCTIONS = ("sum", "avg")
+
+# Values of time_grain
+TIME_GRAINS = ("day", "week", "month", "quarter", "year")
+
+# Column the time grain buckets line items by, and the name of the bucket column
+TIME_COLUMN = "lineitem_start_date"
+PERIOD_ALIAS = "period"
+
+# Dimension shorthands that do not follow the lineitem_ prefix rule
+_DIMENSION_ALIASES = {
+    "campaign": "campaign_id",
+    "mediaplan": "meta_id",
+    "plan": "meta_id"
+}
+
+
+def _resolve_column(name: str) -> str:
+    """
+    Resolve a measure or dimension name to a canonical schema column.
+
+    Names are tried as given, then with the lineitem_ prefix, so "channel"
+    and "lineitem_channel" both resolve to lineitem_channel.
+
+    Args:
+        name: Column name or shorthand
+
+    Returns:
+        The schema column name.
+
+    Raises:
+        SQLQueryError: If the name is not a column of the workspace schema.
+    """
+    from mediaplanpy.storage.schema_columns import get_column_types
+
+    column_types = get_column_types()
+    for candidate in (_DIMENSION_ALIASES.get(name, name), f"lineitem_{name}"):
+        if candidate in column_types:
+            return candidate
+    raise SQLQueryError(f"Unknown column '{name}' in aggregate(); use a line item, campaign or meta column")
+
+
+def _is_numeric_column(column: str) -> bool:
+    from decimal import Decimal
+    from mediaplanpy.storage.schema_columns import get_column_types
+
+    return get_column_types().get(column) in (int, float, Decimal)
+
+
+def _measure_sql(measure: str) -> Tuple[str, str]:
+    """
+    Compile one measure to an aggregate expression.
+
+    Args:
+        measure: "count" (number of line items), a numeric column to sum
+                 (e.g. "cost_total"), or "<function>:<column>" with a function
+                 from MEASURE_FUNCTIONS (e.g. "avg:cost_total", "count_distinct:meta_id")
+
+    Returns:
+        Tuple of (SQL expression, result column name).
+
+    Raises:
+        SQLQueryError: If the measure is not valid.
+    """
+    if measure == "count":
+        return "COUNT(*)", "lineitem_count"
+
+    function, _, name = measure.rpartition(":")
+    function = function or "sum"
+    if function not in MEASURE_FUNCTIONS:
+        raise SQLQueryError(
+            f"Invalid measure function '{function}'. Must be one of: {', '.join(MEASURE_FUNCTIONS)}"
+        )
+
+    column = _resolve_column(name)
+    if function in _NUMERIC_FUNCTIONS and not _is_numeric_column(column):
+        raise SQLQueryError(f"Measure '{measure}' needs a numeric column; '{column}' is not numeric")
+
+    alias = name if function == "sum" and ":" not in measure else f"{function}_{name}"
+    return MEASURE_FUNCTIONS[function].format(column=column), alias
+
+
+def build_aggregate_query(measures: Sequence[str], by: Optional[Sequence[str]] = None,
+                          time_grain: Optional[str] = None,
+                          filter_conditions: Optional[str] = None) -> str:
+    """
+    Build the grouped SQL statement behind aggregate().
+
+    Args:
+        measures: Measures (see _measure_sql())
+        by: Grouping dimensions (column names or shorthands such as "channel" or "campaign")
+        time_grain: Optional time bucket of lineitem_start_date (one of TIME_GRAINS)
+        filter_conditions: Optional SQL condition selecting the line items
+
+    Returns:
+        SQL query with a {*} placeholder.
+
+    Raises:
+        SQLQueryError: If a measure, dimension or time grain is invalid.
+    """
+    if not measures:
+        raise SQLQueryError("aggregate() needs at least one measure")
+    if time_grain is not None and time_grain not in TIME_GRAINS:
+        raise SQLQueryError(f"Invalid time_grain '{time_grain}'. Must be one of: {', '.join(TIME_GRAINS)}")
+
+    group_columns: List[str] = []
+    select_items: List[str] = []
+    aliases: List[str] = []
+
+    for name in by or []:
+        column = _resolve_column(name)
+        group_columns.append(column)
+        select_items.append(column if column == name else f"{column} AS {name}")
+        aliases.append(name)
+
+    if time_grain is not None:
+        bucket = f"CAST(DATE_TRUNC('{time_grain}', {TIME_COLUMN}) AS DATE)"
+        group_columns.append(bucket)
+        select_items.append(f"{bucket} AS {PERIOD_ALIAS}")
+        aliases.append(PERIOD_ALIAS)
+
+    for measure in measures:
+        expression, alias = _measure_sql(measure)
+        select_items.append(f"{expression} AS {alias}")
+        aliases.append(alias)
+
+    duplicates = sorted({alias for alias in aliases if aliases.count(alias) > 1})
+    if duplicates:
+        raise SQLQueryError(f"Duplicate output columns in aggregate(): {', '.join(duplicates)}")
+
+    query = (f"SELECT {', '.join(select_items)}\n"
+             f"FROM {{*}}\n"
+             f"WHERE (is_placeholder = FALSE OR is_placeholder IS NULL)")
+    if filter_conditions:
+        query += f" AND ({filter_conditions})"
+    if group_columns:
+        query += f"\nGROUP BY {', '.join(group_columns)}"
+        query += f"\nORDER BY {', '.join(column + ' NULLS LAST' for column in group_columns)}"
+    return query
+
+
+@_profiled
+def aggregate(self, measures: Sequence[str], by: Optional[Sequence[str]] = None,
+              filters: Optional[Dict[str, Any]] = None, time_grain: Optional[str] = None,
+              engine: str = "auto", return_dataframe: bool = True,
+              result_format: Optional[str] = None) -> Any:
+    """
+    Aggregate line items across all media plans in one grouped query.
+
+    Placeholder line items are excluded, as in list_lineitems(). Archived and
+    non-current plans are included unless filtered out (e.g.
+    filters={"meta_is_current": True}).
+
+    Example:
+        >>> df = workspace_manager.aggregate(
+        ...     measures=["cost_total", "metric_impressions", "count"],
+        ...     by=["channel", "campaign"],
+        ...     filters={"lineitem_start_date": {"min": "2025-01-01"}},
+        ...     time_grain="month")
+
+    Args:
+        measures: Columns to sum (e.g. "cost_total", "metric_clicks"), "count"
+                  for the number of line items, or "<function>:<column>" with
+                  function sum, avg, min, max or count_distinct (e.g.
+                  "avg:cost_total", "count_distinct:meta_id"). Result columns
+                  are named after the measure ("cost_total", "lineitem_count",
+                  "avg_cost_total").
+        by: Dimensions to group by, e.g. "channel", "vehicle", "partner",
+            "campaign" (campaign_id), "dim_custom1" or any schema column.
+            Result columns are named as given.
+        filters: Filters selecting the line items (same format as list_lineitems()).
+        time_grain: Also group by the "period" of lineitem_start_date: "day",
+                    "week", "month", "quarter" or "year". Line items are
+                    counted in the period they start in.
+        engine: Engine preference ("auto", "database", "duckdb").
+        return_dataframe: If False, return a list of dictionaries.
+        result_format: "pandas", "arrow", "polars" or "records"; overrides
+                       return_dataframe (see sql_query()).
+
+    Returns:
+        One row per group (a single row without by and time_grain), ordered by
+        the grouping columns.
+
+    Raises:
+        WorkspaceError: If no workspace configuration is loaded.
+        SQLQueryError: If a measure, dimension or time grain is invalid or the
+                       query fails.
+    """
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    result_format = _resolve_result_format(result_format, return_dataframe)
+    shape = list_query_shape('aggregate', filters, measures=','.join(measures), by=','.join(by or []),
+                             time_grain=time_grain)
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, engine_override=engine, shape=shape)
+
+    params: Dict[str, Any] = {}
+    filter_conditions = None
+    if filters:
+        filter_conditions = self._build_sql_filter_conditions(filters, params, engine=decision.engine)
+    query = build_aggregate_query(measures, by, time_grain, filter_conditions)
+    logger.debug(f"aggregate() query: {query}")
+
+    return self._run_routed_query(decision, query, partition_filters=self._build_partition_filters(filters),
+                                  result_format=result_format, params=params)
+
+
+def patch_workspace_manager():
+    """
+    Add aggregate() to the WorkspaceManager class.
+    """
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+    WorkspaceManager.aggregate = aggregate
+
+
+patch_workspace_manager()
@@ -0,0 +1,141 @@
+"""
+asyncio query API for WorkspaceManager.
+
+This module adds awaitable counterparts of the query methods -
+sql_query_async(), list_campaigns_async(), list_mediaplans_async() and
+list_lineitems_async() - for applications running on an asyncio event loop.
+Each call runs its synchronous counterpart on the workspace's bounded query
+executor (see WorkspaceManager.get_query_executor()), so the event loop keeps
+serving other requests while DuckDB scans Parquet files or PostgreSQL
+returns rows. DuckDB and psycopg2 release the GIL while they work, so
+queries on different worker threads run concurrently.
+
+The query runs in a copy of the awaiting task's context, and context
+variables it sets are copied back when it completes, so the task sees the
+profile (get_last_query_profile()) and routing decision
+(QueryRouter.last_decision) of its own async queries.
+
+Cancelling an awaiting task does not interrupt a query that has already
+started; its result is discarded when it completes.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("mediaplanpy.workspace.async_query")
+
+# Default number of worker threads running async queries
+DEFAULT_ASYNC_WORKERS = 4
+
+
+async def _run_in_query_executor(self, func, *args, **kwargs) -> Any:
+    """
+    Run a synchronous query method on the workspace query executor.
+
+    The method runs in a copy of the calling task's context; the context
+    variables it sets (last query profile, routing decision) are applied to
+    the calling task's context once it returns.
+
+    Args:
+        func: Bound method to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The result of func.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    try:
+        return await loop.run_in_executor(
+            self.get_query_executor(), context.run, functools.partial(func, *args, **kwargs))
+    finally:
+        for variable, value in context.items():
+            if variable.get(None) is not value:
+                variable.set(value)
+
+
+async def sql_query_async(self,
+                          query: str,
+                          engine: str = "auto",
+                          return_dataframe: bool = True,
+                          limit: Optional[int] = None,
+                          partition_filters: Optional[Dict[str, Any]] = None,
+                          use_cache: bool = True,
+                          result_format: Optional[str] = None,
+                          params: Optional[Dict[str, Any]] = None,
+                          profile: Optional[bool] = None) -> Any:
+    """
+    Execute a SQL query against workspace data without blocking the event loop.
+
+    Awaitable counterpart of sql_query(); arguments, routing and results are
+    the same. The profile and routing decision of the query are available to
+    the awaiting task afterwards, as for a synchronous call.
+
+    Example:
+        >>> df = await workspace.sql_query_async(
+        ...     "SELECT campaign_id, SUM(lineitem_cost_total) AS cost FROM {*} GROUP BY campaign_id",
+        ...     profile=True)
+        >>> print(workspace.get_last_query_profile().format())
+
+    Raises:
+        SQLQueryError: If the query is invalid or fails.
+    """
+    return await self._run_in_query_executor(
+        self.sql_query, query, engine=engine, return_dataframe=return_dataframe, limit=limit,
+        partition_filters=partition_filters, use_cache=use_cache, result_format=result_format,
+        params=params, profile=profile)
+
+
+async def list_campaigns_async(self, filters=None, include_stats=True, include_archived=False,
+                               return_dataframe=False, result_format=None):
+    """
+    Retrieve campaigns without blocking the event loop.
+
+    Awaitable counterpart of list_campaigns(); arguments and results are the same.
+    """
+    return await self._run_in_query_executor(
+        self.list_campaigns, filters=filters, include_stats=include_stats,
+        include_archived=include_archived, return_dataframe=return_dataframe, result_format=result_format)
+
+
+async def list_mediaplans_async(self, filters=None, include_stats=True, include_archived=True,
+                                return_dataframe=False, result_format=None):
+    """
+    Retrieve media plans without blocking the event loop.
+
+    Awaitable counterpart of list_mediaplans(); arguments and results are the same.
+    """
+    return await self._run_in_query_executor(
+        self.list_mediaplans, filters=filters, include_stats=include_stats,
+        include_archived=include_archived, return_dataframe=return_dataframe, result_format=result_format)
+
+
+async def list_lineitems_async(self, filters=None, limit=None, return_dataframe=False, result_format=None):
+    """
+    Retrieve line items without blocking the event loop.
+
+    Awaitable counterpart of list_lineitems(); arguments and results are the same.
+    """
+    return await self._run_in_query_executor(
+        self.list_lineitems, filters=filters, limit=limit, return_dataframe=return_dataframe,
+        result_format=result_format)
+
+
+def patch_workspace_manager():
+    """
+    Add the async query methods to the WorkspaceManager class.
+    """
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+    WorkspaceManager._run_in_query_executor = _run_in_query_executor
+    WorkspaceManager.sql_query_async = sql_query_async
+    WorkspaceManager.list_campaigns_async = list_campaigns_async
+    WorkspaceManager.list_mediaplans_async = list_mediaplans_async
+    WorkspaceManager.list_lineitems_async = list_lineitems_async
+
+
+patch_workspace_manager()
@@ -0,0 +1,470 @@
+"""
+Compacted Parquet catalog for workspace queries.
+
+Every saved media plan writes its own ``mediaplans/<id>.parquet`` file, so a
+workspace with many plan versions makes ``{*}`` expand into a very long
+``read_parquet([...])`` list that DuckDB has to open file by file. This module
+provides the WorkspaceCatalog class, which compacts those per-plan files into a
+small number of large Parquet files under ``catalog/`` together with a
+manifest recording which plan IDs live in which file.
+
+After compaction, ``mediaplans/`` acts as a delta area: newly saved plans keep
+writing their per-plan Parquet file there until the next compaction. Query
+pattern resolution combines both transparently - catalog rows are hidden for
+plans that have a newer copy in the delta area or were deleted since the last
+compaction.
+"""
+
+import fnmatch
+import io
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+from mediaplanpy.exceptions import WorkspaceError, StorageError
+
+logger = logging.getLogger("mediaplanpy.workspace.catalog")
+
+# Catalog location (kept outside mediaplans/, which S3 lists recursively)
+CATALOG_SUBDIR = "catalog"
+MANIFEST_PATH = f"{CATALOG_SUBDIR}/manifest.json"
+CATALOG_FORMAT_VERSION = 1
+
+# Delta area written by MediaPlan.save()
+MEDIAPLANS_SUBDIR = "mediaplans"
+
+
+class WorkspaceCatalog:
+    """
+    Manages the compacted Parquet catalog of a workspace.
+
+    The manifest (``catalog/manifest.json``) has the form::
+
+        {
+            "catalog_version": 1,
+            "generation": "20250101T120000-1a2b3c4d",
+            "compacted_at": "2025-01-01T12:00:00+00:00",
+            "files": [
+                {"path": "catalog/part-<generation>-00000.parquet",
+                 "rows": 250000, "plan_ids": ["mediaplan_...", ...],
+                 "campaign_ids": ["campaign_...", ...]}
+            ],
+            "sources": {"mediaplan_abc.parquet": ["mediaplan_abc"]},
+            "deleted_plan_ids": []
+        }
+
+    ``sources`` maps the original per-plan file names to the plan IDs they
+    contained, so ``{pattern}`` placeholders keep matching by file name after
+    compaction. ``deleted_plan_ids`` lists plans removed since the last
+    compaction whose rows are still physically present in catalog files.
+    ``campaign_ids`` lets campaign-filtered queries skip catalog files.
+
+    Example:
+        >>> catalog = WorkspaceCatalog(workspace_manager)
+        >>> result = catalog.compact(dry_run=True)  # Preview
+        >>> result = catalog.compact()
+    """
+
+    DEFAULT_TARGET_ROWS_PER_FILE = 500_000
+
+    def __init__(self, workspace_manager: 'WorkspaceManager'):
+        """
+        Initialize the catalog for a workspace.
+
+        Args:
+            workspace_manager: The WorkspaceManager instance owning the catalog
+        """
+        self.workspace_manager = workspace_manager
+
+    @property
+    def storage_backend(self):
+        """The workspace's storage backend."""
+        return self.workspace_manager.get_storage_backend()
+
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the catalog manifest.
+
+        Returns:
+            The manifest dictionary, or None if the workspace has never been compacted.
+
+        Raises:
+            StorageError: If the manifest exists but cannot be read.
+        """
+        storage_backend = self.storage_backend
+        if not storage_backend.exists(MANIFEST_PATH):
+            return None
+
+        try:
+            return json.loads(storage_backend.read_file(MANIFEST_PATH))
+        except json.JSONDecodeError as e:
+            raise StorageError(f"Catalog manifest {MANIFEST_PATH} is corrupted: {e}")
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the catalog manifest."""
+        self.storage_backend.write_file(MANIFEST_PATH, json.dumps(manifest, indent=2))
+
+    def record_deletion(self, media_plan_id: str) -> bool:
+        """
+        Hide a deleted media plan's rows in the catalog until the next compaction.
+
+        Args:
+            media_plan_id: ID of the media plan that was deleted
+
+        Returns:
+            True if the plan was present in the catalog and has been marked deleted.
+        """
+        return bool(self.record_deletions([media_plan_id]))
+
+    def record_deletions(self, media_plan_ids: List[str]) -> List[str]:
+        """
+        Hide several deleted media plans' rows in the catalog with one manifest update.
+
+        Args:
+            media_plan_ids: IDs of the media plans that were deleted
+
+        Returns:
+            IDs of the plans that were present in the catalog and have been marked deleted.
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            return []
+
+        cataloged = set()
+        for entry in manifest.get('files', []):
+            cataloged.update(entry.get('plan_ids', []))
+        deleted_plan_ids = manifest.setdefault('deleted_plan_ids', [])
+        already_deleted = set(deleted_plan_ids)
+        marked = [plan_id for plan_id in dict.fromkeys(media_plan_ids)
+                  if plan_id in cataloged and plan_id not in already_deleted]
+        if not marked:
+            return []
+
+        deleted_plan_ids.extend(marked)
+        self._write_manifest(manifest)
+        logger.debug(f"Marked {len(marked)} media plans as deleted in catalog")
+        return marked
+
+    def resolve_source(self, pattern: str, delta_refs: List[str],
+                       manifest: Optional[Dict[str, Any]] = None,
+                       partition_filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Build a DuckDB table expression combining catalog and delta files.
+
+        Args:
+            pattern: Placeholder pattern from the query ('*' or a file name pattern)
+            delta_refs: Quoted paths/URLs of matching per-plan files in the delta area
+            manifest: Manifest to resolve against (read from storage if not given)
+            partition_filters: Optional partition pruning hints; catalog files
+                holding none of the requested campaigns are skipped
+
+        Returns:
+            SQL table expression, or None if the workspace has no catalog or
+            neither the catalog nor the delta area contains matching data.
+        """
+        if manifest is None:
+            manifest = self.read_manifest()
+        if manifest is None:
+            return None
+        return self._source_expression(pattern, delta_refs, manifest, partition_filters)
+
+    def _source_expression(self, pattern: str, delta_refs: List[str], manifest: Dict[str, Any],
+                           partition_filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Build the table expression for resolve_source() from a manifest dictionary."""
+        files = manifest.get('files', [])
+
+        campaign_ids = (partition_filters or {}).get('campaign_id')
+        if campaign_ids is not None:
+            # Files written before campaign_ids were recorded are always kept
+            files = [entry for entry in files
+                     if 'campaign_ids' not in entry or set(campaign_ids).intersection(entry['campaign_ids'])]
+
+        if pattern == '*':
+            plan_ids = None
+            catalog_paths = [entry['path'] for entry in files]
+        else:
+            search_pattern = pattern if pattern.endswith('.parquet') else f"{pattern}.parquet"
+            plan_ids = set()
+            for source_name, source_plan_ids in manifest.get('sources', {}).items():
+                if fnmatch.fnmatch(source_name, search_pattern):
+                    plan_ids.update(source_plan_ids)
+            catalog_paths = [entry['path'] for entry in files
+                             if plan_ids.intersection(entry.get('plan_ids', []))]
+
+        if not catalog_paths:
+            if not delta_refs:
+                return None
+            return _read_parquet_expression(delta_refs)
+
+        catalog_refs = [_quote(ref) for ref in self._resolve_refs(catalog_paths)]
+        conditions = []
+        if plan_ids is not None:
+            conditions.append(f"meta_id IN ({_sql_list(sorted(plan_ids))})")
+        deleted_plan_ids = manifest.get('deleted_plan_ids', [])
+        if deleted_plan_ids:
+            conditions.append(f"meta_id NOT IN ({_sql_list(deleted_plan_ids)})")
+        if delta_refs:
+            conditions.append(
+                f"meta_id NOT IN (SELECT meta_id FROM {_read_parquet_expression(delta_refs)} "
+                f"WHERE meta_id IS NOT NULL)"
+            )
+
+        catalog_query = f"SELECT * FROM {_read_parquet_expression(catalog_refs)}"
+        if conditions:
+            catalog_query += " WHERE " + " AND ".join(conditions)
+
+        if delta_refs:
+            return (f"({catalog_query} UNION ALL BY NAME "
+                    f"SELECT * FROM {_read_parquet_expression(delta_refs)})")
+        return f"({catalog_query})"
+
+    def compact(self, target_rows_per_file: Optional[int] = None,
+                dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Merge the delta area and the existing catalog into new catalog files.
+
+        The current logical contents of the workspace (catalog rows that are
+        neither superseded nor deleted, plus every per-plan file in the delta
+        area) are rewritten into files of about ``target_rows_per_file`` rows,
+        sorted by campaign and plan. The manifest is then replaced, and the old
+        catalog files and compacted per-plan Parquet files are removed. The
+        per-plan JSON files are never touched.
+
+        A per-plan Parquet file that changes while compaction runs is left in
+        place, so its newer contents keep superseding the compacted copy.
+
+        Args:
+            target_rows_per_file: Approximate number of rows per catalog file
+            dry_run: If True, only report what would be compacted
+
+        Returns:
+            Dictionary with compaction results
+
+        Raises:
+            WorkspaceError: If compaction fails
+        """
+        self.workspace_manager.check_workspace_active("catalog compaction")
+
+        target_rows_per_file = target_rows_per_file or self.DEFAULT_TARGET_ROWS_PER_FILE
+        if target_rows_per_file <= 0:
+            raise WorkspaceError("target_rows_per_file must be a positive integer")
+
+        storage_backend = self.storage_backend
+        manifest = self.read_manifest()
+        previous_files = [entry['path'] for entry in manifest.get('files', [])] if manifest else []
+        deleted_plan_ids = list(manifest.get('deleted_plan_ids', [])) if manifest else []
+
+        delta_files = self._list_delta_files()
+
+        result = {
+            "dry_run": dry_run,
+            "delta_files_compacted": len(delta_files),
+            "previous_catalog_files": len(previous_files),
+            "deleted_plans_purged": len(deleted_plan_ids),
+            "catalog_files_written": 0,
+            "rows_written": 0,
+            "plans_in_catalog": 0,
+            "delta_files_kept": [],
+            "errors": []
+        }
+
+        if not delta_files and not deleted_plan_ids:
+            logger.info("Catalog is up to date - nothing to compact")
+            return result
+
+        if dry_run:
+            return result
+
+        # Remember delta file versions so files rewritten mid-compaction are kept
+        delta_versions = {path: _file_version(storage_backend, path) for path in delta_files}
+        delta_refs = [_quote(ref) for ref in self._resolve_refs(delta_files)]
+
+        source = self._source_expression('*', delta_refs, manifest or {})
+        generation = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        try:
+            new_files = []
+            if source is not None:
+                new_files = self._write_catalog_files(source, generation, target_rows_per_file)
+            sources = self._collect_sources(manifest, delta_refs, deleted_plan_ids)
+        except Exception as e:
+            raise WorkspaceError(f"Catalog compaction failed: {e}")
+
+        # Keep deletions recorded by other processes while compaction was running
+        current_manifest = self.read_manifest() or {}
+        late_deletions = [plan_id for plan_id in current_manifest.get('deleted_plan_ids', [])
+                          if plan_id not in deleted_plan_ids]
+
+        new_manifest = {
+            "catalog_version": CATALOG_FORMAT_VERSION,
+            "generation": generation,
+            "compacted_at": datetime.now(timezone.utc).isoformat(),
+            "files": new_files,
+            "sources": sources,
+            "deleted_plan_ids": late_deletions
+        }
+        self._write_manifest(new_manifest)
+
+        # Remove superseded catalog files and the compacted delta files
+        for path in previous_files:
+            try:
+                storage_backend.delete_file(path)
+            except Exception as e:
+                result["errors"].append(f"Failed to delete old catalog file {path}: {e}")
+
+        for path, version in delta_versions.items():
+            try:
+                if _file_version(storage_backend, path) != version:
+                    result["delta_files_kept"].append(path)
+                    continue
+                storage_backend.delete_file(path)
+            except Exception as e:
+                result["errors"].append(f"Failed to delete compacted file {path}: {e}")
+
+        result["catalog_files_written"] = len(new_files)
+        result["rows_written"] = sum(entry['rows'] for entry in new_files)
+        result["plans_in_catalog"] = len({plan_id for entry in new_files for plan_id in entry['plan_ids']})
+
+        logger.info(
+            f"Compacted {len(delta_files)} delta files into {len(new_files)} catalog files "
+            f"({result['rows_written']} rows)"
+        )
+        return result
+
+    def _list_delta_files(self) -> List[str]:
+        """List per-plan Parquet files in both the flat and the partitioned layout."""
+        from mediaplanpy.storage.partitioning import PARTITION_GLOB
+
+        storage_backend = self.storage_backend
+        files = set(storage_backend.list_files(MEDIAPLANS_SUBDIR, "*.parquet"))
+        files.update(storage_backend.list_files(MEDIAPLANS_SUBDIR, f"{PARTITION_GLOB}/*.parquet"))
+        return sorted(files)
+
+    def _resolve_refs(self, paths: List[str]) -> List[str]:
+        """Convert workspace-relative paths into paths/URLs DuckDB can read."""
+        storage_backend = self.storage_backend
+        if getattr(storage_backend, 'disk_cache', None) is not None:
+            # Local copies from the S3 disk cache, revalidated with conditional GETs
+            local_paths = storage_backend.cache_files({path: None for path in paths})
+            return [local_paths[path] for path in paths]
+        if type(storage_backend).__name__ == "S3StorageBackend":
+            return [f"s3://{storage_backend.bucket}/{storage_backend.resolve_s3_key(path)}" for path in paths]
+        return [storage_backend.resolve_path(path) for path in paths]
+
+    def _write_catalog_files(self, source: str, generation: str,
+                             target_rows_per_file: int) -> List[Dict[str, Any]]:
+        """
+        Stream the combined source into catalog files.
+
+        Returns:
+            Manifest entries for the files written.
+        """
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        storage_backend = self.storage_backend
+        storage_backend.create_directory(CATALOG_SUBDIR)
+
+        entries = []
+        buffer = writer = None
+        rows = 0
+        plan_ids = set()
+        campaign_ids = set()
+
+        def finish_file():
+            writer.close()
+            path = f"{CATALOG_SUBDIR}/part-{generation}-{len(entries):05d}.parquet"
+            storage_backend.write_file(path, buffer.getvalue())
+            entries.append({"path": path, "rows": rows, "plan_ids": sorted(plan_ids),
+                            "campaign_ids": sorted(campaign_ids)})
+
+        query = f"SELECT * FROM {source} ORDER BY campaign_id, meta_id"
+        with self.workspace_manager.get_duckdb_session_pool().session() as conn:
+            reader = conn.execute(query).fetch_record_batch(min(target_rows_per_file, 100_000))
+            for batch in reader:
+                if writer is None:
+                    buffer = io.BytesIO()
+                    writer = pq.ParquetWriter(buffer, batch.schema, compression='snappy')
+                    rows = 0
+                    plan_ids = set()
+                    campaign_ids = set()
+
+                writer.write_batch(batch)
+                rows += batch.num_rows
+                plan_ids.update(v for v in pc.unique(batch.column('meta_id')).to_pylist() if v is not None)
+                campaign_ids.update(v for v in pc.unique(batch.column('campaign_id')).to_pylist() if v is not None)
+
+                if rows >= target_rows_per_file:
+                    finish_file()
+                    writer = None
+
+        if writer is not None:
+            finish_file()
+
+        return entries
+
+    def _collect_sources(self, manifest: Optional[Dict[str, Any]], delta_refs: List[str],
+                         deleted_plan_ids: List[str]) -> Dict[str, List[str]]:
+        """Merge previous source mappings with the delta files being compacted."""
+        deleted = set(deleted_plan_ids)
+        sources = {}
+        if manifest:
+            for source_name, plan_ids in manifest.get('sources', {}).items():
+                remaining = [plan_id for plan_id in plan_ids if plan_id not in deleted]
+                if remaining:
+                    sources[source_name] = remaining
+
+        if delta_refs:
+            query = (f"SELECT DISTINCT filename, meta_id FROM "
+                     f"read_parquet([{', '.join(delta_refs)}], union_by_name=true, "
+                     f"hive_partitioning=false, filename=true) "
+                     f"WHERE meta_id IS NOT NULL")
+            delta_sources: Dict[str, List[str]] = {}
+            with self.workspace_manager.get_duckdb_session_pool().session() as conn:
+                for filename, plan_id in conn.execute(query).fetchall():
+                    source_name = os.path.basename(filename.replace('\\', '/'))
+                    delta_sources.setdefault(source_name, []).append(plan_id)
+            for source_name, plan_ids in delta_sources.items():
+                sources[source_name] = sorted(plan_ids)
+
+        return sources
+
+
+def _file_version(storage_backend, path: str) -> Optional[tuple]:
+    """Return a (size, modified) tuple identifying the current version of a file."""
+    try:
+        info = storage_backend.get_file_info(path)
+    except StorageError:
+        return None
+    return info.get('size'), str(info.get('modified'))
+
+
+def manifest_version(manifest: Dict[str, Any]) -> str:
+    """
+    Return a token identifying the catalog contents described by a manifest.
+
+    Catalog files are immutable, so the generation and the plans deleted
+    since it identify what the catalog reads.
+    """
+    return f"{manifest.get('generation')}:{sorted(manifest.get('deleted_plan_ids', []))}"
+
+
+def _quote(value: str) -> str:
+    """Quote a value as a SQL string literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_list(values: List[str]) -> str:
+    """Format values as a comma-separated list of SQL string literals."""
+    return ', '.join(_quote(value) for value in values)
+
+
+def _read_parquet_expression(refs: List[str]) -> str:
+    """Build a read_parquet() call over already-quoted file references."""
+    return f"read_parquet([{', '.join(refs)}], union_by_name=true, hive_partitioning=false)"
@@ -0,0 +1,270 @@
+"""
+DuckDB session pool for workspace SQL queries.
+
+This module provides the DuckDBSessionPool class, a set of reusable DuckDB
+sessions owned by a WorkspaceManager. The underlying in-memory database is
+created and configured once (httpfs extension, S3 region/endpoint settings
+and credentials), and every query borrows a session from the pool instead of
+opening and configuring a new connection.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+from mediaplanpy.exceptions import SQLQueryError
+
+logger = logging.getLogger("mediaplanpy.workspace.duckdb_pool")
+
+
+class DuckDBSessionPool:
+    """
+    Pool of pre-configured DuckDB sessions for one storage backend.
+
+    DuckDB connections are not safe to share between threads, so each query
+    borrows its own session (a cursor on the shared database) for the duration
+    of the call. Idle sessions are kept up to ``max_sessions``; concurrent
+    callers beyond that limit get a temporary session that is closed on
+    release rather than waiting for one to free up.
+
+    Settings applied at construction are global to the database, so every
+    session inherits the S3 configuration without repeating it. S3 credentials
+    are re-applied when the backend's temporary credentials are refreshed and
+    after a query is denied access (HTTP 403).
+    """
+
+    DEFAULT_MAX_SESSIONS = 4
+
+    def __init__(self, storage_backend, max_sessions: Optional[int] = None, scan_metrics: bool = False):
+        """
+        Create the DuckDB database and configure it for the storage backend.
+
+        Args:
+            storage_backend: The workspace storage backend queries will read from.
+            max_sessions: Maximum number of idle sessions kept for reuse.
+            scan_metrics: If True, sessions enable DuckDB's profiler so that the
+                          bytes each query reads can be reported (query_stats()).
+
+        Raises:
+            SQLQueryError: If DuckDB is not installed or S3 configuration fails.
+        """
+        try:
+            import duckdb
+        except ImportError:
+            raise SQLQueryError(
+                "DuckDB is required for SQL query functionality. "
+                "Install it with: pip install duckdb"
+            )
+
+        self.storage_backend = storage_backend
+        self.max_sessions = max_sessions or self.DEFAULT_MAX_SESSIONS
+        self.scan_metrics = scan_metrics
+
+        self._lock = threading.Lock()
+        self._idle: List = []
+        self._closed = False
+
+        self._s3_enabled = False
+        self._credentials_lock = threading.Lock()
+        self._credentials = None
+        self._credentials_stale = False
+
+        self._conn = duckdb.connect()
+
+        # With a disk cache, queries read local copies and need no S3 access
+        if (type(storage_backend).__name__ == "S3StorageBackend"
+                and getattr(storage_backend, 'disk_cache', None) is None):
+            try:
+                self._credentials = configure_duckdb_s3(self._conn, storage_backend)
+                self._s3_enabled = True
+            except Exception as e:
+                self._conn.close()
+                raise SQLQueryError(f"Failed to configure DuckDB for S3 access: {e}")
+
+        logger.debug(f"Created DuckDB session pool for {type(storage_backend).__name__}")
+
+    @property
+    def closed(self) -> bool:
+        """Check if the pool has been closed."""
+        return self._closed
+
+    @contextmanager
+    def session(self):
+        """
+        Borrow a DuckDB session for the duration of a with-block.
+
+        A session that raised an error is discarded rather than returned to
+        the pool, so a failed query can never leave a broken session behind.
+        The same applies to a streaming query abandoned part-way through
+        (GeneratorExit), whose session still holds an open result.
+
+        Yields:
+            A DuckDB connection (cursor) configured for the workspace.
+
+        Raises:
+            SQLQueryError: If the pool has been closed.
+        """
+        with self._lock:
+            if self._closed:
+                raise SQLQueryError("DuckDB session pool has been closed")
+            session = self._idle.pop() if self._idle else None
+        if session is None:
+            session = self._new_session()
+
+        if self._s3_enabled:
+            self._refresh_credentials()
+
+        try:
+            yield session
+        except BaseException as e:
+            session.close()
+            if self._s3_enabled and _is_access_denied(e):
+                # Re-apply credentials before the next query, even if unchanged
+                with self._credentials_lock:
+                    self._credentials_stale = True
+            raise
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_sessions:
+                self._idle.append(session)
+                return
+        session.close()
+
+    def _refresh_credentials(self) -> None:
+        """
+        Re-apply S3 credentials if the backend's credentials have changed.
+
+        botocore refreshes temporary credentials shortly before they expire,
+        so comparing them with the ones last applied is enough to replace the
+        DuckDB settings before the old credentials stop working.
+        """
+        try:
+            credentials = self.storage_backend.get_credentials()
+        except Exception as e:
+            logger.warning(f"Could not get S3 credentials from storage backend: {e}")
+            return
+
+        with self._credentials_lock:
+            if credentials == self._credentials and not self._credentials_stale:
+                return
+            self._credentials = configure_duckdb_credentials(self._conn, self.storage_backend, credentials)
+            self._credentials_stale = False
+            logger.debug("Re-applied S3 credentials to DuckDB session pool")
+
+    def _new_session(self):
+        """
+        Open a session on the pool's database.
+
+        With scan_metrics, query profiling is enabled without output so that the
+        bytes each query reads can be retrieved with get_profiling_information()
+        (see query_stats); DuckDB releases without custom profiling settings
+        skip it. Profiling adds overhead to every query, so it is off by default.
+        """
+        session = self._conn.cursor()
+        if not self.scan_metrics:
+            return session
+        try:
+            session.execute("PRAGMA enable_profiling='no_output'")
+            session.execute("""SET custom_profiling_settings='{"TOTAL_BYTES_READ": "true"}'""")
+        except Exception as e:
+            logger.debug(f"DuckDB scan metrics unavailable: {e}")
+            try:
+                session.execute("PRAGMA disable_profiling")
+            except Exception:
+                pass
+        return session
+
+    def close(self) -> None:
+        """Close all sessions and the underlying DuckDB database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for session in idle:
+            session.close()
+        self._conn.close()
+        logger.debug("Closed DuckDB session pool")
+
+
+def _is_access_denied(error: BaseException) -> bool:
+    """Check if a DuckDB error is an S3 access denial (HTTP 403)."""
+    message = str(error)
+    return "403" in message or "Forbidden" in message or "AccessDenied" in message
+
+
+def configure_duckdb_s3(duckdb_conn, s3_storage_backend):
+    """
+    Configure a DuckDB connection to read from the S3StorageBackend's bucket.
+
+    Installs and loads the httpfs extension and applies the backend's region,
+    endpoint, SSL and credential settings.
+
+    Args:
+        duckdb_conn: DuckDB connection object
+        s3_storage_backend: S3StorageBackend instance
+
+    Returns:
+        The credentials applied (see configure_duckdb_credentials).
+    """
+    # Install and load the httpfs extension for S3 support
+    duckdb_conn.execute("INSTALL httpfs;")
+    duckdb_conn.execute("LOAD httpfs;")
+
+    # Configure S3 settings to match the storage backend
+    duckdb_conn.execute(f"SET s3_region='{s3_storage_backend.region}';")
+
+    if s3_storage_backend.endpoint_url:
+        duckdb_conn.execute(f"SET s3_endpoint='{s3_storage_backend.endpoint_url}';")
+
+    duckdb_conn.execute(f"SET s3_use_ssl={'true' if s3_storage_backend.use_ssl else 'false'};")
+
+    # Configure AWS credentials - use the same authentication as S3StorageBackend
+    credentials = configure_duckdb_credentials(duckdb_conn, s3_storage_backend)
+
+    logger.debug("DuckDB configured for S3 access")
+    return credentials
+
+
+def configure_duckdb_credentials(duckdb_conn, s3_storage_backend, credentials=None):
+    """
+    Configure DuckDB S3 credentials to match the S3StorageBackend authentication.
+
+    The credentials come from the backend's boto3 session, so DuckDB uses
+    exactly the same authentication, including a configured profile. If none
+    can be resolved, DuckDB falls back to its own credential chain.
+
+    Args:
+        duckdb_conn: DuckDB connection object
+        s3_storage_backend: S3StorageBackend instance
+        credentials: Credentials to apply (default: the backend's current credentials)
+
+    Returns:
+        The credentials applied, or None if DuckDB uses its own credential chain.
+    """
+    try:
+        if credentials is None:
+            credentials = s3_storage_backend.get_credentials()
+
+        if credentials is not None and credentials.access_key and credentials.secret_key:
+            duckdb_conn.execute(f"SET s3_access_key_id='{credentials.access_key}';")
+            duckdb_conn.execute(f"SET s3_secret_access_key='{credentials.secret_key}';")
+            # Always set the token so a token of expired credentials is cleared
+            duckdb_conn.execute(f"SET s3_session_token='{credentials.token or ''}';")
+            logger.debug("DuckDB configured with credentials from S3 storage backend")
+            return credentials
+
+        if s3_storage_backend.profile:
+            # If using a specific AWS profile, set it for DuckDB
+            duckdb_conn.execute(f"SET s3_aws_profile='{s3_storage_backend.profile}';")
+            logger.debug(f"DuckDB configured to use AWS profile: {s3_storage_backend.profile}")
+
+        logger.info("DuckDB will use default AWS credential chain")
+
+    except Exception as e:
+        logger.warning(f"DuckDB credential configuration failed: {e}")
+        logger.info("DuckDB will attempt to use default AWS credential chain")
+
+    return None
@@ -0,0 +1,267 @@
+"""
+Workspace-wide flighting expansion.
+
+This module adds WorkspaceManager.expand_flighting(), the workspace
+counterpart of MediaPlan.expand_flighting(). Line items are expanded into
+one row per flight day inside DuckDB with a generate_series() range join,
+weighted with the curve's SQL expression, normalized per line item with a
+window sum and summed per period, so only the long-format result reaches
+Python. Curves registered without a SQL expression are applied with the
+vectorized pandas engine (models.flighting.expand_flights()) to the line
+items' dates and measures, fetched in one query.
+
+It also adds WorkspaceManager.get_lineitem_index(), which builds a
+LineItemIntervalIndex over the flights of the workspace's line items for
+repeated "live between X and Y" lookups without re-querying or re-parsing
+dates.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from mediaplanpy.exceptions import SQLQueryError
+from mediaplanpy.models.interval_index import LineItemIntervalIndex
+from mediaplanpy.models.flighting import (
+    FLIGHTING_KEY_COLUMNS,
+    expand_flights,
+    get_flighting_curve,
+    validate_grain
+)
+from mediaplanpy.workspace.aggregate import _is_numeric_column, _resolve_column
+from mediaplanpy.workspace.query import _format_result, _profiled, _resolve_result_format
+from mediaplanpy.workspace.query_profile import profile_stage
+from mediaplanpy.workspace.query_router import list_query_shape
+
+logger = logging.getLogger("mediaplanpy.workspace.flighting")
+
+# Maximum number of workspace line item indexes kept per WorkspaceManager
+MAX_CACHED_LINEITEM_INDEXES = 8
+
+
+def _flighting_measures(measures: Optional[Sequence[str]]) -> List[tuple]:
+    """
+    Resolve the measures of an expansion to (column, result name) pairs.
+
+    Raises:
+        SQLQueryError: If a measure is not a numeric line item column.
+    """
+    resolved = []
+    for measure in measures or ["cost_total"]:
+        column = _resolve_column(measure)
+        if not _is_numeric_column(column):
+            raise SQLQueryError(f"Flighting measure '{measure}' is not a numeric column")
+        resolved.append((column, measure))
+    return resolved
+
+
+def _lineitems_query(measures: List[tuple], filter_conditions: Optional[str]) -> str:
+    """Select the keys, flight dates and measures of the line items to expand."""
+    columns = FLIGHTING_KEY_COLUMNS + [
+        "CAST(lineitem_start_date AS DATE) AS start_date",
+        "CAST(lineitem_end_date AS DATE) AS end_date"
+    ] + [f"{column} AS {name}" for column, name in measures]
+    query = (f"SELECT {', '.join(columns)}\n"
+             f"FROM {{*}}\n"
+             f"WHERE (is_placeholder = FALSE OR is_placeholder IS NULL)\n"
+             f"  AND lineitem_start_date IS NOT NULL AND lineitem_end_date >= lineitem_start_date")
+    if filter_conditions:
+        query += f" AND ({filter_conditions})"
+    return query
+
+
+def build_flighting_query(measures: List[tuple], grain: str, curve_sql: str,
+                          filter_conditions: Optional[str] = None) -> str:
+    """
+    Build the DuckDB query expanding line items into per-period allocations.
+
+    Args:
+        measures: (column, result name) pairs to spread
+        grain: "day", "week" or "month"
+        curve_sql: SQL expression of "{t}" giving the weight of a day
+        filter_conditions: Optional SQL condition selecting the line items
+
+    Returns:
+        SQL query with a {*} placeholder.
+    """
+    keys = ", ".join(FLIGHTING_KEY_COLUMNS)
+    day_position = "((day_index + 0.5) / day_count)"
+    period = "day" if grain == "day" else f"CAST(DATE_TRUNC('{grain}', day) AS DATE)"
+    allocations = ", ".join(f"SUM({name} * share) AS {name}" for _, name in measures)
+    return (
+        f"WITH items AS (\n{_lineitems_query(measures, filter_conditions)}\n),\n"
+        f"days AS (\n"
+        f"  SELECT items.*, CAST(start_date + CAST(day_index AS INTEGER) AS DATE) AS day,\n"
+        f"         date_diff('day', start_date, end_date) + 1 AS day_count, day_index\n"
+        f"  FROM items, generate_series(0, date_diff('day', start_date, end_date)) AS series(day_index)\n"
+        f"),\n"
+        f"weighted AS (\n"
+        f"  SELECT *, {curve_sql.format(t=day_position)} AS weight FROM days\n"
+        f"),\n"
+        f"shared AS (\n"
+        f"  SELECT *, weight / SUM(weight) OVER (PARTITION BY meta_id, lineitem_id) AS share FROM weighted\n"
+        f")\n"
+        f"SELECT {keys}, {period} AS period, COUNT(*) AS days_active, {allocations}\n"
+        f"FROM shared\n"
+        f"GROUP BY {keys}, {period}\n"
+        f"ORDER BY meta_id, lineitem_id, period"
+    )
+
+
+@_profiled
+def expand_flighting(self, filters: Optional[Dict[str, Any]] = None, grain: str = "day",
+                     measures: Optional[Sequence[str]] = None, curve="even",
+                     return_dataframe: bool = True, result_format: Optional[str] = None) -> Any:
+    """
+    Spread the values of all line items in the workspace over their flight dates.
+
+    Workspace counterpart of MediaPlan.expand_flighting(): each line item's
+    values are allocated to the days between its start and end date
+    according to a weighting curve and summed per period. The expansion runs
+    in DuckDB over the workspace Parquet files; placeholder line items and
+    line items without valid dates are left out.
+
+    Example:
+        >>> weekly = workspace_manager.expand_flighting(
+        ...     filters={"meta_is_current": True}, grain="week",
+        ...     measures=["cost_total", "metric_impressions"])
+        >>> weekly.groupby("period")["cost_total"].sum()
+
+    Args:
+        filters (dict, optional): Filters selecting the line items (same format as list_lineitems()).
+        grain (str): "day", "week" (periods start on Monday) or "month".
+        measures (list, optional): Numeric line item columns to spread
+                                   (default: ["cost_total"]).
+        curve: Name of a registered curve ("even", "front_loaded",
+               "back_loaded", "bell"), a FlightingCurve, or a vectorized
+               function of the relative flight position t in [0, 1]. Curves
+               without a SQL expression are evaluated in pandas.
+        return_dataframe (bool): If False, return a list of dictionaries.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
+
+    Returns:
+        Long-format result with campaign_id, meta_id, lineitem_id,
+        lineitem_name, period, days_active and one column per measure.
+
+    Raises:
+        WorkspaceError: If no workspace configuration is loaded.
+        ValidationError: If grain or curve is invalid.
+        SQLQueryError: If a measure is invalid or the query fails.
+    """
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    validate_grain(grain)
+    curve = get_flighting_curve(curve)
+    resolved_measures = _flighting_measures(measures)
+    result_format = _resolve_result_format(result_format, return_dataframe)
+
+    # generate_series() range joins are DuckDB syntax
+    shape = list_query_shape('expand_flighting', filters, grain=grain, curve=curve.name,
+                             measures=','.join(name for _, name in resolved_measures))
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, engine_override="duckdb", shape=shape)
+
+    params: Dict[str, Any] = {}
+    filter_conditions = None
+    if filters:
+        filter_conditions = self._build_sql_filter_conditions(filters, params, engine=decision.engine)
+    partition_filters = self._build_partition_filters(filters)
+
+    if curve.sql is not None:
+        query = build_flighting_query(resolved_measures, grain, curve.sql, filter_conditions)
+        return self._run_routed_query(decision, query, partition_filters=partition_filters,
+                                      result_format=result_format, params=params)
+
+    logger.debug(f"Curve '{curve.name}' has no SQL expression; expanding line items in pandas")
+    lineitems = self._run_routed_query(decision, _lineitems_query(resolved_measures, filter_conditions),
+                                       partition_filters=partition_filters, result_format="pandas",
+                                       params=params)
+    with profile_stage("convert"):
+        expanded = expand_flights(lineitems, [name for _, name in resolved_measures], grain=grain, curve=curve)
+        return _format_result(expanded, result_format)
+
+
+@_profiled
+def get_lineitem_index(self, filters: Optional[Dict[str, Any]] = None,
+                       group_by: Optional[str] = "vehicle", engine: str = "auto") -> LineItemIntervalIndex:
+    """
+    Build an interval index over the flights of the workspace's line items.
+
+    The line items' keys and flight dates are fetched in one query and
+    indexed once, so any number of "live between X and Y" lookups run in
+    logarithmic time without re-querying or re-parsing dates. The index is
+    kept on the workspace manager and reused while the query result cache
+    returns the same result, i.e. until the underlying Parquet files change;
+    clear_query_cache() discards it.
+
+    Example:
+        >>> index = workspace_manager.get_lineitem_index(filters={"meta_is_current": True})
+        >>> live = index.active_between("2025-03-01", "2025-03-31")
+        >>> live[["meta_id", "lineitem_id", "lineitem_name"]]
+        >>> index.count_active_on("2025-03-15")
+
+    Args:
+        filters (dict, optional): Filters selecting the line items (same format as list_lineitems()).
+        group_by (str, optional): Line item column grouping flights for
+                                  overlapping_pairs() (default "vehicle").
+        engine (str): "auto", "duckdb" or "database" (see sql_query()).
+
+    Returns:
+        LineItemIntervalIndex whose items are a DataFrame with campaign_id,
+        meta_id, lineitem_id, lineitem_name, start_date, end_date and the
+        group column. Placeholder line items are not indexed.
+
+    Raises:
+        WorkspaceError: If no workspace configuration is loaded.
+        SQLQueryError: If group_by is not a line item column or the query fails.
+    """
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    group_column = _resolve_column(group_by) if group_by else None
+    shape = list_query_shape('get_lineitem_index', filters, group_by=group_by or '')
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, engine_override=engine, shape=shape)
+
+    params: Dict[str, Any] = {}
+    filter_conditions = None
+    if filters:
+        filter_conditions = self._build_sql_filter_conditions(filters, params, engine=decision.engine)
+    query = _lineitems_query([(group_column, "group_key")] if group_column else [], filter_conditions)
+
+    table = self._run_routed_query(decision, query, partition_filters=self._build_partition_filters(filters),
+                                   result_format="arrow", params=params)
+
+    cache_key = (decision.engine, repr(sorted((filters or {}).items())), group_by)
+    cached = self._lineitem_indexes.get(cache_key)
+    if cached is not None and cached[0] is table:
+        return cached[1]
+
+    with profile_stage("convert"):
+        items = table.to_pandas()
+        if group_column:
+            items = items.rename(columns={"group_key": group_by})
+        index = LineItemIntervalIndex(items["start_date"], items["end_date"], items=items,
+                                      groups=items[group_by] if group_column else None)
+
+    # The result cache shares Arrow tables, so an identical table means unchanged data
+    if len(self._lineitem_indexes) >= MAX_CACHED_LINEITEM_INDEXES:
+        self._lineitem_indexes.pop(next(iter(self._lineitem_indexes)))
+    self._lineitem_indexes[cache_key] = (table, index)
+    return index
+
+
+def patch_workspace_manager():
+    """
+    Add expand_flighting() and get_lineitem_index() to the WorkspaceManager class.
+    """
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+    WorkspaceManager.expand_flighting = expand_flighting
+    WorkspaceManager.get_lineitem_index = get_lineitem_index
+
+
+patch_workspace_manager()
@@ -5,12 +5,14 @@ This module provides the WorkspaceManager class for loading, validating,
 and managing workspace configurations with automatic handling of legacy settings.
 """
 
+import contextvars
 import os
 import json
 import logging
 import pathlib
+import threading
 import uuid
-from typing import Dict, Any, Optional, Union, List, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, Union, List, Tuple
 import glob
 from datetime import datetime
 
@@ -22,6 +24,17 @@ from mediaplanpy.exceptions import (
 from mediaplanpy.workspace.validator import validate_workspace, WORKSPACE_SCHEMA
 from mediaplanpy.schema import SchemaRegistry, SchemaValidator, SchemaMigrator
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    from mediaplanpy.schema.manager import SchemaManager
+    from mediaplanpy.storage.base import StorageBackend
+    from mediaplanpy.workspace.duckdb_pool import DuckDBSessionPool
+    from mediaplanpy.workspace.plan_summary import PlanSummary
+    from mediaplanpy.workspace.query_profile import QueryProfile
+    from mediaplanpy.workspace.query_router import QueryRouter
+    from mediaplanpy.workspace.query_stats import QueryStatsRegistry
+    from mediaplanpy.workspace.result_cache import QueryResultCache
+
 # Configure logging
 logger = logging.getLogger("mediaplanpy.workspace.loader")
 
@@ -67,6 +80,46 @@ class WorkspaceManager:
         self._schema_validator = None
         self._schema_migrator = None
 
+        # Long-lived storage backend (created on first use, rebuilt when the
+        # resolved storage configuration changes)
+        self._storage_backend = None
+        self._storage_backend_key = None
+        self._storage_backend_lock = threading.Lock()
+
+        # DuckDB session pool for sql_query (created on first use, rebuilt
+        # together with the storage backend)
+        self._duckdb_pool = None
+        self._duckdb_pool_lock = threading.Lock()
+
+        # DuckDB query result cache (created on first use, discarded together
+        # with the storage backend)
+        self._query_result_cache = None
+
+        # Interval indexes built by get_lineitem_index(), keyed on the query
+        # and validated against the cached result they were built from
+        self._lineitem_indexes = {}
+
+        # Per-plan summary read by list_mediaplans()/list_campaigns() (created
+        # on first use, discarded together with the storage backend)
+        self._plan_summary = None
+
+        # Engine router for sql_query() and the list_* methods (created on
+        # first use, discarded together with the storage backend)
+        self._query_router = None
+
+        # Per-fingerprint query statistics (created on first use, kept across
+        # configuration reloads)
+        self._query_stats = None
+
+        # Most recent QueryProfile per thread or asyncio task (see get_last_query_profile())
+        self._last_query_profile: contextvars.ContextVar = contextvars.ContextVar(
+            'mediaplanpy_last_query_profile', default=None)
+
+        # Bounded thread pool running the *_async query methods (created on
+        # first use, independent of the storage backend)
+        self._query_executor = None
+        self._query_executor_lock = threading.Lock()
+
     def _migrate_deprecated_fields(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Automatically migrate deprecated fields to new format.
@@ -466,6 +519,7 @@ class WorkspaceManager:
             self.workspace_path = settings_file_path
             self.config = config
             self._resolved_config = None  # Reset resolved config
+            self.reset_storage_backend()
 
             return workspace_id, settings_file_path
         except Exception as e:
@@ -493,8 +547,9 @@ class WorkspaceManager:
             WorkspaceValidationError: If configuration is invalid
             WorkspaceError: If loading fails
         """
-        # Reset resolved config
+        # Reset resolved config and anything built from it
         self._resolved_config = None
+        self.reset_storage_backend()
 
         # Use config_dict if provided
         if config_dict is not None:
@@ -834,6 +889,11 @@ class WorkspaceManager:
         """
         Get the storage backend for this workspace.
 
+        The backend is created once and reused by every subsequent call, so
+        backend setup (e.g. the S3 client and its bucket connection test) is
+        paid only once per workspace. It is rebuilt automatically when the
+        resolved storage configuration changes.
+
         Returns:
             A StorageBackend instance.
 
@@ -843,8 +903,300 @@ class WorkspaceManager:
         if not self.is_loaded:
             raise WorkspaceError("No workspace configuration loaded. Call load() first.")
 
-        from mediaplanpy.storage import get_storage_backend
-        return get_storage_backend(self.get_resolved_config())
+        resolved_config = self.get_resolved_config()
+        backend_key = json.dumps(
+            {
+                'workspace_id': resolved_config.get('workspace_id'),
+                'storage': resolved_config.get('storage', {})
+            },
+            sort_keys=True,
+            default=str
+        )
+
+        with self._storage_backend_lock:
+            if self._storage_backend is None or self._storage_backend_key != backend_key:
+                from mediaplanpy.storage import get_storage_backend
+                self._storage_backend = get_storage_backend(resolved_config)
+                self._storage_backend_key = backend_key
+                logger.debug(f"Created {type(self._storage_backend).__name__} for workspace")
+
+            return self._storage_backend
+
+    def reset_storage_backend(self) -> None:
+        """
+        Discard the cached storage backend.
+
+        The next call to get_storage_backend() creates a fresh backend. This is
+        done automatically when a configuration is loaded or created; call it
+        manually after changing credentials outside of the workspace config.
+        DuckDB sessions built on the old backend and cached query results are
+        discarded as well.
+        """
+        with self._storage_backend_lock:
+            self._storage_backend = None
+            self._storage_backend_key = None
+            self._query_result_cache = None
+            self._lineitem_indexes = {}
+            self._plan_summary = None
+            self._query_router = None
+
+        self.close_duckdb_sessions()
+
+    def get_duckdb_session_pool(self) -> 'DuckDBSessionPool':
+        """
+        Get the DuckDB session pool used by sql_query() and the list_* methods.
+
+        The pool is created on first use with DuckDB already configured for the
+        workspace storage (httpfs, S3 region/endpoint and credentials), and is
+        reused by every subsequent query. It is rebuilt automatically when the
+        storage backend or ``query.scan_metrics`` changes.
+
+        Returns:
+            A DuckDBSessionPool instance.
+
+        Raises:
+            WorkspaceError: If no configuration is loaded.
+            SQLQueryError: If DuckDB is not installed or cannot be configured.
+        """
+        storage_backend = self.get_storage_backend()
+        scan_metrics = bool(self.get_resolved_config().get('query', {}).get('scan_metrics', False))
+
+        with self._duckdb_pool_lock:
+            pool = self._duckdb_pool
+            if (pool is None or pool.closed or pool.storage_backend is not storage_backend
+                    or pool.scan_metrics != scan_metrics):
+                if pool is not None:
+                    pool.close()
+                from mediaplanpy.workspace.duckdb_pool import DuckDBSessionPool
+                self._duckdb_pool = DuckDBSessionPool(storage_backend, scan_metrics=scan_metrics)
+
+            return self._duckdb_pool
+
+    def refresh_duckdb_sessions(self) -> 'DuckDBSessionPool':
+        """
+        Close the current DuckDB sessions and create a freshly configured pool.
+
+        Use this after rotating S3 credentials, or to release memory held by
+        the DuckDB database between bursts of queries.
+
+        Returns:
+            The new DuckDBSessionPool instance.
+        """
+        self.close_duckdb_sessions()
+        return self.get_duckdb_session_pool()
+
+    def close_duckdb_sessions(self) -> None:
+        """
+        Close the DuckDB session pool, if one has been created.
+
+        Sessions are recreated on demand by the next query, so this is safe to
+        call at any time (e.g. when shutting down an application).
+        """
+        with self._duckdb_pool_lock:
+            pool, self._duckdb_pool = self._duckdb_pool, None
+
+        if pool is not None:
+            pool.close()
+
+    def get_query_result_cache(self) -> 'QueryResultCache':
+        """
+        Get the cache of DuckDB query results used by sql_query() and the list_* methods.
+
+        The memory budget is taken from ``query.result_cache_mb`` in the
+        workspace configuration (default 64 MB; 0 disables caching).
+
+        Returns:
+            A QueryResultCache instance.
+
+        Raises:
+            WorkspaceError: If no configuration is loaded.
+        """
+        resolved_config = self.get_resolved_config()
+
+        with self._storage_backend_lock:
+            if self._query_result_cache is None:
+                from mediaplanpy.workspace.result_cache import QueryResultCache, DEFAULT_RESULT_CACHE_MB
+                cache_mb = resolved_config.get('query', {}).get('result_cache_mb', DEFAULT_RESULT_CACHE_MB)
+                self._query_result_cache = QueryResultCache(max_bytes=int(cache_mb * 1024 * 1024))
+            return self._query_result_cache
+
+    def get_plan_summary(self) -> 'PlanSummary':
+        """
+        Get the per-plan summary table used by list_mediaplans() and list_campaigns().
+
+        The summary holds one row per media plan with its line item statistics
+        precomputed, and is kept up to date by MediaPlan.save() and delete().
+        It can be turned off with ``query.plan_summary: false`` in the
+        workspace configuration.
+
+        Returns:
+            A PlanSummary instance.
+        """
+        with self._storage_backend_lock:
+            if self._plan_summary is None:
+                from mediaplanpy.workspace.plan_summary import PlanSummary
+                self._plan_summary = PlanSummary(self)
+            return self._plan_summary
+
+    def get_query_router(self) -> 'QueryRouter':
+        """
+        Get the router choosing between DuckDB and the database for each query.
+
+        The routing mode is taken from ``query.routing`` in the workspace
+        configuration: "database" (default) sends every engine="auto" query to
+        the database when it is enabled, "adaptive" sends each query shape to
+        the engine measured to be faster. The router's last_decision and
+        stats() show which engine was chosen and why.
+
+        Returns:
+            A QueryRouter instance.
+        """
+        with self._storage_backend_lock:
+            if self._query_router is None:
+                from mediaplanpy.workspace.query_router import QueryRouter
+                self._query_router = QueryRouter(self)
+            return self._query_router
+
+    def get_query_stats_registry(self) -> 'QueryStatsRegistry':
+        """
+        Get the registry recording every sql_query() and list_* execution.
+
+        Returns:
+            A QueryStatsRegistry instance.
+        """
+        with self._storage_backend_lock:
+            if self._query_stats is None:
+                from mediaplanpy.workspace.query_stats import QueryStatsRegistry
+                self._query_stats = QueryStatsRegistry(self)
+            return self._query_stats
+
+    def query_stats(self, sort_by: str = "total_ms", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the statistics of the queries run by this process, per query fingerprint.
+
+        Executions are grouped by query shape (the query with its literal values
+        removed, or the list_* method and its filter fields). The registry keeps
+        ``query.stats_max_queries`` fingerprints (default 500). Executions slower
+        than ``query.slow_query_ms`` (default 1000) are also logged as warnings.
+
+        bytes_scanned is only recorded for DuckDB queries with
+        ``query.scan_metrics: true``. This enables DuckDB's profiler on every
+        pooled session, which adds overhead to every DuckDB query; without it
+        bytes_scanned is None.
+
+        Args:
+            sort_by: Column to sort by, descending: "total_ms" (default), "mean_ms",
+                     "max_ms", "calls", "rows", "bytes_scanned" or "last_seen".
+            limit: Maximum number of entries to return.
+
+        Returns:
+            List of dictionaries with fingerprint, query, engines, calls, errors,
+            slow_calls, total_ms, mean_ms, max_ms, last_ms, rows, mean_rows,
+            bytes_scanned, files_touched, first_seen and last_seen.
+
+        Raises:
+            ValueError: If sort_by is not a valid column.
+        """
+        return self.get_query_stats_registry().stats(sort_by=sort_by, limit=limit)
+
+    def get_last_query_profile(self) -> Optional['QueryProfile']:
+        """
+        Get the timing breakdown of the calling thread's most recent profiled query.
+
+        Inside asyncio code this is the awaiting task's most recent profiled
+        query, including those run with sql_query_async().
+
+        Queries are profiled with ``sql_query(..., profile=True)``, or all
+        sql_query() and list_* calls with ``query.profile: true`` in the
+        workspace configuration.
+
+        Returns:
+            A QueryProfile instance, or None if no query has been profiled.
+        """
+        return self._last_query_profile.get()
+
+    def get_query_executor(self) -> 'ThreadPoolExecutor':
+        """
+        Get the thread pool that runs sql_query_async() and the list_*_async methods.
+
+        The pool is bounded by ``query.async_workers`` in the workspace
+        configuration (default 4), so at most that many queries run at once;
+        further calls wait for a free worker without blocking the event loop.
+
+        Returns:
+            A concurrent.futures.ThreadPoolExecutor instance.
+        """
+        resolved_config = self.get_resolved_config()
+
+        with self._query_executor_lock:
+            if self._query_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                from mediaplanpy.workspace.async_query import DEFAULT_ASYNC_WORKERS
+                max_workers = resolved_config.get('query', {}).get('async_workers', DEFAULT_ASYNC_WORKERS)
+                self._query_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                          thread_name_prefix="mediaplanpy-query")
+                logger.debug(f"Created query executor with {max_workers} workers")
+            return self._query_executor
+
+    def close_query_executor(self, wait: bool = True) -> None:
+        """
+        Shut down the thread pool used by the async query methods, if one has been created.
+
+        A new pool is created by the next async query, so this is safe to call
+        at any time (e.g. when shutting down an application).
+
+        Args:
+            wait: Whether to wait for queries already running to finish.
+        """
+        with self._query_executor_lock:
+            executor, self._query_executor = self._query_executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def clear_query_cache(self) -> None:
+        """
+        Discard all cached query results and line item interval indexes.
+
+        Called automatically when a media plan is saved or deleted through
+        this workspace; cached results are also revalidated against the
+        Parquet files they were computed from on every query, so calling this
+        manually is only needed to release memory.
+        """
+        cache = self._query_result_cache
+        if cache is not None:
+            cache.clear()
+        self._lineitem_indexes = {}
+
+    def compact_catalog(self, target_rows_per_file: Optional[int] = None,
+                        dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Compact per-plan Parquet files into the workspace catalog.
+
+        Merges every ``mediaplans/*.parquet`` file (and any previous catalog)
+        into a few large Parquet files under ``catalog/`` with a manifest of
+        the plan IDs each file holds. SQL queries and the list_* methods
+        resolve ``{*}`` against the catalog plus any plans saved since.
+
+        Args:
+            target_rows_per_file: Approximate number of rows per catalog file.
+            dry_run: If True, only report what would be compacted.
+
+        Returns:
+            Dictionary with compaction results.
+
+        Raises:
+            WorkspaceError: If no configuration is loaded or compaction fails.
+            WorkspaceInactiveError: If the workspace is inactive.
+        """
+        if not self.is_loaded:
+            raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+        from mediaplanpy.workspace.catalog import WorkspaceCatalog
+        result = WorkspaceCatalog(self).compact(target_rows_per_file=target_rows_per_file, dry_run=dry_run)
+        if not dry_run:
+            self.clear_query_cache()
+        return result
 
     def get_schema_manager(self) -> 'SchemaManager':
         """
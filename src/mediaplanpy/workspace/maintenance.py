@@ -0,0 +1,221 @@
+"""
+Bulk maintenance of workspace media plans.
+
+This module adds WorkspaceManager.delete_mediaplans(), which deletes many
+media plans at once. Instead of checking and deleting each plan's files one
+by one (MediaPlan.delete()), the plans' files are found with one listing of
+mediaplans/ and removed with StorageBackend.delete_files(): DeleteObjects
+batches of up to 1000 keys on S3, concurrent unlinks on local storage. The
+catalog manifest and plan summary are updated once, and database records are
+removed with a single DELETE per workspace.
+"""
+
+import logging
+import posixpath
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from mediaplanpy.exceptions import StorageError, ValidationError
+from mediaplanpy.storage.partitioning import (
+    PARQUET_LAYOUT_PARTITIONED,
+    PARTITION_GLOB,
+    get_parquet_layout,
+    parse_partition_path
+)
+from mediaplanpy.workspace.query import MEDIAPLANS_SUBDIR
+
+logger = logging.getLogger("mediaplanpy.workspace.maintenance")
+
+
+def _safe_mediaplan_id(media_plan_id: str) -> str:
+    """Sanitize a media plan ID for use as a filename (as MediaPlan.save() does)."""
+    return media_plan_id.replace('/', '_').replace('\\', '_')
+
+
+def _find_mediaplan_files(storage_backend, media_plan_ids: List[str], partitioned: bool) -> Dict[str, List[str]]:
+    """
+    Find the JSON and Parquet files of media plans with a few listings.
+
+    Args:
+        storage_backend: The workspace storage backend
+        media_plan_ids: IDs of the media plans
+        partitioned: Whether the workspace uses the partitioned Parquet layout
+
+    Returns:
+        Dictionary mapping each media plan ID to its existing files.
+    """
+    wanted = {_safe_mediaplan_id(plan_id): plan_id for plan_id in media_plan_ids}
+    listed = set(storage_backend.list_files(MEDIAPLANS_SUBDIR, "*.json"))
+    listed.update(storage_backend.list_files(MEDIAPLANS_SUBDIR, "*.parquet"))
+    if partitioned:
+        listed.update(storage_backend.list_files(MEDIAPLANS_SUBDIR, f"{PARTITION_GLOB}/*.parquet"))
+
+    files = {plan_id: [] for plan_id in media_plan_ids}
+    for path in sorted(listed):
+        path = path.replace('\\', '/')
+        directory, name = posixpath.split(path)
+        stem, extension = posixpath.splitext(name)
+        if stem not in wanted or extension not in ('.json', '.parquet'):
+            continue
+        # Flat copies directly in mediaplans/, plus partition copies of partitioned workspaces
+        if directory == MEDIAPLANS_SUBDIR or (
+                partitioned and extension == '.parquet' and parse_partition_path(directory) is not None):
+            files[wanted[stem]].append(path)
+    return files
+
+
+def delete_mediaplans(self, media_plan_ids: Optional[Union[str, Iterable[str]]] = None,
+                      filters: Optional[Dict[str, Any]] = None, dry_run: bool = False,
+                      include_database: bool = True, max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Delete many media plans from workspace storage and the database at once.
+
+    Bulk counterpart of MediaPlan.delete(). The plans' JSON and Parquet files
+    are found with one listing of mediaplans/ and deleted with batched
+    requests (S3 DeleteObjects with up to 1000 keys per request, concurrent
+    unlinks on local storage). The compacted catalog and plan summary are
+    updated once, and database records are deleted with a single statement.
+    Plans are not loaded, so no per-plan schema version checks are made.
+
+    Example:
+        >>> result = workspace_manager.delete_mediaplans(
+        ...     filters={"meta_is_archived": True}, dry_run=True)
+        >>> result["files_found"]
+
+    Args:
+        media_plan_ids: ID or IDs of the media plans to delete.
+        filters (dict, optional): Filters selecting the media plans to delete
+                                  (same format as list_mediaplans()); used
+                                  instead of media_plan_ids.
+        dry_run (bool): If True, report what would be deleted without deleting anything.
+        include_database (bool): If True, also delete the plans' database
+                                 records if a database is configured.
+        max_workers (int, optional): Maximum number of concurrent storage
+                                     requests (default: the backend's setting).
+
+    Returns:
+        Dictionary with the mediaplan_ids selected, deleted_files (files that
+        would be deleted for a dry run), not_found (IDs without files),
+        files_found, files_deleted, database_deleted, database_rows_deleted,
+        errors and dry_run.
+
+    Raises:
+        WorkspaceError: If no configuration is loaded.
+        WorkspaceInactiveError: If the workspace is inactive.
+        ValidationError: If neither or both of media_plan_ids and filters are given.
+        StorageError: If some files could not be deleted.
+    """
+    # Deletion is a restricted operation
+    self.check_workspace_active("media plan deletion")
+
+    if not self.is_loaded:
+        self.load()
+
+    if (media_plan_ids is None) == (filters is None):
+        raise ValidationError("Specify either media_plan_ids or filters")
+
+    if filters is not None:
+        rows = self.list_mediaplans(filters=filters, include_stats=False, result_format="records")
+        media_plan_ids = [row['meta_id'] for row in rows]
+    elif isinstance(media_plan_ids, str):
+        media_plan_ids = [media_plan_ids]
+    media_plan_ids = list(dict.fromkeys(plan_id for plan_id in media_plan_ids if plan_id))
+
+    workspace_config = self.get_resolved_config()
+    result = {
+        "mediaplan_ids": media_plan_ids,
+        "deleted_files": [],
+        "not_found": [],
+        "errors": [],
+        "dry_run": dry_run,
+        "files_found": 0,
+        "files_deleted": 0,
+        "database_deleted": False,
+        "database_rows_deleted": 0
+    }
+    if not media_plan_ids:
+        logger.info("No media plans selected for deletion")
+        return result
+
+    try:
+        storage_backend = self.get_storage_backend()
+    except Exception as e:
+        raise StorageError(f"Failed to get storage backend: {e}")
+
+    partitioned = get_parquet_layout(workspace_config) == PARQUET_LAYOUT_PARTITIONED
+    plan_files = _find_mediaplan_files(storage_backend, media_plan_ids, partitioned)
+    file_paths = [path for paths in plan_files.values() for path in paths]
+    result["not_found"] = [plan_id for plan_id, paths in plan_files.items() if not paths]
+    result["files_found"] = len(file_paths)
+
+    if dry_run:
+        result["deleted_files"] = file_paths
+        logger.info(f"[DRY RUN] Would delete {len(file_paths)} files of {len(media_plan_ids)} media plans")
+    else:
+        outcomes = storage_backend.delete_files(file_paths, max_workers=max_workers, return_exceptions=True)
+        for path, error in outcomes.items():
+            if error is None:
+                result["deleted_files"].append(path)
+            else:
+                result["errors"].append(f"Failed to delete {path}: {error}")
+        result["files_deleted"] = len(result["deleted_files"])
+
+        # Hide the plans' rows in the compacted catalog until the next compaction
+        self.clear_query_cache()
+        try:
+            from mediaplanpy.workspace.catalog import WorkspaceCatalog
+            marked = WorkspaceCatalog(self).record_deletions(media_plan_ids)
+            if marked:
+                logger.info(f"Marked {len(marked)} media plans as deleted in workspace catalog")
+        except Exception as e:
+            error_msg = f"Failed to update workspace catalog: {str(e)}"
+            result["errors"].append(error_msg)
+            logger.error(error_msg)
+
+        try:
+            deleted_parquet_paths = [p for p in result["deleted_files"] if p.endswith(".parquet")]
+            self.get_plan_summary().record_deletions(media_plan_ids, deleted_parquet_paths)
+        except Exception as e:
+            logger.warning(f"Failed to update plan summary (it will be rebuilt on next use): {e}")
+
+    db_config = workspace_config.get('database', {})
+    if include_database and db_config.get('enabled', False) and db_config.get('host') and db_config.get('database'):
+        try:
+            if dry_run:
+                logger.info(f"[DRY RUN] Would delete database records for {len(media_plan_ids)} media plans")
+                result["database_deleted"] = True  # Would be deleted
+            else:
+                from mediaplanpy.storage.database import PostgreSQLBackend
+                db_backend = PostgreSQLBackend(workspace_config)
+
+                workspace_id = self.config.get('workspace_id', 'unknown')
+                result["database_rows_deleted"] = db_backend.delete_media_plans(media_plan_ids, workspace_id)
+                result["database_deleted"] = True
+                logger.info(f"Deleted {result['database_rows_deleted']} database records "
+                            f"for {len(media_plan_ids)} media plans")
+        except Exception as e:
+            error_msg = f"Failed to delete database records: {str(e)}"
+            result["errors"].append(error_msg)
+            logger.error(error_msg)
+
+    if not dry_run:
+        logger.info(f"Deleted {result['files_deleted']} of {result['files_found']} files "
+                    f"of {len(media_plan_ids)} media plans")
+
+    # Raise an error if there were any deletion failures (but not if files didn't exist)
+    if result["errors"] and not dry_run:
+        raise StorageError(
+            f"Failed to delete some files of {len(media_plan_ids)} media plans: {'; '.join(result['errors'][:10])}")
+
+    return result
+
+
+def patch_workspace_manager():
+    """
+    Add delete_mediaplans() to the WorkspaceManager class.
+    """
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+    WorkspaceManager.delete_mediaplans = delete_mediaplans
+
+
+patch_workspace_manager()
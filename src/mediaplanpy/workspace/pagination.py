@@ -0,0 +1,201 @@
+"""
+Keyset pagination for the list_* methods.
+
+This module provides the helpers behind list_lineitems_page() and
+list_mediaplans_page(). A page is read with the list query's ORDER BY keys
+extended by unique ID columns, a condition selecting the rows after the
+previous page's last key and a LIMIT, so each page costs the same no matter
+how deep into the result it is (no OFFSET rescans). Both DuckDB and
+PostgreSQL evaluate the same condition, with NULL keys sorted last.
+
+The key of the last row is handed to the caller as an opaque continuation
+token: URL-safe base64 of a JSON document holding the key values and a
+digest of the method, filters and options it was issued for, so a token
+cannot be replayed against a different listing.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from mediaplanpy.exceptions import SQLQueryError
+
+# Sort keys of the paged list methods as (column, descending). The leading
+# keys match the ORDER BY of the unpaged methods; the trailing ID columns
+# make the order total (a line item ID repeats across plan versions).
+LINEITEM_PAGE_KEYS = (("lineitem_start_date", True), ("lineitem_name", False),
+                      ("meta_id", False), ("lineitem_id", False))
+MEDIAPLAN_PAGE_KEYS = (("meta_created_at", True), ("meta_id", False))
+
+# Default number of rows per page
+DEFAULT_LINEITEM_PAGE_SIZE = 1000
+DEFAULT_MEDIAPLAN_PAGE_SIZE = 100
+
+_TOKEN_VERSION = 1
+
+
+class ResultPage(NamedTuple):
+    """One page of a paged list_* call and the token of the next page (None on the last page)."""
+    items: Any
+    next_page_token: Optional[str]
+
+
+def page_scope(method: str, filters: Optional[Dict[str, Any]] = None, **options) -> str:
+    """
+    Get the digest binding a page token to one listing.
+
+    Args:
+        method: Name of the paged list method
+        filters: Filters of the call
+        **options: Options that change the rows listed (e.g. include_archived)
+
+    Returns:
+        12-character hexadecimal digest.
+    """
+    listing = json.dumps([method, filters or {}, options], sort_keys=True, default=str)
+    return hashlib.sha1(listing.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_page_token(values: Sequence[Any], scope: str) -> str:
+    """
+    Build the continuation token for the rows after a sort key.
+
+    Args:
+        values: Sort key values of the last row of a page
+        scope: Digest of the listing (see page_scope())
+
+    Returns:
+        Opaque URL-safe token.
+    """
+    document = {"v": _TOKEN_VERSION, "s": scope, "k": [_encode_value(value) for value in values]}
+    raw = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str, scope: str, key_count: int) -> List[Any]:
+    """
+    Read the sort key values from a continuation token.
+
+    Args:
+        token: Token returned as next_page_token
+        scope: Digest of the listing the token is used for (see page_scope())
+        key_count: Number of sort keys of the listing
+
+    Returns:
+        Sort key values of the last row of the previous page.
+
+    Raises:
+        SQLQueryError: If the token is malformed or was issued for a different
+                       method, filters or options.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        document = json.loads(raw.decode("utf-8"))
+        if document.get("v") != _TOKEN_VERSION:
+            raise ValueError("unsupported token version")
+        issued_for = document["s"]
+        values = [_decode_value(value) for value in document["k"]]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise SQLQueryError(f"Invalid page token: {e}")
+
+    if issued_for != scope or len(values) != key_count:
+        raise SQLQueryError("Page token was issued for a different listing (method, filters or options changed)")
+    return values
+
+
+def keyset_clause(keys: Sequence[Tuple[str, bool]], after: Optional[Sequence[Any]],
+                  bind: Callable[[Any], str]) -> Tuple[Optional[str], str]:
+    """
+    Build the condition and ORDER BY of a keyset page.
+
+    For keys (k1, k2, ...) and the previous page's last values (v1, v2, ...)
+    the condition selects rows with k1 after v1, or k1 = v1 and k2 after v2,
+    and so on. NULL sorts after every value, so nothing comes after a NULL
+    key and a NULL comes after any other value.
+
+    Args:
+        keys: Sort keys as (column, descending)
+        after: Key values of the last row already returned, or None for the first page
+        bind: Function binding a value as a query parameter and returning its placeholder
+
+    Returns:
+        Tuple of (condition or None for the first page, ORDER BY expression list).
+    """
+    order_by = ", ".join(f"{column} {'DESC' if descending else 'ASC'} NULLS LAST" for column, descending in keys)
+    if after is None:
+        return None, order_by
+
+    alternatives = []
+    equal_prefix: List[str] = []
+    for (column, descending), value in zip(keys, after):
+        if value is None:
+            # Only NULLs tie with NULL, and nothing sorts after it
+            equal_prefix.append(f"{column} IS NULL")
+            continue
+        placeholder = bind(value)
+        later = f"({column} {'<' if descending else '>'} {placeholder} OR {column} IS NULL)"
+        alternatives.append(" AND ".join(equal_prefix + [later]))
+        equal_prefix.append(f"{column} = {placeholder}")
+
+    if not alternatives:
+        return "FALSE", order_by
+    return " OR ".join(f"({alternative})" for alternative in alternatives), order_by
+
+
+def row_key(rows, keys: Sequence[Tuple[str, bool]], index: int) -> List[Any]:
+    """
+    Get the sort key values of one row of a query result.
+
+    Args:
+        rows: Page rows as a pyarrow Table or pandas DataFrame
+        keys: Sort keys as (column, descending)
+        index: Row index
+
+    Returns:
+        Key values as Python objects (None for NULL).
+    """
+    values = []
+    for column, _ in keys:
+        if hasattr(rows, "iloc"):
+            value = rows[column].iloc[index]
+            value = None if _is_null(value) else value
+            if hasattr(value, "item"):
+                # numpy scalar
+                value = value.item()
+        else:
+            value = rows.column(column)[index].as_py()
+        if hasattr(value, "to_pydatetime"):
+            # Nanosecond timestamps come back as pandas Timestamps
+            value = value.to_pydatetime()
+        values.append(value)
+    return values
+
+
+def _is_null(value: Any) -> bool:
+    try:
+        return bool(value is None or value != value)
+    except (TypeError, ValueError):
+        return False
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return {"s": str(value)}
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "t" in value:
+        return datetime.fromisoformat(value["t"])
+    if "d" in value:
+        return date.fromisoformat(value["d"])
+    return value["s"]
@@ -0,0 +1,470 @@
+"""
+Per-plan summary table for the list_* methods.
+
+``list_mediaplans()`` and ``list_campaigns()`` report plan-level fields plus
+statistics aggregated over each plan's line items. Computing those from the
+line item rows means scanning every row of the workspace on every call. This
+module provides the PlanSummary class, which keeps one row per ``meta_id``
+with the plan-level columns and the precomputed statistics in
+``catalog/summary/plan_summary.parquet``, so the list methods read a table the size
+of the number of plans instead.
+
+The summary records the version of every Parquet file (and the catalog
+manifest) it was computed from. It is used only while the workspace's
+Parquet files still have exactly those versions. ``MediaPlan.save()`` builds
+it if the workspace has none yet, and ``save()`` and ``MediaPlan.delete()``
+update it in place; any other change (another process, compaction, files
+written by older SDK versions) makes it stale, and it is rebuilt from the
+line items on next use.
+"""
+
+import io
+import json
+import logging
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyarrow
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+from mediaplanpy.storage.partitioning import (
+    PARQUET_LAYOUT_PARTITIONED,
+    get_parquet_layout,
+    parse_partition_path,
+    partition_matches
+)
+from mediaplanpy.workspace.catalog import CATALOG_SUBDIR, MANIFEST_PATH
+
+logger = logging.getLogger("mediaplanpy.workspace.plan_summary")
+
+# Summary location (under the catalog, outside mediaplans/ and apart from the catalog files)
+SUMMARY_DIR = f"{CATALOG_SUBDIR}/summary"
+SUMMARY_PATH = f"{SUMMARY_DIR}/plan_summary.parquet"
+SUMMARY_FORMAT_VERSION = 1
+
+# Name the summary table is registered under in list_* queries
+SUMMARY_RELATION = "plan_summary"
+
+# Parquet key/value metadata written with the summary
+_FORMAT_METADATA_KEY = b"mediaplanpy.plan_summary_version"
+_VERSIONS_METADATA_KEY = b"mediaplanpy.source_versions"
+
+# Plan-level columns returned by list_mediaplans(), in order
+MEDIAPLAN_COLUMNS = [
+    'meta_id', 'meta_schema_version', 'meta_created_at', 'meta_name', 'meta_comments',
+    'meta_created_by_id', 'meta_created_by_name', 'meta_is_current', 'meta_is_archived', 'meta_parent_id',
+    'campaign_id', 'campaign_name', 'campaign_objective',
+    'campaign_start_date', 'campaign_end_date', 'campaign_budget_total', 'campaign_product_name',
+    'campaign_budget_currency', 'campaign_agency_id', 'campaign_agency_name',
+    'campaign_advertiser_id', 'campaign_advertiser_name', 'campaign_product_id',
+    'campaign_campaign_type_id', 'campaign_campaign_type_name',
+    'campaign_workflow_status_id', 'campaign_workflow_status_name',
+    'campaign_kpi_name1', 'campaign_kpi_value1', 'campaign_kpi_name2', 'campaign_kpi_value2',
+    'campaign_kpi_name3', 'campaign_kpi_value3', 'campaign_kpi_name4', 'campaign_kpi_value4',
+    'campaign_kpi_name5', 'campaign_kpi_value5',
+    'campaign_dim_custom1', 'campaign_dim_custom2', 'campaign_dim_custom3',
+    'campaign_dim_custom4', 'campaign_dim_custom5',
+    'meta_dim_custom1', 'meta_dim_custom2', 'meta_dim_custom3',
+    'meta_dim_custom4', 'meta_dim_custom5',
+]
+
+# Plan-level columns returned by list_campaigns(), in order
+CAMPAIGN_COLUMNS = [
+    'campaign_id', 'campaign_name', 'campaign_objective', 'campaign_start_date', 'campaign_end_date',
+    'campaign_budget_total', 'campaign_product_name', 'campaign_product_description',
+    'campaign_budget_currency', 'campaign_agency_id', 'campaign_agency_name',
+    'campaign_advertiser_id', 'campaign_advertiser_name', 'campaign_product_id',
+    'campaign_campaign_type_id', 'campaign_campaign_type_name',
+    'campaign_workflow_status_id', 'campaign_workflow_status_name',
+    'campaign_kpi_name1', 'campaign_kpi_value1', 'campaign_kpi_name2', 'campaign_kpi_value2',
+    'campaign_kpi_name3', 'campaign_kpi_value3', 'campaign_kpi_name4', 'campaign_kpi_value4',
+    'campaign_kpi_name5', 'campaign_kpi_value5',
+    'campaign_dim_custom1', 'campaign_dim_custom2', 'campaign_dim_custom3',
+    'campaign_dim_custom4', 'campaign_dim_custom5',
+    'meta_dim_custom1', 'meta_dim_custom2', 'meta_dim_custom3',
+    'meta_dim_custom4', 'meta_dim_custom5',
+    'meta_id', 'meta_is_current', 'meta_is_archived', 'meta_created_at',
+]
+
+# Every plan-level column held by the summary (filters on other columns need the line items)
+PLAN_COLUMNS = MEDIAPLAN_COLUMNS + ['campaign_product_description']
+
+_NOT_PLACEHOLDER = "(is_placeholder = FALSE OR is_placeholder IS NULL)"
+
+
+def _distinct_count(column: str) -> str:
+    return (f"COUNT(DISTINCT CASE WHEN {_NOT_PLACEHOLDER} AND {column} IS NOT NULL "
+            f"AND {column} != '' THEN {column} END)")
+
+
+def _sum(column: str) -> str:
+    return f"SUM(CASE WHEN {_NOT_PLACEHOLDER} THEN {column} ELSE 0 END)"
+
+
+# Line item statistics per plan, in list_mediaplans() order
+STAT_EXPRESSIONS = [
+    ('stat_lineitem_count', f"COUNT(CASE WHEN {_NOT_PLACEHOLDER} THEN 1 END)"),
+    ('stat_total_cost', _sum('lineitem_cost_total')),
+    ('stat_avg_cost_per_item', f"AVG(CASE WHEN {_NOT_PLACEHOLDER} THEN lineitem_cost_total END)"),
+    ('stat_min_start_date', f"MIN(CASE WHEN {_NOT_PLACEHOLDER} AND lineitem_start_date IS NOT NULL "
+                            f"THEN lineitem_start_date END)"),
+    ('stat_max_end_date', f"MAX(CASE WHEN {_NOT_PLACEHOLDER} AND lineitem_end_date IS NOT NULL "
+                          f"THEN lineitem_end_date END)"),
+    ('stat_distinct_channel_count', _distinct_count('lineitem_channel')),
+    ('stat_distinct_vehicle_count', _distinct_count('lineitem_vehicle')),
+    ('stat_distinct_partner_count', _distinct_count('lineitem_partner')),
+    ('stat_distinct_media_product_count', _distinct_count('lineitem_media_product')),
+    ('stat_distinct_adformat_count', _distinct_count('lineitem_adformat')),
+    ('stat_distinct_kpi_count', _distinct_count('lineitem_kpi')),
+    ('stat_distinct_location_name_count', _distinct_count('lineitem_location_name')),
+    ('stat_sum_cost_media', _sum('lineitem_cost_media')),
+    ('stat_sum_cost_buying', _sum('lineitem_cost_buying')),
+    ('stat_sum_cost_platform', _sum('lineitem_cost_platform')),
+    ('stat_sum_cost_data', _sum('lineitem_cost_data')),
+    ('stat_sum_cost_creative', _sum('lineitem_cost_creative')),
+    ('stat_sum_metric_impressions', _sum('lineitem_metric_impressions')),
+    ('stat_sum_metric_clicks', _sum('lineitem_metric_clicks')),
+    ('stat_sum_metric_views', _sum('lineitem_metric_views')),
+]
+
+# Statistics returned by list_mediaplans() and list_campaigns(), in order
+MEDIAPLAN_STAT_COLUMNS = [name for name, _ in STAT_EXPRESSIONS]
+CAMPAIGN_STAT_COLUMNS = [
+    'stat_lineitem_count', 'stat_total_cost', 'stat_min_start_date', 'stat_max_end_date',
+    'stat_distinct_channel_count', 'stat_distinct_vehicle_count', 'stat_distinct_partner_count',
+    'stat_distinct_media_product_count', 'stat_distinct_adformat_count', 'stat_distinct_kpi_count',
+    'stat_distinct_location_name_count',
+]
+
+
+def build_summary_query(source: str = "{*}") -> str:
+    """
+    Build the query computing one summary row per plan from line item rows.
+
+    Args:
+        source: Table expression holding the line item rows ({*} for the workspace)
+
+    Returns:
+        SQL query string
+    """
+    stats = ',\n    '.join(f"{expression} AS {name}" for name, expression in STAT_EXPRESSIONS)
+    return (f"SELECT {', '.join(PLAN_COLUMNS)},\n    {stats}\n"
+            f"FROM {source}\n"
+            f"GROUP BY {', '.join(PLAN_COLUMNS)}")
+
+
+class PlanSummary:
+    """
+    Maintains the per-plan summary table of a workspace.
+
+    The summary is kept in memory after first use and revalidated against a
+    listing of the workspace's Parquet file versions on every call, the same
+    listing the query result cache uses.
+
+    Example:
+        >>> summary = workspace_manager.get_plan_summary()
+        >>> table = summary.get_table()  # Rebuilt if stale
+        >>> summary.rebuild()  # Force a rebuild
+    """
+
+    def __init__(self, workspace_manager: 'WorkspaceManager'):
+        """
+        Initialize the summary for a workspace.
+
+        Args:
+            workspace_manager: The WorkspaceManager instance owning the summary
+        """
+        self.workspace_manager = workspace_manager
+        self._table = None
+        self._versions = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether the list methods read from the summary.
+
+        Disabled by ``query.plan_summary: false`` in the workspace configuration,
+        and for workspaces whose queries are always routed to the database
+        (an enabled database without ``query.routing: "adaptive"``).
+        """
+        from mediaplanpy.workspace.query_router import ROUTING_ADAPTIVE
+
+        query_config = self.workspace_manager.get_resolved_config().get('query', {})
+        if not query_config.get('plan_summary', True):
+            return False
+        if query_config.get('routing') == ROUTING_ADAPTIVE:
+            return True
+        return self.workspace_manager._get_active_sql_engine() == 'duckdb'
+
+    def get_table(self) -> Optional['pyarrow.Table']:
+        """
+        Get the summary table, rebuilding it if it no longer matches the workspace.
+
+        Returns:
+            pyarrow Table with one row per plan, or None if the workspace has no
+            Parquet data.
+
+        Raises:
+            SQLQueryError: If the summary has to be rebuilt and the rebuild query fails.
+        """
+        snapshot = self.get_snapshot()
+        return snapshot[0] if snapshot is not None else None
+
+    def get_snapshot(self, partition_filters: Optional[Dict[str, Any]] = None
+                     ) -> Optional[Tuple['pyarrow.Table', Dict[str, str]]]:
+        """
+        Get the summary table together with the source versions it was computed from.
+
+        With partition_filters (partitioned layout), only the partitions that
+        can match are listed to validate the summary, so it is only known to
+        be current for the plans stored there. Rows of other plans must be
+        excluded by the caller's own filters.
+
+        Args:
+            partition_filters: Optional partition pruning hints (see sql_query())
+
+        Returns:
+            Tuple of (pyarrow Table, source versions), or None if the workspace
+            has no Parquet data.
+
+        Raises:
+            SQLQueryError: If the summary has to be rebuilt and the rebuild query fails.
+        """
+        with self._lock:
+            current = self._source_versions(partition_filters)
+            stored = self._load()
+            if stored is not None and not self._is_current(stored[1], current, partition_filters):
+                # Another process may have updated the stored copy
+                stored = self._load(from_storage=True)
+            if stored is not None and self._is_current(stored[1], current, partition_filters):
+                return stored
+
+            if partition_filters:
+                current = self._source_versions()
+            table = self._rebuild(current)
+            return (table, current) if table is not None else None
+
+    def rebuild(self) -> Optional['pyarrow.Table']:
+        """
+        Recompute the summary from the line items and store it.
+
+        Returns:
+            The new summary table, or None if the workspace has no Parquet data.
+        """
+        with self._lock:
+            return self._rebuild(self._source_versions())
+
+    def record_save(self, plan_id: str, parquet_path: str, replaced_paths: Iterable[str] = ()) -> bool:
+        """
+        Replace a plan's summary row after its Parquet file was written.
+
+        Only applied if the summary was up to date before the save; otherwise
+        it is left stale and rebuilt on next use. If the workspace has no
+        summary yet, it is built.
+
+        Args:
+            plan_id: ID of the saved media plan
+            parquet_path: Path of the Parquet file that was written
+            replaced_paths: Paths of previous copies of the plan removed by the save
+
+        Returns:
+            True if the summary was updated.
+        """
+        if not self.enabled:
+            return False
+
+        import pyarrow.compute as pc
+
+        with self._lock:
+            stored = self._load()
+            if stored is None:
+                return self._rebuild(self._source_versions()) is not None
+
+            table, versions = stored
+            current = self._source_versions()
+            if not _unchanged_except(versions, current, [parquet_path, *replaced_paths]):
+                logger.debug("Plan summary is out of date - it will be rebuilt on next use")
+                return False
+
+            # The plan's existing row must come from the file being replaced; an ID
+            # shared with a plan stored in another file needs a full rebuild
+            existing_rows = pc.sum(pc.equal(table.column('meta_id'), plan_id)).as_py() or 0
+            previously_stored = any(path in versions for path in [parquet_path, *replaced_paths])
+            if existing_rows > 1 or (existing_rows == 1 and not previously_stored):
+                logger.debug(f"Plan ID {plan_id} is stored in several files - plan summary will be rebuilt")
+                return False
+
+            row = self._plan_row(parquet_path)
+            kept = table.filter(pc.fill_null(pc.not_equal(table.column('meta_id'), plan_id), True))
+            self._store(_concat([kept, row]), current)
+            return True
+
+    def record_deletion(self, plan_id: str, deleted_paths: Iterable[str] = ()) -> bool:
+        """
+        Remove a deleted plan's summary row.
+
+        Only applied if the summary was up to date before the deletion;
+        otherwise it is left stale and rebuilt on next use.
+
+        Args:
+            plan_id: ID of the deleted media plan
+            deleted_paths: Paths of the Parquet files that were deleted
+
+        Returns:
+            True if the summary was updated.
+        """
+        return self.record_deletions([plan_id], deleted_paths)
+
+    def record_deletions(self, plan_ids: Iterable[str], deleted_paths: Iterable[str] = ()) -> bool:
+        """
+        Remove the summary rows of several deleted plans in one update.
+
+        Only applied if the summary was up to date before the deletions;
+        otherwise it is left stale and rebuilt on next use.
+
+        Args:
+            plan_ids: IDs of the deleted media plans
+            deleted_paths: Paths of the Parquet files that were deleted
+
+        Returns:
+            True if the summary was updated.
+        """
+        if not self.enabled:
+            return False
+
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        plan_ids = pa.array(list(dict.fromkeys(plan_ids)), type=pa.string())
+        with self._lock:
+            stored = self._load()
+            if stored is None:
+                return False
+
+            table, versions = stored
+            current = self._source_versions()
+            # Deleting a compacted plan also changes the catalog manifest
+            if not _unchanged_except(versions, current, [MANIFEST_PATH, *deleted_paths]):
+                logger.debug("Plan summary is out of date - it will be rebuilt on next use")
+                return False
+
+            deleted = pc.fill_null(pc.is_in(table.column('meta_id'), value_set=plan_ids), False)
+            deleted_ids = table.column('meta_id').filter(deleted)
+            if len(deleted_ids) > len(pc.unique(deleted_ids)):
+                logger.debug("A deleted plan ID is stored in several files - plan summary will be rebuilt")
+                return False
+
+            self._store(table.filter(pc.invert(deleted)), current)
+            return True
+
+    def _rebuild(self, versions: Dict[str, str]) -> Optional['pyarrow.Table']:
+        """Recompute the summary over {*} and store it with the given source versions."""
+        if not versions:
+            return None
+
+        table = self.workspace_manager._sql_query_duckdb(build_summary_query(), result_format="arrow",
+                                                         use_cache=False)
+        if table.num_columns == 0:
+            return None
+
+        logger.info(f"Rebuilt plan summary ({table.num_rows} plans)")
+        self._store(table, versions)
+        return table
+
+    def _plan_row(self, parquet_path: str) -> 'pyarrow.Table':
+        """Compute the summary row of the plan stored in one Parquet file."""
+        from mediaplanpy.workspace.catalog import WorkspaceCatalog, _quote, _read_parquet_expression
+        from mediaplanpy.workspace.query import _fetch_duckdb_result
+
+        ref = WorkspaceCatalog(self.workspace_manager)._resolve_refs([parquet_path])[0]
+        query = build_summary_query(_read_parquet_expression([_quote(ref)]))
+        with self.workspace_manager.get_duckdb_session_pool().session() as conn:
+            return _fetch_duckdb_result(conn.execute(query), fetch_arrow=True)
+
+    def _source_versions(self, partition_filters: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """List the version of every Parquet file {*} reads, plus the catalog manifest."""
+        from mediaplanpy.workspace.catalog import WorkspaceCatalog, manifest_version
+        from mediaplanpy.workspace.query import _list_parquet_files
+
+        versions = {}
+        manifest = WorkspaceCatalog(self.workspace_manager).read_manifest()
+        if manifest is not None:
+            versions[MANIFEST_PATH] = manifest_version(manifest)
+        _list_parquet_files(self.workspace_manager, '*', partition_filters, versions)
+        return versions
+
+    def _is_current(self, stored: Dict[str, str], current: Dict[str, str],
+                    partition_filters: Optional[Dict[str, Any]] = None) -> bool:
+        """Compare stored source versions with a (possibly partition-pruned) listing."""
+        if not partition_filters or get_parquet_layout(
+                self.workspace_manager.get_resolved_config()) != PARQUET_LAYOUT_PARTITIONED:
+            return stored == current
+
+        # Only the files the pruned listing can see are compared
+        def visible(path):
+            if path == MANIFEST_PATH:
+                return True
+            partition_values = parse_partition_path(path)
+            return partition_values is not None and partition_matches(partition_values, partition_filters)
+
+        return {path: version for path, version in stored.items() if visible(path)} == current
+
+    def _load(self, from_storage: bool = False) -> Optional[Tuple['pyarrow.Table', Dict[str, str]]]:
+        """Get the stored summary and its source versions (from memory, else from storage)."""
+        if self._table is not None and not from_storage:
+            return self._table, self._versions
+
+        import pyarrow.parquet as pq
+
+        storage_backend = self.workspace_manager.get_storage_backend()
+        if not storage_backend.exists(SUMMARY_PATH):
+            return None
+
+        try:
+            table = pq.read_table(io.BytesIO(storage_backend.read_file(SUMMARY_PATH, binary=True)))
+            metadata = table.schema.metadata or {}
+            if metadata.get(_FORMAT_METADATA_KEY) != str(SUMMARY_FORMAT_VERSION).encode():
+                return None
+            versions = json.loads(metadata[_VERSIONS_METADATA_KEY])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable plan summary {SUMMARY_PATH}: {e}")
+            return None
+
+        self._table, self._versions = table.replace_schema_metadata(None), versions
+        return self._table, self._versions
+
+    def _store(self, table: 'pyarrow.Table', versions: Dict[str, str]) -> None:
+        """Keep the summary in memory and write it to storage."""
+        import pyarrow.parquet as pq
+
+        self._table, self._versions = table, versions
+
+        buffer = io.BytesIO()
+        pq.write_table(table.replace_schema_metadata({
+            _FORMAT_METADATA_KEY: str(SUMMARY_FORMAT_VERSION),
+            _VERSIONS_METADATA_KEY: json.dumps(versions, sort_keys=True)
+        }), buffer, compression='snappy')
+
+        storage_backend = self.workspace_manager.get_storage_backend()
+        try:
+            storage_backend.create_directory(SUMMARY_DIR)
+            storage_backend.write_file(SUMMARY_PATH, buffer.getvalue())
+        except Exception as e:
+            # Still usable from memory; other processes rebuild their own
+            logger.warning(f"Failed to write plan summary {SUMMARY_PATH}: {e}")
+
+
+def _unchanged_except(before: Dict[str, str], after: Dict[str, str], paths: List[str]) -> bool:
+    """True if two version listings only differ in the given paths."""
+    excluded = set(paths)
+    return ({path: version for path, version in before.items() if path not in excluded}
+            == {path: version for path, version in after.items() if path not in excluded})
+
+
+def _concat(tables: List['pyarrow.Table']) -> 'pyarrow.Table':
+    """Concatenate summary tables whose column types may differ slightly."""
+    import pyarrow as pa
+
+    return pa.concat_tables(tables, promote_options="permissive")
@@ -6,33 +6,108 @@ in the mediaplans subdirectory of the workspace storage and properly handle
 placeholder records for empty media plans.
 """
 
+import functools
 import logging
 import os
-from typing import Dict, Any, List, Optional, Union
+import time
+from contextlib import closing, ExitStack
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional
 from mediaplanpy.exceptions import SQLQueryError
+from mediaplanpy.storage.partitioning import (
+    PARQUET_LAYOUT_PARTITIONED,
+    PARTITION_GLOB,
+    get_parquet_layout,
+    get_partition_listing_dirs,
+    parse_partition_path,
+    partition_matches
+)
+from mediaplanpy.workspace.plan_summary import (
+    CAMPAIGN_COLUMNS,
+    CAMPAIGN_STAT_COLUMNS,
+    MEDIAPLAN_COLUMNS,
+    MEDIAPLAN_STAT_COLUMNS,
+    PLAN_COLUMNS,
+    STAT_EXPRESSIONS,
+    SUMMARY_RELATION
+)
+from mediaplanpy.workspace.pagination import (
+    DEFAULT_LINEITEM_PAGE_SIZE,
+    DEFAULT_MEDIAPLAN_PAGE_SIZE,
+    LINEITEM_PAGE_KEYS,
+    MEDIAPLAN_PAGE_KEYS,
+    ResultPage,
+    decode_page_token,
+    encode_page_token,
+    keyset_clause,
+    page_scope,
+    row_key
+)
+from mediaplanpy.workspace.query_profile import current_profile, profile_stage, profiled_query
+from mediaplanpy.workspace.query_router import RoutingDecision, list_query_shape
 import pandas as pd
-import io
 import re
 
+if TYPE_CHECKING:
+    import pyarrow
+
 logger = logging.getLogger("mediaplanpy.workspace.query")
 
 # Define constants
 MEDIAPLANS_SUBDIR = "mediaplans"
 
 
+# Field name fragments identifying date fields in filters
+DATE_FIELD_PATTERNS = [
+    'start_date', 'end_date', 'created_at', 'updated_at',
+    'last_updated', 'min_start_date', 'max_end_date'
+]
+
+# Number of Parquet files scanned per pyarrow dataset by _load_workspace_data()
+SCAN_FILES_PER_DATASET = 64
+
+# Default number of rows per record batch yielded by sql_query_iter()
+DEFAULT_STREAM_BATCH_SIZE = 10000
+
+# Names of the query parameters bound for workspace isolation; user
+# parameters may not start with RESERVED_PARAM_PREFIX
+RESERVED_PARAM_PREFIX = "mediaplanpy_"
+WORKSPACE_ID_PARAM = RESERVED_PARAM_PREFIX + "workspace_id"
+PLAN_ID_PARAM = RESERVED_PARAM_PREFIX + "plan_id"
+
+# Result formats accepted by sql_query() and the list_* methods
+RESULT_FORMATS = ("pandas", "arrow", "polars", "records")
+
+
 def _get_parquet_files(self):
     """
     Find all Parquet files in the workspace storage.
 
     Returns:
-        List of paths to Parquet files in the workspace.
+        List of paths to Parquet files in the workspace (per-plan files only;
+        compacted catalog files are listed in the catalog manifest).
     """
+    from mediaplanpy.workspace.catalog import CATALOG_SUBDIR
+
     storage_backend = self.get_storage_backend()
 
-    # First look in the mediaplans subdirectory
+    # Look in the root directory for backward compatibility. It is listed first:
+    # S3 listings are recursive, so the backend's listing cache then answers the
+    # mediaplans listing below without another walk of the workspace
+    root_files = []
+    try:
+        root_files = storage_backend.list_files("", "*.parquet")
+        # Filter out any files in the mediaplans subdirectory (listed below)
+        # and the compacted catalog (S3 listings are recursive)
+        root_files = [f for f in root_files
+                      if not f.startswith(MEDIAPLANS_SUBDIR) and not f.startswith(CATALOG_SUBDIR)]
+    except Exception as e:
+        logger.warning(f"Error listing files in root directory: {e}")
+
+    # Then look in the mediaplans subdirectory (either Parquet layout)
     mediaplans_files = []
     try:
-        mediaplans_files = storage_backend.list_files(MEDIAPLANS_SUBDIR, "*.parquet")
+        mediaplans_files = _list_parquet_files(self, '*')
         # Prepend the subdirectory path if needed
         mediaplans_files = [
             f if f.startswith(MEDIAPLANS_SUBDIR) else os.path.join(MEDIAPLANS_SUBDIR, f)
@@ -41,66 +116,297 @@ def _get_parquet_files(self):
     except Exception as e:
         logger.warning(f"Error listing files in mediaplans subdirectory: {e}")
 
-    # Also look in the root directory for backward compatibility
-    root_files = []
-    try:
-        root_files = storage_backend.list_files("", "*.parquet")
-        # Filter out any files in the mediaplans subdirectory (already counted)
-        root_files = [f for f in root_files if not f.startswith(MEDIAPLANS_SUBDIR)]
-    except Exception as e:
-        logger.warning(f"Error listing files in root directory: {e}")
-
     # Combine both lists
     all_files = mediaplans_files + root_files
 
     return all_files
 
 
-def _load_workspace_data(self, filters=None):
+def _load_workspace_data(self, filters=None, columns=None):
     """
     Load and combine all Parquet files in the workspace.
 
+    Files are scanned with pyarrow.dataset rather than downloaded and parsed
+    one by one: filters that can be expressed on the column types are pushed
+    into the scan, so row groups whose statistics exclude them are never
+    decoded, and only the requested columns are materialized. Filters that
+    cannot be pushed down (regex, dates stored as strings) are applied to the
+    loaded rows with _apply_filters().
+
     Args:
-        filters: Optional pre-filtering to apply while loading
+        filters: Optional filters to apply while loading (same format as list_* filters)
+        columns: Optional list of columns to load (default: all columns)
 
     Returns:
         Combined pandas DataFrame of all media plan data
     """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    from mediaplanpy.workspace.catalog import WorkspaceCatalog
+
     storage_backend = self.get_storage_backend()
     parquet_files = self._get_parquet_files()
+    manifest = WorkspaceCatalog(self).read_manifest()
+    catalog_files = [entry['path'] for entry in manifest.get('files', [])] if manifest else []
 
-    if not parquet_files:
+    if not parquet_files and not catalog_files:
         logger.warning("No Parquet files found in workspace")
         return pd.DataFrame()
 
-    dataframes = []
-    for file_path in parquet_files:
+    try:
+        filesystem, to_arrow_path = _get_arrow_filesystem(storage_backend)
+    except Exception as e:
+        logger.warning(f"Could not create Arrow filesystem, scanning downloaded files instead: {e}")
+        filesystem, to_arrow_path = None, None
+
+    parquet_format = ds.ParquetFileFormat()
+
+    def make_dataset(paths):
+        if filesystem is not None:
+            dataset = ds.dataset([to_arrow_path(path) for path in paths], format=parquet_format,
+                                 filesystem=filesystem)
+        else:
+            # Backends without an Arrow filesystem: scan in-memory copies, downloaded
+            # concurrently where the backend supports it (filters and projection still
+            # skip decoding excluded row groups and columns)
+            contents = storage_backend.read_files(paths, binary=True)
+            fragments = [parquet_format.make_fragment(pa.BufferReader(contents[path])) for path in paths]
+            dataset = ds.FileSystemDataset(fragments, schema=fragments[0].physical_schema, format=parquet_format)
+        # Files written by different SDK versions may differ in columns or types
+        return dataset.replace_schema(pa.unify_schemas(
+            [fragment.physical_schema for fragment in dataset.get_fragments()],
+            promote_options="permissive"
+        ))
+
+    hidden_plan_ids = set(manifest.get('deleted_plan_ids', [])) if manifest else set()
+
+    def scan(group_paths, is_catalog):
+        """Scan a group of files; returns (table or None, residual filters, plan IDs)."""
+        dataset = make_dataset(group_paths)
+        schema = dataset.schema
+
+        scan_filter, group_residual_filters = _build_arrow_filter(schema, filters or {})
+
+        if is_catalog and hidden_plan_ids and 'meta_id' in schema.names:
+            # Hide catalog rows of plans deleted or re-saved since compaction
+            visible = ~pc.field('meta_id').isin(
+                pa.array(sorted(hidden_plan_ids), type=schema.field('meta_id').type))
+            scan_filter = visible if scan_filter is None else scan_filter & visible
+
+        scan_columns = None
+        if columns is not None:
+            scan_columns = [c for c in columns if c in schema.names]
+            scan_columns += [f for f in group_residual_filters
+                             if f in schema.names and f not in scan_columns]
+
+        # Drop empty batches as they stream in: they still reference the
+        # decoded column buffers of the row groups the filter rejected
+        scanner = dataset.scanner(columns=scan_columns, filter=scan_filter)
+        batches = [batch for batch in scanner.to_batches() if batch.num_rows]
+        table = pa.Table.from_batches(batches, schema=scanner.projected_schema) if batches else None
+
+        plan_ids = set()
+        if not is_catalog and catalog_files and 'meta_id' in schema.names:
+            # Re-saved plans supersede their catalog rows whether or not they match the filters
+            meta_ids = dataset.to_table(columns=['meta_id']).column('meta_id')
+            plan_ids = set(pc.unique(meta_ids.drop_null()).to_pylist())
+        return table, group_residual_filters, plan_ids
+
+    tables = []
+    residual_filters = {}
+    for paths, is_catalog in ((parquet_files, False), (catalog_files, True)):
+        # Scan in groups of files: each dataset keeps the Parquet metadata of
+        # every file it has opened, which adds up across thousands of plans
+        for offset in range(0, len(paths), SCAN_FILES_PER_DATASET):
+            group = paths[offset:offset + SCAN_FILES_PER_DATASET]
+            try:
+                results = [scan(group, is_catalog)]
+            except Exception as e:
+                if len(group) == 1:
+                    logger.error(f"Skipping unreadable Parquet file {group[0]}: {e}")
+                    continue
+                # Rescan the group file by file, so an unreadable file only loses its own rows
+                logger.warning(f"Error scanning Parquet files, scanning them one by one: {e}")
+                results = []
+                for path in group:
+                    try:
+                        results.append(scan([path], is_catalog))
+                    except Exception as file_error:
+                        logger.error(f"Skipping unreadable Parquet file {path}: {file_error}")
+
+            for table, group_residual_filters, plan_ids in results:
+                if table is not None:
+                    tables.append(table)
+                residual_filters.update(group_residual_filters)
+                hidden_plan_ids |= plan_ids
+
+    if not tables:
+        return pd.DataFrame()
+
+    df = pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+    if residual_filters:
+        df = self._apply_filters(df, residual_filters).reset_index(drop=True)
+
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+
+    return df
+
+
+def _get_arrow_filesystem(storage_backend):
+    """
+    Get a pyarrow filesystem reading the same files as a storage backend.
+
+    Args:
+        storage_backend: The workspace storage backend.
+
+    Returns:
+        Tuple of (pyarrow FileSystem, function converting a storage path to a
+        filesystem path), or (None, None) if the backend has no Arrow equivalent.
+    """
+    from pyarrow import fs
+
+    backend_type = type(storage_backend).__name__
+
+    if backend_type == "LocalStorageBackend":
+        return fs.LocalFileSystem(), storage_backend.resolve_path
+
+    if backend_type == "S3StorageBackend":
+        options = {"region": storage_backend.region}
+        if storage_backend.endpoint_url:
+            options["endpoint_override"] = storage_backend.endpoint_url
+        options["scheme"] = "https" if storage_backend.use_ssl else "http"
+
+        # Use the backend's current credentials; the filesystem is created for
+        # every scan, so temporary credentials are picked up once refreshed
         try:
-            # Read the file into a DataFrame
-            content = storage_backend.read_file(file_path, binary=True)
-            buffer = io.BytesIO(content)
-            df = pd.read_parquet(buffer)
+            credentials = storage_backend.get_credentials()
+            if credentials is not None and credentials.access_key:
+                options["access_key"] = credentials.access_key
+                options["secret_key"] = credentials.secret_key
+                if credentials.token:
+                    options["session_token"] = credentials.token
+        except Exception as e:
+            logger.debug(f"Using default AWS credential chain for Arrow S3 access: {e}")
+
+        return fs.S3FileSystem(**options), \
+            lambda path: f"{storage_backend.bucket}/{storage_backend.resolve_s3_key(path)}"
 
-            # Apply pre-filtering if provided (optimization)
-            if filters:
-                df = self._apply_filters(df, filters)
+    return None, None
+
+
+def _build_arrow_filter(schema, filters):
+    """
+    Translate list_* style filters into a pyarrow dataset expression.
 
-            if not df.empty:
-                dataframes.append(df)
+    A filter is pushed down only when its values convert exactly to the
+    column's Arrow type, so the scan can never fail on a type mismatch.
+    Everything else is returned as a residual filter for _apply_filters().
 
+    Args:
+        schema: pyarrow Schema of the scanned files.
+        filters: Dictionary of field names and filter values.
+
+    Returns:
+        Tuple of (expression or None, dictionary of residual filters).
+    """
+    import pyarrow.compute as pc
+
+    expression = None
+    residual_filters = {}
+
+    for field, value in filters.items():
+        if field not in schema.names:
+            # Left to _apply_filters(), which sees the columns of all scanned files
+            residual_filters[field] = value
+            continue
+
+        try:
+            field_expression = _arrow_field_filter(pc.field(field), schema.field(field).type, field, value)
         except Exception as e:
-            logger.error(f"Error loading Parquet file {file_path}: {e}")
+            logger.debug(f"Filter on {field} not pushed down: {e}")
+            field_expression = None
 
-    if not dataframes:
-        return pd.DataFrame()
+        if field_expression is None:
+            residual_filters[field] = value
+        else:
+            expression = field_expression if expression is None else expression & field_expression
+
+    return expression, residual_filters
 
-    return pd.concat(dataframes, ignore_index=True)
+
+def _arrow_field_filter(column, arrow_type, field, value):
+    """
+    Build the pyarrow expression for one filter, or None if it cannot be pushed down.
+
+    Args:
+        column: pyarrow field expression for the column.
+        arrow_type: Arrow type of the column.
+        field: Column name.
+        value: Filter value (scalar, list, or {'min', 'max', 'regex'} dictionary).
+
+    Returns:
+        pyarrow Expression or None.
+
+    Raises:
+        ValueError, TypeError or pyarrow errors if a value cannot be converted.
+    """
+    import pyarrow as pa
+    import pyarrow.types as pat
+
+    is_date_field = any(pattern in field.lower() for pattern in DATE_FIELD_PATTERNS)
+
+    def to_scalar(v):
+        if v is None:
+            return pa.scalar(None, type=arrow_type)
+        if pat.is_date(arrow_type):
+            return pa.scalar(pd.to_datetime(v).date(), type=arrow_type)
+        if pat.is_timestamp(arrow_type):
+            timestamp = pd.to_datetime(v)
+            if timestamp.tzinfo is not None and arrow_type.tz is None:
+                raise ValueError("timezone-aware value for naive timestamp column")
+            return pa.scalar(timestamp, type=arrow_type)
+        if pat.is_string(arrow_type) or pat.is_large_string(arrow_type):
+            # Date strings are compared as dates by _apply_filters()
+            if is_date_field or not isinstance(v, str):
+                raise TypeError("not a string filter")
+            return pa.scalar(v, type=arrow_type)
+        if pat.is_boolean(arrow_type):
+            if not isinstance(v, bool):
+                raise TypeError("not a boolean filter")
+            return pa.scalar(v, type=arrow_type)
+        if pat.is_integer(arrow_type) or pat.is_floating(arrow_type):
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                raise TypeError("not a numeric filter")
+            return pa.scalar(v, type=arrow_type)
+        raise TypeError(f"unsupported column type {arrow_type}")
+
+    if isinstance(value, list):
+        return column.isin(pa.array([to_scalar(v).as_py() for v in value], type=arrow_type))
+
+    if isinstance(value, dict):
+        if 'regex' in value or not ('min' in value or 'max' in value):
+            return None
+        expression = None
+        if 'min' in value:
+            expression = column >= to_scalar(value['min'])
+        if 'max' in value:
+            upper = column <= to_scalar(value['max'])
+            expression = upper if expression is None else expression & upper
+        return expression
+
+    return column == to_scalar(value)
 
 
 def _apply_filters(self, df, filters):
     """
     Apply filters to a DataFrame with enhanced date field support.
 
+    All conditions are combined into a single boolean mask, so the frame is
+    indexed once and each date column is parsed at most once.
+
     Args:
         df: pandas DataFrame to filter
         filters: Dictionary of field names and filter values
@@ -111,64 +417,56 @@ def _apply_filters(self, df, filters):
     if not filters:
         return df
 
-    filtered_df = df.copy()
-
-    # Define date field patterns for smart detection
-    date_field_patterns = [
-        'start_date', 'end_date', 'created_at', 'updated_at',
-        'last_updated', 'min_start_date', 'max_end_date'
-    ]
+    mask = pd.Series(True, index=df.index)
 
     for field, value in filters.items():
-        if field not in filtered_df.columns:
+        if field not in df.columns:
             logger.warning(f"Filter field '{field}' not found in data columns")
             continue
 
+        column = df[field]
+
         # Detect if this is likely a date field
-        is_date_field = any(pattern in field.lower() for pattern in date_field_patterns)
+        is_date_field = any(pattern in field.lower() for pattern in DATE_FIELD_PATTERNS)
+        df_dates = None
+        if is_date_field:
+            try:
+                df_dates = pd.to_datetime(column, errors='coerce')
+            except Exception as e:
+                logger.warning(f"Failed to parse dates in {field}: {e}")
 
         if isinstance(value, list):
             # List of values (IN operator)
-            if is_date_field:
+            if df_dates is not None:
                 # Convert both sides to datetime for proper comparison
                 try:
-                    # Convert filter values to datetime
                     date_values = [pd.to_datetime(v) for v in value]
-                    # Convert DataFrame column to datetime
-                    df_dates = pd.to_datetime(filtered_df[field], errors='coerce')
-                    filtered_df = filtered_df[df_dates.isin(date_values)]
+                    mask &= df_dates.isin(date_values)
                 except Exception as e:
                     logger.warning(f"Failed to apply date list filter for {field}: {e}")
                     # Fallback to string comparison
-                    filtered_df = filtered_df[filtered_df[field].isin(value)]
+                    mask &= column.isin(value)
             else:
-                filtered_df = filtered_df[filtered_df[field].isin(value)]
+                mask &= column.isin(value)
 
         elif isinstance(value, dict):
             # Range filter {'min': x, 'max': y} or regex {'regex': pattern}
             if 'min' in value or 'max' in value:
-                if is_date_field:
+                if df_dates is not None:
                     # Handle date range filtering
                     try:
-                        # Convert DataFrame column to datetime
-                        df_dates = pd.to_datetime(filtered_df[field], errors='coerce')
-
                         if 'min' in value:
-                            min_date = pd.to_datetime(value['min'])
-                            filtered_df = filtered_df[df_dates >= min_date]
-
+                            mask &= df_dates >= pd.to_datetime(value['min'])
                         if 'max' in value:
-                            max_date = pd.to_datetime(value['max'])
-                            filtered_df = filtered_df[df_dates <= max_date]
-
+                            mask &= df_dates <= pd.to_datetime(value['max'])
                     except Exception as e:
                         logger.warning(f"Failed to apply date range filter for {field}: {e}")
                         # Fallback to string comparison (may not work correctly for dates)
                         try:
                             if 'min' in value:
-                                filtered_df = filtered_df[filtered_df[field] >= value['min']]
+                                mask &= column >= value['min']
                             if 'max' in value:
-                                filtered_df = filtered_df[filtered_df[field] <= value['max']]
+                                mask &= column <= value['max']
                         except Exception as fallback_error:
                             logger.error(f"Date filter failed completely for {field}: {fallback_error}")
                             continue
@@ -176,39 +474,50 @@ def _apply_filters(self, df, filters):
                     # Numeric range filtering
                     try:
                         if 'min' in value:
-                            filtered_df = filtered_df[filtered_df[field] >= value['min']]
+                            mask &= column >= value['min']
                         if 'max' in value:
-                            filtered_df = filtered_df[filtered_df[field] <= value['max']]
+                            mask &= column <= value['max']
                     except Exception as e:
                         logger.warning(f"Failed to apply numeric range filter for {field}: {e}")
                         continue
 
             if 'regex' in value:
                 try:
-                    filtered_df = filtered_df[filtered_df[field].astype(str).str.match(value['regex'])]
+                    mask &= column.astype(str).str.match(value['regex'])
                 except Exception as e:
                     logger.warning(f"Failed to apply regex filter for {field}: {e}")
                     continue
 
         else:
             # Exact match
-            if is_date_field:
+            if df_dates is not None:
                 # Handle date exact matching
                 try:
-                    target_date = pd.to_datetime(value)
-                    df_dates = pd.to_datetime(filtered_df[field], errors='coerce')
-                    filtered_df = filtered_df[df_dates == target_date]
+                    mask &= df_dates == pd.to_datetime(value)
                 except Exception as e:
                     logger.warning(f"Failed to apply date exact filter for {field}: {e}")
                     # Fallback to string comparison
-                    filtered_df = filtered_df[filtered_df[field] == value]
+                    mask &= column == value
             else:
-                filtered_df = filtered_df[filtered_df[field] == value]
+                mask &= column == value
 
-    return filtered_df
+    return df[mask.fillna(False).astype(bool)]
 
 
-def list_campaigns(self, filters=None, include_stats=True, include_archived=False, return_dataframe=False):
+def _profiled(method):
+    """
+    Profile calls of a list_* method as one query (see query_profile.profiled_query()).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with profiled_query(self, method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@_profiled
+def list_campaigns(self, filters=None, include_stats=True, include_archived=False, return_dataframe=False,
+                   result_format=None):
     """
     Retrieve a list of unique campaigns with metadata and statistics (v3.0).
 
@@ -230,199 +539,121 @@ def list_campaigns(self, filters=None, include_stats=True, include_archived=Fals
                                 which excludes campaigns where meta_is_archived is TRUE
                                 (rows with a NULL meta_is_archived are always included).
         return_dataframe (bool): If True, return pandas DataFrame instead of list of dicts.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
 
     Returns:
-        List of dictionaries or DataFrame, each row representing a unique campaign.
+        List of dictionaries or DataFrame (or the requested result_format), each row
+        representing a unique campaign.
     """
-    import pandas as pd
-
     # Ensure workspace is loaded
     if not self.is_loaded:
         from mediaplanpy.exceptions import WorkspaceError
         raise WorkspaceError("No workspace configuration loaded. Call load() first.")
 
-    # Step 1: Build simple SQL query to get all campaign data with line item aggregations
+    # Step 1: Build a query returning the current/latest plan of each campaign
     # The workspace_id filter will be automatically injected by sql_query
     # Filter out archived plans at SQL level, unless include_archived is set
     # v3.0: Removed deprecated audience/location fields, added KPIs and custom dimensions
-    archived_clause = "" if include_archived else "WHERE meta_is_archived = FALSE OR meta_is_archived IS NULL"
-
-    if include_stats:
-        query = """
-        SELECT
-            campaign_id,
-            campaign_name,
-            campaign_objective,
-            campaign_start_date,
-            campaign_end_date,
-            campaign_budget_total,
-            campaign_product_name,
-            campaign_product_description,
-            campaign_budget_currency,
-            campaign_agency_id,
-            campaign_agency_name,
-            campaign_advertiser_id,
-            campaign_advertiser_name,
-            campaign_product_id,
-            campaign_campaign_type_id,
-            campaign_campaign_type_name,
-            campaign_workflow_status_id,
-            campaign_workflow_status_name,
-            -- v3.0: Campaign KPI fields
-            campaign_kpi_name1,
-            campaign_kpi_value1,
-            campaign_kpi_name2,
-            campaign_kpi_value2,
-            campaign_kpi_name3,
-            campaign_kpi_value3,
-            campaign_kpi_name4,
-            campaign_kpi_value4,
-            campaign_kpi_name5,
-            campaign_kpi_value5,
-            -- v3.0: Campaign custom dimension fields
-            campaign_dim_custom1,
-            campaign_dim_custom2,
-            campaign_dim_custom3,
-            campaign_dim_custom4,
-            campaign_dim_custom5,
-            -- v3.0: Meta custom dimension fields
-            meta_dim_custom1,
-            meta_dim_custom2,
-            meta_dim_custom3,
-            meta_dim_custom4,
-            meta_dim_custom5,
-            meta_id,
-            meta_is_current,
-            meta_is_archived,
-            meta_created_at,
-            -- Line item statistics per media plan
-            COUNT(CASE WHEN is_placeholder = FALSE OR is_placeholder IS NULL THEN 1 END) as stat_lineitem_count,
-            SUM(CASE WHEN is_placeholder = FALSE OR is_placeholder IS NULL THEN lineitem_cost_total ELSE 0 END) as stat_total_cost,
-            MIN(CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_start_date IS NOT NULL THEN lineitem_start_date END) as stat_min_start_date,
-            MAX(CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_end_date IS NOT NULL THEN lineitem_end_date END) as stat_max_end_date,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_channel IS NOT NULL AND lineitem_channel != '' THEN lineitem_channel END) as stat_distinct_channel_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_vehicle IS NOT NULL AND lineitem_vehicle != '' THEN lineitem_vehicle END) as stat_distinct_vehicle_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_partner IS NOT NULL AND lineitem_partner != '' THEN lineitem_partner END) as stat_distinct_partner_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_media_product IS NOT NULL AND lineitem_media_product != '' THEN lineitem_media_product END) as stat_distinct_media_product_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_adformat IS NOT NULL AND lineitem_adformat != '' THEN lineitem_adformat END) as stat_distinct_adformat_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_kpi IS NOT NULL AND lineitem_kpi != '' THEN lineitem_kpi END) as stat_distinct_kpi_count,
-            COUNT(DISTINCT CASE WHEN (is_placeholder = FALSE OR is_placeholder IS NULL) AND lineitem_location_name IS NOT NULL AND lineitem_location_name != '' THEN lineitem_location_name END) as stat_distinct_location_name_count
-        FROM {*}
-        __ARCHIVED_CLAUSE__
-        GROUP BY campaign_id, campaign_name, campaign_objective,
-                 campaign_start_date, campaign_end_date, campaign_budget_total,
-                 campaign_product_name, campaign_product_description,
-                 campaign_budget_currency, campaign_agency_id, campaign_agency_name,
-                 campaign_advertiser_id, campaign_advertiser_name, campaign_product_id,
-                 campaign_campaign_type_id, campaign_campaign_type_name,
-                 campaign_workflow_status_id, campaign_workflow_status_name,
-                 campaign_kpi_name1, campaign_kpi_value1, campaign_kpi_name2, campaign_kpi_value2,
-                 campaign_kpi_name3, campaign_kpi_value3, campaign_kpi_name4, campaign_kpi_value4,
-                 campaign_kpi_name5, campaign_kpi_value5,
-                 campaign_dim_custom1, campaign_dim_custom2, campaign_dim_custom3,
-                 campaign_dim_custom4, campaign_dim_custom5,
-                 meta_dim_custom1, meta_dim_custom2, meta_dim_custom3,
-                 meta_dim_custom4, meta_dim_custom5,
-                 meta_id, meta_is_current, meta_is_archived, meta_created_at
-        ORDER BY campaign_id,
-                 CASE WHEN meta_is_current = TRUE THEN 0 ELSE 1 END,
-                 meta_created_at DESC
-        """
-    else:
-        query = """
-        SELECT DISTINCT
-            campaign_id,
-            campaign_name,
-            campaign_objective,
-            campaign_start_date,
-            campaign_end_date,
-            campaign_budget_total,
-            campaign_product_name,
-            campaign_product_description,
-            campaign_budget_currency,
-            campaign_agency_id,
-            campaign_agency_name,
-            campaign_advertiser_id,
-            campaign_advertiser_name,
-            campaign_product_id,
-            campaign_campaign_type_id,
-            campaign_campaign_type_name,
-            campaign_workflow_status_id,
-            campaign_workflow_status_name,
-            -- v3.0: Campaign KPI fields
-            campaign_kpi_name1,
-            campaign_kpi_value1,
-            campaign_kpi_name2,
-            campaign_kpi_value2,
-            campaign_kpi_name3,
-            campaign_kpi_value3,
-            campaign_kpi_name4,
-            campaign_kpi_value4,
-            campaign_kpi_name5,
-            campaign_kpi_value5,
-            -- v3.0: Campaign custom dimension fields
-            campaign_dim_custom1,
-            campaign_dim_custom2,
-            campaign_dim_custom3,
-            campaign_dim_custom4,
-            campaign_dim_custom5,
-            -- v3.0: Meta custom dimension fields
-            meta_dim_custom1,
-            meta_dim_custom2,
-            meta_dim_custom3,
-            meta_dim_custom4,
-            meta_dim_custom5,
-            meta_id,
-            meta_is_current,
-            meta_is_archived,
-            meta_created_at,
-            CASE WHEN meta_is_current = TRUE THEN 0 ELSE 1 END AS meta_is_current_sort
-        FROM {*}
-        __ARCHIVED_CLAUSE__
-        ORDER BY campaign_id,
-                 meta_is_current_sort,
-                 meta_created_at DESC
-        """
-
-    query = query.replace("__ARCHIVED_CLAUSE__", archived_clause)
+    result_format = _resolve_result_format(result_format, return_dataframe)
+
+    # Read the per-plan summary instead of the line items when it covers the filters
+    partition_filters = self._build_partition_filters(filters, include_archived=include_archived)
+    summary = self._get_plan_summary_table(filters, partition_filters)
+
+    # The query is engine-specific, so the engine is chosen before it is built
+    shape = list_query_shape('list_campaigns', filters, include_stats=include_stats,
+                             include_archived=include_archived)
+    decision = None
+    engine = 'duckdb'
+    if summary is None:
+        with profile_stage("route"):
+            decision = self.get_query_router().route(None, shape=shape)
+        engine = decision.engine
+
+    query = _build_campaigns_query(SUMMARY_RELATION if summary is not None else "{*}",
+                                   include_stats=include_stats, include_archived=include_archived,
+                                   aggregate=summary is None, engine=engine)
 
     # Add user filters if provided
+    params = {}
     if filters:
-        query = self._add_sql_filters(query, filters)
+        query = self._add_sql_filters(query, filters, params, engine=engine)
 
     # Step 2: Execute query - workspace_id filter is automatically injected
-    df = self.sql_query(query, return_dataframe=True)
+    if summary is not None:
+        return self._query_plan_summary(summary, query, params, result_format, shape)
+    if engine == 'duckdb':
+        return self._run_routed_query(decision, query, partition_filters=partition_filters, params=params,
+                                      result_format=result_format)
+
+    # DISTINCT ON requires ordering by campaign_id first - sort the campaigns by name here
+    df = self._run_routed_query(decision, query, partition_filters=partition_filters, params=params,
+                                result_format="pandas")
+    if not df.empty:
+        df = df.sort_values('campaign_name', kind='stable', na_position='last').reset_index(drop=True)
+    return _format_result(df, result_format)
+
+
+def _build_campaigns_query(source, include_stats=True, include_archived=False, aggregate=True,
+                           engine='duckdb'):
+    """
+    Build the list_campaigns() query returning one row per campaign.
 
-    if df.empty:
-        return df if return_dataframe else []
+    Each campaign is represented by its current plan (or the most recently
+    created one if none is current). The plan is selected in the engine with
+    a window function - ROW_NUMBER() in a QUALIFY clause on DuckDB, DISTINCT ON
+    on PostgreSQL, which has no QUALIFY (and sql_query() rejects subqueries) -
+    and the number of plans per campaign is a windowed COUNT, so only one row
+    per campaign is returned.
 
-    # Step 3: Count non-archived plans per campaign (before filtering to first row)
-    if include_stats:
-        plan_counts = df.groupby('campaign_id')['meta_id'].nunique().reset_index()
-        plan_counts.columns = ['campaign_id', 'stat_media_plan_count']
+    Args:
+        source: Table to read ("{*}" for the line items, SUMMARY_RELATION for the summary)
+        include_stats: Whether to include the line item statistics and plan counts
+        include_archived: Whether to include archived media plans
+        aggregate: Whether source holds line items that must be aggregated per plan
+        engine: Engine the query runs on ('duckdb' or 'database')
 
-    # Step 4: Keep only the first row per campaign_id (current or most recent)
-    # The ORDER BY in the SQL already sorted by is_current and created_at DESC
-    result_df = df.groupby('campaign_id', as_index=False).first()
+    Returns:
+        SQL query string. Rows with a NULL campaign_id are excluded.
+    """
+    current_plan_order = "CASE WHEN meta_is_current = TRUE THEN 0 ELSE 1 END, meta_created_at DESC NULLS LAST"
 
-    # Step 5: Add plan counts back to the filtered dataframe
+    columns = list(CAMPAIGN_COLUMNS)
     if include_stats:
-        result_df = result_df.merge(plan_counts, on='campaign_id', how='left')
-        result_df['stat_media_plan_count'] = result_df['stat_media_plan_count'].fillna(0).astype(int)
-        # Add stat_last_updated as meta_created_at
-        result_df['stat_last_updated'] = result_df['meta_created_at']
-
-    # Step 6: Sort by campaign name
-    result_df = result_df.sort_values('campaign_name').reset_index(drop=True)
-
-    # Step 7: Return in requested format (keep meta fields for future use)
-    if return_dataframe:
-        return result_df
+        stat_expressions = dict(STAT_EXPRESSIONS)
+        columns += [f"{stat_expressions[name]} AS {name}" if aggregate else name for name in CAMPAIGN_STAT_COLUMNS]
+        columns += ["COUNT(meta_id) OVER (PARTITION BY campaign_id) AS stat_media_plan_count",
+                    "meta_created_at AS stat_last_updated"]
     else:
-        return result_df.to_dict(orient='records')
-
-
-def list_mediaplans(self, filters=None, include_stats=True, include_archived=True, return_dataframe=False):
+        columns.append("CASE WHEN meta_is_current = TRUE THEN 0 ELSE 1 END AS meta_is_current_sort")
+
+    where = "WHERE campaign_id IS NOT NULL"
+    if not include_archived:
+        where += " AND (meta_is_archived = FALSE OR meta_is_archived IS NULL)"
+
+    # Rows of the same plan collapse into one (aggregated when stats are included)
+    group_by = f"GROUP BY {', '.join(CAMPAIGN_COLUMNS)}\n" if aggregate else ""
+
+    column_list = ',\n    '.join(columns)
+    if engine == 'duckdb':
+        return (f"SELECT {column_list}\n"
+                f"FROM {source}\n"
+                f"{where}\n"
+                f"{group_by}"
+                f"QUALIFY ROW_NUMBER() OVER (PARTITION BY campaign_id ORDER BY {current_plan_order}) = 1\n"
+                f"ORDER BY campaign_name NULLS LAST, campaign_id")
+
+    return (f"SELECT DISTINCT ON (campaign_id) {column_list}\n"
+            f"FROM {source}\n"
+            f"{where}\n"
+            f"{group_by}"
+            f"ORDER BY campaign_id, {current_plan_order}")
+
+
+@_profiled
+def list_mediaplans(self, filters=None, include_stats=True, include_archived=True, return_dataframe=False,
+                    result_format=None):
     """
     Retrieve a list of media plans with metadata and statistics (v3.0).
 
@@ -440,9 +671,32 @@ def list_mediaplans(self, filters=None, include_stats=True, include_archived=Tru
                                 plans where meta_is_archived is TRUE (rows with a NULL
                                 meta_is_archived are always included).
         return_dataframe (bool): If True, return pandas DataFrame instead of list of dicts.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
+
+    Returns:
+        List of dictionaries or DataFrame (or the requested result_format), each row
+        representing a unique media plan.
+    """
+    return self._list_mediaplans(filters, include_stats, include_archived,
+                                 _resolve_result_format(result_format, return_dataframe))
+
+
+def _list_mediaplans(self, filters, include_stats, include_archived, result_format, page=None):
+    """
+    Run the list_mediaplans() query, optionally for one keyset page.
+
+    Args:
+        filters: Filters to apply
+        include_stats: Whether to include summary statistics
+        include_archived: Whether to include archived media plans
+        result_format: One of RESULT_FORMATS
+        page: Optional (after, page_size) tuple: key values (see
+              MEDIAPLAN_PAGE_KEYS) of the last plan already returned, or None
+              for the first page, and the number of rows to fetch
 
     Returns:
-        List of dictionaries or DataFrame, each row representing a unique media plan.
+        The media plans in the requested result_format.
     """
     # Ensure workspace is loaded
     if not self.is_loaded:
@@ -550,15 +804,79 @@ def list_mediaplans(self, filters=None, include_stats=True, include_archived=Tru
 
     query = query.replace("__ARCHIVED_CLAUSE__", archived_clause)
 
-    # Add filters if provided
+    # Read the per-plan summary instead of the line items when it covers the filters
+    partition_filters = self._build_partition_filters(filters, include_archived=include_archived)
+    summary = self._get_plan_summary_table(filters, partition_filters)
+    if summary is not None:
+        columns = MEDIAPLAN_COLUMNS + (MEDIAPLAN_STAT_COLUMNS if include_stats else [])
+        query = (f"SELECT {', '.join(columns)}\n"
+                 f"FROM {SUMMARY_RELATION}\n"
+                 f"{archived_clause}\n"
+                 f"ORDER BY meta_created_at DESC")
+
+    shape = list_query_shape('list_mediaplans', filters, include_stats=include_stats,
+                             include_archived=include_archived, paged=page is not None)
+    if summary is not None:
+        params = {}
+        if filters:
+            query = self._add_sql_filters(query, filters, params, engine='duckdb')
+        if page is not None:
+            query = _keyset_page_query(query, MEDIAPLAN_PAGE_KEYS, page, params)
+        return self._query_plan_summary(summary, query, params, result_format, shape)
+
+    # Use routing logic - chooses database vs Parquet before the filters are compiled
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, shape=shape)
+    params = {}
     if filters:
-        query = self._add_sql_filters(query, filters)
+        query = self._add_sql_filters(query, filters, params, engine=decision.engine)
+    if page is not None:
+        query = _keyset_page_query(query, MEDIAPLAN_PAGE_KEYS, page, params)
+
+    return self._run_routed_query(decision, query, partition_filters=partition_filters,
+                                  result_format=result_format, params=params)
+
+
+@_profiled
+def list_mediaplans_page(self, filters=None, page_size=DEFAULT_MEDIAPLAN_PAGE_SIZE, page_token=None,
+                         include_stats=True, include_archived=True, return_dataframe=False,
+                         result_format=None):
+    """
+    Retrieve one page of list_mediaplans() using keyset pagination.
 
-    # Use routing logic - automatically chooses database vs Parquet!
-    return self.sql_query(query, return_dataframe=return_dataframe)
+    Plans are ordered by meta_created_at (newest first), then meta_id. Each
+    page is read with a condition on these keys instead of an OFFSET, so
+    later pages cost the same as the first, on DuckDB and PostgreSQL alike.
 
+    Args:
+        filters (dict, optional): Filters to apply (see list_mediaplans()).
+        page_size (int): Maximum number of media plans per page.
+        page_token (str, optional): next_page_token of the previous page; None for the first page.
+        include_stats (bool): Whether to include summary statistics.
+        include_archived (bool): Whether to include archived media plans.
+        return_dataframe (bool): If True, return the items as a pandas DataFrame.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
+
+    Returns:
+        ResultPage(items, next_page_token); next_page_token is None on the last page.
+
+    Raises:
+        SQLQueryError: If page_size is not positive or page_token is invalid or
+                       was issued for different filters or options.
+    """
+    result_format = _resolve_result_format(result_format, return_dataframe)
+    scope = page_scope('list_mediaplans', filters, include_stats=include_stats,
+                       include_archived=include_archived)
+    after = _page_start(page_token, page_size, scope, MEDIAPLAN_PAGE_KEYS)
 
-def list_lineitems(self, filters=None, limit=None, return_dataframe=False):
+    rows = self._list_mediaplans(filters, include_stats, include_archived, _page_fetch_format(result_format),
+                                 page=(after, page_size))
+    return _result_page(rows, MEDIAPLAN_PAGE_KEYS, page_size, scope, result_format)
+
+
+@_profiled
+def list_lineitems(self, filters=None, limit=None, return_dataframe=False, result_format=None):
     """
     Retrieve a list of line items across all media plans (v3.0).
 
@@ -579,15 +897,206 @@ def list_lineitems(self, filters=None, limit=None, return_dataframe=False):
                                  filter values or lists of values.
         limit (int, optional): Maximum number of line items to return.
         return_dataframe (bool): If True, return pandas DataFrame instead of list of dicts.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
 
     Returns:
-        List of dictionaries or DataFrame, each row representing a line item.
+        List of dictionaries or DataFrame (or the requested result_format), each row
+        representing a line item.
     """
     # Ensure workspace is loaded
     if not self.is_loaded:
         from mediaplanpy.exceptions import WorkspaceError
         raise WorkspaceError("No workspace configuration loaded. Call load() first.")
 
+    # Use routing logic - chooses database vs Parquet before the filters are compiled
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, shape=list_query_shape('list_lineitems', filters))
+    params = {}
+    query = self._build_lineitems_query(filters, params, engine=decision.engine)
+
+    return self._run_routed_query(decision, query, limit=limit,
+                                  partition_filters=self._build_partition_filters(filters),
+                                  result_format=_resolve_result_format(result_format, return_dataframe),
+                                  params=params)
+
+
+@_profiled
+def list_lineitems_page(self, filters=None, page_size=DEFAULT_LINEITEM_PAGE_SIZE, page_token=None,
+                        return_dataframe=False, result_format=None):
+    """
+    Retrieve one page of list_lineitems() using keyset pagination.
+
+    Line items are ordered by lineitem_start_date (latest first) and
+    lineitem_name, as in list_lineitems(), then by meta_id and lineitem_id so
+    that the order is total. Each page is read with a condition on these keys
+    instead of an OFFSET, so later pages cost the same as the first, on
+    DuckDB and PostgreSQL alike.
+
+    Example:
+        >>> page = workspace_manager.list_lineitems_page(page_size=500)
+        >>> while page.next_page_token:
+        ...     page = workspace_manager.list_lineitems_page(page_size=500, page_token=page.next_page_token)
+
+    Args:
+        filters (dict, optional): Filters to apply (see list_lineitems()).
+        page_size (int): Maximum number of line items per page.
+        page_token (str, optional): next_page_token of the previous page; None for the first page.
+        return_dataframe (bool): If True, return the items as a pandas DataFrame.
+        result_format (str, optional): "pandas", "arrow", "polars" or "records";
+                                       overrides return_dataframe (see sql_query()).
+
+    Returns:
+        ResultPage(items, next_page_token); next_page_token is None on the last page.
+
+    Raises:
+        SQLQueryError: If page_size is not positive or page_token is invalid or
+                       was issued for different filters.
+    """
+    # Ensure workspace is loaded
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    result_format = _resolve_result_format(result_format, return_dataframe)
+    scope = page_scope('list_lineitems', filters)
+    after = _page_start(page_token, page_size, scope, LINEITEM_PAGE_KEYS)
+
+    with profile_stage("route"):
+        decision = self.get_query_router().route(None, shape=list_query_shape('list_lineitems', filters,
+                                                                              paged=True))
+    params = {}
+    query = self._build_lineitems_query(filters, params, engine=decision.engine)
+    query = _keyset_page_query(query, LINEITEM_PAGE_KEYS, (after, page_size), params)
+
+    rows = self._run_routed_query(decision, query, partition_filters=self._build_partition_filters(filters),
+                                  result_format=_page_fetch_format(result_format), params=params)
+    return _result_page(rows, LINEITEM_PAGE_KEYS, page_size, scope, result_format)
+
+
+def _page_start(page_token, page_size, scope, keys):
+    """
+    Validate the page size and decode the key values a page starts after.
+
+    Args:
+        page_token: Continuation token, or None for the first page
+        page_size: Requested number of rows per page
+        scope: Digest of the listing (see pagination.page_scope())
+        keys: Sort keys of the listing
+
+    Returns:
+        Key values of the last row of the previous page, or None for the first page.
+
+    Raises:
+        SQLQueryError: If page_size is not a positive integer or the token is invalid.
+    """
+    if not isinstance(page_size, int) or isinstance(page_size, bool) or page_size < 1:
+        raise SQLQueryError(f"Invalid page_size: {page_size!r}. Must be a positive integer")
+    if page_token is None:
+        return None
+    return decode_page_token(page_token, scope, len(keys))
+
+
+def _keyset_page_query(query, keys, page, params):
+    """
+    Turn a list query into the query of one keyset page.
+
+    The query's trailing ORDER BY is replaced by the keyset order, the
+    condition selecting rows after the previous page is added to its WHERE
+    clause and one row more than the page size is fetched, to tell whether
+    another page follows.
+
+    Args:
+        query: List query ending in an ORDER BY clause
+        keys: Sort keys as (column, descending)
+        page: Tuple of (key values of the last row already returned or None, page size)
+        params: Query parameters the key values are bound to
+
+    Returns:
+        The page query.
+    """
+    after, page_size = page
+    condition, order_by = keyset_clause(keys, after, lambda value: _bind_sql_param(params, value))
+
+    order_pos = query.upper().rfind('ORDER BY')
+    if order_pos != -1:
+        query = query[:order_pos].rstrip()
+    if condition:
+        query = _add_where_condition(query, condition)
+    return f"{query}\nORDER BY {order_by}\nLIMIT {page_size + 1}"
+
+
+def _page_fetch_format(result_format):
+    """Format a keyset page is fetched in: Arrow for "arrow"/"polars", pandas otherwise."""
+    return "arrow" if result_format in ("arrow", "polars") else "pandas"
+
+
+def _result_page(rows, keys, page_size, scope, result_format):
+    """
+    Build a ResultPage from the rows fetched by a keyset page query.
+
+    Args:
+        rows: Up to page_size + 1 rows as a pyarrow Table or pandas DataFrame
+              (see _page_fetch_format())
+        keys: Sort keys as (column, descending)
+        page_size: Number of rows per page
+        scope: Digest of the listing (see pagination.page_scope())
+        result_format: One of RESULT_FORMATS
+
+    Returns:
+        ResultPage with at most page_size items and the next page's token, or
+        None if no rows follow.
+    """
+    next_page_token = None
+    if len(rows) > page_size:
+        rows = rows.slice(0, page_size) if hasattr(rows, "slice") else rows.iloc[:page_size]
+        next_page_token = encode_page_token(row_key(rows, keys, page_size - 1), scope)
+
+    with profile_stage("convert"):
+        return ResultPage(_format_result(rows, result_format), next_page_token)
+
+
+def iter_lineitems(self, filters=None, batch_size=DEFAULT_STREAM_BATCH_SIZE):
+    """
+    Stream line items across all media plans as Arrow record batches.
+
+    Streaming counterpart of list_lineitems() for exports and ETL jobs: rows
+    are produced batch by batch through sql_query_iter(), so memory use does
+    not grow with the number of line items in the workspace.
+
+    Args:
+        filters (dict, optional): Filters to apply (same format as list_lineitems()).
+        batch_size (int): Maximum number of rows per record batch.
+
+    Yields:
+        pyarrow.RecordBatch objects, in list_lineitems() order.
+    """
+    # Ensure workspace is loaded
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    decision = self.get_query_router().route(None, shape=list_query_shape('list_lineitems', filters))
+    params = {}
+    query = self._build_lineitems_query(filters, params, engine=decision.engine)
+    return self.sql_query_iter(query, engine=decision.engine, batch_size=batch_size,
+                               partition_filters=self._build_partition_filters(filters),
+                               params=params)
+
+
+def _build_lineitems_query(self, filters=None, params=None, engine=None):
+    """
+    Build the SQL query behind list_lineitems() and iter_lineitems().
+
+    Args:
+        filters (dict, optional): Filters to apply.
+        params (dict, optional): Dictionary the filter values are added to
+                                 (required when filters are given).
+        engine (str, optional): Engine the query runs on (see _build_sql_filter_conditions()).
+
+    Returns:
+        SQL query string with a {*} placeholder.
+    """
     # Build SQL query - select all columns, filter out placeholders
     query = """
     SELECT * FROM {*}
@@ -596,28 +1105,139 @@ def list_lineitems(self, filters=None, limit=None, return_dataframe=False):
     # Add filters if provided
     if filters:
         # For line items, we need to add filters as additional WHERE conditions
-        filter_conditions = self._build_sql_filter_conditions(filters)
+        filter_conditions = self._build_sql_filter_conditions(filters, params, engine=engine)
         if filter_conditions:
             query += f" AND ({filter_conditions})"
 
     query += " ORDER BY lineitem_start_date DESC, lineitem_name"
 
-    # Use routing logic with limit - automatically chooses database vs Parquet!
-    return self.sql_query(query, return_dataframe=return_dataframe, limit=limit)
+    return query
 
 
-def _add_sql_filters(self, base_query, filters):
+def _get_plan_summary_table(self, filters=None, partition_filters=None):
+    """
+    Get the per-plan summary table for a list_mediaplans()/list_campaigns() call.
+
+    Args:
+        filters: Filters of the call; the summary only holds plan-level columns,
+                 so filtering on any other column requires the line items.
+        partition_filters: Partition pruning hints derived from the filters;
+                           only the matching partitions are listed to check
+                           that the summary is current.
+
+    Returns:
+        Tuple of (pyarrow Table with one row per plan, source versions), or
+        None if the call has to scan the line items (summary disabled, queries
+        routed to the database, unsupported filter or summary unavailable).
+    """
+    if filters and any(field not in PLAN_COLUMNS for field in filters):
+        return None
+
+    plan_summary = self.get_plan_summary()
+    if not plan_summary.enabled:
+        return None
+
+    try:
+        with profile_stage("summary_snapshot"):
+            return plan_summary.get_snapshot(partition_filters)
+    except Exception as e:
+        logger.warning(f"Plan summary unavailable, aggregating line items instead: {e}")
+        return None
+
+
+def _query_plan_summary(self, summary, query, params, result_format, shape):
+    """
+    Run a query against the per-plan summary table.
+
+    Results are kept in the query result cache, keyed on the query, its
+    parameters and the source versions of the summary. The execution is
+    recorded in the query statistics under shape.
+
+    Args:
+        summary: Summary table and source versions (see _get_plan_summary_table())
+        query: SQL query reading from SUMMARY_RELATION
+        params: Bound parameter values for the query
+        result_format: One of RESULT_FORMATS
+        shape: Query shape of the calling list_* method
+
+    Returns:
+        Query result in the requested format.
+
+    Raises:
+        SQLQueryError: If the query fails.
+    """
+    profile = current_profile()
+    if profile is not None:
+        profile.engine, profile.routing_reason = 'duckdb', "plan summary table"
+
+    scan_info = {}
+    start = time.perf_counter()
+    try:
+        result = _run_plan_summary_query(self, summary, query, params, result_format, scan_info)
+    except SQLQueryError as e:
+        self.get_query_stats_registry().record(shape, 'duckdb', time.perf_counter() - start, error=str(e))
+        raise
+
+    self.get_query_stats_registry().record(shape, 'duckdb', time.perf_counter() - start, rows=len(result),
+                                           **scan_info)
+    return result
+
+
+def _run_plan_summary_query(self, summary, query, params, result_format, scan_info):
+    """Execute a _query_plan_summary() query, filling scan_info with the bytes scanned."""
+    table, versions = summary
+    fetch_arrow = result_format in ("arrow", "polars")
+
+    cache = self.get_query_result_cache()
+    cache_key = None
+    if cache.enabled:
+        with profile_stage("cache_lookup"):
+            cache_key = cache.make_key(query, versions, result_type="arrow" if fetch_arrow else "pandas",
+                                       params=params)
+            cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug(f"Plan summary query served from cache ({len(cached_result)} rows)")
+            if _scan_metrics_enabled(self):
+                scan_info["bytes_scanned"] = 0
+            return _convert_profiled_result(cached_result, result_format, cache_hit=True)
+
+    try:
+        with ExitStack() as stack:
+            with profile_stage("session_setup"):
+                conn = stack.enter_context(self.get_duckdb_session_pool().session())
+                conn.register(SUMMARY_RELATION, table)
+            try:
+                result = _execute_duckdb(conn, query, params, fetch_arrow,
+                                         scan_info if _scan_metrics_enabled(self) else None)
+            finally:
+                conn.unregister(SUMMARY_RELATION)
+    except Exception as e:
+        raise _duckdb_query_error(e)
+
+    if cache_key is not None:
+        with profile_stage("cache_store"):
+            cache.put(cache_key, result)
+
+    return _convert_profiled_result(result, result_format)
+
+
+def _add_sql_filters(self, base_query, filters, params, engine=None):
     """
     Convert filter dict to SQL WHERE clauses and add to base query.
 
     If the base query already contains a WHERE clause, the existing
     conditions are wrapped in parentheses and the new filter conditions
     are appended with AND. Otherwise a new WHERE clause is inserted
-    before GROUP BY / ORDER BY / LIMIT (or at the end of the query).
+    before GROUP BY / HAVING / QUALIFY / ORDER BY / LIMIT (or at the end
+    of the query).
+    Filter values are added to params and referenced by $name placeholders
+    (see _build_sql_filter_conditions()).
 
     Args:
         base_query: SQL query string
         filters: Dictionary of filter criteria
+        params: Dictionary the filter values are added to
+        engine: Engine the query runs on (see _build_sql_filter_conditions())
 
     Returns:
         Query with WHERE clause added or extended
@@ -629,81 +1249,168 @@ def _add_sql_filters(self, base_query, filters):
         return base_query
 
     try:
-        filter_conditions = self._build_sql_filter_conditions(filters)
+        filter_conditions = self._build_sql_filter_conditions(filters, params, engine=engine)
         if not filter_conditions:
             return base_query
 
-        base_query_upper = base_query.upper()
-
-        # Check if the query already has a WHERE clause
-        where_pos = base_query_upper.find('WHERE')
-
-        if where_pos != -1:
-            # Query already has a WHERE clause — append with AND.
-            # Find the end of the existing WHERE clause (before GROUP BY,
-            # ORDER BY, LIMIT, or end of query).
-            end_positions = []
-            for clause in ['GROUP BY', 'ORDER BY', 'LIMIT']:
-                pos = base_query_upper.find(clause, where_pos + 5)
-                if pos != -1:
-                    end_positions.append(pos)
-
-            if end_positions:
-                end_pos = min(end_positions)
-                existing_where = base_query[where_pos + 5:end_pos].strip()
-                filtered_query = (
-                    base_query[:where_pos] +
-                    f"WHERE ({existing_where}) AND ({filter_conditions})\n" +
-                    base_query[end_pos:]
-                )
-            else:
-                existing_where = base_query[where_pos + 5:].strip()
-                filtered_query = (
-                    base_query[:where_pos] +
-                    f"WHERE ({existing_where}) AND ({filter_conditions})"
-                )
-        else:
-            # No existing WHERE — insert a new one.
-            # Find the position to insert WHERE clause
-            # Look for GROUP BY, ORDER BY, or end of query
-            insert_positions = []
-            for clause in ['GROUP BY', 'ORDER BY', 'LIMIT']:
-                pos = base_query_upper.find(clause)
-                if pos != -1:
-                    insert_positions.append(pos)
-
-            if insert_positions:
-                insert_pos = min(insert_positions)
-                # Insert WHERE clause before the first found clause
-                filtered_query = (
-                        base_query[:insert_pos].rstrip() +
-                        f"\nWHERE {filter_conditions}\n" +
-                        base_query[insert_pos:]
-                )
-            else:
-                # No special clauses found, add WHERE at the end
-                filtered_query = f"{base_query.rstrip()}\nWHERE {filter_conditions}"
-
-        return filtered_query
+        return _add_where_condition(base_query, filter_conditions)
 
     except Exception as e:
         from mediaplanpy.exceptions import SQLQueryError
         raise SQLQueryError(f"Failed to add SQL filters: {str(e)}")
 
 
+def _add_where_condition(base_query, filter_conditions):
+    """
+    Add a condition to the WHERE clause of a query (see _add_sql_filters()).
+
+    Args:
+        base_query: SQL query string
+        filter_conditions: SQL condition to AND with the existing WHERE clause
+
+    Returns:
+        Query with WHERE clause added or extended
+    """
+    base_query_upper = base_query.upper()
+
+    # Check if the query already has a WHERE clause
+    where_pos = base_query_upper.find('WHERE')
+
+    if where_pos != -1:
+        # Query already has a WHERE clause — append with AND.
+        # Find the end of the existing WHERE clause (before GROUP BY,
+        # ORDER BY, LIMIT, or end of query).
+        end_positions = []
+        for clause in ['GROUP BY', 'HAVING', 'QUALIFY', 'ORDER BY', 'LIMIT']:
+            pos = base_query_upper.find(clause, where_pos + 5)
+            if pos != -1:
+                end_positions.append(pos)
+
+        if end_positions:
+            end_pos = min(end_positions)
+            existing_where = base_query[where_pos + 5:end_pos].strip()
+            filtered_query = (
+                base_query[:where_pos] +
+                f"WHERE ({existing_where}) AND ({filter_conditions})\n" +
+                base_query[end_pos:]
+            )
+        else:
+            existing_where = base_query[where_pos + 5:].strip()
+            filtered_query = (
+                base_query[:where_pos] +
+                f"WHERE ({existing_where}) AND ({filter_conditions})"
+            )
+    else:
+        # No existing WHERE — insert a new one.
+        # Find the position to insert WHERE clause
+        # Look for GROUP BY, ORDER BY, or end of query
+        insert_positions = []
+        for clause in ['GROUP BY', 'HAVING', 'QUALIFY', 'ORDER BY', 'LIMIT']:
+            pos = base_query_upper.find(clause)
+            if pos != -1:
+                insert_positions.append(pos)
+
+        if insert_positions:
+            insert_pos = min(insert_positions)
+            # Insert WHERE clause before the first found clause
+            filtered_query = (
+                    base_query[:insert_pos].rstrip() +
+                    f"\nWHERE {filter_conditions}\n" +
+                    base_query[insert_pos:]
+            )
+        else:
+            # No special clauses found, add WHERE at the end
+            filtered_query = f"{base_query.rstrip()}\nWHERE {filter_conditions}"
+
+    return filtered_query
+
+
+def _build_partition_filters(self, filters, include_archived=True):
+    """
+    Derive partition pruning hints from a filter dict.
+
+    Only filters that map onto the partition keys of the "partitioned" Parquet
+    layout are used (campaign_id, meta_is_archived, and campaign start/end
+    dates for the year partition); everything else is left to the WHERE
+    clause built by _build_sql_filter_conditions(). The hints are a superset
+    of the rows the SQL filters select - they only skip files that cannot
+    contain matching rows.
+
+    Args:
+        filters: Dictionary of filter criteria (same format as _add_sql_filters())
+        include_archived: If False, archived partitions are skipped
+
+    Returns:
+        Partition filters dict for sql_query(partition_filters=...), or None if
+        nothing can be pruned
+    """
+    partition_filters = {}
+    filters = filters or {}
+
+    campaign_filter = filters.get('campaign_id')
+    if isinstance(campaign_filter, list):
+        partition_filters['campaign_id'] = [str(v) for v in campaign_filter]
+    elif campaign_filter is not None and not isinstance(campaign_filter, dict):
+        partition_filters['campaign_id'] = [str(campaign_filter)]
+
+    archived_values = None
+    archived_filter = filters.get('meta_is_archived')
+    if archived_filter is not None and not isinstance(archived_filter, dict):
+        values = archived_filter if isinstance(archived_filter, list) else [archived_filter]
+        archived_values = ['true' if str(v).lower() == 'true' else 'false' for v in values]
+    if not include_archived:
+        archived_values = [v for v in (archived_values or ['false']) if v == 'false']
+    if archived_values is not None:
+        partition_filters['meta_is_archived'] = archived_values
+
+    # Year partition is the campaign start year; end dates bound it from above
+    year_bounds = {'min': [], 'max': []}
+    for field, value in (('campaign_start_date', filters.get('campaign_start_date')),
+                         ('campaign_end_date', filters.get('campaign_end_date'))):
+        if value is None:
+            continue
+        try:
+            if isinstance(value, dict):
+                lower = value.get('min') if field == 'campaign_start_date' else None
+                upper = value.get('max')
+            else:
+                years = [int(str(v)[:4]) for v in (value if isinstance(value, list) else [value])]
+                if not years:
+                    continue
+                lower = min(years) if field == 'campaign_start_date' else None
+                upper = max(years)
+            if lower is not None:
+                year_bounds['min'].append(int(str(lower)[:4]))
+            if upper is not None:
+                year_bounds['max'].append(int(str(upper)[:4]))
+        except (TypeError, ValueError):
+            # Not a recognisable date - leave the year unpruned
+            continue
+
+    year_range = {}
+    if year_bounds['min']:
+        year_range['min'] = max(year_bounds['min'])
+    if year_bounds['max']:
+        year_range['max'] = min(year_bounds['max'])
+    if year_range:
+        partition_filters['year'] = year_range
+
+    return partition_filters or None
+
+
 def _column_is_numeric(self, field):
     """
     Determine whether a column's declared type is numeric (int/Decimal).
 
     Uses the canonical schema (storage/schema_columns.py) so filter values are
-    quoted based on the column's actual SQL type rather than guessed from the
+    bound based on the column's actual SQL type rather than guessed from the
     Python value's own shape - a varchar column holding a numeric-looking
-    string (e.g. campaign_workflow_status_id = "1") must still be quoted.
+    string (e.g. campaign_workflow_status_id = "1") must still get a string.
 
     Returns:
         True/False if the column is part of the canonical schema, or None if
         it isn't (e.g. workspace_id, stat_* computed aliases) - callers should
-        fall back to guessing from the value's shape in that case.
+        fall back to the value's own type in that case.
     """
     try:
         from mediaplanpy.storage.schema_columns import get_column_types
@@ -717,10 +1424,15 @@ def _column_is_numeric(self, field):
     return col_type in (int, Decimal)
 
 
-def _build_sql_filter_conditions(self, filters):
+def _build_sql_filter_conditions(self, filters, params, engine=None):
     """
     Convert filter dictionary to SQL WHERE conditions (v3.0).
 
+    Filter values are never written into the SQL text: each one is added to
+    params and referenced through a $name placeholder, so the engines bind
+    them as query parameters. Filters with the same shape (same fields and
+    operators, different values) therefore compile to identical SQL.
+
     Handles:
     - List values (IN operator)
     - Range filters {'min': x, 'max': y}
@@ -731,10 +1443,8 @@ def _build_sql_filter_conditions(self, filters):
       RE2 for DuckDB - both close to, but not identical to, Python's `re`)
     - Exact matches
     - Date field detection and conversion
-    - SQL injection prevention through proper escaping
-    - Scalar quoting based on the target column's declared type (falls back
-      to guessing from the value's shape for columns outside the canonical
-      schema)
+    - Parameter values typed from the target column's declared type (falls
+      back to the value's own type for columns outside the canonical schema)
 
     v3.0 Note:
         - Deprecated v2.0 fields (audience_*, location_type, locations) are no longer
@@ -743,6 +1453,9 @@ def _build_sql_filter_conditions(self, filters):
 
     Args:
         filters: Dictionary of field names and filter values
+        params: Dictionary the filter values are added to, keyed by placeholder name
+        engine: Engine the conditions run on ('duckdb' or 'database'); defaults
+                to the engine a default sql_query() call routes to
 
     Returns:
         String of SQL WHERE conditions joined with AND
@@ -754,6 +1467,7 @@ def _build_sql_filter_conditions(self, filters):
         return ""
 
     conditions = []
+    engine = engine or self._get_active_sql_engine()
 
     # Define date field patterns for smart detection
     date_field_patterns = [
@@ -771,93 +1485,47 @@ def _build_sql_filter_conditions(self, filters):
                 if not value:  # Empty list
                     continue
 
-                if is_date_field:
-                    # Date list - convert to proper date format
-                    escaped_values = []
-                    for v in value:
-                        escaped_values.append(f"'{self._escape_sql_value(str(v))}'")
-                    conditions.append(f"{field} IN ({', '.join(escaped_values)})")
-                else:
-                    # Regular list
-                    escaped_values = [f"'{self._escape_sql_value(str(v))}'" for v in value]
-                    conditions.append(f"{field} IN ({', '.join(escaped_values)})")
+                placeholders = [_bind_sql_param(params, self._filter_param_value(field, v, is_date_field))
+                                for v in value]
+                conditions.append(f"{field} IN ({', '.join(placeholders)})")
 
             elif isinstance(value, dict):
                 # Range filter {'min': x, 'max': y} or regex
                 if 'min' in value or 'max' in value:
                     range_conditions = []
-                    is_numeric_column = self._column_is_numeric(field)
 
                     if 'min' in value:
-                        min_val = self._escape_sql_value(str(value['min']))
-                        if is_date_field:
-                            range_conditions.append(f"{field} >= '{min_val}'")
-                        elif is_numeric_column is True:
-                            range_conditions.append(f"{field} >= {min_val}")
-                        elif is_numeric_column is False:
-                            range_conditions.append(f"{field} >= '{min_val}'")
-                        else:
-                            # Unknown column - fall back to guessing from value shape
-                            try:
-                                float(value['min'])
-                                range_conditions.append(f"{field} >= {min_val}")
-                            except (ValueError, TypeError):
-                                range_conditions.append(f"{field} >= '{min_val}'")
+                        min_param = _bind_sql_param(
+                            params, self._filter_param_value(field, value['min'], is_date_field))
+                        range_conditions.append(f"{field} >= {min_param}")
 
                     if 'max' in value:
-                        max_val = self._escape_sql_value(str(value['max']))
-                        if is_date_field:
-                            range_conditions.append(f"{field} <= '{max_val}'")
-                        elif is_numeric_column is True:
-                            range_conditions.append(f"{field} <= {max_val}")
-                        elif is_numeric_column is False:
-                            range_conditions.append(f"{field} <= '{max_val}'")
-                        else:
-                            # Unknown column - fall back to guessing from value shape
-                            try:
-                                float(value['max'])
-                                range_conditions.append(f"{field} <= {max_val}")
-                            except (ValueError, TypeError):
-                                range_conditions.append(f"{field} <= '{max_val}'")
-
-                    if range_conditions:
-                        conditions.append(f"({' AND '.join(range_conditions)})")
+                        max_param = _bind_sql_param(
+                            params, self._filter_param_value(field, value['max'], is_date_field))
+                        range_conditions.append(f"{field} <= {max_param}")
+
+                    conditions.append(f"({' AND '.join(range_conditions)})")
 
                 if 'regex' in value:
                     # Regex filter - use each engine's native boolean regex-match
                     # capability rather than emulating via SQL LIKE, which cannot
                     # express alternation/anchors/character classes at all.
-                    # _escape_sql_value() is NOT used here - its whitelist strips
-                    # regex metacharacters (|, ^, $, (), [], etc.), which is exactly
-                    # right for a literal value but destroys a regex pattern.
-                    escaped_pattern = self._escape_regex_literal(value['regex'])
-                    if self._get_active_sql_engine() == 'database':
+                    # The pattern is bound as a parameter, so regex metacharacters
+                    # and quotes reach the engine unchanged.
+                    pattern_param = _bind_sql_param(params, str(value['regex']))
+                    if engine == 'database':
                         # PostgreSQL: `~` is the boolean POSIX-regex match operator.
-                        conditions.append(f"{field} ~ '{escaped_pattern}'")
+                        conditions.append(f"{field} ~ {pattern_param}")
                     else:
                         # DuckDB: `~` silently misbehaves for strings (returns no
                         # match, no error) - the 2-arg form of regexp_matches() is
                         # DuckDB's boolean regex-match function (RE2 syntax).
-                        conditions.append(f"regexp_matches({field}, '{escaped_pattern}')")
+                        conditions.append(f"regexp_matches({field}, {pattern_param})")
 
             else:
                 # Exact match
-                escaped_value = self._escape_sql_value(str(value))
-                if is_date_field:
-                    conditions.append(f"{field} = '{escaped_value}'")
-                else:
-                    is_numeric_column = self._column_is_numeric(field)
-                    if is_numeric_column is True:
-                        conditions.append(f"{field} = {escaped_value}")
-                    elif is_numeric_column is False:
-                        conditions.append(f"{field} = '{escaped_value}'")
-                    else:
-                        # Unknown column - fall back to guessing from value shape
-                        try:
-                            float(value)
-                            conditions.append(f"{field} = {escaped_value}")
-                        except (ValueError, TypeError):
-                            conditions.append(f"{field} = '{escaped_value}'")
+                value_param = _bind_sql_param(params, self._filter_param_value(field, value, is_date_field))
+                conditions.append(f"{field} = {value_param}")
 
         except Exception as e:
             from mediaplanpy.exceptions import SQLQueryError
@@ -866,61 +1534,74 @@ def _build_sql_filter_conditions(self, filters):
     return ' AND '.join(conditions)
 
 
-def _escape_sql_value(self, value):
+def _filter_param_value(self, field, value, is_date_field=False):
     """
-    Escape SQL value to prevent injection attacks.
+    Convert a filter value to the query parameter bound for it.
+
+    The column's declared type (per the canonical schema) decides: values
+    for numeric columns are bound as numbers, values for other schema
+    columns - including numeric-looking strings for varchar columns and
+    dates, which both engines cast from ISO strings - as strings. For
+    columns outside the schema the value's own type is kept.
 
     Args:
-        value: String value to escape
+        field: Column the value is compared against
+        value: Filter value
+        is_date_field: True if the column holds dates
 
     Returns:
-        Escaped string safe for SQL
-    """
-    if value is None:
-        return 'NULL'
-
-    # Convert to string and escape single quotes
-    str_value = str(value)
-    # Escape single quotes by doubling them
-    escaped = str_value.replace("'", "''")
-    # Remove other potentially dangerous characters
-    # Keep alphanumeric, spaces, hyphens, underscores, periods, colons
-    import re
-    escaped = re.sub(r"[^\w\s\-\.:@]", "", escaped)
+        Parameter value to bind
 
-    return escaped
+    Raises:
+        ValueError: If a numeric column is filtered on a non-numeric value
+    """
+    if is_date_field or isinstance(value, bool):
+        return str(value)
+
+    is_numeric_column = self._column_is_numeric(field)
+    if is_numeric_column is True:
+        if isinstance(value, (int, float, Decimal)):
+            return value
+        text = str(value).strip()
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                return Decimal(text)
+            except InvalidOperation:
+                raise ValueError(f"'{value}' is not a number")
+    if is_numeric_column is None and isinstance(value, (int, float, Decimal)):
+        return value
+    return str(value)
 
 
-def _escape_regex_literal(self, pattern):
+def _bind_sql_param(params: Dict[str, Any], value: Any) -> str:
     """
-    Escape a regex pattern for safe embedding in a single-quoted SQL string
-    literal, preserving regex syntax.
-
-    Unlike _escape_sql_value(), which strips characters like |, ^, $, (), []
-    that are meaningless for a plain literal value but essential to a regex
-    pattern, this only doubles single quotes - the standard, sufficient
-    escaping for a value placed inside a quoted SQL string literal.
+    Add a value to a query's parameters under a fresh name.
 
     Args:
-        pattern: Regex pattern string to escape
+        params: Parameters of the query being built
+        value: Value to bind
 
     Returns:
-        Escaped string safe to embed inside a single-quoted SQL literal
+        The $name placeholder that references the value
     """
-    return str(pattern).replace("'", "''")
+    index = len(params)
+    while f"filter_{index}" in params:
+        index += 1
+    name = f"filter_{index}"
+    params[name] = value
+    return f"${name}"
 
 
 def _get_active_sql_engine(self):
     """
-    Determine which engine a default ("auto") sql_query() call will route to,
-    so filter conditions that need engine-specific SQL (e.g. regex matching,
-    which has no syntax shared identically by DuckDB and PostgreSQL) can be
-    chosen at filter-build time, before sql_query() itself decides the engine.
+    Determine which engine queries are routed to by default, for callers that
+    build engine-specific SQL (e.g. regex matching, which has no syntax shared
+    identically by DuckDB and PostgreSQL) without a routing decision.
 
-    Mirrors _should_route_to_database()'s "auto" branch. Valid because
-    list_campaigns()/list_mediaplans()/list_lineitems() - the only callers of
-    _build_sql_filter_conditions() - always call sql_query() with the default
-    engine="auto" and never override it.
+    The list_* methods route their query first (see QueryRouter) and pass the
+    chosen engine to _build_sql_filter_conditions() instead.
 
     Returns:
         'database' if the workspace's database is enabled, else 'duckdb'
@@ -932,45 +1613,389 @@ def _get_active_sql_engine(self):
     return 'database' if db_config.get('enabled', False) else 'duckdb'
 
 
-def sql_query(self,
-              query: str,
-              engine: str = "auto",
-              return_dataframe: bool = True,
-              limit: Optional[int] = None) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+def _resolve_result_format(result_format: Optional[str], return_dataframe: bool) -> str:
+    """
+    Determine the result format of a query from result_format and return_dataframe.
+
+    Args:
+        result_format: One of RESULT_FORMATS, or None to follow return_dataframe
+        return_dataframe: Legacy flag ("pandas" if True, "records" if False)
+
+    Returns:
+        The result format to produce.
+
+    Raises:
+        SQLQueryError: If result_format is not a supported format.
+    """
+    if result_format is None:
+        return "pandas" if return_dataframe else "records"
+    if result_format not in RESULT_FORMATS:
+        raise SQLQueryError(
+            f"Invalid result_format: {result_format!r}. Must be one of {', '.join(RESULT_FORMATS)}"
+        )
+    return result_format
+
+
+def _format_result(result, result_format: str) -> Any:
+    """
+    Convert a query result to the requested format.
+
+    Arrow tables are handed to Polars without copying; pandas DataFrames are
+    only converted when a different format was requested.
+
+    Args:
+        result: Query result as a pandas DataFrame or pyarrow Table
+        result_format: One of RESULT_FORMATS
+
+    Returns:
+        DataFrame, pyarrow Table, Polars DataFrame or list of dictionaries.
+    """
+    import pyarrow as pa
+
+    if isinstance(result, pd.DataFrame):
+        if result_format == "pandas":
+            return result
+        if result_format == "records":
+            return result.to_dict(orient='records')
+        result = pa.Table.from_pandas(result, preserve_index=False)
+
+    if result_format == "arrow":
+        return result
+    if result_format == "polars":
+        try:
+            import polars as pl
+        except ImportError:
+            raise SQLQueryError(
+                "Polars is required for result_format='polars'. "
+                "Install it with: pip install polars"
+            )
+        return pl.from_arrow(result)
+
+    result_df = result.to_pandas()
+    return result_df if result_format == "pandas" else result_df.to_dict(orient='records')
+
+
+def _empty_result(result_format: str) -> Any:
+    """
+    Get an empty query result in the requested format.
+
+    Args:
+        result_format: One of RESULT_FORMATS
+
+    Returns:
+        Empty DataFrame, pyarrow Table, Polars DataFrame or list.
+    """
+    if result_format == "records":
+        return []
+    return _format_result(pd.DataFrame(), result_format)
+
+
+def _fetch_duckdb_result(result, fetch_arrow: bool) -> Any:
+    """
+    Fetch an executed DuckDB result as a pyarrow Table or pandas DataFrame.
+
+    Args:
+        result: DuckDB connection or relation holding the executed query
+        fetch_arrow: Whether to fetch Arrow instead of pandas
+
+    Returns:
+        pyarrow Table if fetch_arrow, otherwise pandas DataFrame.
+    """
+    if not fetch_arrow:
+        return result.df()
+    if hasattr(result, "to_arrow_table"):
+        # to_arrow_table() replaces fetch_arrow_table() in newer DuckDB releases
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()
+
+
+def _execute_duckdb(conn, query: str, params: Optional[Dict[str, Any]], fetch_arrow: bool,
+                    scan_info: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Execute a resolved query on a DuckDB session and fetch its result.
+
+    When the query is being profiled, execution and fetching are timed as
+    separate stages and the query's EXPLAIN ANALYZE output is added to the
+    profile.
+
+    Args:
+        conn: DuckDB session
+        query: Executable query
+        params: Optional values for $name placeholders
+        fetch_arrow: True to fetch a pyarrow Table, False for a pandas DataFrame
+        scan_info: Optional dictionary to store the number of bytes the query
+                   read under "bytes_scanned"
+
+    Returns:
+        The query result.
+    """
+    with profile_stage("execute"):
+        duckdb_result = conn.execute(query, params or None)
+    with profile_stage("fetch"):
+        result = _fetch_duckdb_result(duckdb_result, fetch_arrow)
+
+    if scan_info is not None:
+        scan_info["bytes_scanned"] = _duckdb_bytes_read(conn)
+
+    profile = current_profile()
+    if profile is not None:
+        with profile_stage("explain_analyze"):
+            try:
+                rows = conn.execute(f"EXPLAIN ANALYZE {query}", params or None).fetchall()
+                profile.explain = "\n".join(str(row[-1]) for row in rows)
+            except Exception as e:
+                logger.debug(f"EXPLAIN ANALYZE failed: {e}")
+                profile.explain = f"EXPLAIN ANALYZE failed: {e}"
+
+    return result
+
+
+def _scan_metrics_enabled(self) -> bool:
+    """Whether DuckDB queries report the bytes they read (``query.scan_metrics``)."""
+    return bool(self.get_resolved_config().get('query', {}).get('scan_metrics', False))
+
+
+def _duckdb_bytes_read(conn) -> Optional[int]:
+    """
+    Get the number of bytes the last query of a DuckDB session read.
+
+    Args:
+        conn: DuckDB session created by a DuckDBSessionPool with scan_metrics
+
+    Returns:
+        Bytes read, or None if the DuckDB release does not report them.
+    """
+    try:
+        import json
+        return json.loads(conn.get_profiling_information(format="json")).get("total_bytes_read")
+    except Exception:
+        return None
+
+
+def _convert_profiled_result(result, result_format: str, cache_hit: bool = False) -> Any:
+    """
+    Convert a query result with _format_result(), recording the conversion in the current profile.
+
+    Args:
+        result: Query result as a pandas DataFrame or pyarrow Table
+        result_format: One of RESULT_FORMATS
+        cache_hit: Whether the result was served from the result cache
+
+    Returns:
+        The result in the requested format.
+    """
+    with profile_stage("convert"):
+        formatted = _format_result(result, result_format)
+
+    profile = current_profile()
+    if profile is not None:
+        profile.cache_hit = profile.cache_hit or cache_hit
+        profile.rows = len(formatted)
+    return formatted
+
+
+def sql_query(self,
+              query: str,
+              engine: str = "auto",
+              return_dataframe: bool = True,
+              limit: Optional[int] = None,
+              partition_filters: Optional[Dict[str, Any]] = None,
+              use_cache: bool = True,
+              result_format: Optional[str] = None,
+              params: Optional[Dict[str, Any]] = None,
+              profile: Optional[bool] = None) -> Any:
+    """
+    Execute SQL query against workspace data with intelligent routing.
+
+    Enhanced with intelligent routing (see get_query_router()):
+    - query.routing "database" (default): queries with database enabled → PostgreSQL
+    - query.routing "adaptive": {pattern} lookups of individual plans → DuckDB,
+      other queries → the engine measured to be faster for the query's shape
+    - Database disabled or unreachable → DuckDB + Parquet (existing fast path)
+
+    Use {pattern} syntax to specify which parquet files to query:
+    - {*} queries all parquet files in the mediaplans directory
+    - {*abc*} queries files containing 'abc' in their name
+    - {abc} queries the specific file abc.parquet
+
+    Examples:
+        # Query all data (auto-routes to database if enabled)
+        workspace.sql_query("SELECT DISTINCT campaign_id FROM {*}")
+
+        # Force database engine
+        workspace.sql_query("SELECT * FROM {*}", engine="database")
+
+        # Force DuckDB engine
+        workspace.sql_query("SELECT * FROM {*}", engine="duckdb")
+
+        # Pattern queries (always use DuckDB)
+        workspace.sql_query("SELECT SUM(cost_total) FROM {campaign_*}")
+
+        # Bound parameters
+        workspace.sql_query("SELECT * FROM {*} WHERE campaign_id = $campaign",
+                            params={"campaign": "CAM001"})
+
+    Args:
+        query: SQL query string with {pattern} placeholders for file patterns.
+               Only SELECT operations are allowed.
+        engine: Query engine ("auto", "database", "duckdb"). Default "auto".
+        return_dataframe: If True, return pandas DataFrame; if False, return list of dicts.
+        limit: Optional maximum number of rows to return.
+        partition_filters: Optional partition pruning hints for workspaces using the
+                           "partitioned" Parquet layout (see _build_partition_filters()).
+                           Parquet files in partitions that cannot match are skipped;
+                           the hints never filter rows themselves, so the query must
+                           still contain the corresponding WHERE conditions.
+        use_cache: If True (default), DuckDB results are served from and stored in the
+                   workspace query result cache. Cached results are only reused while
+                   the Parquet files the query reads are unchanged.
+        result_format: Optional result format, overriding return_dataframe:
+                       "pandas" (DataFrame), "arrow" (pyarrow Table),
+                       "polars" (Polars DataFrame, requires polars) or
+                       "records" (list of dicts). With DuckDB, "arrow" and
+                       "polars" are built from DuckDB's Arrow result without
+                       a pandas round trip.
+        params: Optional values for $name placeholders in the query. Values are
+                bound by the engine rather than written into the SQL text, so
+                they need no escaping and queries that differ only in their
+                values share the same statement. Names starting with
+                "mediaplanpy_" are reserved.
+        profile: If True, time each stage of the query (validation, routing,
+                 file listing, session/S3 setup, rewrite, execution including
+                 DuckDB's EXPLAIN ANALYZE, conversion). The breakdown is logged
+                 at INFO level and returned by get_last_query_profile(). None
+                 (default) follows query.profile in the workspace config.
+
+    Returns:
+        Query results in the requested format (DataFrame or list of dictionaries
+        by default).
+
+    Raises:
+        WorkspaceError: If workspace is not loaded.
+        SQLQueryError: If query is invalid, unsafe, or execution fails.
+    """
+    # Ensure workspace is loaded
+    if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
+        raise WorkspaceError("No workspace configuration loaded. Call load() first.")
+
+    with profiled_query(self, query, profile):
+        with profile_stage("validate"):
+            # Validate SQL query safety (existing logic)
+            _validate_sql_safety(query)
+
+            result_format = _resolve_result_format(result_format, return_dataframe)
+
+            _validate_query_params(params)
+
+        # Intelligent routing decision
+        with profile_stage("route"):
+            decision = self.get_query_router().route(query, engine)
+        return self._run_routed_query(decision, query, limit=limit, partition_filters=partition_filters,
+                                      use_cache=use_cache, result_format=result_format, params=params)
+
+
+def _run_routed_query(self, decision: RoutingDecision, query: str,
+                      limit: Optional[int] = None,
+                      partition_filters: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True,
+                      result_format: str = "pandas",
+                      params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Execute a query on the engine chosen by the query router and record its cost.
+
+    The latency and row count are recorded for the decision's query shape,
+    both for routing and in the query statistics (with the bytes and files
+    scanned by DuckDB). A failed database query expires the cached database
+    health check, so the next routing decision checks the connection again.
+
+    Args:
+        decision: Routing decision for the query
+        query: SQL query string with {pattern} placeholders
+        limit: Optional maximum number of rows to return
+        partition_filters: Optional partition pruning hints (see sql_query())
+        use_cache: Whether DuckDB results may be served from the result cache
+        result_format: One of RESULT_FORMATS
+        params: Optional values for $name placeholders in the query
+
+    Returns:
+        Query results in the requested format.
+
+    Raises:
+        SQLQueryError: If execution fails.
+    """
+    router = self.get_query_router()
+    profile = current_profile()
+    if profile is not None:
+        profile.engine, profile.routing_reason = decision.engine, decision.reason
+
+    query_stats = self.get_query_stats_registry()
+    scan_info = {}
+    start = time.perf_counter()
+    try:
+        if decision.engine == 'database':
+            result = self._sql_query_postgres(query, limit=limit, result_format=result_format, params=params)
+        else:
+            result = self._sql_query_duckdb(query, limit=limit, partition_filters=partition_filters,
+                                            use_cache=use_cache, result_format=result_format, params=params,
+                                            scan_info=scan_info)
+    except SQLQueryError as e:
+        if decision.engine == 'database':
+            router.expire_health()
+        query_stats.record(decision.shape, decision.engine, time.perf_counter() - start, error=str(e))
+        raise
+
+    seconds = time.perf_counter() - start
+    router.record(decision, seconds, len(result))
+    query_stats.record(decision.shape, decision.engine, seconds, rows=len(result), **scan_info)
+    if profile is not None:
+        profile.rows = len(result)
+    return result
+
+
+def sql_query_iter(self,
+                   query: str,
+                   engine: str = "auto",
+                   batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+                   limit: Optional[int] = None,
+                   partition_filters: Optional[Dict[str, Any]] = None,
+                   params: Optional[Dict[str, Any]] = None) -> Iterator["pyarrow.RecordBatch"]:
     """
-    Execute SQL query against workspace data with intelligent routing.
+    Execute SQL query against workspace data and stream the results.
 
-    Enhanced with intelligent routing:
-    - {*} queries with database enabled → PostgreSQL (server-side processing)
-    - All other queries → DuckDB + Parquet (existing fast path)
+    Streaming counterpart of sql_query() for exports and ETL jobs: instead of
+    materializing the full result, rows are yielded as pyarrow RecordBatches
+    of at most batch_size rows. DuckDB hands batches over straight from its
+    result stream; on PostgreSQL a server-side (named) cursor is used so rows
+    are fetched from the server one batch at a time. Routing and {pattern}
+    placeholders work as in sql_query(). Streamed results are never cached.
 
-    Use {pattern} syntax to specify which parquet files to query:
-    - {*} queries all parquet files in the mediaplans directory
-    - {*abc*} queries files containing 'abc' in their name
-    - {abc} queries the specific file abc.parquet
+    The query is validated and routed when this method is called; execution
+    starts on the first iteration. The DuckDB session or database connection
+    is held until the iterator is exhausted, so call close() on it when
+    stopping early.
 
     Examples:
-        # Query all data (auto-routes to database if enabled)
-        workspace.sql_query("SELECT DISTINCT campaign_id FROM {*}")
-
-        # Force database engine
-        workspace.sql_query("SELECT * FROM {*}", engine="database")
-
-        # Force DuckDB engine
-        workspace.sql_query("SELECT * FROM {*}", engine="duckdb")
+        # Write every line item to a Parquet file in constant memory
+        import pyarrow.parquet as pq
 
-        # Pattern queries (always use DuckDB)
-        workspace.sql_query("SELECT SUM(cost_total) FROM {campaign_*}")
+        batches = workspace.sql_query_iter("SELECT * FROM {*}", batch_size=50000)
+        writer = None
+        for batch in batches:
+            writer = writer or pq.ParquetWriter("lineitems.parquet", batch.schema)
+            writer.write_batch(batch)
 
     Args:
         query: SQL query string with {pattern} placeholders for file patterns.
                Only SELECT operations are allowed.
         engine: Query engine ("auto", "database", "duckdb"). Default "auto".
-        return_dataframe: If True, return pandas DataFrame; if False, return list of dicts.
+        batch_size: Maximum number of rows per record batch.
         limit: Optional maximum number of rows to return.
+        partition_filters: Optional partition pruning hints (see sql_query()).
+        params: Optional values for $name placeholders in the query (see sql_query()).
 
     Returns:
-        Query results as DataFrame or list of dictionaries.
+        Iterator of pyarrow.RecordBatch objects.
 
     Raises:
         WorkspaceError: If workspace is not loaded.
@@ -978,26 +2003,30 @@ def sql_query(self,
     """
     # Ensure workspace is loaded
     if not self.is_loaded:
+        from mediaplanpy.exceptions import WorkspaceError
         raise WorkspaceError("No workspace configuration loaded. Call load() first.")
 
-    # Validate SQL query safety (existing logic)
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise SQLQueryError(f"batch_size must be a positive integer, got {batch_size!r}")
+
     _validate_sql_safety(query)
+    _validate_query_params(params)
 
-    # Intelligent routing decision
-    if self._should_route_to_database(query, engine):
-        return self._sql_query_postgres(query, return_dataframe, limit)
+    if self.get_query_router().route(query, engine).engine == 'database':
+        return self._sql_query_iter_postgres(query, batch_size, limit, params)
     else:
-        return self._sql_query_duckdb(query, return_dataframe, limit)
+        return self._sql_query_iter_duckdb(query, batch_size, limit, partition_filters, params)
 
 
 def _should_route_to_database(self, query: str, engine_override: str) -> bool:
     """
-    Determine whether to route query to database or DuckDB using EXISTING methods.
+    Determine whether to route query to database or DuckDB.
 
-    Routing Logic:
-    - engine="database" → Always database (with validation using existing PostgreSQLBackend)
+    Routing Logic (see QueryRouter):
+    - engine="database" → Always database (connection health cached for database.health_check_ttl)
     - engine="duckdb" → Always DuckDB
-    - engine="auto" → Database if enabled (performance optimization for all queries)
+    - engine="auto" → Database if enabled (query.routing "database"), or the
+      engine measured to be faster for the query's shape (query.routing "adaptive")
 
     Args:
         query: SQL query string
@@ -1009,83 +2038,159 @@ def _should_route_to_database(self, query: str, engine_override: str) -> bool:
     Raises:
         SQLQueryError: If database requested but not available
     """
-    if engine_override == "database":
-        # Explicit database request - use existing methods for validation
-        db_config = self.get_database_config()  # Existing WorkspaceManager method
+    return self.get_query_router().route(query, engine_override).engine == 'database'
 
-        if not db_config.get('enabled', False):
-            raise SQLQueryError(
-                "Database engine requested but database is not enabled in workspace configuration"
-            )
 
-        # Use existing PostgreSQLBackend for validation
-        try:
-            from mediaplanpy.storage.database import PostgreSQLBackend
-            backend = PostgreSQLBackend(self.get_resolved_config())  # Existing validation in constructor
-
-            # Use existing test_connection method
-            if not backend.test_connection():
-                raise SQLQueryError(
-                    "Database engine requested but database connection failed"
-                )
-        except Exception as e:
-            if isinstance(e, SQLQueryError):
-                raise  # Re-raise our custom errors
-            else:
-                raise SQLQueryError(f"Database engine requested but unavailable: {e}")
+def _sql_query_duckdb(self, query: str, return_dataframe: bool = True,
+                      limit: Optional[int] = None,
+                      partition_filters: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True,
+                      result_format: Optional[str] = None,
+                      params: Optional[Dict[str, Any]] = None,
+                      scan_info: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Execute query using DuckDB against Parquet files (existing logic).
 
-        return True
+    This is the existing sql_query implementation renamed for routing.
+    Results are cached per workspace, keyed on the query, its parameters and
+    the version of every file it reads, so repeated queries over unchanged
+    files skip DuckDB.
+    The "arrow" and "polars" formats fetch DuckDB's Arrow result directly
+    instead of going through pandas.
+    If scan_info is given, the number of Parquet files read and, with
+    query.scan_metrics, the bytes DuckDB scanned are stored in it
+    ("files_touched", "bytes_scanned").
+    """
+    # This is the existing implementation from the original sql_query method
+    # (all the DuckDB + S3 logic that was already working)
 
-    elif engine_override == "duckdb":
-        # Explicit DuckDB request
-        return False
+    result_format = _resolve_result_format(result_format, return_dataframe)
+    fetch_arrow = result_format in ("arrow", "polars")
+
+    # Collect file versions while resolving patterns when results can be cached
+    cache = self.get_query_result_cache() if use_cache else None
+    file_versions = {} if cache is not None and cache.enabled else None
+
+    with profile_stage("resolve_patterns"):
+        resolved_query = _resolve_duckdb_query(self, query, limit, partition_filters, file_versions)
+    if resolved_query is None:
+        # No parquet files found (empty workspace): return empty results gracefully
+        return _empty_result(result_format)
+
+    if scan_info is None:
+        scan_info = {}
+    scan_info["files_touched"] = 0
+
+    cache_key = None
+    if file_versions is not None:
+        with profile_stage("cache_lookup"):
+            cache_key = cache.make_key(query, file_versions, limit,
+                                       result_type="arrow" if fetch_arrow else "pandas",
+                                       params=params)
+            cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            logger.debug(f"Query result served from cache ({len(cached_result)} rows)")
+            if _scan_metrics_enabled(self):
+                scan_info["bytes_scanned"] = 0
+            return _convert_profiled_result(cached_result, result_format, cache_hit=True)
+
+    # Parquet files the query reads (per-plan and catalog files)
+    scan_info["files_touched"] = len(set(re.findall(r"'([^']+\.parquet)'", resolved_query)))
 
-    elif engine_override == "auto":
-        # Auto routing: use database whenever enabled for optimal performance
-        db_config = self.get_database_config()  # Existing method
+    try:
+        # Get storage backend info for logging
+        storage_type = type(self.get_storage_backend()).__name__
 
-        # Route to database if enabled, regardless of query pattern
-        if db_config.get('enabled', False):
-            return True
-        else:
-            return False
+        logger.debug(f"Executing SQL query with DuckDB using {storage_type}")
+        logger.debug(f"Resolved query: {resolved_query}")
 
-    else:
-        raise SQLQueryError(
-            f"Invalid engine parameter: {engine_override}. "
-            "Must be 'auto', 'database', or 'duckdb'"
-        )
+        # Borrow a pre-configured session (S3 access is set up once per pool)
+        with ExitStack() as stack:
+            with profile_stage("session_setup"):
+                conn = stack.enter_context(self.get_duckdb_session_pool().session())
+            result = _execute_duckdb(conn, resolved_query, params, fetch_arrow,
+                                     scan_info if _scan_metrics_enabled(self) else None)
 
+        logger.debug(f"DuckDB query executed successfully, returned {len(result)} rows")
 
-def _sql_query_duckdb(self, query: str, return_dataframe: bool = True,
-                      limit: Optional[int] = None) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        if cache_key is not None:
+            with profile_stage("cache_store"):
+                cache.put(cache_key, result)
+
+        # Return in requested format
+        return _convert_profiled_result(result, result_format)
+
+    except Exception as e:
+        raise _duckdb_query_error(e)
+
+
+def _sql_query_iter_duckdb(self, query: str, batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+                           limit: Optional[int] = None,
+                           partition_filters: Optional[Dict[str, Any]] = None,
+                           params: Optional[Dict[str, Any]] = None) -> Iterator["pyarrow.RecordBatch"]:
     """
-    Execute query using DuckDB against Parquet files (existing logic).
+    Stream a query's results from DuckDB as Arrow record batches.
 
-    This is the existing sql_query implementation renamed for routing.
+    Generator behind sql_query_iter(). The borrowed DuckDB session stays
+    checked out while batches are being consumed; an iterator that is
+    closed early discards its session instead of returning it to the pool.
     """
-    # This is the existing implementation from the original sql_query method
-    # (all the DuckDB + S3 logic that was already working)
+    resolved_query = _resolve_duckdb_query(self, query, limit, partition_filters)
+    if resolved_query is None:
+        return
 
-    try:
-        import duckdb
-    except ImportError:
-        raise SQLQueryError(
-            "DuckDB is required for SQL query functionality. "
-            "Install it with: pip install duckdb"
-        )
+    logger.debug(f"Streaming SQL query with DuckDB: {resolved_query}")
 
+    with self.get_duckdb_session_pool().session() as conn:
+        try:
+            result = conn.execute(resolved_query, params or None)
+            # to_arrow_reader() replaces fetch_record_batch() in newer DuckDB releases
+            if hasattr(result, "to_arrow_reader"):
+                reader = result.to_arrow_reader(batch_size)
+            else:
+                reader = result.fetch_record_batch(batch_size)
+        except Exception as e:
+            raise _duckdb_query_error(e)
+
+        rows = 0
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except Exception as e:
+                raise _duckdb_query_error(e)
+            rows += batch.num_rows
+            yield batch
+
+    logger.debug(f"DuckDB query streamed successfully, returned {rows} rows")
+
+
+def _resolve_duckdb_query(self, query: str, limit: Optional[int] = None,
+                          partition_filters: Optional[Dict[str, Any]] = None,
+                          file_versions: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Resolve {pattern} placeholders and the row limit for a DuckDB query.
+
+    Args:
+        query: SQL query string with {pattern} placeholders
+        limit: Optional row limit
+        partition_filters: Optional partition pruning hints
+        file_versions: Optional dictionary filled with the version of every file read
+
+    Returns:
+        The executable query, or None if the workspace has no Parquet files to query.
+
+    Raises:
+        SQLQueryError: If the patterns cannot be resolved.
+    """
     # Resolve file patterns in the query (handles S3 URLs)
     try:
-        resolved_query = _resolve_sql_file_patterns(self, query)
+        resolved_query = _resolve_sql_file_patterns(self, query, partition_filters, file_versions)
     except SQLQueryError as e:
-        # If no parquet files found (empty workspace), return empty results gracefully
         if "No parquet files found" in str(e):
             logger.debug(f"No parquet files found for query - returning empty result: {e}")
-            if return_dataframe:
-                return pd.DataFrame()
-            else:
-                return []
+            return None
         # Re-raise other SQLQueryErrors
         raise
 
@@ -1095,76 +2200,41 @@ def _sql_query_duckdb(self, query: str, return_dataframe: bool = True,
         if not re.search(r'\bLIMIT\s+\d+', resolved_query, re.IGNORECASE):
             resolved_query = f"SELECT * FROM ({resolved_query}) LIMIT {limit}"
 
-    try:
-        # Get storage backend info for logging
-        storage_backend = self.get_storage_backend()
-        storage_type = type(storage_backend).__name__
-
-        logger.debug(f"Executing SQL query with DuckDB using {storage_type}")
-        logger.debug(f"Resolved query: {resolved_query}")
-
-        # Create DuckDB connection
-        conn = duckdb.connect()
-
-        # Configure S3 access if using S3 storage
-        if storage_type == "S3StorageBackend":
-            try:
-                # Install and load httpfs extension for S3 support
-                conn.execute("INSTALL httpfs;")
-                conn.execute("LOAD httpfs;")
-
-                # Configure S3 settings
-                conn.execute(f"SET s3_region='{storage_backend.region}';")
-
-                if storage_backend.endpoint_url:
-                    conn.execute(f"SET s3_endpoint='{storage_backend.endpoint_url}';")
-
-                conn.execute(f"SET s3_use_ssl={'true' if storage_backend.use_ssl else 'false'};")
-
-                # Configure credentials
-                _configure_duckdb_credentials(conn, storage_backend)
-
-                logger.debug("DuckDB configured for S3 access")
-
-            except Exception as e:
-                conn.close()
-                raise SQLQueryError(f"Failed to configure DuckDB for S3 access: {e}")
+    return resolved_query
 
-        # Execute the query
-        result_df = conn.execute(resolved_query).df()
-        conn.close()
 
-        logger.debug(f"DuckDB query executed successfully, returned {len(result_df)} rows")
+def _duckdb_query_error(e: Exception) -> SQLQueryError:
+    """
+    Translate a DuckDB execution error into an SQLQueryError with a helpful message.
 
-        # Return in requested format
-        if return_dataframe:
-            return result_df
-        else:
-            return result_df.to_dict(orient='records')
+    Args:
+        e: The exception raised while executing the query
 
-    except Exception as e:
-        # Provide helpful error messages for common S3 issues
-        error_msg = str(e).lower()
+    Returns:
+        SQLQueryError to raise in its place
+    """
+    # Provide helpful error messages for common S3 issues
+    error_msg = str(e).lower()
 
-        if "s3" in error_msg and ("credentials" in error_msg or "access" in error_msg):
-            raise SQLQueryError(
-                f"S3 access failed - check AWS credentials and bucket permissions. "
-                f"DuckDB needs the same AWS credentials as your S3StorageBackend. "
-                f"Original error: {str(e)}"
-            )
-        elif "s3" in error_msg and "region" in error_msg:
-            raise SQLQueryError(
-                f"S3 region configuration error. Verify bucket region matches workspace config. "
-                f"Original error: {str(e)}"
-            )
-        elif "httpfs" in error_msg or "extension" in error_msg:
-            raise SQLQueryError(
-                f"DuckDB S3 extension error. Make sure DuckDB can install/load the httpfs extension. "
-                f"Original error: {str(e)}"
-            )
-        else:
-            # Wrap other DuckDB errors in our custom exception
-            raise SQLQueryError(f"DuckDB query execution failed: {str(e)}")
+    if "s3" in error_msg and ("credentials" in error_msg or "access" in error_msg):
+        return SQLQueryError(
+            f"S3 access failed - check AWS credentials and bucket permissions. "
+            f"DuckDB needs the same AWS credentials as your S3StorageBackend. "
+            f"Original error: {str(e)}"
+        )
+    elif "s3" in error_msg and "region" in error_msg:
+        return SQLQueryError(
+            f"S3 region configuration error. Verify bucket region matches workspace config. "
+            f"Original error: {str(e)}"
+        )
+    elif "httpfs" in error_msg or "extension" in error_msg:
+        return SQLQueryError(
+            f"DuckDB S3 extension error. Make sure DuckDB can install/load the httpfs extension. "
+            f"Original error: {str(e)}"
+        )
+    else:
+        # Wrap other DuckDB errors in our custom exception
+        return SQLQueryError(f"DuckDB query execution failed: {str(e)}")
 
 
 def _is_workspace_isolation_error(e: Exception) -> bool:
@@ -1195,116 +2265,253 @@ def _is_workspace_isolation_error(e: Exception) -> bool:
 
 
 def _sql_query_postgres(self, query: str, return_dataframe: bool = True,
-                        limit: Optional[int] = None) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+                        limit: Optional[int] = None,
+                        result_format: Optional[str] = None,
+                        params: Optional[Dict[str, Any]] = None) -> Any:
     """
     Execute query against PostgreSQL database with workspace isolation.
 
     Enhanced to support both {*} and {plan_id} patterns with automatic
-    plan_id filtering for optimal performance.
+    plan_id filtering for optimal performance. Rows are fetched through a
+    server-side cursor in chunks of database.fetch_size rows.
 
     Args:
         query: SQL query with {*} or {plan_id} pattern
-        return_dataframe: Return format preference
+        return_dataframe: Return format preference (used when result_format is None)
         limit: Optional row limit
+        result_format: Optional result format (see sql_query())
+        params: Optional values for $name placeholders in the query
 
     Returns:
-        Query results as DataFrame or list of dictionaries
+        Query results in the requested format
 
     Raises:
         SQLQueryError: If database execution fails
     """
     try:
-        from mediaplanpy.storage.database import PostgreSQLBackend
         import pandas as pd
     except ImportError as e:
         raise SQLQueryError(f"Required dependencies not available: {e}")
 
+    result_format = _resolve_result_format(result_format, return_dataframe)
+    table_name = self.get_database_config().get('table_name', 'media_plans')
+
     try:
-        # Get database configuration and table name
-        database_config = self.get_database_config()
-        table_name = database_config.get('table_name', 'media_plans')
+        with profile_stage("rewrite"):
+            db_backend, resolved_query, bound_params = _resolve_postgres_query(self, query, limit, params)
 
-        # Get current workspace ID for isolation
-        workspace_config = self.get_resolved_config()
-        workspace_id = workspace_config.get('workspace_id')
+        logger.debug(f"Executing PostgreSQL query: {resolved_query}")
 
-        if not workspace_id:
-            raise SQLQueryError("No workspace_id found in configuration - required for database queries")
+        # Fetch through a server-side cursor and assemble the result chunk by chunk,
+        # so the full result set is never buffered as raw rows on the client
+        chunks = []
+        with profile_stage("execute"), \
+                closing(db_backend.iter_query_chunks(resolved_query, params=bound_params)) as chunk_iter:
+            for columns, records in chunk_iter:
+                if result_format == "pandas":
+                    chunks.append(pd.DataFrame.from_records(records, columns=columns, coerce_float=True))
+                elif result_format in ("arrow", "polars"):
+                    chunks.append(_records_to_arrow(columns, records))
+                else:
+                    chunks.extend(dict(zip(columns, row)) for row in records)
+
+        if result_format == "records":
+            logger.debug(f"PostgreSQL query executed successfully, returned {len(chunks)} rows")
+            return chunks
+
+        with profile_stage("convert"):
+            if result_format == "pandas":
+                result = chunks[0]
+                if len(chunks) > 1:
+                    # Chunks where a column was entirely NULL come back as object dtype
+                    result = pd.concat(chunks, ignore_index=True).infer_objects()
+            else:
+                import pyarrow as pa
+                result = pa.concat_tables(chunks, promote_options="permissive")
 
-        # Create database backend
-        db_backend = PostgreSQLBackend(workspace_config)
+        logger.debug(f"PostgreSQL query executed successfully, returned {len(result)} rows")
+        return _convert_profiled_result(result, result_format)
 
-        # Resolve patterns: {*} → table_name, {plan_id} → table_name + WHERE filter
-        resolved_query = self._resolve_database_patterns(query, table_name)
+    except Exception as e:
+        raise _postgres_query_error(e, table_name)
 
-        # Add workspace isolation (CRITICAL for multi-tenant safety)
-        resolved_query = self._add_workspace_filter(resolved_query, workspace_id)
 
-        # Apply limit if specified
-        if limit and not re.search(r'\bLIMIT\b', resolved_query, re.IGNORECASE):
-            resolved_query = f"SELECT * FROM ({resolved_query}) AS limited LIMIT {limit}"
+def _sql_query_iter_postgres(self, query: str, batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+                             limit: Optional[int] = None,
+                             params: Optional[Dict[str, Any]] = None) -> Iterator["pyarrow.RecordBatch"]:
+    """
+    Stream a query's results from PostgreSQL as Arrow record batches.
 
-        logger.debug(f"Executing PostgreSQL query: {resolved_query}")
+    Generator behind sql_query_iter(). Rows are read through a server-side
+    (named) cursor, so only one batch is held in memory at a time. Column
+    types are inferred from each batch's values.
+    """
+    table_name = self.get_database_config().get('table_name', 'media_plans')
 
-        # Execute query using database backend
-        with db_backend.connect() as conn:
-            if return_dataframe:
-                result_df = pd.read_sql(resolved_query, conn)
-                logger.debug(f"PostgreSQL query executed successfully, returned {len(result_df)} rows")
-                return result_df
-            else:
-                # Return list of dicts
-                cursor = conn.cursor()
-                cursor.execute(resolved_query)
+    try:
+        db_backend, resolved_query, bound_params = _resolve_postgres_query(self, query, limit, params)
+    except Exception as e:
+        raise _postgres_query_error(e, table_name)
 
-                # Get column names
-                columns = [desc[0] for desc in cursor.description]
+    logger.debug(f"Streaming PostgreSQL query: {resolved_query}")
 
-                # Fetch all rows and convert to list of dicts
-                rows = cursor.fetchall()
-                result = [dict(zip(columns, row)) for row in rows]
+    rows = 0
+    with closing(db_backend.iter_query_chunks(resolved_query, batch_size, bound_params)) as chunk_iter:
+        while True:
+            try:
+                columns, records = next(chunk_iter)
+            except StopIteration:
+                break
+            except Exception as e:
+                raise _postgres_query_error(e, table_name)
+            if records:
+                rows += len(records)
+                yield from _records_to_arrow(columns, records).to_batches()
 
-                cursor.close()
-                logger.debug(f"PostgreSQL query executed successfully, returned {len(result)} rows")
-                return result
+    logger.debug(f"PostgreSQL query streamed successfully, returned {rows} rows")
 
-    except Exception as e:
-        # Provide specific error context for database issues
-        error_msg = str(e).lower()
 
-        if "connection" in error_msg or "connect" in error_msg:
-            raise SQLQueryError(
-                f"Database connection failed. Check database configuration and ensure "
-                f"PostgreSQL is running. Original error: {str(e)}"
-            )
-        elif "table" in error_msg and "does not exist" in error_msg:
-            raise SQLQueryError(
-                f"Database table '{table_name}' does not exist. "
-                f"Enable auto_create_table or create table manually. Original error: {str(e)}"
-            )
-        elif _is_workspace_isolation_error(e):
-            raise SQLQueryError(
-                f"Workspace isolation error - invalid workspace_id filter. "
-                f"Original error: {str(e)}"
-            )
-        else:
-            # Generic database error
-            raise SQLQueryError(f"PostgreSQL query execution failed: {str(e)}")
+def _records_to_arrow(columns: List[str], records: List[tuple]) -> "pyarrow.Table":
+    """
+    Build an Arrow table from database cursor rows.
+
+    Args:
+        columns: Column names from cursor.description
+        records: Row tuples from fetchall()/fetchmany()
+
+    Returns:
+        pyarrow Table with one column per name; types are inferred from the values.
+    """
+    import pyarrow as pa
+
+    return pa.table({name: pa.array([record[i] for record in records])
+                     for i, name in enumerate(columns)})
+
+
+def _resolve_postgres_query(self, query: str, limit: Optional[int] = None,
+                            params: Optional[Dict[str, Any]] = None):
+    """
+    Build the database backend and executable PostgreSQL query for a workspace query.
+
+    The workspace_id (and plan_id) isolation filters are bound as parameters
+    alongside the caller's, and $name placeholders are converted to
+    psycopg2's %(name)s style.
+
+    Args:
+        query: SQL query with {*} or {plan_id} pattern
+        limit: Optional row limit
+        params: Optional values for $name placeholders in the query
+
+    Returns:
+        Tuple of (PostgreSQLBackend, resolved query string, parameters to bind)
+
+    Raises:
+        SQLQueryError: If the workspace has no workspace_id
+    """
+    from mediaplanpy.storage.database import PostgreSQLBackend
+
+    # Get database configuration and table name
+    database_config = self.get_database_config()
+    table_name = database_config.get('table_name', 'media_plans')
+
+    # Get current workspace ID for isolation
+    workspace_config = self.get_resolved_config()
+    workspace_id = workspace_config.get('workspace_id')
+
+    if not workspace_id:
+        raise SQLQueryError("No workspace_id found in configuration - required for database queries")
+
+    # Create database backend
+    db_backend = PostgreSQLBackend(workspace_config)
+
+    bound_params = dict(params or {})
+
+    # Resolve patterns: {*} → table_name, {plan_id} → table_name + WHERE filter
+    resolved_query = self._resolve_database_patterns(query, table_name, bound_params)
+
+    # Add workspace isolation (CRITICAL for multi-tenant safety)
+    resolved_query = self._add_workspace_filter(resolved_query, workspace_id, bound_params)
+
+    # Apply limit if specified
+    if limit and not re.search(r'\bLIMIT\b', resolved_query, re.IGNORECASE):
+        resolved_query = f"SELECT * FROM ({resolved_query}) AS limited LIMIT {limit}"
+
+    return db_backend, _to_pyformat(resolved_query, bound_params), bound_params
+
+
+def _to_pyformat(query: str, params: Dict[str, Any]) -> str:
+    """
+    Convert $name placeholders to psycopg2's %(name)s parameter style.
+
+    Only references to keys of params outside string literals are converted,
+    so dollar-quoted strings and other uses of $ are left alone. Literal %
+    signs are doubled, as psycopg2 requires whenever parameters are passed.
+
+    Args:
+        query: SQL query with $name placeholders
+        params: Parameters that will be bound to the query
+
+    Returns:
+        Query in psycopg2 parameter style
+    """
+    def to_placeholder(match):
+        name = match.group(1)
+        return f"%({name})s" if name in params else match.group(0)
+
+    parts = re.split(r"('(?:[^']|'')*')", query.replace('%', '%%'))
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\$([A-Za-z_]\w*)', to_placeholder, parts[i])
+    return ''.join(parts)
+
+
+def _postgres_query_error(e: Exception, table_name: str) -> SQLQueryError:
+    """
+    Translate a PostgreSQL execution error into an SQLQueryError with a helpful message.
+
+    Args:
+        e: The exception raised while executing the query
+        table_name: Name of the media plans table
+
+    Returns:
+        SQLQueryError to raise in its place
+    """
+    # Provide specific error context for database issues
+    error_msg = str(e).lower()
+
+    if "connection" in error_msg or "connect" in error_msg:
+        return SQLQueryError(
+            f"Database connection failed. Check database configuration and ensure "
+            f"PostgreSQL is running. Original error: {str(e)}"
+        )
+    elif "table" in error_msg and "does not exist" in error_msg:
+        return SQLQueryError(
+            f"Database table '{table_name}' does not exist. "
+            f"Enable auto_create_table or create table manually. Original error: {str(e)}"
+        )
+    elif _is_workspace_isolation_error(e):
+        return SQLQueryError(
+            f"Workspace isolation error - invalid workspace_id filter. "
+            f"Original error: {str(e)}"
+        )
+    else:
+        # Generic database error
+        return SQLQueryError(f"PostgreSQL query execution failed: {str(e)}")
 
 
-def _resolve_database_patterns(self, query: str, table_name: str) -> str:
+def _resolve_database_patterns(self, query: str, table_name: str, params: Dict[str, Any]) -> str:
     """
     Resolve database query patterns for {*} and {plan_id} cases.
 
     Handles:
     - {*} → table_name (query all plans)
-    - {plan_id} → table_name + WHERE media_plan_id = 'plan_id' (query specific plan)
+    - {plan_id} → table_name + WHERE meta_id = $mediaplanpy_plan_id (query specific plan)
 
     Uses only the first pattern found if multiple exist.
 
     Args:
         query: SQL query with {pattern} placeholder
         table_name: Database table name to substitute
+        params: Query parameters; the plan_id is added to them
 
     Returns:
         Query with pattern resolved and plan_id filter added if applicable
@@ -1332,7 +2539,7 @@ def _resolve_database_patterns(self, query: str, table_name: str) -> str:
         else:
             # {plan_id} case: replace with table name and add plan_id filter
             resolved_query = query.replace(f'{{{pattern}}}', table_name)
-            resolved_query = self._add_plan_id_filter(resolved_query, pattern)
+            resolved_query = self._add_plan_id_filter(resolved_query, pattern, params)
             logger.debug(f"Resolved {{{{}}}} pattern to table with plan_id filter: {pattern}")
 
         return resolved_query
@@ -1343,7 +2550,7 @@ def _resolve_database_patterns(self, query: str, table_name: str) -> str:
         else:
             raise SQLQueryError(f"Failed to resolve database pattern: {str(e)}")
 
-def _add_plan_id_filter(self, query: str, plan_id: str) -> str:
+def _add_plan_id_filter(self, query: str, plan_id: str, params: Dict[str, Any]) -> str:
     """
     Add plan_id filter to SQL query using the same logic as workspace filter.
 
@@ -1353,6 +2560,7 @@ def _add_plan_id_filter(self, query: str, plan_id: str) -> str:
     Args:
         query: Original SQL query (may already contain WHERE clause)
         plan_id: Media plan identifier to filter by
+        params: Query parameters; plan_id is bound as $mediaplanpy_plan_id
 
     Returns:
         Query with plan_id filter added (combined with existing WHERE if present)
@@ -1363,9 +2571,9 @@ def _add_plan_id_filter(self, query: str, plan_id: str) -> str:
     if not plan_id:
         raise SQLQueryError("plan_id is required for plan-specific database queries")
 
-    # Escape single quotes in plan_id for SQL safety
-    safe_plan_id = self._escape_sql_value(plan_id)
-    plan_filter = f"meta_id = '{safe_plan_id}'"
+    # Bind plan_id as a parameter rather than writing it into the SQL
+    params[PLAN_ID_PARAM] = plan_id
+    plan_filter = f"meta_id = ${PLAN_ID_PARAM}"
 
     try:
         # Normalize query for parsing - but preserve original formatting
@@ -1446,7 +2654,7 @@ def _add_plan_id_filter(self, query: str, plan_id: str) -> str:
         )
 
 
-def _add_workspace_filter(self, query: str, workspace_id: str) -> str:
+def _add_workspace_filter(self, query: str, workspace_id: str, params: Dict[str, Any]) -> str:
     """
     Add workspace isolation filter to SQL query for multi-tenant safety.
 
@@ -1458,6 +2666,7 @@ def _add_workspace_filter(self, query: str, workspace_id: str) -> str:
     Args:
         query: Original SQL query (may already contain WHERE clause from user filters)
         workspace_id: Current workspace identifier
+        params: Query parameters; workspace_id is bound as $mediaplanpy_workspace_id
 
     Returns:
         Query with workspace filter added (combined with existing WHERE if present)
@@ -1468,9 +2677,9 @@ def _add_workspace_filter(self, query: str, workspace_id: str) -> str:
     if not workspace_id:
         raise SQLQueryError("workspace_id is required for database query isolation")
 
-    # Escape single quotes in workspace_id for SQL safety
-    safe_workspace_id = workspace_id.replace("'", "''")
-    workspace_filter = f"workspace_id = '{safe_workspace_id}'"
+    # Bind workspace_id as a parameter rather than writing it into the SQL
+    params[WORKSPACE_ID_PARAM] = workspace_id
+    workspace_filter = f"workspace_id = ${WORKSPACE_ID_PARAM}"
 
     try:
         # Normalize query for parsing - but preserve original formatting
@@ -1649,15 +2858,52 @@ def _validate_sql_safety(query: str) -> None:
         )
 
 
-def _resolve_sql_file_patterns(workspace_manager, query: str) -> str:
+def _validate_query_params(params: Optional[Dict[str, Any]]) -> None:
+    """
+    Validate the parameters passed to sql_query() / sql_query_iter().
+
+    Args:
+        params: Mapping of placeholder names to values, or None.
+
+    Raises:
+        SQLQueryError: If params is not a mapping or uses a reserved name.
+    """
+    if params is None:
+        return
+
+    if not isinstance(params, dict):
+        raise SQLQueryError(
+            f"params must be a dictionary of placeholder names to values, got {type(params).__name__}"
+        )
+
+    for name in params:
+        if not isinstance(name, str) or not re.fullmatch(r'[A-Za-z_]\w*', name):
+            raise SQLQueryError(f"Invalid query parameter name: {name!r}")
+        if name.startswith(RESERVED_PARAM_PREFIX):
+            raise SQLQueryError(
+                f"Query parameter names starting with '{RESERVED_PARAM_PREFIX}' are reserved: {name}"
+            )
+
+
+def _resolve_sql_file_patterns(workspace_manager, query: str,
+                               partition_filters: Optional[Dict[str, Any]] = None,
+                               file_versions: Optional[Dict[str, str]] = None) -> str:
     """
     Replace {pattern} placeholders with actual file paths or S3 URLs.
 
-    Enhanced for S3 storage support - generates S3 URLs when using S3 storage backend.
+    Enhanced for S3 storage support - generates S3 URLs when using S3 storage backend,
+    or paths of local copies when the backend has a disk cache (storage.s3.cache_dir).
+    If the workspace has a compacted catalog, patterns resolve to the catalog
+    files combined with the per-plan files saved since the last compaction.
+    With the "partitioned" Parquet layout, partitions excluded by
+    partition_filters are skipped without being listed.
 
     Args:
         workspace_manager: The WorkspaceManager instance.
         query: SQL query with {pattern} placeholders.
+        partition_filters: Optional partition pruning hints.
+        file_versions: Optional dictionary to fill with the version token of every
+                       file the resolved query reads (used for result caching).
 
     Returns:
         Query with resolved file paths or S3 URLs.
@@ -1680,74 +2926,81 @@ def _resolve_sql_file_patterns(workspace_manager, query: str) -> str:
 
     resolved_query = query
 
-    for pattern in pattern_matches:
-        try:
-            # Get matching files based on pattern
-            if pattern == '*':
-                # All parquet files
-                matching_files = storage_backend.list_files(MEDIAPLANS_SUBDIR, "*.parquet")
-            else:
-                # Specific pattern - add .parquet extension if not present
-                search_pattern = pattern if pattern.endswith('.parquet') else f"{pattern}.parquet"
-                matching_files = storage_backend.list_files(MEDIAPLANS_SUBDIR, search_pattern)
-
-            if not matching_files:
-                raise SQLQueryError(
-                    f"No parquet files found matching pattern '{pattern}' "
-                    f"in {MEDIAPLANS_SUBDIR} directory"
-                )
-
-            # Convert file paths to appropriate format based on storage backend type
-            if storage_backend_type == "S3StorageBackend":
-                # For S3: generate S3 URLs that DuckDB can read directly
-                file_urls = []
-                for file_path in matching_files:
-                    # Ensure the file path includes the mediaplans subdirectory
-                    if not file_path.startswith(MEDIAPLANS_SUBDIR):
-                        full_file_path = f"{MEDIAPLANS_SUBDIR}/{file_path}"
-                    else:
-                        full_file_path = file_path
-
-                    # Generate S3 URL
-                    s3_key = storage_backend.resolve_s3_key(full_file_path)
-                    s3_url = f"s3://{storage_backend.bucket}/{s3_key}"
-                    file_urls.append(f"'{s3_url}'")
-
-                logger.debug(f"Generated {len(file_urls)} S3 URLs for pattern '{pattern}'")
+    # Compacted catalog, if the workspace has one (None otherwise)
+    from mediaplanpy.workspace.catalog import WorkspaceCatalog, MANIFEST_PATH, manifest_version
+    catalog = WorkspaceCatalog(workspace_manager)
+    manifest = catalog.read_manifest()
+    if manifest is not None and file_versions is not None:
+        file_versions[MANIFEST_PATH] = manifest_version(manifest)
 
-                # Configure DuckDB for S3 access using the same credentials as storage backend
-                resolved_pattern = _prepare_duckdb_s3_access(storage_backend, file_urls)
+    partitioned = get_parquet_layout(workspace_manager.get_resolved_config()) == PARQUET_LAYOUT_PARTITIONED
 
-            else:
-                # For local storage: use local file paths (existing logic)
-                full_paths = []
-                for file_path in matching_files:
-                    # Ensure the file path includes the mediaplans subdirectory
-                    if not file_path.startswith(MEDIAPLANS_SUBDIR):
-                        full_file_path = f"{MEDIAPLANS_SUBDIR}/{file_path}"
-                    else:
-                        full_file_path = file_path
+    # With a disk cache, DuckDB reads local copies, revalidated against the
+    # ETags of the listing (so unchanged files need no request at all)
+    disk_cached = getattr(storage_backend, 'disk_cache', None) is not None
 
-                    # Get the absolute path from storage backend
-                    if hasattr(storage_backend, 'resolve_path'):
-                        resolved_path = storage_backend.resolve_path(full_file_path)
-                        full_paths.append(f"'{resolved_path}'")
-                    else:
-                        # Fallback for storage backends without resolve_path
-                        full_paths.append(f"'{full_file_path}'")
+    for pattern in pattern_matches:
+        try:
+            # Get matching files based on pattern (pruned by partition for partitioned layouts)
+            listed_versions = {} if disk_cached else file_versions
+            matching_files = _list_parquet_files(workspace_manager, pattern, partition_filters, listed_versions)
+            if disk_cached:
+                if file_versions is not None:
+                    file_versions.update(listed_versions)
+                local_paths = storage_backend.cache_files(listed_versions)
+
+            file_refs = []
+            for file_path in matching_files:
+                # Ensure the file path includes the mediaplans subdirectory
+                if not file_path.startswith(MEDIAPLANS_SUBDIR):
+                    full_file_path = f"{MEDIAPLANS_SUBDIR}/{file_path}"
+                else:
+                    full_file_path = file_path
 
-                # Handle multiple files with UNION ALL or read_parquet array
-                if len(full_paths) == 1:
-                    resolved_pattern = full_paths[0]
+                # Convert file paths to appropriate format based on storage backend type
+                if disk_cached:
+                    file_refs.append(f"'{local_paths[file_path]}'")
+                elif storage_backend_type == "S3StorageBackend":
+                    # For S3: generate S3 URLs that DuckDB can read directly
+                    s3_key = storage_backend.resolve_s3_key(full_file_path)
+                    file_refs.append(f"'s3://{storage_backend.bucket}/{s3_key}'")
+                elif hasattr(storage_backend, 'resolve_path'):
+                    # For local storage: use the absolute path from storage backend
+                    file_refs.append(f"'{storage_backend.resolve_path(full_file_path)}'")
                 else:
-                    # Create a list for read_parquet function
-                    file_list = ', '.join(full_paths)
+                    # Fallback for storage backends without resolve_path
+                    file_refs.append(f"'{full_file_path}'")
+
+            # Combine with compacted catalog files; S3 access itself is configured
+            # once by the workspace's DuckDB session pool
+            resolved_pattern = None
+            if manifest is not None:
+                resolved_pattern = catalog.resolve_source(pattern, file_refs, manifest=manifest,
+                                                          partition_filters=partition_filters)
+
+            if resolved_pattern is None:
+                if not file_refs:
+                    raise SQLQueryError(
+                        f"No parquet files found matching pattern '{pattern}' "
+                        f"in {MEDIAPLANS_SUBDIR} directory"
+                    )
+
+                # Handle multiple files with a read_parquet array
+                if partitioned:
+                    # Partition directories must not be read back as extra columns
+                    file_list = ', '.join(file_refs)
+                    resolved_pattern = f"read_parquet([{file_list}], hive_partitioning=false)"
+                elif len(file_refs) == 1:
+                    resolved_pattern = file_refs[0]
+                else:
+                    file_list = ', '.join(file_refs)
                     resolved_pattern = f"read_parquet([{file_list}])"
 
             # Replace the pattern in the query
             resolved_query = resolved_query.replace(f'{{{pattern}}}', resolved_pattern)
 
-            logger.debug(f"Resolved pattern '{pattern}' to {len(matching_files)} file(s) for {storage_backend_type}")
+            logger.debug(f"Resolved pattern '{pattern}' to {len(matching_files)} file(s) for {storage_backend_type}"
+                         f"{' plus catalog' if manifest is not None else ''}")
 
         except Exception as e:
             if isinstance(e, SQLQueryError):
@@ -1758,111 +3011,71 @@ def _resolve_sql_file_patterns(workspace_manager, query: str) -> str:
     return resolved_query
 
 
-def _prepare_duckdb_s3_access(s3_storage_backend, file_urls: List[str]) -> str:
+def _list_parquet_files(workspace_manager, pattern: str,
+                        partition_filters: Optional[Dict[str, Any]] = None,
+                        file_versions: Optional[Dict[str, str]] = None) -> List[str]:
     """
-    Prepare DuckDB S3 access configuration and return the file pattern for the query.
+    List the per-plan Parquet files in mediaplans/ matching a placeholder pattern.
 
-    This function configures DuckDB to use the same AWS credentials as the S3StorageBackend
-    and returns the appropriate file pattern for the SQL query.
+    For the "flat" layout this lists mediaplans/ directly. For the "partitioned"
+    layout only the partition directories that can match partition_filters are
+    listed (a campaign_id filter narrows the listing to those campaigns'
+    directories), and files in non-matching partitions are dropped.
 
     Args:
-        s3_storage_backend: The S3StorageBackend instance
-        file_urls: List of S3 URLs to access
+        workspace_manager: The WorkspaceManager instance.
+        pattern: Placeholder pattern ('*' or a file name pattern).
+        partition_filters: Optional partition pruning hints.
+        file_versions: Optional dictionary to fill with the version token of each
+                       returned file (listed in the same call where possible).
 
     Returns:
-        String representing the file pattern for DuckDB (single file or read_parquet array)
+        List of file paths relative to the storage root.
     """
-    try:
-        import duckdb
-    except ImportError:
-        raise SQLQueryError(
-            "DuckDB is required for SQL query functionality. "
-            "Install it with: pip install duckdb"
-        )
-
-    # Configure DuckDB for S3 access using the same credentials as storage backend
-    conn = duckdb.connect()
-
-    try:
-        # Install and load the httpfs extension for S3 support
-        conn.execute("INSTALL httpfs;")
-        conn.execute("LOAD httpfs;")
-
-        # Configure S3 settings to match the storage backend
-        conn.execute(f"SET s3_region='{s3_storage_backend.region}';")
-
-        if s3_storage_backend.endpoint_url:
-            conn.execute(f"SET s3_endpoint='{s3_storage_backend.endpoint_url}';")
-
-        conn.execute(f"SET s3_use_ssl={'true' if s3_storage_backend.use_ssl else 'false'};")
+    storage_backend = workspace_manager.get_storage_backend()
 
-        # Configure AWS credentials - use the same authentication as S3StorageBackend
-        _configure_duckdb_credentials(conn, s3_storage_backend)
+    listed_versions = {}
 
-        logger.debug("DuckDB S3 configuration completed successfully")
+    def list_files(path, file_pattern):
+        if file_versions is None:
+            return storage_backend.list_files(path, file_pattern)
+        versions = storage_backend.get_file_versions(path, file_pattern)
+        listed_versions.update(versions)
+        return list(versions)
 
-    except Exception as e:
-        logger.error(f"Failed to configure DuckDB for S3 access: {e}")
-        raise SQLQueryError(f"Failed to configure DuckDB for S3: {e}")
-    finally:
-        conn.close()
-
-    # Return the appropriate file pattern for the query
-    if len(file_urls) == 1:
-        return file_urls[0]
+    if pattern == '*':
+        search_pattern = "*.parquet"
     else:
-        # Multiple files - use read_parquet with array
-        file_list = ', '.join(file_urls)
-        return f"read_parquet([{file_list}])"
-
-
-def _configure_duckdb_credentials(duckdb_conn, s3_storage_backend):
-    """
-    Configure DuckDB S3 credentials to match the S3StorageBackend authentication.
-
-    Args:
-        duckdb_conn: DuckDB connection object
-        s3_storage_backend: S3StorageBackend instance
-    """
-    try:
-        # Get AWS credentials from the same session/client as S3StorageBackend
-        # This ensures DuckDB uses exactly the same authentication
-
-        if s3_storage_backend.profile:
-            # If using a specific AWS profile, set it for DuckDB
-            duckdb_conn.execute(f"SET s3_aws_profile='{s3_storage_backend.profile}';")
-            logger.debug(f"DuckDB configured to use AWS profile: {s3_storage_backend.profile}")
-
-        else:
-            # Use credential chain (environment variables, IAM roles, etc.)
-            # Try to get credentials from the boto3 session
-            try:
-                # Get credentials from the S3 client's session
-                credentials = s3_storage_backend.s3_client._request_signer._credentials
-
-                if hasattr(credentials, 'access_key') and credentials.access_key:
-                    duckdb_conn.execute(f"SET s3_access_key_id='{credentials.access_key}';")
-                    logger.debug("DuckDB configured with access key from S3 client")
-
-                if hasattr(credentials, 'secret_key') and credentials.secret_key:
-                    duckdb_conn.execute(f"SET s3_secret_access_key='{credentials.secret_key}';")
-                    logger.debug("DuckDB configured with secret key from S3 client")
-
-                if hasattr(credentials, 'session_token') and credentials.session_token:
-                    duckdb_conn.execute(f"SET s3_session_token='{credentials.session_token}';")
-                    logger.debug("DuckDB configured with session token from S3 client")
-
-            except Exception as e:
-                logger.warning(f"Could not extract credentials from S3 client: {e}")
-                logger.info("DuckDB will use default AWS credential chain")
+        # Specific pattern - add .parquet extension if not present
+        search_pattern = pattern if pattern.endswith('.parquet') else f"{pattern}.parquet"
+
+    if get_parquet_layout(workspace_manager.get_resolved_config()) != PARQUET_LAYOUT_PARTITIONED:
+        files = list_files(MEDIAPLANS_SUBDIR, search_pattern)
+        if file_versions is not None:
+            file_versions.update(listed_versions)
+        return files
+
+    listing_dirs = get_partition_listing_dirs(partition_filters)
+    if listing_dirs is None:
+        files = list_files(MEDIAPLANS_SUBDIR, f"{PARTITION_GLOB}/{search_pattern}")
+    else:
+        # Campaign directories are known - list only those
+        inner_glob = PARTITION_GLOB.split('/', 1)[1]
+        files = []
+        for listing_dir in listing_dirs:
+            files.extend(list_files(f"{MEDIAPLANS_SUBDIR}/{listing_dir}",
+                                    f"{inner_glob}/{search_pattern}"))
 
-                # Fallback: let DuckDB use its own credential chain
-                # This should work if environment variables or IAM roles are configured
-                pass
+    matching_files = []
+    for file_path in files:
+        partition_values = parse_partition_path(file_path)
+        if partition_values is not None and partition_matches(partition_values, partition_filters):
+            matching_files.append(file_path)
+            if file_versions is not None:
+                file_versions[file_path] = listed_versions[file_path]
 
-    except Exception as e:
-        logger.warning(f"DuckDB credential configuration failed: {e}")
-        logger.info("DuckDB will attempt to use default AWS credential chain")
+    logger.debug(f"Partition pruning kept {len(matching_files)} of {len(files)} listed files")
+    return matching_files
 
 
 def _get_mediaplans_path(workspace_manager) -> str:
@@ -1907,16 +3120,24 @@ def patch_workspace_manager():
     WorkspaceManager._apply_filters = _apply_filters
     WorkspaceManager.list_campaigns = list_campaigns
     WorkspaceManager.list_mediaplans = list_mediaplans
+    WorkspaceManager._list_mediaplans = _list_mediaplans
+    WorkspaceManager.list_mediaplans_page = list_mediaplans_page
     WorkspaceManager.list_lineitems = list_lineitems
+    WorkspaceManager.list_lineitems_page = list_lineitems_page
+    WorkspaceManager.iter_lineitems = iter_lineitems
 
     # =========================================================================
     # SQL QUERY METHODS
     # =========================================================================
     WorkspaceManager._should_route_to_database = _should_route_to_database
+    WorkspaceManager._run_routed_query = _run_routed_query
     WorkspaceManager._sql_query_postgres = _sql_query_postgres
     WorkspaceManager._add_workspace_filter = _add_workspace_filter
     WorkspaceManager.sql_query = sql_query
     WorkspaceManager._sql_query_duckdb = _sql_query_duckdb
+    WorkspaceManager.sql_query_iter = sql_query_iter
+    WorkspaceManager._sql_query_iter_duckdb = _sql_query_iter_duckdb
+    WorkspaceManager._sql_query_iter_postgres = _sql_query_iter_postgres
     WorkspaceManager._resolve_database_patterns = _resolve_database_patterns
     WorkspaceManager._add_plan_id_filter = _add_plan_id_filter
 
@@ -1926,15 +3147,16 @@ def patch_workspace_manager():
     WorkspaceManager._validate_sql_safety = _validate_sql_safety
     WorkspaceManager._resolve_sql_file_patterns = _resolve_sql_file_patterns
     WorkspaceManager._get_mediaplans_path = _get_mediaplans_path
-    WorkspaceManager._prepare_duckdb_s3_access = _prepare_duckdb_s3_access
-    WorkspaceManager._configure_duckdb_credentials = _configure_duckdb_credentials
 
     WorkspaceManager._add_sql_filters = _add_sql_filters
+    WorkspaceManager._build_partition_filters = _build_partition_filters
+    WorkspaceManager._build_lineitems_query = _build_lineitems_query
     WorkspaceManager._build_sql_filter_conditions = _build_sql_filter_conditions
     WorkspaceManager._column_is_numeric = _column_is_numeric
-    WorkspaceManager._escape_sql_value = _escape_sql_value
-    WorkspaceManager._escape_regex_literal = _escape_regex_literal
+    WorkspaceManager._filter_param_value = _filter_param_value
     WorkspaceManager._get_active_sql_engine = _get_active_sql_engine
+    WorkspaceManager._get_plan_summary_table = _get_plan_summary_table
+    WorkspaceManager._query_plan_summary = _query_plan_summary
 
 # Update the patch call at the bottom of the file
 patch_workspace_manager()
\ No newline at end of file
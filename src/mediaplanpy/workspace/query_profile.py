@@ -0,0 +1,223 @@
+"""
+Per-stage timing of workspace SQL queries.
+
+This module provides the QueryProfile class, which breaks the time spent in
+sql_query() and the list_* methods down by stage:
+
+- ``validate``: SQL safety and parameter validation
+- ``route``: engine routing, including a database health check when one is due
+- ``resolve_patterns``: {pattern} resolution, i.e. listing the Parquet files
+- ``summary_snapshot``: loading the per-plan summary read by the list_*
+  methods and checking it against the Parquet file listing
+- ``cache_lookup`` / ``cache_store``: query result cache lookup and insertion
+- ``session_setup``: borrowing a DuckDB session; on first use this creates the
+  session pool and applies the S3 region, endpoint and credential settings
+- ``rewrite``: PostgreSQL query rewrite ({pattern} resolution and workspace
+  isolation filter) and backend setup
+- ``execute``: engine execution (for PostgreSQL, including fetching the rows)
+- ``fetch``: materializing the DuckDB result as a DataFrame or Arrow table
+- ``convert``: conversion to the requested result format (e.g. dicts)
+- ``explain_analyze``: DuckDB ``EXPLAIN ANALYZE`` of the query, run only while
+  profiling and excluded from the total
+
+Profiling is enabled per call with ``sql_query(..., profile=True)`` or for
+every query with ``query.profile: true`` in the workspace configuration.
+Each finished profile is logged at INFO level and kept as the calling
+thread's (or asyncio task's) WorkspaceManager.get_last_query_profile(). Streaming queries
+(sql_query_iter(), iter_lineitems()) are not profiled.
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+logger = logging.getLogger("mediaplanpy.workspace.query_profile")
+
+# Stages that only run because the query is being profiled
+PROFILING_STAGES = ("explain_analyze",)
+
+# Profile of the query running in the current thread or asyncio task
+_current_profile: contextvars.ContextVar = contextvars.ContextVar('mediaplanpy_query_profile', default=None)
+
+
+class QueryProfile:
+    """
+    Timing breakdown of one query call.
+
+    Example:
+        >>> df = workspace_manager.sql_query("SELECT * FROM {*}", profile=True)
+        >>> profile = workspace_manager.get_last_query_profile()
+        >>> profile.stage_seconds("resolve_patterns")
+        >>> print(profile.format())
+    """
+
+    def __init__(self, label: str):
+        """
+        Start profiling a query call.
+
+        Args:
+            label: The query, or the list_* method, being profiled
+        """
+        self.label = label
+        self.stages: List[Tuple[str, float]] = []
+        self.engine: Optional[str] = None
+        self.routing_reason: Optional[str] = None
+        self.cache_hit = False
+        self.rows: Optional[int] = None
+        self.explain: Optional[str] = None
+        self.elapsed_seconds: Optional[float] = None
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a with-block as one stage of the query.
+
+        Args:
+            name: Stage name; repeated stages are added up
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def finish(self, rows: Optional[int] = None) -> None:
+        """
+        Stop the clock.
+
+        Args:
+            rows: Number of result rows, if known
+        """
+        self.elapsed_seconds = time.perf_counter() - self._started_at
+        if rows is not None:
+            self.rows = rows
+
+    def stage_seconds(self, name: str) -> float:
+        """Total seconds spent in a stage (0.0 if it did not run)."""
+        return sum(seconds for stage, seconds in self.stages if stage == name)
+
+    @property
+    def total_seconds(self) -> float:
+        """Wall-clock time of the call, excluding stages that only run while profiling."""
+        elapsed = self.elapsed_seconds
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._started_at
+        return elapsed - sum(self.stage_seconds(name) for name in PROFILING_STAGES)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the profile as a dictionary.
+
+        Returns:
+            Dictionary with the label, engine, routing reason, cache hit, rows,
+            per-stage milliseconds (in execution order), the unaccounted
+            remainder, the total milliseconds and the EXPLAIN ANALYZE output.
+        """
+        stages: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            stages[name] = stages.get(name, 0.0) + seconds * 1000
+
+        timed_ms = sum(ms for name, ms in stages.items() if name not in PROFILING_STAGES)
+        total_ms = self.total_seconds * 1000
+        return {
+            "label": self.label,
+            "engine": self.engine,
+            "routing_reason": self.routing_reason,
+            "cache_hit": self.cache_hit,
+            "rows": self.rows,
+            "stages_ms": {name: round(ms, 3) for name, ms in stages.items()},
+            "other_ms": round(max(total_ms - timed_ms, 0.0), 3),
+            "total_ms": round(total_ms, 3),
+            "explain": self.explain
+        }
+
+    def format(self) -> str:
+        """
+        Format the profile as a human-readable report.
+
+        Returns:
+            Multi-line report listing each stage with its share of the total.
+        """
+        data = self.as_dict()
+        total_ms = data["total_ms"] or 1e-9
+        label = " ".join(self.label.split())
+        if len(label) > 120:
+            label = label[:117] + "..."
+
+        lines = [f"Query profile: {label}",
+                 f"  engine: {self.engine or 'none'}"
+                 + (f" ({self.routing_reason})" if self.routing_reason else ""),
+                 f"  rows: {'unknown' if self.rows is None else self.rows}"
+                 + (" (result cache hit)" if self.cache_hit else "")]
+        for name, ms in list(data["stages_ms"].items()) + [("other", data["other_ms"])]:
+            share = "" if name in PROFILING_STAGES else f" {ms / total_ms:6.1%}"
+            lines.append(f"  {name:<18}{ms:10.3f} ms{share}")
+        lines.append(f"  {'total':<18}{data['total_ms']:10.3f} ms")
+        if self.explain:
+            lines.append(self.explain)
+        return "\n".join(lines)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """The profile of the query running on the calling thread, or None if it is not profiled."""
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_stage(name: str):
+    """
+    Time a with-block as a stage of the current profile (no-op when not profiling).
+
+    Args:
+        name: Stage name
+    """
+    profile = current_profile()
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
+
+
+@contextmanager
+def profiled_query(workspace_manager: 'WorkspaceManager', label: str, enabled: Optional[bool] = None):
+    """
+    Profile a query call if requested or enabled by ``query.profile``.
+
+    Calls made while another query of the same thread is being profiled (e.g.
+    sql_query() inside list_mediaplans()) add their stages to that profile.
+
+    Args:
+        workspace_manager: Workspace the query runs against
+        label: The query, or the list_* method, being profiled
+        enabled: True/False to force profiling on/off; None uses ``query.profile``
+
+    Yields:
+        The QueryProfile, or None if the call is not profiled.
+    """
+    outer = current_profile()
+    if outer is not None:
+        yield outer
+        return
+
+    if enabled is None:
+        enabled = workspace_manager.get_resolved_config().get('query', {}).get('profile', False)
+    if not enabled:
+        yield None
+        return
+
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.finish()
+        workspace_manager._last_query_profile.set(profile)
+        logger.info(profile.format())
@@ -0,0 +1,309 @@
+"""
+Engine routing for workspace SQL queries.
+
+This module provides the QueryRouter class, which decides whether a query
+runs on DuckDB (over the workspace Parquet files) or on PostgreSQL. With the
+default ``query.routing: "database"`` every ``engine="auto"`` query goes to
+the database whenever it is enabled. With ``query.routing: "adaptive"`` the
+router records the latency and result size of each query shape (the query
+text with literal values removed, or the list_* method and its filter fields)
+on each engine, and sends the shape to the engine that has been faster.
+Queries reading individual plans through a ``{pattern}`` placeholder read a
+single Parquet file and go to DuckDB.
+
+The database health check behind both modes is cached for
+``database.health_check_ttl`` seconds instead of being repeated for every
+query. Every decision carries the reason it was made; the most recent one
+per thread (or asyncio task) is available as ``QueryRouter.last_decision``.
+"""
+
+import contextvars
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, TYPE_CHECKING
+
+from mediaplanpy.exceptions import SQLQueryError
+
+if TYPE_CHECKING:
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+logger = logging.getLogger("mediaplanpy.workspace.query_router")
+
+# Values of query.routing
+ROUTING_DATABASE = "database"
+ROUTING_ADAPTIVE = "adaptive"
+
+# Seconds a database health check result is reused
+DEFAULT_HEALTH_CHECK_TTL = 30
+
+# Observations per engine before adaptive routing compares a shape's latencies
+MIN_SAMPLES_PER_ENGINE = 3
+
+# Weight of the newest observation in the moving averages
+_EWMA_ALPHA = 0.3
+
+ENGINE_DUCKDB = "duckdb"
+ENGINE_DATABASE = "database"
+
+
+class RoutingDecision(NamedTuple):
+    """Engine chosen for a query, with the reason and the query shape it was chosen for."""
+    engine: str
+    reason: str
+    shape: str
+
+
+class _ShapeStats:
+    """Moving averages of latency and result size for one query shape on one engine."""
+
+    def __init__(self):
+        self.count = 0
+        self.avg_seconds = 0.0
+        self.avg_rows = 0.0
+
+    def add(self, seconds: float, rows: int) -> None:
+        if self.count == 0:
+            self.avg_seconds, self.avg_rows = seconds, float(rows)
+        else:
+            self.avg_seconds += _EWMA_ALPHA * (seconds - self.avg_seconds)
+            self.avg_rows += _EWMA_ALPHA * (rows - self.avg_rows)
+        self.count += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "avg_ms": round(self.avg_seconds * 1000, 3),
+                "avg_rows": round(self.avg_rows, 1)}
+
+
+def query_shape(query: str) -> str:
+    """
+    Reduce a query to its shape for routing statistics.
+
+    String and numeric literals are replaced by ``?`` and whitespace is
+    collapsed, so queries that differ only in their values share a shape.
+
+    Args:
+        query: SQL query string with {pattern} placeholders.
+
+    Returns:
+        The query shape.
+    """
+    shape = re.sub(r"'(?:[^']|'')*'", "?", query)
+    shape = re.sub(r"\b\d+(?:\.\d+)?\b", "?", shape)
+    return re.sub(r"\s+", " ", shape).strip()
+
+
+def list_query_shape(method: str, filters: Optional[Dict[str, Any]] = None, **options) -> str:
+    """
+    Build the routing shape of a list_* call from its filter fields and options.
+
+    Args:
+        method: Name of the list method
+        filters: Filters of the call (only the field names are used)
+        **options: Options that change the query (e.g. include_stats)
+
+    Returns:
+        The query shape, e.g. "list_campaigns(campaign_id; include_stats=True)".
+    """
+    parts = [','.join(sorted(filters or {}))]
+    parts.extend(f"{name}={value}" for name, value in sorted(options.items()))
+    return f"{method}({'; '.join(parts)})"
+
+
+def is_single_plan_query(query: str) -> bool:
+    """True if every {pattern} placeholder of a query names specific plans rather than {*}."""
+    patterns = re.findall(r"\{([^}]+)\}", query)
+    return bool(patterns) and '*' not in patterns
+
+
+class QueryRouter:
+    """
+    Chooses the engine for each workspace query and records per-shape query costs.
+
+    Example:
+        >>> router = workspace_manager.get_query_router()
+        >>> df = workspace_manager.sql_query("SELECT COUNT(*) FROM {*}")
+        >>> router.last_decision.reason
+        'database enabled (query.routing = database)'
+        >>> router.stats()["shapes"]
+    """
+
+    def __init__(self, workspace_manager: 'WorkspaceManager'):
+        """
+        Initialize the router for a workspace.
+
+        Args:
+            workspace_manager: The WorkspaceManager instance whose queries are routed
+        """
+        self.workspace_manager = workspace_manager
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, _ShapeStats]] = {}
+        self._health: Optional[bool] = None
+        self._health_checked_at = 0.0
+        self._last_decision: contextvars.ContextVar = contextvars.ContextVar(
+            'mediaplanpy_routing_decision', default=None)
+
+    @property
+    def mode(self) -> str:
+        """Routing mode from ``query.routing`` ("database" or "adaptive")."""
+        return self.workspace_manager.get_resolved_config().get('query', {}).get('routing', ROUTING_DATABASE)
+
+    @property
+    def last_decision(self) -> Optional[RoutingDecision]:
+        """The most recent routing decision made on the calling thread or asyncio task."""
+        return self._last_decision.get()
+
+    def route(self, query: Optional[str], engine_override: str = "auto",
+              shape: Optional[str] = None) -> RoutingDecision:
+        """
+        Choose the engine for a query.
+
+        Args:
+            query: SQL query string (may be None if shape is given)
+            engine_override: Engine preference ("auto", "database", "duckdb")
+            shape: Routing shape; derived from the query if not given
+
+        Returns:
+            The RoutingDecision.
+
+        Raises:
+            SQLQueryError: If the database is requested but not enabled or
+                           unavailable, or engine_override is invalid.
+        """
+        shape = shape or query_shape(query)
+
+        if engine_override == ENGINE_DATABASE:
+            if not self._database_enabled():
+                raise SQLQueryError(
+                    "Database engine requested but database is not enabled in workspace configuration"
+                )
+            if not self.database_available():
+                raise SQLQueryError("Database engine requested but database connection failed")
+            decision = RoutingDecision(ENGINE_DATABASE, "database requested explicitly", shape)
+        elif engine_override == ENGINE_DUCKDB:
+            decision = RoutingDecision(ENGINE_DUCKDB, "DuckDB requested explicitly", shape)
+        elif engine_override == "auto":
+            decision = self._route_auto(query, shape)
+        else:
+            raise SQLQueryError(
+                f"Invalid engine parameter: {engine_override}. "
+                "Must be 'auto', 'database', or 'duckdb'"
+            )
+
+        self._last_decision.set(decision)
+        logger.debug(f"Routed query to {decision.engine}: {decision.reason}")
+        return decision
+
+    def record(self, decision: RoutingDecision, seconds: float, rows: int) -> None:
+        """
+        Record the cost of a query executed on the engine of a routing decision.
+
+        Args:
+            decision: Decision the query was executed under
+            seconds: Wall-clock execution time
+            rows: Number of result rows
+        """
+        with self._lock:
+            engines = self._stats.setdefault(decision.shape, {})
+            engines.setdefault(decision.engine, _ShapeStats()).add(seconds, rows)
+
+    def database_available(self) -> bool:
+        """
+        Check that the database accepts connections, reusing a recent result.
+
+        Returns:
+            True if the last health check (at most ``database.health_check_ttl``
+            seconds old) succeeded.
+        """
+        ttl = self.workspace_manager.get_database_config().get('health_check_ttl', DEFAULT_HEALTH_CHECK_TTL)
+
+        with self._lock:
+            if self._health is not None and time.monotonic() - self._health_checked_at < ttl:
+                return self._health
+
+        try:
+            from mediaplanpy.storage.database import PostgreSQLBackend
+            healthy = PostgreSQLBackend(self.workspace_manager.get_resolved_config()).test_connection()
+        except Exception as e:
+            logger.warning(f"Database health check failed: {e}")
+            healthy = False
+
+        with self._lock:
+            self._health, self._health_checked_at = healthy, time.monotonic()
+        return healthy
+
+    def expire_health(self) -> None:
+        """Forget the cached health check, so the next routing decision checks again."""
+        with self._lock:
+            self._health = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the routing mode, database health and per-shape statistics.
+
+        Returns:
+            Dictionary with "mode", "database_healthy" (None if not checked
+            recently) and "shapes" mapping each shape to per-engine counts,
+            average latency in ms and average rows.
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "database_healthy": self._health,
+                "shapes": {shape: {engine: stats.as_dict() for engine, stats in engines.items()}
+                           for shape, engines in self._stats.items()}
+            }
+
+    def reset(self) -> None:
+        """Discard the recorded statistics and the cached health check."""
+        with self._lock:
+            self._stats.clear()
+            self._health = None
+
+    def _database_enabled(self) -> bool:
+        try:
+            return bool(self.workspace_manager.get_database_config().get('enabled', False))
+        except Exception:
+            return False
+
+    def _route_auto(self, query: Optional[str], shape: str) -> RoutingDecision:
+        """Choose the engine for an engine="auto" query."""
+        if not self._database_enabled():
+            return RoutingDecision(ENGINE_DUCKDB, "database not enabled", shape)
+
+        if self.mode != ROUTING_ADAPTIVE:
+            return RoutingDecision(ENGINE_DATABASE, "database enabled (query.routing = database)", shape)
+
+        if not self.database_available():
+            return RoutingDecision(ENGINE_DUCKDB, "database unavailable (cached health check)", shape)
+
+        if query is not None and is_single_plan_query(query):
+            return RoutingDecision(ENGINE_DUCKDB, "single-plan lookup reads one Parquet file", shape)
+
+        with self._lock:
+            engines = self._stats.get(shape, {})
+            duckdb_stats = engines.get(ENGINE_DUCKDB)
+            database_stats = engines.get(ENGINE_DATABASE)
+            duckdb_count = duckdb_stats.count if duckdb_stats else 0
+            database_count = database_stats.count if database_stats else 0
+
+            # Sample both engines before comparing them
+            if min(duckdb_count, database_count) < MIN_SAMPLES_PER_ENGINE:
+                engine = ENGINE_DUCKDB if duckdb_count < database_count else ENGINE_DATABASE
+                return RoutingDecision(
+                    engine,
+                    f"sampling engines for this query shape ({duckdb_count} DuckDB / "
+                    f"{database_count} database runs of {MIN_SAMPLES_PER_ENGINE})",
+                    shape)
+
+            duckdb_ms = duckdb_stats.avg_seconds * 1000
+            database_ms = database_stats.avg_seconds * 1000
+
+        if duckdb_ms <= database_ms:
+            return RoutingDecision(ENGINE_DUCKDB, f"faster for this query shape "
+                                                  f"({duckdb_ms:.1f} ms vs {database_ms:.1f} ms on the database)",
+                                   shape)
+        return RoutingDecision(ENGINE_DATABASE, f"faster for this query shape "
+                                                f"({database_ms:.1f} ms vs {duckdb_ms:.1f} ms on DuckDB)",
+                               shape)
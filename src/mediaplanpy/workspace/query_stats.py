@@ -0,0 +1,324 @@
+"""
+Query statistics registry and slow-query log.
+
+This module provides the QueryStatsRegistry class, which records every
+sql_query() and list_* execution of a WorkspaceManager. Executions are
+grouped by fingerprint: a hash of the query shape, i.e. the query text with
+literal values removed (or the list_* method and its filter fields). Each
+entry keeps the engines used, the number of calls, errors and slow calls,
+total/mean/max latency, rows returned, bytes scanned (as reported by
+DuckDB's profiler with ``query.scan_metrics: true``) and the number of
+Parquet files read.
+
+The registry is bounded: beyond ``query.stats_max_queries`` fingerprints
+(default 500; 0 disables the registry) the least recently executed ones are
+dropped. Executions taking at least ``query.slow_query_ms`` milliseconds
+(default 1000; 0 disables the log) are logged as a WARNING whose message is
+a JSON object and whose ``query_stats`` attribute holds the same fields.
+
+With ``query.stats_flush_seconds`` set, each process also writes its
+statistics to ``query_stats/<host>-<pid>.json`` in workspace storage at most
+that often, so ``mediaplanpy workspace query-stats`` can report on
+long-running services from a separate process.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mediaplanpy.workspace.loader import WorkspaceManager
+
+logger = logging.getLogger("mediaplanpy.workspace.query_stats")
+
+# Default number of query fingerprints kept by the registry
+DEFAULT_STATS_MAX_QUERIES = 500
+
+# Default latency (ms) from which an execution is logged as a slow query
+DEFAULT_SLOW_QUERY_MS = 1000
+
+# Directory in workspace storage holding the per-process statistics files
+STATS_DIR = "query_stats"
+
+# Columns query_stats() can sort by
+SORT_KEYS = ("total_ms", "mean_ms", "max_ms", "calls", "rows", "bytes_scanned", "last_seen")
+
+
+def query_fingerprint(shape: str) -> str:
+    """
+    Get the fingerprint of a query shape.
+
+    Args:
+        shape: Query shape (see query_router.query_shape())
+
+    Returns:
+        12-character hexadecimal fingerprint.
+    """
+    return hashlib.sha1(shape.encode("utf-8")).hexdigest()[:12]
+
+
+class QueryStatsRegistry:
+    """
+    Bounded, in-process statistics of the queries run against a workspace.
+
+    Example:
+        >>> workspace_manager.list_campaigns()
+        >>> for entry in workspace_manager.query_stats(sort_by="total_ms", limit=5):
+        ...     print(entry["fingerprint"], entry["calls"], entry["mean_ms"], entry["query"])
+    """
+
+    def __init__(self, workspace_manager: 'WorkspaceManager'):
+        """
+        Initialize an empty registry for a workspace.
+
+        Args:
+            workspace_manager: The WorkspaceManager instance whose queries are recorded
+        """
+        self.workspace_manager = workspace_manager
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._last_flush = time.monotonic()
+        self._flushing = False
+
+    def _query_config(self) -> Dict[str, Any]:
+        return self.workspace_manager.get_resolved_config().get('query', {})
+
+    @property
+    def enabled(self) -> bool:
+        """Whether executions are recorded (``query.stats_max_queries`` > 0)."""
+        return self._query_config().get('stats_max_queries', DEFAULT_STATS_MAX_QUERIES) > 0
+
+    def record(self, shape: str, engine: str, seconds: float,
+               rows: Optional[int] = None,
+               bytes_scanned: Optional[int] = None,
+               files_touched: Optional[int] = None,
+               error: Optional[str] = None) -> None:
+        """
+        Record one query execution.
+
+        Args:
+            shape: Query shape the execution is grouped under
+            engine: Engine the query ran on ('duckdb' or 'database')
+            seconds: Wall-clock execution time
+            rows: Number of rows returned
+            bytes_scanned: Bytes read by the engine, if known
+            files_touched: Number of Parquet files read, if known
+            error: Error message if the query failed
+        """
+        query_config = self._query_config()
+        max_queries = query_config.get('stats_max_queries', DEFAULT_STATS_MAX_QUERIES)
+        slow_query_ms = query_config.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS)
+        if max_queries <= 0:
+            return
+
+        fingerprint = query_fingerprint(shape)
+        latency_ms = seconds * 1000
+        slow = bool(slow_query_ms) and latency_ms >= slow_query_ms
+        now = datetime.now(timezone.utc).isoformat()
+
+        with self._lock:
+            entry = self._entries.pop(fingerprint, None)
+            if entry is None:
+                entry = {"fingerprint": fingerprint, "query": shape, "engines": {}, "calls": 0,
+                         "errors": 0, "slow_calls": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0,
+                         "rows": 0, "bytes_scanned": None, "files_touched": None,
+                         "first_seen": now, "last_seen": now}
+            entry["engines"][engine] = entry["engines"].get(engine, 0) + 1
+            entry["calls"] += 1
+            entry["errors"] += error is not None
+            entry["slow_calls"] += slow
+            entry["total_ms"] += latency_ms
+            entry["max_ms"] = max(entry["max_ms"], latency_ms)
+            entry["last_ms"] = latency_ms
+            entry["rows"] += rows or 0
+            if bytes_scanned is not None:
+                entry["bytes_scanned"] = (entry["bytes_scanned"] or 0) + bytes_scanned
+            if files_touched is not None:
+                entry["files_touched"] = max(entry["files_touched"] or 0, files_touched)
+            entry["last_seen"] = now
+
+            # Most recently executed fingerprints are kept at the end
+            self._entries[fingerprint] = entry
+            while len(self._entries) > max_queries:
+                self._entries.popitem(last=False)
+
+        if slow:
+            record = {"fingerprint": fingerprint, "engine": engine, "latency_ms": round(latency_ms, 3),
+                      "threshold_ms": slow_query_ms, "rows": rows, "bytes_scanned": bytes_scanned,
+                      "files_touched": files_touched, "error": error, "query": shape}
+            logger.warning(f"Slow query: {json.dumps(record, default=str)}", extra={"query_stats": record})
+
+        self._maybe_flush(query_config)
+
+    def stats(self, sort_by: str = "total_ms", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the recorded statistics per query fingerprint.
+
+        Args:
+            sort_by: Column to sort by, descending (one of SORT_KEYS)
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of dictionaries with fingerprint, query, engines, calls, errors,
+            slow_calls, total_ms, mean_ms, max_ms, last_ms, rows, mean_rows,
+            bytes_scanned, files_touched, first_seen and last_seen.
+
+        Raises:
+            ValueError: If sort_by is not a valid column.
+        """
+        with self._lock:
+            entries = [dict(entry, engines=dict(entry["engines"])) for entry in self._entries.values()]
+        return summarize_entries(entries, sort_by, limit)
+
+    def reset(self) -> None:
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._entries.clear()
+
+    def flush(self) -> Optional[str]:
+        """
+        Write this process's statistics to workspace storage.
+
+        Returns:
+            Storage path of the statistics file, or None if nothing was recorded.
+
+        Raises:
+            StorageError: If the file cannot be written.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            if not entries:
+                return None
+            content = json.dumps({"host": socket.gethostname(), "pid": os.getpid(),
+                                  "written_at": datetime.now(timezone.utc).isoformat(),
+                                  "queries": entries}, default=str)
+
+        path = f"{STATS_DIR}/{socket.gethostname()}-{os.getpid()}.json"
+        storage_backend = self.workspace_manager.get_storage_backend()
+        storage_backend.create_directory(STATS_DIR)
+        storage_backend.write_file(path, content)
+        return path
+
+    def _maybe_flush(self, query_config: Dict[str, Any]) -> None:
+        """Flush the statistics if query.stats_flush_seconds have passed since the last flush."""
+        flush_seconds = query_config.get('stats_flush_seconds', 0)
+        if not flush_seconds:
+            return
+
+        with self._lock:
+            if self._flushing or time.monotonic() - self._last_flush < flush_seconds:
+                return
+            self._flushing = True
+
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Could not write query statistics: {e}")
+        finally:
+            with self._lock:
+                self._flushing = False
+                self._last_flush = time.monotonic()
+
+
+def load_persisted_stats(workspace_manager: 'WorkspaceManager') -> List[Dict[str, Any]]:
+    """
+    Read the statistics files written by all processes using a workspace.
+
+    Args:
+        workspace_manager: The WorkspaceManager instance
+
+    Returns:
+        Raw statistics entries of all files (unmerged).
+    """
+    storage_backend = workspace_manager.get_storage_backend()
+    entries = []
+    try:
+        paths = storage_backend.list_files(STATS_DIR, "*.json")
+    except Exception:
+        return entries
+
+    for path in paths:
+        try:
+            entries.extend(json.loads(storage_backend.read_file(path))["queries"])
+        except Exception as e:
+            logger.warning(f"Skipping unreadable query statistics file {path}: {e}")
+    return entries
+
+
+def clear_persisted_stats(workspace_manager: 'WorkspaceManager') -> int:
+    """
+    Delete the statistics files written by all processes using a workspace.
+
+    Args:
+        workspace_manager: The WorkspaceManager instance
+
+    Returns:
+        Number of files deleted.
+    """
+    storage_backend = workspace_manager.get_storage_backend()
+    try:
+        paths = storage_backend.list_files(STATS_DIR, "*.json")
+    except Exception:
+        return 0
+    for path in paths:
+        storage_backend.delete_file(path)
+    return len(paths)
+
+
+def summarize_entries(entries: List[Dict[str, Any]], sort_by: str = "total_ms",
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Merge statistics entries by fingerprint, add derived columns and sort them.
+
+    Args:
+        entries: Raw statistics entries (e.g. from several processes)
+        sort_by: Column to sort by, descending (one of SORT_KEYS)
+        limit: Maximum number of entries to return
+
+    Returns:
+        Merged entries with mean_ms and mean_rows added.
+
+    Raises:
+        ValueError: If sort_by is not a valid column.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Invalid sort_by '{sort_by}'. Must be one of: {', '.join(SORT_KEYS)}")
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        current = merged.get(entry["fingerprint"])
+        if current is None:
+            merged[entry["fingerprint"]] = dict(entry, engines=dict(entry["engines"]))
+            continue
+        for engine, calls in entry["engines"].items():
+            current["engines"][engine] = current["engines"].get(engine, 0) + calls
+        for key in ("calls", "errors", "slow_calls", "total_ms", "rows"):
+            current[key] += entry[key]
+        current["max_ms"] = max(current["max_ms"], entry["max_ms"])
+        if entry["bytes_scanned"] is not None:
+            current["bytes_scanned"] = (current["bytes_scanned"] or 0) + entry["bytes_scanned"]
+        if entry["files_touched"] is not None:
+            current["files_touched"] = max(current["files_touched"] or 0, entry["files_touched"])
+        current["first_seen"] = min(current["first_seen"], entry["first_seen"])
+        if entry["last_seen"] > current["last_seen"]:
+            current["last_seen"], current["last_ms"] = entry["last_seen"], entry["last_ms"]
+
+    results = []
+    for entry in merged.values():
+        calls = entry["calls"] or 1
+        entry["mean_ms"] = entry["total_ms"] / calls
+        entry["mean_rows"] = entry["rows"] / calls
+        for key in ("total_ms", "mean_ms", "max_ms", "last_ms"):
+            entry[key] = round(entry[key], 3)
+        entry["mean_rows"] = round(entry["mean_rows"], 1)
+        results.append(entry)
+
+    results.sort(key=lambda entry: entry[sort_by] if entry[sort_by] is not None else -1, reverse=True)
+    return results[:limit] if limit is not None else results
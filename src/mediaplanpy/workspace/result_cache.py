@@ -0,0 +1,183 @@
+"""
+Query result cache for workspace SQL queries.
+
+This module provides the QueryResultCache class, a bounded in-memory LRU
+cache of DuckDB query results owned by a WorkspaceManager. Entries are keyed
+on the normalized SQL text plus a fingerprint of the Parquet files the query
+read (path and size/mtime for local storage, ETag for S3), so a cached result
+is only served while every file behind it is unchanged. Saving or deleting a
+media plan through the workspace also clears the cache explicitly.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger("mediaplanpy.workspace.result_cache")
+
+# Default memory budget for cached results
+DEFAULT_RESULT_CACHE_MB = 64
+
+
+class QueryResultCache:
+    """
+    LRU cache of query results (pandas DataFrames or pyarrow Tables) with a memory budget.
+
+    The size of each entry is estimated with ``DataFrame.memory_usage(deep=True)``
+    or ``Table.nbytes``. When adding an entry would exceed the budget, least
+    recently used entries are evicted first; a single result larger than the
+    whole budget is not cached at all. Cached DataFrames are copied on the way
+    in and out, so callers can modify what they get back without affecting the
+    cache; Arrow tables are immutable and shared as-is.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Create an empty cache.
+
+        Args:
+            max_bytes: Memory budget in bytes. 0 disables caching.
+        """
+        self.max_bytes = DEFAULT_RESULT_CACHE_MB * 1024 * 1024 if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the cache can hold any results."""
+        return self.max_bytes > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached result.
+
+        Args:
+            key: Cache key from make_key().
+
+        Returns:
+            A copy of the cached DataFrame, the cached Arrow table, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[0]
+            return result.copy() if isinstance(result, pd.DataFrame) else result
+
+    def put(self, key: str, result: Any) -> bool:
+        """
+        Add a result to the cache, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key from make_key().
+            result: Query result to cache (pandas DataFrame or pyarrow Table).
+
+        Returns:
+            True if the result was cached, False if it exceeds the budget.
+        """
+        if isinstance(result, pd.DataFrame):
+            size = int(result.memory_usage(index=True, deep=True).sum())
+        else:
+            size = int(result.nbytes)
+        if size > self.max_bytes:
+            logger.debug(f"Query result of {size} bytes exceeds cache budget, not cached")
+            return False
+
+        if isinstance(result, pd.DataFrame):
+            result = result.copy()
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+
+            while self._entries and self._current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (result, size)
+            self._current_bytes += size
+        return True
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, memory use and hit/miss/eviction counts.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    @staticmethod
+    def make_key(query: str, file_versions: Dict[str, str], limit: Optional[int] = None,
+                 result_type: str = "pandas", params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a query over a set of files.
+
+        Args:
+            query: SQL query with {pattern} placeholders (before resolution).
+            file_versions: Mapping of every file the query reads to its version token.
+            limit: Row limit applied to the query, if any.
+            result_type: Type of the cached result ("pandas" or "arrow").
+            params: Values bound to the query's placeholders, if any.
+
+        Returns:
+            Hex digest identifying the query and file set.
+        """
+        digest = hashlib.sha256()
+        digest.update(normalize_query(query).encode('utf-8'))
+        digest.update(f"\0limit={limit}\0type={result_type}\0".encode('utf-8'))
+        for name in sorted(params or {}):
+            digest.update(f"{name}={params[name]!r}\0".encode('utf-8'))
+        for path in sorted(file_versions):
+            digest.update(f"{path}\0{file_versions[path]}\0".encode('utf-8'))
+        return digest.hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize SQL text for use in a cache key.
+
+    Collapses whitespace outside string literals; literals and identifiers
+    are otherwise left untouched, so queries that differ only in layout
+    share a cache entry.
+
+    Args:
+        query: SQL query string.
+
+    Returns:
+        Normalized query string.
+    """
+    parts = re.split(r"('(?:[^']|'')*')", query)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s+', ' ', parts[i])
+    return ''.join(parts).strip()
@@ -16,12 +16,48 @@ from datetime import datetime
 from typing import Dict, Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from mediaplanpy.models import MediaPlan
     from mediaplanpy.workspace.loader import WorkspaceManager
 
 from mediaplanpy.exceptions import WorkspaceError, SchemaVersionError, ValidationError
 
 logger = logging.getLogger("mediaplanpy.workspace.upgrader")
 
+# Number of files read ahead with StorageBackend.read_files() by the
+# per-file upgrade steps (bounds the contents held in memory at once)
+UPGRADE_READ_BATCH_SIZE = 256
+
+
+def _read_ahead(storage_backend, files, contents, index, binary=False):
+    """
+    Get the contents of files[index], reading the next batch of files if needed.
+
+    Files are read UPGRADE_READ_BATCH_SIZE at a time with read_files(), which
+    fetches them concurrently on S3; contents holds the current batch.
+
+    Args:
+        storage_backend: Workspace storage backend
+        files: All files of the upgrade step
+        contents: Dictionary of the current batch, replaced in place
+        index: Position of the file to get
+        binary: If True, read the files in binary mode
+
+    Returns:
+        The file contents.
+
+    Raises:
+        FileReadError: If the file cannot be read.
+    """
+    file_path = files[index]
+    if file_path not in contents:
+        contents.clear()
+        contents.update(storage_backend.read_files(files[index:index + UPGRADE_READ_BATCH_SIZE],
+                                                   binary=binary, return_exceptions=True))
+    content = contents[file_path]
+    if isinstance(content, Exception):
+        raise content
+    return content
+
 
 class WorkspaceUpgrader:
     """
@@ -379,10 +415,11 @@ class WorkspaceUpgrader:
             binary_mode = file_pattern.endswith(".parquet")
 
             # Copy each file using appropriate method
-            for file_path in files:
+            contents = {}
+            for index, file_path in enumerate(files):
                 try:
                     # Read file content from source
-                    content = storage_backend.read_file(file_path, binary=binary_mode)
+                    content = _read_ahead(storage_backend, files, contents, index, binary=binary_mode)
 
                     # Construct backup file path
                     filename = os.path.basename(file_path)
@@ -565,9 +602,10 @@ class WorkspaceUpgrader:
                     pass
 
             # Check each file's schema version
-            for file_path in json_files:
+            contents = {}
+            for index, file_path in enumerate(json_files):
                 try:
-                    content = storage_backend.read_file(file_path, binary=False)
+                    content = _read_ahead(storage_backend, json_files, contents, index)
                     import json
                     data = json.loads(content)
 
@@ -623,8 +661,6 @@ class WorkspaceUpgrader:
         Returns:
             Dictionary with migration results
         """
-        from mediaplanpy.models import MediaPlan
-
         result = {
             "migrated_count": 0,
             "already_current_count": 0,
@@ -649,6 +685,7 @@ class WorkspaceUpgrader:
             total_files = len(json_files)
             logger.info(f"Found {total_files} JSON files to process for v3.0 upgrade")
 
+            contents = {}
             for index, file_path in enumerate(json_files, start=1):
                 try:
                     result["processed_files"].append(file_path)
@@ -659,7 +696,7 @@ class WorkspaceUpgrader:
                     if dry_run:
                         # For dry run, just check what would be migrated
                         try:
-                            content = storage_backend.read_file(file_path, binary=False)
+                            content = _read_ahead(storage_backend, json_files, contents, index - 1)
                             import json
                             data = json.loads(content)
 
@@ -695,7 +732,7 @@ class WorkspaceUpgrader:
                         # Actually perform migration
                         try:
                             # Pre-check for v1.0 and below files
-                            content = storage_backend.read_file(file_path, binary=False)
+                            content = _read_ahead(storage_backend, json_files, contents, index - 1)
                             import json
                             data = json.loads(content)
 
@@ -725,9 +762,9 @@ class WorkspaceUpgrader:
                             mediaplan_logger.setLevel(logging.ERROR)  # Suppress WARNING level during upgrade
 
                             try:
-                                # Load media plan (will trigger v2.0 → v3.0 migration via schema migrator)
-                                # Note: validate_version=False suppresses expected v2.0 deprecation warnings during upgrade
-                                media_plan = MediaPlan.load(self.workspace_manager, path=file_path, validate_version=False, auto_migrate=True)
+                                # Build media plan from the content already read (will trigger v2.0 → v3.0
+                                # migration via schema migrator), as MediaPlan.load(validate_version=False) would
+                                media_plan = self._mediaplan_from_content(file_path, content)
 
                                 # Save with v3.0 schema (will auto-regenerate Parquet and update Database)
                                 # Note: validate_version=False suppresses warnings during upgrade
@@ -786,8 +823,6 @@ class WorkspaceUpgrader:
         Returns:
             Dictionary with regeneration results
         """
-        from mediaplanpy.models import MediaPlan
-
         result = {
             "regenerated_count": 0,
             "skipped_count": 0,
@@ -809,7 +844,8 @@ class WorkspaceUpgrader:
 
             logger.info(f"Regenerating Parquet files for {len(json_files)} media plans")
 
-            for json_path in json_files:
+            contents = {}
+            for index, json_path in enumerate(json_files):
                 try:
                     # Construct Parquet path from JSON path
                     parquet_path = json_path.rsplit('.', 1)[0] + '.parquet'
@@ -820,9 +856,10 @@ class WorkspaceUpgrader:
                         result["regenerated_count"] += 1
                     else:
                         try:
-                            # Load media plan from JSON (already migrated to v3.0 in previous step)
-                            # Note: validate_version=False suppresses expected v2.0 deprecation warnings
-                            media_plan = MediaPlan.load(self.workspace_manager, path=json_path, validate_version=False)
+                            # Load media plan from JSON (already migrated to v3.0 in previous step),
+                            # reading ahead in batches
+                            content = _read_ahead(storage_backend, json_files, contents, index)
+                            media_plan = self._mediaplan_from_content(json_path, content)
 
                             # Save will automatically regenerate Parquet with v3.0 schema
                             media_plan.save(
@@ -853,6 +890,26 @@ class WorkspaceUpgrader:
 
         return result
 
+    def _mediaplan_from_content(self, file_path: str, content: str) -> 'MediaPlan':
+        """
+        Create a media plan from file contents read by the upgrade steps.
+
+        Equivalent to MediaPlan.load(path=file_path, validate_version=False)
+        without reading the file again.
+
+        Args:
+            file_path: Path the contents were read from (selects the format)
+            content: File contents
+
+        Returns:
+            MediaPlan instance.
+        """
+        from mediaplanpy.models import MediaPlan
+        from mediaplanpy.storage.formats import get_format_handler_instance
+
+        data = get_format_handler_instance(file_path).deserialize(content)
+        return MediaPlan.from_dict(data)
+
     def _get_workspace_record_count(self, db_backend) -> int:
         """
         Get the count of records in the database for this workspace.
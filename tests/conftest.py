@@ -5,12 +5,14 @@ This module provides pytest fixtures for testing v3.0 functionality.
 """
 
 import pytest
+import json
+import os
 import tempfile
 import shutil
 from pathlib import Path
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
 
 from mediaplanpy.models import (
     MediaPlan, Campaign, LineItem, Meta, Dictionary,
@@ -480,3 +482,87 @@ def workspace_config_v3():
             "enabled": False
         }
     }
+
+
+@pytest.fixture
+def make_local_workspace(temp_dir):
+    """
+    Return a factory creating a loaded local workspace in temp_dir.
+
+    The factory takes the workspace_id, an optional storage.parquet_layout
+    and an optional query settings dictionary.
+    """
+    from mediaplanpy.workspace import WorkspaceManager
+
+    def _make(workspace_id: str, parquet_layout: Optional[str] = None,
+              query: Optional[Dict[str, Any]] = None):
+        config = {
+            "workspace_id": workspace_id,
+            "workspace_name": f"Test {workspace_id}",
+            "workspace_settings": {
+                "schema_version": "3.0"
+            },
+            "storage": {
+                "mode": "local",
+                "local": {
+                    "base_path": temp_dir
+                }
+            },
+            "database": {
+                "enabled": False
+            }
+        }
+        if parquet_layout:
+            config["storage"]["parquet_layout"] = parquet_layout
+        if query:
+            config["query"] = query
+
+        config_path = os.path.join(temp_dir, "workspace.json")
+        with open(config_path, 'w') as f:
+            json.dump(config, f)
+
+        workspace_manager = WorkspaceManager(workspace_path=config_path)
+        workspace_manager.load()
+        return workspace_manager
+
+    return _make
+
+
+@pytest.fixture
+def make_mediaplan():
+    """
+    Return a factory creating a media plan with line items.
+
+    Line items are named "<campaign name> Line Item <i>", run from the
+    campaign start date to lineitem_end_date (default: the campaign end date,
+    December 31 of the start year), cost cost_total each, and take their
+    channel from channels in turn.
+    """
+    def _make(campaign_name: Optional[str] = None, lineitem_count: int = 3,
+              campaign_id: Optional[str] = None, start_date: str = "2025-01-01",
+              lineitem_end_date: Optional[str] = None, cost_total: float = 1000,
+              channels: Sequence[str] = ()):
+        campaign_name = campaign_name or f"Campaign {campaign_id}"
+        end_date = f"{start_date[:4]}-12-31"
+        create_args = {"campaign_id": campaign_id} if campaign_id else {}
+        media_plan = MediaPlan.create(
+            campaign_name=campaign_name,
+            campaign_start_date=start_date,
+            campaign_end_date=end_date,
+            campaign_budget_total=10000,
+            created_by_name="test@example.com",
+            **create_args
+        )
+        for i in range(lineitem_count):
+            lineitem = {
+                "name": f"{campaign_name} Line Item {i}",
+                "start_date": start_date,
+                "end_date": lineitem_end_date or end_date,
+                "cost_total": cost_total
+            }
+            if channels:
+                lineitem["channel"] = channels[i % len(channels)]
+            media_plan.create_lineitem(lineitem)
+        return media_plan
+
+    return _make
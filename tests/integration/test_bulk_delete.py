@@ -0,0 +1,97 @@
+"""
+Integration tests for bulk media plan deletion.
+
+Tests WorkspaceManager.delete_mediaplans(), including:
+- Deleting by IDs and by filters, with dry runs
+- Flat and partitioned Parquet layouts
+- Keeping the plan summary and compacted catalog consistent
+"""
+
+import pytest
+import os
+
+from mediaplanpy.exceptions import ValidationError
+
+
+def _files(base_path):
+    found = []
+    for root, _, files in os.walk(os.path.join(base_path, "mediaplans")):
+        for name in files:
+            found.append(os.path.relpath(os.path.join(root, name), base_path).replace(os.sep, "/"))
+    return sorted(found)
+
+
+@pytest.fixture
+def make_workspace_with_plans(make_local_workspace, make_mediaplan):
+    """Return a factory creating a local workspace with saved media plans."""
+    def _make(parquet_layout=None, plan_count=5):
+        workspace_manager = make_local_workspace("test_bulk_delete", parquet_layout=parquet_layout)
+        plans = []
+        for i in range(plan_count):
+            media_plan = make_mediaplan(f"Campaign {i}", lineitem_count=2, lineitem_end_date="2025-03-31")
+            media_plan.save(workspace_manager)
+            plans.append(media_plan)
+        return workspace_manager, plans
+
+    return _make
+
+
+@pytest.fixture
+def workspace_with_plans(make_workspace_with_plans):
+    """Create a local workspace with five saved media plans."""
+    return make_workspace_with_plans()
+
+
+class TestDeleteMediaplans:
+    """Test deleting many media plans at once."""
+
+    def test_delete_by_ids(self, workspace_with_plans, temp_dir):
+        workspace_manager, plans = workspace_with_plans
+        assert len(workspace_manager.list_mediaplans()) == 5
+        ids = [plans[0].meta.id, plans[2].meta.id, "mediaplan_missing"]
+
+        result = workspace_manager.delete_mediaplans(ids)
+
+        assert result["files_found"] == 4 and result["files_deleted"] == 4
+        assert result["not_found"] == ["mediaplan_missing"]
+        assert not [f for f in _files(temp_dir) if plans[0].meta.id in f or plans[2].meta.id in f]
+        remaining = [row["meta_id"] for row in workspace_manager.list_mediaplans()]
+        assert sorted(remaining) == sorted(plan.meta.id for plan in [plans[1], plans[3], plans[4]])
+
+    def test_dry_run_by_filters(self, workspace_with_plans, temp_dir):
+        workspace_manager, plans = workspace_with_plans
+        before = _files(temp_dir)
+
+        result = workspace_manager.delete_mediaplans(
+            filters={"campaign_name": ["Campaign 1", "Campaign 3"]}, dry_run=True)
+
+        assert sorted(result["mediaplan_ids"]) == sorted([plans[1].meta.id, plans[3].meta.id])
+        assert result["files_found"] == 4 and result["files_deleted"] == 0
+        assert len(result["deleted_files"]) == 4
+        assert _files(temp_dir) == before
+
+    def test_selection_required(self, workspace_with_plans):
+        workspace_manager, plans = workspace_with_plans
+        with pytest.raises(ValidationError):
+            workspace_manager.delete_mediaplans()
+        with pytest.raises(ValidationError):
+            workspace_manager.delete_mediaplans([plans[0].meta.id], filters={"campaign_name": "Campaign 0"})
+
+    def test_compacted_plans_hidden(self, workspace_with_plans):
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        workspace_manager.delete_mediaplans([plans[1].meta.id, plans[4].meta.id])
+
+        df = workspace_manager.sql_query("SELECT DISTINCT meta_id FROM {*}")
+        assert sorted(df["meta_id"]) == sorted(plan.meta.id for plan in [plans[0], plans[2], plans[3]])
+
+    def test_partitioned_layout(self, make_workspace_with_plans, temp_dir):
+        workspace_manager, plans = make_workspace_with_plans(parquet_layout="partitioned", plan_count=3)
+
+        result = workspace_manager.delete_mediaplans(plans[1].meta.id)
+
+        assert result["files_deleted"] == 2
+        assert [f for f in result["deleted_files"] if f.endswith(".parquet") and "campaign_id=" in f]
+        assert not [f for f in _files(temp_dir) if plans[1].meta.id in f]
+        assert len(workspace_manager.list_mediaplans()) == 2
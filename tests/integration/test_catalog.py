@@ -0,0 +1,158 @@
+"""
+Integration tests for the compacted workspace catalog.
+
+Tests catalog compaction and query resolution, including:
+- Compaction of per-plan Parquet files into catalog files
+- Queries returning the same results before and after compaction
+- Plans saved, archived and deleted after compaction (delta area)
+- Re-compaction and dry runs
+"""
+
+import pytest
+import os
+import json
+
+from mediaplanpy.workspace.catalog import MANIFEST_PATH
+
+
+@pytest.fixture
+def workspace_with_plans(make_local_workspace, make_mediaplan):
+    """Create a local workspace with four saved media plans."""
+    workspace_manager = make_local_workspace("test_catalog")
+
+    plans = []
+    for i in range(4):
+        media_plan = make_mediaplan(f"Campaign {i}", lineitem_end_date="2025-03-31", channels=["social"])
+        media_plan.save(workspace_manager)
+        plans.append(media_plan)
+
+    return workspace_manager, plans
+
+
+def _plan_counts(workspace_manager):
+    df = workspace_manager.sql_query(
+        "SELECT meta_id, COUNT(*) AS row_count FROM {*} GROUP BY meta_id ORDER BY meta_id"
+    )
+    return dict(zip(df['meta_id'], df['row_count']))
+
+
+class TestCatalogCompaction:
+    """Test compact_catalog() and query results over the catalog."""
+
+    def test_compaction_preserves_query_results(self, workspace_with_plans, temp_dir):
+        """Queries return the same rows before and after compaction."""
+        workspace_manager, plans = workspace_with_plans
+        before = _plan_counts(workspace_manager)
+
+        result = workspace_manager.compact_catalog(target_rows_per_file=5)
+
+        assert result["delta_files_compacted"] == 4
+        assert result["catalog_files_written"] == 3
+        assert result["rows_written"] == 12
+        assert result["plans_in_catalog"] == 4
+        assert _plan_counts(workspace_manager) == before
+
+        # Per-plan Parquet files are gone, JSON files remain
+        remaining = os.listdir(os.path.join(temp_dir, "mediaplans"))
+        assert not [name for name in remaining if name.endswith(".parquet")]
+        assert len([name for name in remaining if name.endswith(".json")]) == 4
+
+        with open(os.path.join(temp_dir, MANIFEST_PATH)) as f:
+            manifest = json.load(f)
+        assert len(manifest["files"]) == 3
+        assert set(manifest["sources"]) == {f"{plan.meta.id}.parquet" for plan in plans}
+
+    def test_list_methods_after_compaction(self, workspace_with_plans):
+        """list_* methods resolve against the catalog transparently."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        assert len(workspace_manager.list_campaigns()) == 4
+        assert len(workspace_manager.list_mediaplans()) == 4
+        assert len(workspace_manager.list_lineitems()) == 12
+
+    def test_specific_pattern_after_compaction(self, workspace_with_plans):
+        """{pattern} placeholders still match plans by original file name."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        df = workspace_manager.sql_query(f"SELECT DISTINCT meta_id FROM {{{plans[0].meta.id}}}")
+
+        assert df['meta_id'].tolist() == [plans[0].meta.id]
+
+    def test_new_plan_saved_after_compaction(self, workspace_with_plans, make_mediaplan):
+        """Plans saved after compaction are visible from the delta area."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        new_plan = make_mediaplan("Campaign New", lineitem_count=2, channels=["social"])
+        new_plan.save(workspace_manager)
+
+        counts = _plan_counts(workspace_manager)
+        assert len(counts) == 5
+        assert counts[new_plan.meta.id] == 2
+
+    def test_resaved_plan_supersedes_catalog(self, workspace_with_plans):
+        """A plan re-saved after compaction is not returned twice."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        plans[0].archive(workspace_manager)
+
+        df = workspace_manager.list_mediaplans(return_dataframe=True)
+        archived = df[df['meta_id'] == plans[0].meta.id]
+        assert len(df) == 4
+        assert len(archived) == 1
+        assert bool(archived['meta_is_archived'].iloc[0]) is True
+        assert _plan_counts(workspace_manager)[plans[0].meta.id] == 3
+
+    def test_deleted_plan_hidden_from_catalog(self, workspace_with_plans):
+        """Deleting a compacted plan hides its catalog rows."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        plans[1].delete(workspace_manager)
+
+        counts = _plan_counts(workspace_manager)
+        assert plans[1].meta.id not in counts
+        assert len(counts) == 3
+
+    def test_recompaction_purges_deletions(self, workspace_with_plans, temp_dir, make_mediaplan):
+        """Re-compaction folds the delta area in and drops deleted plans."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        plans[1].delete(workspace_manager)
+        make_mediaplan("Campaign New", channels=["social"]).save(workspace_manager)
+        expected = _plan_counts(workspace_manager)
+
+        result = workspace_manager.compact_catalog()
+
+        assert result["delta_files_compacted"] == 1
+        assert result["deleted_plans_purged"] == 1
+        assert result["plans_in_catalog"] == 4
+        assert _plan_counts(workspace_manager) == expected
+
+        catalog_files = os.listdir(os.path.join(temp_dir, "catalog"))
+        assert len([name for name in catalog_files if name.endswith(".parquet")]) == 1
+
+    def test_dry_run_changes_nothing(self, workspace_with_plans, temp_dir):
+        """A dry run reports the work without writing a catalog."""
+        workspace_manager, plans = workspace_with_plans
+
+        result = workspace_manager.compact_catalog(dry_run=True)
+
+        assert result["delta_files_compacted"] == 4
+        assert result["catalog_files_written"] == 0
+        assert not os.path.exists(os.path.join(temp_dir, MANIFEST_PATH))
+
+    def test_compaction_with_nothing_to_do(self, workspace_with_plans):
+        """Compacting an up-to-date catalog is a no-op."""
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.compact_catalog()
+
+        result = workspace_manager.compact_catalog()
+
+        assert result["delta_files_compacted"] == 0
+        assert result["catalog_files_written"] == 0
+        assert len(_plan_counts(workspace_manager)) == 4
@@ -109,6 +109,164 @@ class TestDatabaseMigration:
         pytest.skip("Requires test database configuration")
 
 
+class FakeServerSideCursor:
+    """Minimal stand-in for a psycopg2 named cursor."""
+
+    def __init__(self, connection, name, rows):
+        self.connection = connection
+        self.name = name
+        self.itersize = None
+        self.description = None
+        self.fetch_sizes = []
+        self._rows = rows
+        self._position = 0
+
+    def execute(self, query, params=None):
+        self.connection.queries.append(query)
+        self.connection.params.append(params)
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        self.description = [("meta_id",), ("lineitem_cost_total",)]
+        chunk = self._rows[self._position:self._position + size]
+        self._position += len(chunk)
+        return chunk
+
+    def close(self):
+        self.connection.cursor_closed = True
+
+
+class FakeConnection:
+    """Minimal stand-in for a psycopg2 connection serving fixed rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.params = []
+        self.cursors = []
+        self.cursor_closed = False
+        self.closed = False
+
+    def cursor(self, name=None):
+        cursor = FakeServerSideCursor(self, name, self.rows)
+        self.cursors.append(cursor)
+        return cursor
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def database_workspace(temp_dir):
+    """Create a workspace with the database enabled (connections are faked per test)."""
+    import os
+    import json
+    from mediaplanpy.workspace import WorkspaceManager
+
+    config_path = os.path.join(temp_dir, "workspace.json")
+    with open(config_path, 'w') as f:
+        json.dump({
+            "workspace_id": "test_database_query",
+            "workspace_name": "Database Query",
+            "workspace_settings": {"schema_version": "3.0"},
+            "storage": {"mode": "local", "local": {"base_path": temp_dir}},
+            "database": {"enabled": True, "host": "localhost", "database": "mediaplanpy", "fetch_size": 2}
+        }, f)
+
+    workspace_manager = WorkspaceManager(workspace_path=config_path)
+    workspace_manager.load()
+    return workspace_manager
+
+
+class TestServerSideCursorQueries:
+    """Test chunked fetching through server-side cursors (no database server needed)."""
+
+    ROWS = [("MP_001", 100.0), ("MP_001", None), ("MP_002", 300.0), ("MP_003", None), ("MP_003", None)]
+
+    def fake_connect(self, monkeypatch):
+        from mediaplanpy.storage.database import PostgreSQLBackend
+
+        connection = FakeConnection(self.ROWS)
+        monkeypatch.setattr(PostgreSQLBackend, "connect", lambda backend: connection)
+        return connection
+
+    def test_iter_query_chunks_uses_named_cursor(self, database_workspace, monkeypatch):
+        """Rows are fetched in fetch_size chunks from a named cursor that is closed afterwards."""
+        from mediaplanpy.storage.database import PostgreSQLBackend
+
+        connection = self.fake_connect(monkeypatch)
+        backend = PostgreSQLBackend(database_workspace.get_resolved_config())
+
+        chunks = list(backend.iter_query_chunks("SELECT 1"))
+
+        cursor = connection.cursors[0]
+        assert cursor.name is not None
+        assert cursor.itersize == 2
+        assert [len(records) for _, records in chunks] == [2, 2, 1]
+        assert chunks[0][0] == ["meta_id", "lineitem_cost_total"]
+        assert connection.cursor_closed and connection.closed
+
+    def test_empty_result_keeps_columns(self, database_workspace, monkeypatch):
+        """A query without rows still reports its columns."""
+        from mediaplanpy.storage.database import PostgreSQLBackend
+
+        connection = self.fake_connect(monkeypatch)
+        connection.rows = []
+        backend = PostgreSQLBackend(database_workspace.get_resolved_config())
+
+        assert list(backend.iter_query_chunks("SELECT 1")) == [(["meta_id", "lineitem_cost_total"], [])]
+
+    def test_sql_query_assembles_chunks(self, database_workspace, monkeypatch):
+        """sql_query() combines chunks into one DataFrame with consistent dtypes."""
+        connection = self.fake_connect(monkeypatch)
+
+        df = database_workspace.sql_query("SELECT * FROM {*}")
+
+        assert df["meta_id"].tolist() == [row[0] for row in self.ROWS]
+        assert df["lineitem_cost_total"].dtype == "float64"
+        assert "workspace_id" in connection.queries[0]
+
+    def test_sql_query_records_and_arrow(self, database_workspace, monkeypatch):
+        """Records and Arrow results are assembled from the same chunks."""
+        self.fake_connect(monkeypatch)
+
+        records = database_workspace.sql_query("SELECT * FROM {*}", return_dataframe=False)
+        table = database_workspace.sql_query("SELECT * FROM {*}", result_format="arrow")
+
+        assert records[2] == {"meta_id": "MP_002", "lineitem_cost_total": 300.0}
+        assert table.num_rows == len(self.ROWS)
+        assert str(table.schema.field("lineitem_cost_total").type) == "double"
+
+    def test_sql_query_iter_streams_chunks(self, database_workspace, monkeypatch):
+        """sql_query_iter() yields one record batch per fetched chunk."""
+        self.fake_connect(monkeypatch)
+
+        batches = list(database_workspace.sql_query_iter("SELECT * FROM {*}", batch_size=2))
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+
+    def test_filters_bound_as_parameters(self, database_workspace, monkeypatch):
+        """Workspace isolation and filter values are passed as bound parameters."""
+        connection = self.fake_connect(monkeypatch)
+
+        database_workspace.list_lineitems(filters={"lineitem_name": "O'Brien & Co"})
+        database_workspace.sql_query("SELECT * FROM {*} WHERE lineitem_name LIKE '%$x%' AND meta_id = $plan",
+                                     params={"plan": "MP_001"})
+
+        listed_query, user_query = connection.queries
+        assert "workspace_id = %(mediaplanpy_workspace_id)s" in listed_query
+        assert "lineitem_name = %(filter_0)s" in listed_query
+        assert "O'Brien" not in listed_query
+        assert connection.params[0] == {"filter_0": "O'Brien & Co",
+                                        "mediaplanpy_workspace_id": "test_database_query"}
+        # Literal % is escaped and placeholders inside string literals are left alone
+        assert "LIKE '%%$x%%'" in user_query
+        assert "meta_id = %(plan)s" in user_query
+
+
 # Placeholder tests that always pass to show database tests exist
 class TestDatabasePlaceholder:
     """Placeholder tests to indicate database tests are defined."""
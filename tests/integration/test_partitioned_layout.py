@@ -0,0 +1,184 @@
+"""
+Integration tests for the partitioned Parquet layout.
+
+Tests the "partitioned" storage.parquet_layout option, including:
+- Parquet copies written under campaign_id=/year=/meta_is_archived= directories
+- Moving the copy between partitions on archive/restore
+- Partition pruning in list_* methods and sql_query(partition_filters=...)
+- Interaction with delete() and catalog compaction
+"""
+
+import pytest
+import os
+
+from mediaplanpy.storage.partitioning import parse_partition_path
+
+
+def _parquet_files(base_path):
+    found = []
+    for root, _, files in os.walk(os.path.join(base_path, "mediaplans")):
+        for name in files:
+            if name.endswith(".parquet"):
+                found.append(os.path.relpath(os.path.join(root, name), base_path).replace(os.sep, "/"))
+    return sorted(found)
+
+
+@pytest.fixture
+def partitioned_workspace(make_local_workspace, make_mediaplan):
+    """Create a local workspace using the partitioned layout with three plans."""
+    workspace_manager = make_local_workspace("test_partitioned", parquet_layout="partitioned")
+
+    plans = [
+        make_mediaplan(campaign_id="camp_a", start_date="2024-03-01", lineitem_count=2),
+        make_mediaplan(campaign_id="camp_a", start_date="2025-01-01", lineitem_count=2),
+        make_mediaplan(campaign_id="camp_b", start_date="2025-06-01", lineitem_count=2),
+    ]
+    for media_plan in plans:
+        media_plan.save(workspace_manager)
+
+    return workspace_manager, plans
+
+
+class TestPartitionedSave:
+    """Test where Parquet copies are written."""
+
+    def test_parquet_written_to_partition(self, partitioned_workspace, temp_dir):
+        """Each plan's Parquet copy lives in its partition directory."""
+        workspace_manager, plans = partitioned_workspace
+
+        files = _parquet_files(temp_dir)
+
+        assert (f"mediaplans/campaign_id=camp_a/year=2024/meta_is_archived=false/"
+                f"{plans[0].meta.id}.parquet") in files
+        assert len(files) == 3
+        assert not os.path.exists(os.path.join(temp_dir, "mediaplans", f"{plans[0].meta.id}.parquet"))
+
+    def test_archive_moves_partition(self, partitioned_workspace, temp_dir):
+        """Archiving moves the Parquet copy instead of duplicating it."""
+        workspace_manager, plans = partitioned_workspace
+
+        plans[2].archive(workspace_manager)
+
+        files = [f for f in _parquet_files(temp_dir) if plans[2].meta.id in f]
+        assert len(files) == 1
+        assert parse_partition_path(files[0])["meta_is_archived"] == "true"
+
+    def test_delete_removes_partitioned_copy(self, partitioned_workspace, temp_dir):
+        """delete() finds and removes the partitioned Parquet copy."""
+        workspace_manager, plans = partitioned_workspace
+
+        result = plans[0].delete(workspace_manager)
+
+        assert result["files_deleted"] == 2
+        assert not [f for f in _parquet_files(temp_dir) if plans[0].meta.id in f]
+
+    def test_query_columns_match_flat_layout(self, partitioned_workspace):
+        """Partition directories are not read back as extra columns."""
+        workspace_manager, plans = partitioned_workspace
+
+        df = workspace_manager.sql_query("SELECT * FROM {*}")
+
+        assert "year" not in df.columns
+        assert len(df) == 6
+
+
+class TestPartitionPruning:
+    """Test that filters skip partitions that cannot match."""
+
+    def _listed_files(self, workspace_manager, monkeypatch):
+        """Record the files handed to DuckDB by pattern resolution."""
+        from mediaplanpy.workspace import query as query_module
+
+        listed = []
+        original = query_module._list_parquet_files
+
+        def recording_list(*args, **kwargs):
+            files = original(*args, **kwargs)
+            listed.extend(files)
+            return files
+
+        monkeypatch.setattr(query_module, "_list_parquet_files", recording_list)
+        return listed
+
+    def test_campaign_filter_prunes(self, partitioned_workspace, monkeypatch):
+        """list_mediaplans with a campaign_id filter only reads that campaign."""
+        workspace_manager, plans = partitioned_workspace
+        listed = self._listed_files(workspace_manager, monkeypatch)
+
+        result = workspace_manager.list_mediaplans(filters={"campaign_id": ["camp_b"]})
+
+        assert [row["meta_id"] for row in result] == [plans[2].meta.id]
+        assert len(listed) == 1
+        assert "campaign_id=camp_b" in listed[0]
+
+    def test_year_filter_prunes(self, partitioned_workspace, monkeypatch):
+        """A campaign_start_date range skips other years."""
+        workspace_manager, plans = partitioned_workspace
+        listed = self._listed_files(workspace_manager, monkeypatch)
+
+        result = workspace_manager.list_mediaplans(
+            filters={"campaign_start_date": {"min": "2025-01-01", "max": "2025-12-31"}}
+        )
+
+        assert {row["meta_id"] for row in result} == {plans[1].meta.id, plans[2].meta.id}
+        assert len(listed) == 2
+
+    def test_archived_partitions_skipped(self, partitioned_workspace, monkeypatch):
+        """list_campaigns (include_archived=False) skips archived partitions."""
+        workspace_manager, plans = partitioned_workspace
+        plans[2].archive(workspace_manager)
+        listed = self._listed_files(workspace_manager, monkeypatch)
+
+        campaigns = workspace_manager.list_campaigns()
+
+        assert [c["campaign_id"] for c in campaigns] == ["camp_a"]
+        assert all("meta_is_archived=false" in path for path in listed)
+
+    def test_raw_sql_query_partition_filters(self, partitioned_workspace):
+        """sql_query accepts partition_filters for raw queries."""
+        workspace_manager, plans = partitioned_workspace
+
+        df = workspace_manager.sql_query(
+            "SELECT DISTINCT meta_id FROM {*}",
+            partition_filters={"campaign_id": ["camp_a"], "year": {"min": 2025}}
+        )
+
+        assert df["meta_id"].tolist() == [plans[1].meta.id]
+
+    def test_catalog_with_partitioned_delta(self, partitioned_workspace, temp_dir):
+        """Compaction folds partitioned files into the catalog."""
+        workspace_manager, plans = partitioned_workspace
+
+        result = workspace_manager.compact_catalog()
+
+        assert result["delta_files_compacted"] == 3
+        assert _parquet_files(temp_dir) == []
+        filtered = workspace_manager.list_mediaplans(filters={"campaign_id": ["camp_a"]})
+        assert {row["meta_id"] for row in filtered} == {plans[0].meta.id, plans[1].meta.id}
+
+
+class TestBuildPartitionFilters:
+    """Test derivation of partition hints from list_* filters."""
+
+    @pytest.fixture
+    def workspace_manager(self, partitioned_workspace):
+        return partitioned_workspace[0]
+
+    def test_no_prunable_filters(self, workspace_manager):
+        assert workspace_manager._build_partition_filters({"lineitem_channel": "social"}) is None
+
+    def test_campaign_and_archived(self, workspace_manager):
+        result = workspace_manager._build_partition_filters(
+            {"campaign_id": "camp_a"}, include_archived=False
+        )
+        assert result == {"campaign_id": ["camp_a"], "meta_is_archived": ["false"]}
+
+    def test_regex_campaign_filter_not_pruned(self, workspace_manager):
+        assert workspace_manager._build_partition_filters({"campaign_id": {"regex": "camp_.*"}}) is None
+
+    def test_year_bounds(self, workspace_manager):
+        result = workspace_manager._build_partition_filters({
+            "campaign_start_date": {"min": "2024-02-01"},
+            "campaign_end_date": {"max": "2025-03-31"}
+        })
+        assert result == {"year": {"min": 2024, "max": 2025}}
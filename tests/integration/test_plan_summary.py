@@ -0,0 +1,194 @@
+"""
+Integration tests for the per-plan summary table.
+
+Tests the summary read by list_mediaplans() and list_campaigns(), including:
+- Results matching the line item aggregation
+- Summary built on first save, rows replaced on save, archive and restore,
+  and removed on delete
+- Filters on line item columns falling back to the aggregation
+- Rebuilding after the Parquet files change outside of save()/delete()
+"""
+
+import pytest
+import os
+import json
+
+import pandas as pd
+
+from mediaplanpy.workspace import WorkspaceManager
+from mediaplanpy.workspace.plan_summary import SUMMARY_PATH
+
+CHANNELS = ["social", "search"]
+
+
+@pytest.fixture
+def workspace_with_plans(make_local_workspace, make_mediaplan):
+    """Create a local workspace with four saved media plans."""
+    workspace_manager = make_local_workspace("test_plan_summary")
+
+    plans = []
+    for i in range(4):
+        media_plan = make_mediaplan(f"Campaign {i}", lineitem_count=i + 1, lineitem_end_date="2025-03-31",
+                                    channels=CHANNELS)
+        media_plan.save(workspace_manager)
+        plans.append(media_plan)
+
+    return workspace_manager, plans
+
+
+def _scanning_manager(workspace_manager):
+    """Load a second manager for the same workspace with the summary turned off."""
+    config_path = workspace_manager.workspace_path
+    with open(config_path) as f:
+        config = json.load(f)
+    config["query"] = {"plan_summary": False}
+    scan_config_path = os.path.join(os.path.dirname(config_path), "workspace_scan.json")
+    with open(scan_config_path, 'w') as f:
+        json.dump(config, f)
+
+    scanning_manager = WorkspaceManager(workspace_path=scan_config_path)
+    scanning_manager.load()
+    return scanning_manager
+
+
+def _sorted(df, key):
+    return df.sort_values(key).reset_index(drop=True)
+
+
+class TestPlanSummaryResults:
+    """Test that the summary returns the same results as the line item aggregation."""
+
+    def test_list_mediaplans_matches_scan(self, workspace_with_plans):
+        workspace_manager, _ = workspace_with_plans
+        scanning_manager = _scanning_manager(workspace_manager)
+
+        from_summary = workspace_manager.list_mediaplans(return_dataframe=True)
+        from_scan = scanning_manager.list_mediaplans(return_dataframe=True)
+
+        assert workspace_manager.get_storage_backend().exists(SUMMARY_PATH)
+        assert list(from_summary.columns) == list(from_scan.columns)
+        pd.testing.assert_frame_equal(_sorted(from_summary, 'meta_id'), _sorted(from_scan, 'meta_id'))
+
+    def test_list_campaigns_matches_scan(self, workspace_with_plans):
+        workspace_manager, _ = workspace_with_plans
+        scanning_manager = _scanning_manager(workspace_manager)
+
+        for include_stats in (True, False):
+            from_summary = workspace_manager.list_campaigns(include_stats=include_stats, return_dataframe=True)
+            from_scan = scanning_manager.list_campaigns(include_stats=include_stats, return_dataframe=True)
+            pd.testing.assert_frame_equal(from_summary, from_scan)
+
+    def test_plan_level_filters(self, workspace_with_plans):
+        workspace_manager, plans = workspace_with_plans
+
+        result = workspace_manager.list_mediaplans(filters={"campaign_name": "Campaign 2"})
+
+        assert [row['meta_id'] for row in result] == [plans[2].meta.id]
+        assert result[0]['stat_lineitem_count'] == 3
+
+    def test_lineitem_filters_fall_back_to_scan(self, workspace_with_plans):
+        workspace_manager, _ = workspace_with_plans
+
+        result = workspace_manager.list_mediaplans(filters={"lineitem_channel": "search"},
+                                                   return_dataframe=True)
+
+        # Only the search line items are aggregated; plan 0 has none
+        assert len(result) == 3
+        assert sorted(result['stat_lineitem_count']) == [1, 1, 2]
+
+
+class TestPlanSummaryMaintenance:
+    """Test that save() and delete() keep the summary up to date."""
+
+    def test_built_on_first_save(self, workspace_with_plans):
+        workspace_manager, _ = workspace_with_plans
+
+        assert workspace_manager.get_storage_backend().exists(SUMMARY_PATH)
+        assert workspace_manager.get_plan_summary().get_table().num_rows == 4
+
+    def test_shared_plan_id_rebuilds(self, workspace_with_plans, make_mediaplan):
+        workspace_manager, plans = workspace_with_plans
+
+        # A second plan saved under an existing ID to a different file
+        duplicate = make_mediaplan("Campaign Copy", channels=CHANNELS)
+        duplicate.meta.id = plans[0].meta.id
+        duplicate.save(workspace_manager, path="mediaplans/campaign_copy.json", overwrite=True)
+
+        result = workspace_manager.list_mediaplans(filters={"meta_id": plans[0].meta.id})
+        assert sorted(row['campaign_name'] for row in result) == ["Campaign 0", "Campaign Copy"]
+
+    def test_save_replaces_row(self, workspace_with_plans, monkeypatch):
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.list_mediaplans()
+
+        plans[0].create_lineitem({
+            "name": "Added Line Item",
+            "start_date": "2025-01-01",
+            "end_date": "2025-03-31",
+            "cost_total": 500
+        })
+        plans[0].save(workspace_manager, overwrite=True)
+
+        # Updated in place rather than rebuilt
+        def fail_rebuild(versions):
+            raise AssertionError("plan summary was rebuilt")
+        monkeypatch.setattr(workspace_manager.get_plan_summary(), "_rebuild", fail_rebuild)
+
+        result = workspace_manager.list_mediaplans(filters={"meta_id": plans[0].meta.id})
+        assert len(result) == 1
+        assert result[0]['stat_lineitem_count'] == 2
+        assert result[0]['stat_total_cost'] == 1500
+
+    def test_new_plan_added(self, workspace_with_plans, make_mediaplan):
+        workspace_manager, _ = workspace_with_plans
+        workspace_manager.list_campaigns()
+
+        make_mediaplan("Campaign 4", channels=CHANNELS).save(workspace_manager)
+
+        campaigns = workspace_manager.list_campaigns()
+        assert "Campaign 4" in [campaign['campaign_name'] for campaign in campaigns]
+        assert len(campaigns) == 5
+
+    def test_archive_and_restore(self, workspace_with_plans):
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.list_mediaplans()
+
+        plans[1].archive(workspace_manager)
+        active = workspace_manager.list_mediaplans(include_archived=False)
+        assert plans[1].meta.id not in [row['meta_id'] for row in active]
+        assert len(workspace_manager.list_campaigns()) == 3
+
+        plans[1].restore(workspace_manager)
+        active = workspace_manager.list_mediaplans(include_archived=False)
+        assert plans[1].meta.id in [row['meta_id'] for row in active]
+
+    def test_delete_removes_row(self, workspace_with_plans):
+        workspace_manager, plans = workspace_with_plans
+        workspace_manager.list_mediaplans()
+
+        plans[3].delete(workspace_manager)
+
+        result = workspace_manager.list_mediaplans()
+        assert plans[3].meta.id not in [row['meta_id'] for row in result]
+        assert len(result) == 3
+
+    def test_external_change_rebuilds(self, workspace_with_plans, make_mediaplan):
+        workspace_manager, _ = workspace_with_plans
+        assert len(workspace_manager.list_mediaplans()) == 4
+
+        # A plan saved through another manager does not update this one's copy
+        other_manager = WorkspaceManager(workspace_path=workspace_manager.workspace_path)
+        other_manager.load()
+        make_mediaplan("Campaign 4", channels=CHANNELS).save(other_manager)
+
+        assert len(workspace_manager.list_mediaplans()) == 5
+
+    def test_disabled_summary_not_written(self, workspace_with_plans):
+        workspace_manager, _ = workspace_with_plans
+        scanning_manager = _scanning_manager(workspace_manager)
+        scanning_manager.get_storage_backend().delete_file(SUMMARY_PATH)
+
+        scanning_manager.list_mediaplans()
+        scanning_manager.list_campaigns()
+
+        assert not scanning_manager.get_storage_backend().exists(SUMMARY_PATH)
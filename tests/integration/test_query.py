@@ -333,6 +333,128 @@ class TestListCampaigns:
         assert "campaign_id" in df.columns
 
 
+@pytest.fixture(params=[True, False], ids=["summary", "scan"])
+def workspace_with_plan_versions(request, temp_dir):
+    """Create a workspace with several plan versions per campaign.
+
+    Parametrized to read from the per-plan summary and from the line items.
+    """
+    config = {
+        "workspace_id": "test_workspace_plan_versions",
+        "workspace_name": "Test Workspace for Plan Versions",
+        "workspace_settings": {
+            "schema_version": "3.0"
+        },
+        "storage": {
+            "mode": "local",
+            "local": {
+                "base_path": temp_dir
+            }
+        },
+        "database": {
+            "enabled": False
+        },
+        "query": {
+            "plan_summary": request.param
+        }
+    }
+
+    config_path = os.path.join(temp_dir, "workspace.json")
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+
+    workspace_manager = WorkspaceManager(workspace_path=config_path)
+    workspace_manager.load()
+
+    def make_plan(meta_id, campaign_id, created_at, is_current, lineitem_count=1):
+        meta = Meta(
+            id=meta_id,
+            schema_version="v3.0",
+            name=f"Plan {meta_id}",
+            created_by_name="Test User",
+            created_at=created_at,
+            is_current=is_current
+        )
+        campaign = Campaign(
+            id=campaign_id,
+            name=f"Campaign {campaign_id}",
+            objective="awareness",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 12, 31),
+            budget_total=Decimal("50000")
+        )
+        lineitems = [
+            LineItem(
+                id=f"LI_{meta_id}_{i}",
+                name=f"Line Item {i} for {meta_id}",
+                start_date=date(2025, 1, 1),
+                end_date=date(2025, 3, 31),
+                cost_total=Decimal("1000"),
+                channel="display"
+            )
+            for i in range(lineitem_count)
+        ]
+        plan = MediaPlan(meta=meta, campaign=campaign, lineitems=lineitems)
+        # overwrite=True keeps the given created_at
+        plan.save(workspace_manager, overwrite=True)
+        return plan
+
+    # Campaign B: the current plan is older than the latest version
+    make_plan("MP_B_1", "CAM_B", datetime(2025, 1, 1), is_current=True, lineitem_count=2)
+    make_plan("MP_B_2", "CAM_B", datetime(2025, 3, 1), is_current=False, lineitem_count=3)
+    make_plan("MP_B_3", "CAM_B", datetime(2025, 2, 1), is_current=False)
+    # Campaign A: no current plan, so the latest version represents it
+    make_plan("MP_A_1", "CAM_A", datetime(2025, 1, 1), is_current=False)
+    make_plan("MP_A_2", "CAM_A", datetime(2025, 2, 1), is_current=False, lineitem_count=4)
+
+    return workspace_manager
+
+
+class TestListCampaignsCurrentPlan:
+    """Test the per-campaign plan selection done in the query engine."""
+
+    def test_one_row_per_campaign(self, workspace_with_plan_versions):
+        """Each campaign is represented by its current, else latest, plan."""
+        campaigns = workspace_with_plan_versions.list_campaigns()
+
+        assert [c["campaign_id"] for c in campaigns] == ["CAM_A", "CAM_B"]
+        assert [c["meta_id"] for c in campaigns] == ["MP_A_2", "MP_B_1"]
+        assert [c["stat_lineitem_count"] for c in campaigns] == [4, 2]
+        assert [c["stat_media_plan_count"] for c in campaigns] == [2, 3]
+        assert all(c["stat_last_updated"] == c["meta_created_at"] for c in campaigns)
+
+    def test_no_stats(self, workspace_with_plan_versions):
+        """The selection also applies without statistics."""
+        campaigns = workspace_with_plan_versions.list_campaigns(include_stats=False)
+
+        assert [c["meta_id"] for c in campaigns] == ["MP_A_2", "MP_B_1"]
+        assert "stat_media_plan_count" not in campaigns[0]
+
+    def test_arrow_result(self, workspace_with_plan_versions):
+        """Only one row per campaign comes back from the engine."""
+        table = workspace_with_plan_versions.list_campaigns(result_format="arrow")
+
+        assert table.num_rows == 2
+        assert table.column("meta_id").to_pylist() == ["MP_A_2", "MP_B_1"]
+
+    def test_database_query_shape(self, workspace_with_plan_versions):
+        """The PostgreSQL variant is a single SELECT that takes the workspace filter."""
+        from mediaplanpy.workspace.query import _build_campaigns_query, _validate_sql_safety
+
+        workspace_manager = workspace_with_plan_versions
+        params = {}
+        query = _build_campaigns_query("{*}", engine="database")
+        query = workspace_manager._add_sql_filters(query, {"campaign_id": "CAM_A"}, params)
+        query = workspace_manager._add_workspace_filter(query, "ws", params)
+
+        _validate_sql_safety(query)
+        assert query.startswith("SELECT DISTINCT ON (campaign_id)")
+        assert "QUALIFY" not in query
+        where_clause = query[query.index("WHERE"):query.index("GROUP BY")]
+        assert "workspace_id = $mediaplanpy_workspace_id" in where_clause
+        assert "campaign_id = $filter_0" in where_clause
+
+
 class TestListLineItems:
     """Test list_lineitems() with v3.0 line items."""
 
@@ -443,6 +565,1126 @@ class TestSQLQuery:
         assert result is not None
 
 
+
+class TestDuckDBSessionPool:
+    """Test the workspace-owned DuckDB session pool behind sql_query()."""
+
+    def test_queries_reuse_pool(self, temp_workspace_with_v3_plans):
+        """Consecutive queries share one pool and reuse its idle session."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT COUNT(*) FROM {*}")
+        pool = workspace_manager.get_duckdb_session_pool()
+        workspace_manager.list_mediaplans()
+        workspace_manager.list_campaigns()
+
+        assert workspace_manager.get_duckdb_session_pool() is pool
+        assert len(pool._idle) == 1
+
+    def test_failed_query_discards_session(self, temp_workspace_with_v3_plans):
+        """A session that raised is not returned to the pool."""
+        from mediaplanpy.exceptions import SQLQueryError
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        pool = workspace_manager.get_duckdb_session_pool()
+
+        with pytest.raises(SQLQueryError):
+            workspace_manager.sql_query("SELECT no_such_column FROM {*}")
+
+        assert len(pool._idle) == 0
+        assert len(workspace_manager.sql_query("SELECT * FROM {*}")) > 0
+
+    def test_concurrent_queries(self, temp_workspace_with_v3_plans):
+        """Queries from several threads each get their own session."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        expected = len(workspace_manager.sql_query("SELECT * FROM {*}"))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(
+                lambda _: len(workspace_manager.sql_query("SELECT * FROM {*}")), range(32)
+            ))
+
+        assert counts == [expected] * 32
+        pool = workspace_manager.get_duckdb_session_pool()
+        assert len(pool._idle) <= pool.max_sessions
+
+    def test_close_and_refresh(self, temp_workspace_with_v3_plans):
+        """close/refresh replace the pool; queries keep working afterwards."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        pool = workspace_manager.get_duckdb_session_pool()
+
+        refreshed = workspace_manager.refresh_duckdb_sessions()
+        assert pool.closed
+        assert refreshed is not pool
+
+        workspace_manager.close_duckdb_sessions()
+        assert refreshed.closed
+        assert len(workspace_manager.sql_query("SELECT * FROM {*}")) > 0
+
+    def test_reload_closes_pool(self, temp_workspace_with_v3_plans):
+        """Loading a configuration closes sessions built on the old backend."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        pool = workspace_manager.get_duckdb_session_pool()
+
+        workspace_manager.load()
+
+        assert pool.closed
+        assert workspace_manager.get_duckdb_session_pool() is not pool
+
+class TestQueryResultCache:
+    """Test the DuckDB query result cache behind sql_query()."""
+
+    def test_repeated_query_served_from_cache(self, temp_workspace_with_v3_plans):
+        """An identical query over unchanged files does not reach DuckDB."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        first = workspace_manager.list_campaigns()
+        workspace_manager.close_duckdb_sessions()
+        workspace_manager._duckdb_pool = None
+        workspace_manager.get_duckdb_session_pool = lambda: pytest.fail("query reached DuckDB")
+
+        assert workspace_manager.list_campaigns() == first
+        assert workspace_manager.get_query_result_cache().stats()["hits"] == 1
+
+    def test_whitespace_differences_share_entry(self, temp_workspace_with_v3_plans):
+        """Queries differing only in layout share a cache entry."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+        workspace_manager.sql_query("SELECT  COUNT(*) AS n\n  FROM {*}\n")
+
+        assert workspace_manager.get_query_result_cache().stats()["hits"] == 1
+
+    def test_changed_file_invalidates(self, temp_workspace_with_v3_plans, temp_dir):
+        """Rewriting a Parquet file outside the SDK changes the fingerprint."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+
+        parquet_path = os.path.join(temp_dir, "mediaplans", "mediaplan_minimal.parquet")
+        stat_info = os.stat(parquet_path)
+        os.utime(parquet_path, ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns + 1_000_000))
+
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+
+        assert workspace_manager.get_query_result_cache().stats()["hits"] == 0
+
+    def test_save_clears_cache(self, temp_workspace_with_v3_plans, mediaplan_v3_minimal):
+        """Saving a media plan through the workspace clears cached results."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        before = len(workspace_manager.list_mediaplans())
+
+        mediaplan_v3_minimal.meta.id = "mediaplan_cache_test"
+        mediaplan_v3_minimal.save(workspace_manager, path="mediaplans/mediaplan_cache_test.json")
+
+        assert workspace_manager.get_query_result_cache().stats()["entries"] == 0
+        assert len(workspace_manager.list_mediaplans()) == before + 1
+
+    def test_cached_result_is_a_copy(self, temp_workspace_with_v3_plans):
+        """Modifying a returned DataFrame does not change the cached result."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        df = workspace_manager.sql_query("SELECT meta_id FROM {*}")
+        df["meta_id"] = "changed"
+
+        assert "changed" not in workspace_manager.sql_query("SELECT meta_id FROM {*}")["meta_id"].tolist()
+
+    def test_use_cache_false_bypasses(self, temp_workspace_with_v3_plans):
+        """use_cache=False neither reads nor fills the cache."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT COUNT(*) FROM {*}", use_cache=False)
+
+        assert workspace_manager.get_query_result_cache().stats()["entries"] == 0
+
+    def test_lru_eviction_within_budget(self):
+        """Least recently used entries are evicted to stay within the budget."""
+        import pandas as pd
+        from mediaplanpy.workspace.result_cache import QueryResultCache
+
+        frame = pd.DataFrame({"value": range(100)})
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        cache = QueryResultCache(max_bytes=size * 2)
+
+        cache.put("a", frame)
+        cache.put("b", frame)
+        cache.get("a")
+        cache.put("c", frame)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.put("big", pd.concat([frame] * 3)) is False
+
+    def test_normalize_query_keeps_literals(self):
+        """Whitespace inside string literals is significant."""
+        from mediaplanpy.workspace.result_cache import normalize_query
+
+        assert normalize_query(" SELECT *\n FROM {*} ") == "SELECT * FROM {*}"
+        assert normalize_query("SELECT 'a  b'") != normalize_query("SELECT 'a b'")
+
+
+class TestLoadWorkspaceData:
+    """Test the pyarrow.dataset scan behind _load_workspace_data()."""
+
+    def test_column_projection(self, temp_workspace_with_v3_plans):
+        """Only the requested columns are returned."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        df = workspace_manager._load_workspace_data(columns=["meta_id", "lineitem_cost_total"])
+
+        assert list(df.columns) == ["meta_id", "lineitem_cost_total"]
+        assert len(df) == len(workspace_manager._load_workspace_data())
+
+    def test_pushed_down_range_filter(self, temp_workspace_with_v3_plans):
+        """Numeric range filters are applied by the scan."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        all_rows = workspace_manager._load_workspace_data()
+        threshold = all_rows["lineitem_cost_total"].max()
+
+        df = workspace_manager._load_workspace_data(
+            filters={"lineitem_cost_total": {"min": threshold}}, columns=["lineitem_cost_total"]
+        )
+
+        assert len(df) == (all_rows["lineitem_cost_total"] >= threshold).sum()
+        assert (df["lineitem_cost_total"] >= threshold).all()
+
+    def test_residual_filters_match_apply_filters(self, temp_workspace_with_v3_plans):
+        """Regex and string date filters give the same rows as _apply_filters()."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        all_rows = workspace_manager._load_workspace_data()
+        filters = {
+            "campaign_start_date": {"min": "2000-01-01"},
+            "lineitem_name": {"regex": ".*"},
+        }
+
+        df = workspace_manager._load_workspace_data(filters=filters)
+
+        assert len(df) == len(workspace_manager._apply_filters(all_rows, filters))
+
+    def test_corrupt_file_skipped_alone(self, temp_workspace_with_v3_plans):
+        """An unreadable file only loses its own rows, not those of the files scanned with it."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        all_rows = workspace_manager._load_workspace_data()
+        assert len(all_rows) > 0
+
+        workspace_manager.get_storage_backend().write_file("mediaplans/corrupt.parquet", b"not a parquet file")
+
+        df = workspace_manager._load_workspace_data()
+
+        assert len(df) == len(all_rows)
+        assert sorted(df["meta_id"].unique()) == sorted(all_rows["meta_id"].unique())
+
+    def test_build_arrow_filter_splits_filters(self):
+        """Filters on missing columns or with values not fitting the column type stay residual."""
+        import pyarrow as pa
+        from mediaplanpy.workspace.query import _build_arrow_filter
+
+        schema = pa.schema([
+            ("campaign_id", pa.string()),
+            ("campaign_start_date", pa.string()),
+            ("lineitem_cost_total", pa.float64()),
+        ])
+
+        expression, residual = _build_arrow_filter(schema, {
+            "campaign_id": ["CAM_001", "CAM_002"],
+            "campaign_start_date": {"min": "2025-01-01"},
+            "lineitem_cost_total": {"max": "1000"},
+            "missing_column": 1,
+        })
+
+        assert expression is not None
+        assert set(residual) == {"campaign_start_date", "lineitem_cost_total", "missing_column"}
+
+
+class TestSQLQueryIter:
+    """Test streaming query results with sql_query_iter()."""
+
+    def test_yields_record_batches(self, temp_workspace_with_v3_plans):
+        """Streamed batches hold the same rows as sql_query()."""
+        import pyarrow as pa
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        batches = list(workspace_manager.sql_query_iter("SELECT meta_id FROM {*}", batch_size=1))
+
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        assert all(batch.num_rows <= 1 for batch in batches)
+        streamed = sorted(pa.Table.from_batches(batches).column("meta_id").to_pylist())
+        expected = sorted(workspace_manager.sql_query("SELECT meta_id FROM {*}")["meta_id"].tolist())
+        assert streamed == expected
+
+    def test_limit(self, temp_workspace_with_v3_plans):
+        """The limit caps the total number of streamed rows."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        batches = workspace_manager.sql_query_iter("SELECT * FROM {*}", limit=1)
+
+        assert sum(batch.num_rows for batch in batches) == 1
+
+    def test_empty_workspace_yields_nothing(self, temp_dir):
+        """A workspace without Parquet files streams no batches."""
+        config_path = os.path.join(temp_dir, "workspace.json")
+        with open(config_path, 'w') as f:
+            json.dump({
+                "workspace_id": "test_empty_stream",
+                "workspace_name": "Empty Stream",
+                "workspace_settings": {"schema_version": "3.0"},
+                "storage": {"mode": "local", "local": {"base_path": temp_dir}},
+                "database": {"enabled": False}
+            }, f)
+        workspace_manager = WorkspaceManager(workspace_path=config_path)
+        workspace_manager.load()
+
+        assert list(workspace_manager.sql_query_iter("SELECT * FROM {*}")) == []
+
+    def test_invalid_batch_size(self, temp_workspace_with_v3_plans):
+        """Non-positive batch sizes are rejected up front."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.sql_query_iter("SELECT * FROM {*}", batch_size=0)
+
+    def test_closed_iterator_discards_session(self, temp_workspace_with_v3_plans):
+        """A stream closed part-way through does not return its session to the pool."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        pool = workspace_manager.get_duckdb_session_pool()
+
+        batches = workspace_manager.sql_query_iter("SELECT * FROM {*}", batch_size=1)
+        next(batches)
+        batches.close()
+
+        assert pool._idle == []
+        assert len(workspace_manager.sql_query("SELECT * FROM {*}", use_cache=False)) >= 1
+
+    def test_iter_lineitems_matches_list_lineitems(self, temp_workspace_with_v3_plans):
+        """iter_lineitems() streams the rows list_lineitems() returns."""
+        import pyarrow as pa
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        table = pa.Table.from_batches(list(workspace_manager.iter_lineitems(batch_size=1)))
+        expected = workspace_manager.list_lineitems(return_dataframe=True)
+
+        assert table.column("lineitem_id").to_pylist() == expected["lineitem_id"].tolist()
+
+
+class TestResultFormats:
+    """Test the result_format option of sql_query() and the list_* methods."""
+
+    def test_arrow_result(self, temp_workspace_with_v3_plans):
+        """result_format='arrow' returns a pyarrow Table with the same rows."""
+        import pyarrow as pa
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        table = workspace_manager.sql_query("SELECT meta_id FROM {*} ORDER BY meta_id", result_format="arrow")
+        df = workspace_manager.sql_query("SELECT meta_id FROM {*} ORDER BY meta_id")
+
+        assert isinstance(table, pa.Table)
+        assert table.column("meta_id").to_pylist() == df["meta_id"].tolist()
+
+    def test_records_matches_return_dataframe_false(self, temp_workspace_with_v3_plans):
+        """result_format='records' is the same as return_dataframe=False."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        assert (workspace_manager.list_mediaplans(result_format="records")
+                == workspace_manager.list_mediaplans(return_dataframe=False))
+
+    def test_result_format_overrides_return_dataframe(self, temp_workspace_with_v3_plans):
+        """An explicit result_format wins over return_dataframe."""
+        import pandas as pd
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        assert isinstance(workspace_manager.list_lineitems(result_format="pandas"), pd.DataFrame)
+
+    def test_list_campaigns_arrow(self, temp_workspace_with_v3_plans):
+        """list_campaigns() converts its result to Arrow."""
+        import pyarrow as pa
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        table = workspace_manager.list_campaigns(result_format="arrow")
+        df = workspace_manager.list_campaigns(return_dataframe=True)
+
+        assert isinstance(table, pa.Table)
+        assert table.column("campaign_id").to_pylist() == df["campaign_id"].tolist()
+
+    def test_polars_result(self, temp_workspace_with_v3_plans):
+        """result_format='polars' returns a Polars DataFrame."""
+        pl = pytest.importorskip("polars")
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        result = workspace_manager.list_lineitems(result_format="polars")
+
+        assert isinstance(result, pl.DataFrame)
+        assert result.height == len(workspace_manager.list_lineitems())
+
+    def test_arrow_results_cached_separately(self, temp_workspace_with_v3_plans):
+        """Arrow and pandas results of one query use separate cache entries."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT meta_id FROM {*}")
+        table = workspace_manager.sql_query("SELECT meta_id FROM {*}", result_format="arrow")
+        cached = workspace_manager.sql_query("SELECT meta_id FROM {*}", result_format="arrow")
+
+        assert cached.equals(table)
+        assert workspace_manager.get_query_result_cache().stats()["entries"] == 2
+        assert workspace_manager.get_query_result_cache().stats()["hits"] == 1
+
+    def test_empty_workspace_arrow(self, temp_dir):
+        """An empty workspace returns an empty Arrow table."""
+        import pyarrow as pa
+
+        config_path = os.path.join(temp_dir, "workspace.json")
+        with open(config_path, 'w') as f:
+            json.dump({
+                "workspace_id": "test_empty_arrow",
+                "workspace_name": "Empty Arrow",
+                "workspace_settings": {"schema_version": "3.0"},
+                "storage": {"mode": "local", "local": {"base_path": temp_dir}},
+                "database": {"enabled": False}
+            }, f)
+        workspace_manager = WorkspaceManager(workspace_path=config_path)
+        workspace_manager.load()
+
+        result = workspace_manager.list_mediaplans(result_format="arrow")
+
+        assert isinstance(result, pa.Table)
+        assert result.num_rows == 0
+
+    def test_invalid_result_format(self, temp_workspace_with_v3_plans):
+        """Unknown result formats are rejected."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.sql_query("SELECT * FROM {*}", result_format="excel")
+
+
+class TestBoundParameters:
+    """Test that filter values are bound as query parameters."""
+
+    def test_sql_query_params(self, temp_workspace_with_v3_plans):
+        """$name placeholders are bound from params."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        df = workspace_manager.sql_query(
+            "SELECT DISTINCT campaign_id, $label AS label FROM {*} WHERE campaign_id = $campaign",
+            params={"campaign": "CAM001", "label": "O'Brien & Co"}
+        )
+
+        assert df["campaign_id"].tolist() == ["CAM001"]
+        assert df["label"].tolist() == ["O'Brien & Co"]
+
+    def test_same_filter_shape_same_sql(self, temp_workspace_with_v3_plans):
+        """Filters differing only in their values compile to identical SQL."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        first, second = {}, {}
+        query_first = workspace_manager._build_lineitems_query(
+            {"campaign_id": "CAM001", "lineitem_cost_total": {"min": 100}}, first)
+        query_second = workspace_manager._build_lineitems_query(
+            {"campaign_id": "CAM002", "lineitem_cost_total": {"min": "2500.50"}}, second)
+
+        assert query_first == query_second
+        assert first == {"filter_0": "CAM001", "filter_1": 100}
+        assert second == {"filter_0": "CAM002", "filter_1": Decimal("2500.50")}
+
+    def test_filter_values_are_not_rewritten(self, temp_workspace_with_v3_plans):
+        """Quotes and punctuation in filter values are matched exactly, not stripped."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        assert workspace_manager.list_lineitems(filters={"lineitem_name": "x' OR '1'='1"}) == []
+        assert len(workspace_manager.list_lineitems(filters={"campaign_id": ["CAM001", "CAM'002"]})) \
+            == len(workspace_manager.list_lineitems(filters={"campaign_id": "CAM001"}))
+
+    def test_non_numeric_value_for_numeric_column(self, temp_workspace_with_v3_plans):
+        """A non-numeric value for a numeric column is rejected."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.list_lineitems(filters={"lineitem_cost_total": {"min": "cheap"}})
+
+    def test_params_part_of_cache_key(self, temp_workspace_with_v3_plans):
+        """Cached results are not shared between different parameter values."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        query = "SELECT DISTINCT campaign_id FROM {*} WHERE campaign_id = $campaign"
+        first = workspace_manager.sql_query(query, params={"campaign": "CAM001"})
+        second = workspace_manager.sql_query(query, params={"campaign": "CAM002"})
+
+        assert first["campaign_id"].tolist() == ["CAM001"]
+        assert second["campaign_id"].tolist() == ["CAM002"]
+
+    def test_reserved_param_names_rejected(self, temp_workspace_with_v3_plans):
+        """Parameter names used for workspace isolation cannot be supplied."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.sql_query("SELECT * FROM {*}", params={"mediaplanpy_workspace_id": "other"})
+
+
+class TestAsyncQueries:
+    """Test the asyncio query methods."""
+
+    def test_results_match_sync(self, temp_workspace_with_v3_plans):
+        """Async methods return the same results as their sync counterparts."""
+        import asyncio
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        async def run():
+            return await asyncio.gather(
+                workspace_manager.sql_query_async("SELECT COUNT(*) AS n FROM {*}", use_cache=False),
+                workspace_manager.list_campaigns_async(),
+                workspace_manager.list_mediaplans_async(include_stats=False),
+                workspace_manager.list_lineitems_async(limit=10, result_format="arrow"),
+            )
+
+        count, campaigns, mediaplans, lineitems = asyncio.run(run())
+
+        assert count["n"][0] == workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")["n"][0]
+        assert campaigns == workspace_manager.list_campaigns()
+        assert mediaplans == workspace_manager.list_mediaplans(include_stats=False)
+        assert lineitems.num_rows == len(workspace_manager.list_lineitems(limit=10))
+
+    def test_event_loop_not_blocked(self, temp_workspace_with_v3_plans, monkeypatch):
+        """Other coroutines keep running while a query executes."""
+        import asyncio
+        import time
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        def slow_query(*args, **kwargs):
+            time.sleep(0.3)
+            return "done"
+        monkeypatch.setattr(workspace_manager, "sql_query", slow_query)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker_task = asyncio.ensure_future(ticker())
+            result = await workspace_manager.sql_query_async("SELECT 1")
+            ticker_task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result == "done"
+        assert ticks > 5
+
+    def test_profile_visible_to_caller(self, temp_workspace_with_v3_plans):
+        """The awaiting task sees the profile and routing decision of its query."""
+        import asyncio
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        async def run():
+            await workspace_manager.sql_query_async("SELECT COUNT(*) AS n FROM {*}", profile=True)
+            return workspace_manager.get_last_query_profile(), workspace_manager.get_query_router().last_decision
+
+        profile, decision = asyncio.run(run())
+        assert profile is not None
+        assert profile.stage_seconds("execute") > 0
+        assert decision.engine == "duckdb"
+        # Outside the task, the calling thread's own state is unchanged
+        assert workspace_manager.get_last_query_profile() is None
+
+    def test_executor_bounded(self, temp_workspace_with_v3_plans, monkeypatch):
+        """No more than query.async_workers queries run at once."""
+        import asyncio
+        import threading
+        import time
+
+        with open(temp_workspace_with_v3_plans) as f:
+            config = json.load(f)
+        config["query"] = {"async_workers": 2}
+        with open(temp_workspace_with_v3_plans, 'w') as f:
+            json.dump(config, f)
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def tracked_query(*args, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+        monkeypatch.setattr(workspace_manager, "sql_query", tracked_query)
+
+        async def run():
+            await asyncio.gather(*[workspace_manager.sql_query_async("SELECT 1") for _ in range(6)])
+
+        asyncio.run(run())
+        workspace_manager.close_query_executor()
+
+        assert peak == 2
+        assert workspace_manager._query_executor is None
+
+
+@pytest.fixture
+def routed_workspace(temp_workspace_with_v3_plans, monkeypatch):
+    """Workspace with an enabled (stubbed) database and adaptive query routing."""
+    import time
+    import mediaplanpy.storage.database as database_module
+
+    with open(temp_workspace_with_v3_plans) as f:
+        config = json.load(f)
+    config["query"] = {"routing": "adaptive"}
+    with open(temp_workspace_with_v3_plans, 'w') as f:
+        json.dump(config, f)
+
+    workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+    workspace_manager.load()
+    monkeypatch.setattr(workspace_manager, "get_database_config",
+                        lambda: {"enabled": True, "health_check_ttl": 60})
+
+    class FakeBackend:
+        healthy = True
+        checks = 0
+
+        def __init__(self, config):
+            pass
+
+        def test_connection(self):
+            FakeBackend.checks += 1
+            return FakeBackend.healthy
+    monkeypatch.setattr(database_module, "PostgreSQLBackend", FakeBackend)
+
+    # The "database" answers like DuckDB, only slower
+    database_queries = []
+
+    def fake_postgres(query, limit=None, result_format="pandas", params=None):
+        database_queries.append(query)
+        time.sleep(0.02)
+        return workspace_manager._sql_query_duckdb(query, limit=limit, use_cache=False,
+                                                   result_format=result_format, params=params)
+    monkeypatch.setattr(workspace_manager, "_sql_query_postgres", fake_postgres)
+
+    workspace_manager.fake_backend = FakeBackend
+    workspace_manager.database_queries = database_queries
+    return workspace_manager
+
+
+class TestQueryRouting:
+    """Test engine routing between DuckDB and the database."""
+
+    def test_default_mode_routes_to_database(self, routed_workspace, monkeypatch):
+        """Without adaptive routing, an enabled database receives every auto query."""
+        config = routed_workspace.get_resolved_config()
+        monkeypatch.setitem(config, "query", {})
+
+        routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*}")
+
+        decision = routed_workspace.get_query_router().last_decision
+        assert decision.engine == "database"
+        assert "query.routing" in decision.reason
+        assert len(routed_workspace.database_queries) == 1
+
+    def test_health_check_cached(self, routed_workspace):
+        """Explicit database queries reuse the cached connection check."""
+        for _ in range(3):
+            routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*}", engine="database")
+        assert routed_workspace.fake_backend.checks == 1
+
+        routed_workspace.get_query_router().expire_health()
+        routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*}", engine="database")
+        assert routed_workspace.fake_backend.checks == 2
+
+    def test_unhealthy_database(self, routed_workspace):
+        """Auto queries fall back to DuckDB; explicit database queries fail."""
+        routed_workspace.fake_backend.healthy = False
+
+        routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*}")
+        assert routed_workspace.get_query_router().last_decision.engine == "duckdb"
+        assert "unavailable" in routed_workspace.get_query_router().last_decision.reason
+
+        with pytest.raises(WorkspaceManager.SQLQueryError, match="connection failed"):
+            routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*}", engine="database")
+        assert routed_workspace.fake_backend.checks == 1
+
+    def test_single_plan_lookup_uses_duckdb(self, routed_workspace):
+        """Queries naming individual plans read their Parquet file."""
+        routed_workspace.sql_query("SELECT COUNT(*) AS n FROM {*minimal*}")
+
+        decision = routed_workspace.get_query_router().last_decision
+        assert decision.engine == "duckdb"
+        assert "single-plan" in decision.reason
+        assert routed_workspace.database_queries == []
+
+    def test_adaptive_picks_faster_engine(self, routed_workspace):
+        """After sampling both engines, a query shape goes to the faster one."""
+        from mediaplanpy.workspace.query_router import MIN_SAMPLES_PER_ENGINE
+
+        router = routed_workspace.get_query_router()
+        engines = []
+        for channel in ["a", "b"] * (MIN_SAMPLES_PER_ENGINE + 2):
+            routed_workspace.sql_query(f"SELECT COUNT(*) AS n FROM {{*}} WHERE lineitem_channel = '{channel}'",
+                                       use_cache=False)
+            engines.append(router.last_decision.engine)
+
+        # Queries differing only in their literals share one shape
+        shapes = router.stats()["shapes"]
+        assert len(shapes) == 1
+        counts = next(iter(shapes.values()))
+        assert counts["duckdb"]["count"] >= MIN_SAMPLES_PER_ENGINE
+        assert counts["database"]["count"] == MIN_SAMPLES_PER_ENGINE
+
+        assert engines[-1] == "duckdb"
+        assert router.last_decision.reason.startswith("faster")
+
+    def test_list_filters_follow_routed_engine(self, routed_workspace, monkeypatch):
+        """List methods compile engine-specific filters for the engine they run on."""
+        config = routed_workspace.get_resolved_config()
+        monkeypatch.setitem(config, "query", {})
+
+        routed_workspace.database_queries.clear()
+        monkeypatch.setattr(routed_workspace, "_sql_query_postgres",
+                            lambda query, **kwargs: routed_workspace.database_queries.append(query) or [])
+
+        routed_workspace.list_lineitems(filters={"lineitem_name": {"regex": "^Line"}})
+
+        assert len(routed_workspace.database_queries) == 1
+        assert "lineitem_name ~ $filter_0" in routed_workspace.database_queries[0]
+        assert routed_workspace.get_query_router().last_decision.shape == "list_lineitems(lineitem_name)"
+
+
+class TestQueryProfiling:
+    """Test per-stage query profiling."""
+
+    def test_profile_stages(self, temp_workspace_with_v3_plans):
+        """profile=True records each stage and the EXPLAIN ANALYZE output."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        query = "SELECT COUNT(*) AS n FROM {*}"
+
+        df = workspace_manager.sql_query(query, profile=True)
+        profile = workspace_manager.get_last_query_profile()
+
+        assert df["n"][0] == workspace_manager.sql_query(query, use_cache=False)["n"][0]
+        data = profile.as_dict()
+        for stage in ["validate", "route", "resolve_patterns", "session_setup", "execute", "fetch", "convert"]:
+            assert stage in data["stages_ms"]
+        assert data["engine"] == "duckdb"
+        assert data["rows"] == 1
+        assert data["cache_hit"] is False
+        assert "Query Profiling Information" in profile.explain
+        assert data["total_ms"] > 0
+        assert "resolve_patterns" in profile.format()
+
+    def test_cache_hit_recorded(self, temp_workspace_with_v3_plans):
+        """A cached result is flagged and skips execution."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        query = "SELECT COUNT(*) AS n FROM {*}"
+
+        workspace_manager.sql_query(query)
+        workspace_manager.sql_query(query, profile=True)
+        data = workspace_manager.get_last_query_profile().as_dict()
+
+        assert data["cache_hit"] is True
+        assert "execute" not in data["stages_ms"]
+
+    def test_not_profiled_by_default(self, temp_workspace_with_v3_plans):
+        """Queries are only profiled on request."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+        workspace_manager.list_lineitems()
+
+        assert workspace_manager.get_last_query_profile() is None
+
+    def test_workspace_toggle_profiles_list_methods(self, temp_workspace_with_v3_plans, caplog):
+        """query.profile profiles list_* calls as one query and logs the breakdown."""
+        import logging
+
+        with open(temp_workspace_with_v3_plans) as f:
+            config = json.load(f)
+        config["query"] = {"profile": True}
+        with open(temp_workspace_with_v3_plans, 'w') as f:
+            json.dump(config, f)
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with caplog.at_level(logging.INFO, logger="mediaplanpy.workspace.query_profile"):
+            lineitems = workspace_manager.list_lineitems(filters={"lineitem_name": ["none"]})
+        profile = workspace_manager.get_last_query_profile()
+
+        assert profile.label == "list_lineitems"
+        assert profile.rows == len(lineitems)
+        assert profile.as_dict()["stages_ms"]["route"] >= 0
+        assert "Query profile: list_lineitems" in caplog.text
+
+
+class TestQueryStats:
+    """Test the query statistics registry and slow-query log."""
+
+    @staticmethod
+    def _set_query_config(workspace_path, **settings):
+        with open(workspace_path) as f:
+            config = json.load(f)
+        config["query"] = settings
+        with open(workspace_path, 'w') as f:
+            json.dump(config, f)
+
+    def test_queries_grouped_by_fingerprint(self, temp_workspace_with_v3_plans):
+        """Queries differing only in literal values share one entry with scan details."""
+        self._set_query_config(temp_workspace_with_v3_plans, scan_metrics=True)
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT * FROM {*} WHERE lineitem_cost_total > 100")
+        workspace_manager.sql_query("SELECT * FROM {*} WHERE lineitem_cost_total > 200")
+        workspace_manager.sql_query("SELECT * FROM {*} WHERE lineitem_cost_total > 200")
+        stats = workspace_manager.query_stats()
+
+        assert len(stats) == 1
+        entry = stats[0]
+        assert entry["query"] == "SELECT * FROM {*} WHERE lineitem_cost_total > ?"
+        assert entry["calls"] == 3
+        assert entry["engines"] == {"duckdb": 3}
+        assert entry["files_touched"] > 0
+        assert entry["bytes_scanned"] > 0
+        assert entry["mean_ms"] == pytest.approx(entry["total_ms"] / 3, abs=0.01)
+
+    def test_scan_metrics_off_by_default(self, temp_workspace_with_v3_plans):
+        """Without query.scan_metrics, sessions are not profiled and bytes are unknown."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT * FROM {*} WHERE lineitem_cost_total > 100")
+        entry = workspace_manager.query_stats()[0]
+
+        assert entry["files_touched"] > 0
+        assert entry["bytes_scanned"] is None
+        assert workspace_manager.get_duckdb_session_pool().scan_metrics is False
+
+    def test_list_methods_recorded(self, temp_workspace_with_v3_plans):
+        """list_* calls are recorded under their method and filter fields."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        campaigns = workspace_manager.list_campaigns()
+        workspace_manager.list_lineitems(filters={"lineitem_name": ["none"]})
+        queries = {entry["query"]: entry for entry in workspace_manager.query_stats(sort_by="calls")}
+
+        assert queries["list_campaigns(; include_archived=False; include_stats=True)"]["rows"] == len(campaigns)
+        assert "list_lineitems(lineitem_name)" in queries
+
+    def test_registry_is_bounded(self, temp_workspace_with_v3_plans):
+        """Beyond query.stats_max_queries the least recently run fingerprints are dropped."""
+        self._set_query_config(temp_workspace_with_v3_plans, stats_max_queries=2)
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        for column in ["campaign_id", "meta_id", "lineitem_id"]:
+            workspace_manager.sql_query(f"SELECT DISTINCT {column} FROM {{*}}")
+        queries = [entry["query"] for entry in workspace_manager.query_stats()]
+
+        assert sorted(queries) == ["SELECT DISTINCT lineitem_id FROM {*}", "SELECT DISTINCT meta_id FROM {*}"]
+        with pytest.raises(ValueError):
+            workspace_manager.query_stats(sort_by="bogus")
+
+    def test_slow_query_logged(self, temp_workspace_with_v3_plans, caplog):
+        """Queries over query.slow_query_ms are logged as structured warnings."""
+        import logging
+
+        self._set_query_config(temp_workspace_with_v3_plans, slow_query_ms=0.000001)
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        with caplog.at_level(logging.WARNING, logger="mediaplanpy.workspace.query_stats"):
+            workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+
+        records = [r for r in caplog.records if hasattr(r, "query_stats")]
+        assert len(records) == 1
+        assert records[0].query_stats["query"] == "SELECT COUNT(*) AS n FROM {*}"
+        assert records[0].query_stats["engine"] == "duckdb"
+        assert json.loads(records[0].getMessage()[len("Slow query: "):])["rows"] == 1
+        assert workspace_manager.query_stats()[0]["slow_calls"] == 1
+
+    def test_flushed_stats_merged(self, temp_workspace_with_v3_plans):
+        """Statistics written to workspace storage are merged by fingerprint."""
+        from mediaplanpy.workspace.query_stats import (
+            clear_persisted_stats, load_persisted_stats, summarize_entries
+        )
+
+        self._set_query_config(temp_workspace_with_v3_plans, stats_flush_seconds=0.000001)
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+        workspace_manager.sql_query("SELECT COUNT(*) AS n FROM {*}")
+        entries = load_persisted_stats(workspace_manager)
+        merged = summarize_entries(entries + entries)
+
+        assert len(entries) == 1
+        assert merged[0]["calls"] == 4
+        assert clear_persisted_stats(workspace_manager) == 1
+        assert load_persisted_stats(workspace_manager) == []
+
+
+class TestKeysetPagination:
+    """Test keyset pagination of list_lineitems_page() and list_mediaplans_page()."""
+
+    @staticmethod
+    def _all_pages(method, **kwargs):
+        items, token, pages = [], None, 0
+        while True:
+            page = method(page_token=token, **kwargs)
+            items.extend(page.items)
+            pages += 1
+            token = page.next_page_token
+            if token is None:
+                return items, pages
+
+    def test_lineitem_pages_cover_all_rows_in_order(self, temp_workspace_with_v3_plans):
+        """Paging returns every line item once, in list_lineitems() order."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lineitems = workspace_manager.list_lineitems()
+        paged, pages = self._all_pages(workspace_manager.list_lineitems_page, page_size=1)
+
+        assert pages == len(lineitems)
+        assert sorted((li["meta_id"], li["lineitem_id"]) for li in paged) == \
+            sorted((li["meta_id"], li["lineitem_id"]) for li in lineitems)
+        assert [(li["lineitem_start_date"], li["lineitem_name"]) for li in paged] == \
+            [(li["lineitem_start_date"], li["lineitem_name"]) for li in lineitems]
+
+    def test_mediaplan_pages(self, temp_workspace_with_v3_plans):
+        """Media plan pages follow list_mediaplans() order."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        plans = workspace_manager.list_mediaplans()
+        paged, _ = self._all_pages(workspace_manager.list_mediaplans_page, page_size=1)
+        first = workspace_manager.list_mediaplans_page(page_size=len(plans), result_format="pandas")
+
+        assert [plan["meta_id"] for plan in paged] == [plan["meta_id"] for plan in plans]
+        assert len(first.items) == len(plans)
+        assert first.next_page_token is None
+
+    def test_token_bound_to_listing(self, temp_workspace_with_v3_plans):
+        """Tokens are rejected for other filters and malformed tokens are reported."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        page = workspace_manager.list_lineitems_page(page_size=1)
+        assert page.next_page_token is not None
+
+        with pytest.raises(WorkspaceManager.SQLQueryError, match="different listing"):
+            workspace_manager.list_lineitems_page(filters={"lineitem_name": "x"},
+                                                  page_token=page.next_page_token)
+        with pytest.raises(WorkspaceManager.SQLQueryError, match="different listing"):
+            workspace_manager.list_mediaplans_page(page_token=page.next_page_token)
+        with pytest.raises(WorkspaceManager.SQLQueryError, match="Invalid page token"):
+            workspace_manager.list_lineitems_page(page_token="not-a-token")
+        with pytest.raises(WorkspaceManager.SQLQueryError, match="page_size"):
+            workspace_manager.list_lineitems_page(page_size=0)
+
+    def test_keyset_clause_sorts_nulls_last(self):
+        """A NULL key has nothing after it and a value is followed by NULLs."""
+        from mediaplanpy.workspace.pagination import keyset_clause
+
+        params = []
+
+        def bind(value):
+            params.append(value)
+            return f"$p{len(params)}"
+
+        keys = (("a", True), ("b", False))
+        assert keyset_clause(keys, [None, None], bind)[0] == "FALSE"
+        condition, order_by = keyset_clause(keys, [None, "x"], bind)
+        assert condition == "(a IS NULL AND (b > $p1 OR b IS NULL))"
+        assert order_by == "a DESC NULLS LAST, b ASC NULLS LAST"
+
+
+class TestAggregate:
+    """Test grouped aggregation with aggregate()."""
+
+    def test_matches_pandas_groupby(self, temp_workspace_with_v3_plans):
+        """Grouped sums and counts equal a pandas groupby over list_lineitems()."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lineitems = workspace_manager.list_lineitems(return_dataframe=True)
+        expected = lineitems.groupby("lineitem_channel", dropna=False).agg(
+            cost_total=("lineitem_cost_total", "sum"), lineitem_count=("lineitem_id", "size"))
+
+        result = workspace_manager.aggregate(["cost_total", "count"], by=["channel"])
+
+        assert list(result.columns) == ["channel", "cost_total", "lineitem_count"]
+        assert len(result) == len(expected)
+        for _, row in result.iterrows():
+            assert float(row["cost_total"]) == pytest.approx(float(expected.loc[row["channel"], "cost_total"]))
+            assert row["lineitem_count"] == expected.loc[row["channel"], "lineitem_count"]
+
+    def test_time_grain_and_filters(self, temp_workspace_with_v3_plans):
+        """time_grain adds a period column and filters restrict the line items."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lineitems = workspace_manager.list_lineitems(return_dataframe=True)
+        campaign_id = lineitems["campaign_id"].iloc[0]
+        campaign_rows = lineitems[lineitems["campaign_id"] == campaign_id]
+
+        monthly = workspace_manager.aggregate(["cost_total", "count_distinct:meta_id"],
+                                              filters={"campaign_id": campaign_id},
+                                              time_grain="month", result_format="records")
+
+        assert all(row["period"].day == 1 for row in monthly)
+        assert sum(row["cost_total"] for row in monthly) == \
+            pytest.approx(float(campaign_rows["lineitem_cost_total"].sum()))
+        total = workspace_manager.aggregate(["cost_total"], filters={"campaign_id": campaign_id},
+                                            result_format="records")
+        assert len(total) == 1
+
+    def test_invalid_requests(self, temp_workspace_with_v3_plans):
+        """Unknown columns, non-numeric sums and bad time grains are rejected."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        for kwargs in [{"measures": ["no_such_column"]},
+                       {"measures": ["sum:channel"]},
+                       {"measures": ["median:cost_total"]},
+                       {"measures": ["cost_total"], "time_grain": "hour"},
+                       {"measures": []}]:
+            with pytest.raises(WorkspaceManager.SQLQueryError):
+                workspace_manager.aggregate(**kwargs)
+
+
+class TestExpandFlighting:
+    """Test workspace-wide flighting expansion with expand_flighting()."""
+
+    def test_sql_matches_in_memory_engine(self, temp_workspace_with_v3_plans):
+        """DuckDB curves give the same allocations as the pandas engine."""
+        import numpy as np
+        from mediaplanpy.models.flighting import FLIGHTING_CURVES
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+        bell = FLIGHTING_CURVES["bell"].weights
+
+        in_sql = workspace_manager.expand_flighting(grain="week", curve="bell")
+        in_pandas = workspace_manager.expand_flighting(grain="week", curve=lambda t: bell(t))
+        keys = ["meta_id", "lineitem_id", "period"]
+        in_sql = in_sql.sort_values(keys).reset_index(drop=True)
+        in_pandas = in_pandas.sort_values(keys).reset_index(drop=True)
+
+        assert len(in_sql) > 0
+        assert list(in_sql.columns) == list(in_pandas.columns)
+        assert (in_sql["period"] == in_pandas["period"]).all()
+        assert (in_sql["days_active"] == in_pandas["days_active"]).all()
+        assert np.allclose(in_sql["cost_total"].astype(float), in_pandas["cost_total"].astype(float))
+
+    def test_totals_preserved_with_filters(self, temp_workspace_with_v3_plans):
+        """Daily allocations add up to each selected line item's cost."""
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lineitems = workspace_manager.list_lineitems(return_dataframe=True)
+        campaign_id = lineitems["campaign_id"].iloc[0]
+        selected = lineitems[lineitems["campaign_id"] == campaign_id]
+
+        daily = workspace_manager.expand_flighting(filters={"campaign_id": campaign_id}, result_format="records")
+
+        assert {row["campaign_id"] for row in daily} == {campaign_id}
+        assert sum(row["cost_total"] for row in daily) == pytest.approx(float(selected["lineitem_cost_total"].sum()))
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.expand_flighting(measures=["channel"])
+
+
+class TestLineItemIndex:
+    """Test the workspace line item interval index from get_lineitem_index()."""
+
+    def test_lookups_match_list_lineitems(self, temp_workspace_with_v3_plans):
+        """Live line items match a date filter over list_lineitems()."""
+        import pandas as pd
+
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        lineitems = workspace_manager.list_lineitems(return_dataframe=True)
+        lineitems = lineitems[lineitems["is_placeholder"] != True]
+        day = pd.to_datetime(lineitems["lineitem_start_date"]).min() + pd.Timedelta(days=10)
+        live = lineitems[(pd.to_datetime(lineitems["lineitem_start_date"]) <= day)
+                         & (pd.to_datetime(lineitems["lineitem_end_date"]) >= day)]
+
+        index = workspace_manager.get_lineitem_index()
+        found = index.active_on(day)
+
+        assert len(index) == len(lineitems)
+        assert sorted(found["lineitem_id"]) == sorted(live["lineitem_id"])
+        assert index.count_active_on(day) == len(live)
+        assert "vehicle" in found.columns
+
+    def test_index_reused_until_cache_cleared(self, temp_workspace_with_v3_plans):
+        workspace_manager = WorkspaceManager(workspace_path=temp_workspace_with_v3_plans)
+        workspace_manager.load()
+
+        index = workspace_manager.get_lineitem_index(group_by=None)
+        assert workspace_manager.get_lineitem_index(group_by=None) is index
+
+        workspace_manager.clear_query_cache()
+        assert workspace_manager.get_lineitem_index(group_by=None) is not index
+        with pytest.raises(WorkspaceManager.SQLQueryError):
+            workspace_manager.get_lineitem_index(group_by="no_such_column")
+
+
 class TestAddSqlFilters:
     """Unit-level tests for _add_sql_filters WHERE-clause merging."""
 
@@ -456,17 +1698,20 @@ class TestAddSqlFilters:
             "WHERE meta_is_archived = FALSE OR meta_is_archived IS NULL "
             "GROUP BY campaign_id ORDER BY campaign_id"
         )
+        params = {}
         result = workspace_manager._add_sql_filters(
-            base, {"campaign_id": "CAM001"}
+            base, {"campaign_id": "CAM001"}, params
         )
         upper = result.upper()
         # Must contain exactly one WHERE keyword
         assert upper.count("WHERE") == 1, f"Expected 1 WHERE, got {upper.count('WHERE')}: {result}"
         # Existing conditions must be parenthesised
         assert "(meta_is_archived = FALSE OR meta_is_archived IS NULL)" in result
-        # Filter condition must appear after AND
+        # Filter condition must appear after AND, with its value bound
         assert "AND" in upper
-        assert "campaign_id" in result
+        assert "campaign_id = $filter_0" in result
+        assert "CAM001" not in result
+        assert params == {"filter_0": "CAM001"}
 
     def test_appends_to_existing_where_without_group_by(self, temp_workspace_with_v3_plans):
         """When the base query has WHERE + ORDER BY (no GROUP BY), filters are ANDed."""
@@ -479,7 +1724,7 @@ class TestAddSqlFilters:
             "ORDER BY campaign_id"
         )
         result = workspace_manager._add_sql_filters(
-            base, {"campaign_id": "CAM001"}
+            base, {"campaign_id": "CAM001"}, {}
         )
         upper = result.upper()
         assert upper.count("WHERE") == 1
@@ -492,7 +1737,7 @@ class TestAddSqlFilters:
 
         base = "SELECT * FROM t GROUP BY campaign_id"
         result = workspace_manager._add_sql_filters(
-            base, {"campaign_id": "CAM001"}
+            base, {"campaign_id": "CAM001"}, {}
         )
         upper = result.upper()
         assert upper.count("WHERE") == 1
@@ -0,0 +1,659 @@
+"""
+Integration tests for workspace storage backend handling.
+
+Tests the storage backend owned by WorkspaceManager, including:
+- Reuse of a single backend instance across calls
+- Invalidation when the workspace configuration changes
+- S3 backends paying their connection test only once (via moto)
+- Bulk reads with read_files(), concurrent on S3
+- Streaming S3 reads (ranged GETs) and multipart uploads
+"""
+
+import pytest
+import os
+import json
+import threading
+import time
+
+from mediaplanpy.models import MediaPlan
+from mediaplanpy.workspace import WorkspaceManager
+
+
+def _local_config(base_path, workspace_id="test_storage_backend"):
+    return {
+        "workspace_id": workspace_id,
+        "workspace_name": "Test Storage Backend",
+        "workspace_settings": {
+            "schema_version": "3.0"
+        },
+        "storage": {
+            "mode": "local",
+            "local": {
+                "base_path": base_path
+            }
+        },
+        "database": {
+            "enabled": False
+        }
+    }
+
+
+@pytest.fixture
+def local_workspace(temp_dir):
+    """Create a local workspace settings file and return its path."""
+    config_path = os.path.join(temp_dir, "workspace.json")
+    with open(config_path, 'w') as f:
+        json.dump(_local_config(temp_dir), f)
+    return config_path
+
+
+class TestStorageBackendCaching:
+    """Test that WorkspaceManager owns a long-lived storage backend."""
+
+    def test_backend_is_reused(self, local_workspace):
+        """Repeated calls return the same backend instance."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+
+        first = workspace_manager.get_storage_backend()
+        second = workspace_manager.get_storage_backend()
+
+        assert first is second
+
+    def test_backend_is_shared_across_threads(self, local_workspace):
+        """Concurrent first calls all receive the same backend instance."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+
+        backends = []
+
+        def get_backend():
+            backends.append(workspace_manager.get_storage_backend())
+
+        threads = [threading.Thread(target=get_backend) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(backends) == 8
+        assert all(backend is backends[0] for backend in backends)
+
+    def test_reload_invalidates_backend(self, local_workspace):
+        """Loading a configuration discards the previous backend."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+        first = workspace_manager.get_storage_backend()
+
+        workspace_manager.load()
+        second = workspace_manager.get_storage_backend()
+
+        assert first is not second
+
+    def test_storage_config_change_rebuilds_backend(self, local_workspace, temp_dir):
+        """A changed storage configuration produces a backend for the new location."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+        first = workspace_manager.get_storage_backend()
+
+        new_base_path = os.path.join(temp_dir, "other_storage")
+        workspace_manager.config["storage"]["local"]["base_path"] = new_base_path
+        workspace_manager._resolved_config = None
+
+        second = workspace_manager.get_storage_backend()
+
+        assert first is not second
+        assert second.base_path == os.path.abspath(new_base_path)
+
+    def test_reset_storage_backend(self, local_workspace):
+        """reset_storage_backend() forces a new backend on the next call."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+        first = workspace_manager.get_storage_backend()
+
+        workspace_manager.reset_storage_backend()
+
+        assert workspace_manager.get_storage_backend() is not first
+
+    def test_save_load_use_cached_backend(self, local_workspace, mediaplan_v3_minimal, monkeypatch):
+        """A save/load cycle never builds a backend outside the WorkspaceManager."""
+        workspace_manager = WorkspaceManager(workspace_path=local_workspace)
+        workspace_manager.load()
+        workspace_manager.get_storage_backend()
+
+        import mediaplanpy.storage as storage_module
+
+        def fail_get_storage_backend(workspace_config):
+            raise AssertionError("storage backend rebuilt outside WorkspaceManager")
+
+        monkeypatch.setattr(storage_module, "get_storage_backend", fail_get_storage_backend)
+
+        mediaplan_v3_minimal.save(workspace_manager)
+        loaded = MediaPlan.load(workspace_manager, media_plan_id=mediaplan_v3_minimal.meta.id)
+
+        assert loaded.meta.id == mediaplan_v3_minimal.meta.id
+
+
+class TestS3StorageBackendCaching:
+    """Test S3 connection reuse against a local S3 stand-in."""
+
+    @pytest.fixture
+    def s3_workspace(self, monkeypatch):
+        moto = pytest.importorskip("moto")
+        import boto3
+
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+        with moto.mock_aws():
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-bucket")
+
+            config = {
+                "workspace_id": "test_s3_backend",
+                "workspace_name": "Test S3 Backend",
+                "workspace_settings": {
+                    "schema_version": "3.0"
+                },
+                "storage": {
+                    "mode": "s3",
+                    "s3": {
+                        "bucket": "test-bucket",
+                        "region": "us-east-1",
+                        "prefix": "workspace"
+                    }
+                },
+                "database": {
+                    "enabled": False
+                }
+            }
+
+            workspace_manager = WorkspaceManager()
+            workspace_manager.load(config_dict=config)
+            yield workspace_manager
+
+    def test_connection_test_runs_once(self, s3_workspace, mediaplan_v3_minimal, monkeypatch):
+        """A full save/load cycle issues a single head_bucket call."""
+        from mediaplanpy.storage.s3 import S3StorageBackend
+
+        calls = []
+        original_test_connection = S3StorageBackend._test_connection
+
+        def counting_test_connection(backend):
+            calls.append(backend)
+            return original_test_connection(backend)
+
+        monkeypatch.setattr(S3StorageBackend, "_test_connection", counting_test_connection)
+
+        mediaplan_v3_minimal.save(s3_workspace, include_database=False)
+        loaded = MediaPlan.load(s3_workspace, media_plan_id=mediaplan_v3_minimal.meta.id)
+
+        assert loaded.meta.id == mediaplan_v3_minimal.meta.id
+        assert len(calls) == 1
+
+
+@pytest.fixture
+def s3_backend(monkeypatch):
+    """Create an S3 backend on a moto bucket with 4 concurrent requests and 5 MB chunks."""
+    moto = pytest.importorskip("moto")
+    import boto3
+    from mediaplanpy.storage.s3 import S3StorageBackend
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-bucket")
+        config = _local_config("", workspace_id="test_s3_backend")
+        config["storage"] = {
+            "mode": "s3",
+            "s3": {"bucket": "test-bucket", "region": "us-east-1", "prefix": "workspace",
+                   "max_concurrency": 4, "chunk_size_mb": 5}
+        }
+        yield S3StorageBackend(config)
+
+
+class TestBulkReads:
+    """Test StorageBackend.read_files() on local storage and a local S3 stand-in."""
+
+    def test_local_reads_in_order(self, temp_dir):
+        from mediaplanpy.exceptions import FileReadError
+        from mediaplanpy.storage.local import LocalStorageBackend
+
+        backend = LocalStorageBackend(_local_config(temp_dir))
+        paths = [f"mediaplans/plan_{i}.json" for i in range(5)]
+        for i, path in enumerate(reversed(paths)):
+            backend.write_file(path, f"content {4 - i}")
+
+        contents = backend.read_files(paths)
+
+        assert list(contents) == paths
+        assert list(contents.values()) == [f"content {i}" for i in range(5)]
+
+        with pytest.raises(FileReadError):
+            backend.read_files(paths + ["mediaplans/missing.json"])
+        contents = backend.read_files(["mediaplans/missing.json"] + paths, return_exceptions=True)
+        assert isinstance(contents["mediaplans/missing.json"], FileReadError)
+        assert contents[paths[0]] == "content 0"
+
+    def test_s3_reads_concurrently(self, s3_backend, monkeypatch):
+        """Reads overlap, are bounded by max_concurrency and keep the order of paths."""
+        from mediaplanpy.exceptions import FileReadError
+        from mediaplanpy.storage.s3 import S3StorageBackend
+
+        paths = [f"mediaplans/plan_{i}.parquet" for i in range(12)]
+        for i, path in enumerate(paths):
+            s3_backend.write_file(path, bytes([i]) * 10)
+
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+        original_read_file = S3StorageBackend.read_file
+
+        def slow_read_file(backend, path, binary=False):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            try:
+                time.sleep(0.05)
+                return original_read_file(backend, path, binary=binary)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        monkeypatch.setattr(S3StorageBackend, "read_file", slow_read_file)
+
+        contents = s3_backend.read_files(paths, binary=True)
+
+        assert list(contents) == paths
+        assert all(contents[path] == bytes([i]) * 10 for i, path in enumerate(paths))
+        assert 1 < peak[0] <= 4
+
+        contents = s3_backend.read_files(paths[:2] + ["mediaplans/missing.parquet"], binary=True,
+                                         max_workers=2, return_exceptions=True)
+        assert isinstance(contents["mediaplans/missing.parquet"], FileReadError)
+        with pytest.raises(FileReadError):
+            s3_backend.read_files(["mediaplans/missing.parquet"] + paths, binary=True)
+
+
+class TestS3Streaming:
+    """Test streamed S3 reads and multipart uploads through open_file()."""
+
+    def test_large_writes_use_multipart_upload(self, s3_backend, monkeypatch):
+        content = os.urandom(12 * 1024 * 1024 + 123)
+        part_numbers = []
+        original_upload_part = s3_backend.s3_client.upload_part
+
+        def counting_upload_part(**kwargs):
+            part_numbers.append(kwargs["PartNumber"])
+            return original_upload_part(**kwargs)
+
+        monkeypatch.setattr(s3_backend.s3_client, "upload_part", counting_upload_part)
+
+        with s3_backend.open_file("exports/large.bin", "wb") as f:
+            for offset in range(0, len(content), 256 * 1024):
+                f.write(content[offset:offset + 256 * 1024])
+
+        assert sorted(part_numbers) == [1, 2, 3]
+        assert s3_backend.read_file("exports/large.bin", binary=True) == content
+
+    def test_part_numbers_unique_with_slow_uploads(self, s3_backend, monkeypatch):
+        """Parts finishing out of order still get consecutive, unique numbers."""
+        s3_backend.max_concurrency = 2
+        part_numbers = []
+        original_upload_part = s3_backend.s3_client.upload_part
+
+        def slow_upload_part(**kwargs):
+            # Early parts finish last, so a slot frees up while others are still in flight
+            time.sleep(0.3 if kwargs["PartNumber"] % 2 else 0.05)
+            part_numbers.append(kwargs["PartNumber"])
+            return original_upload_part(**kwargs)
+
+        monkeypatch.setattr(s3_backend.s3_client, "upload_part", slow_upload_part)
+
+        # Widen the window between a part being recorded and its future completing
+        from mediaplanpy.storage.s3 import S3WriteWrapper
+        original_send_part = S3WriteWrapper._send_part
+
+        def slow_send_part(wrapper, part_number, part):
+            original_send_part(wrapper, part_number, part)
+            time.sleep(0.2)
+
+        monkeypatch.setattr(S3WriteWrapper, "_send_part", slow_send_part)
+
+        chunk = 5 * 1024 * 1024
+        content = os.urandom(7 * chunk + 17)
+        with s3_backend.open_file("exports/large.bin", "wb") as f:
+            for offset in range(0, len(content), chunk // 2):
+                f.write(content[offset:offset + chunk // 2])
+
+        assert sorted(part_numbers) == list(range(1, 9))
+        assert s3_backend.read_file("exports/large.bin", binary=True) == content
+
+    def test_small_writes_and_failed_writes(self, s3_backend):
+        """Small files use one put_object; an exception inside the block discards the upload."""
+        with s3_backend.open_file("mediaplans/plan.json", "w") as f:
+            f.write('{"name": "caf\u00e9"}')
+        assert s3_backend.read_file("mediaplans/plan.json") == '{"name": "caf\u00e9"}'
+
+        with pytest.raises(RuntimeError):
+            with s3_backend.open_file("exports/partial.bin", "wb") as f:
+                f.write(os.urandom(11 * 1024 * 1024))
+                raise RuntimeError("export failed")
+
+        assert not s3_backend.exists("exports/partial.bin")
+        assert not s3_backend.s3_client.list_multipart_uploads(Bucket="test-bucket").get("Uploads")
+
+    def test_streamed_reads_use_ranges(self, s3_backend, monkeypatch):
+        content = os.urandom(11 * 1024 * 1024)
+        s3_backend.write_file("exports/large.bin", content)
+        ranges = []
+        original_get_object = s3_backend.s3_client.get_object
+
+        def recording_get_object(**kwargs):
+            ranges.append(kwargs.get("Range"))
+            return original_get_object(**kwargs)
+
+        monkeypatch.setattr(s3_backend.s3_client, "get_object", recording_get_object)
+
+        with s3_backend.open_file("exports/large.bin", "rb") as f:
+            f.seek(-10, os.SEEK_END)
+            assert f.read() == content[-10:]
+            f.seek(100)
+            assert f.read(50) == content[100:150]
+
+        assert ranges and all(r is not None for r in ranges)
+        assert ranges[0] == f"bytes=0-{5 * 1024 * 1024 - 1}"
+
+        with s3_backend.open_file("exports/large.bin", "rb") as f:
+            assert f.read() == content
+
+    def test_parquet_round_trip(self, s3_backend):
+        """Parquet writers and readers work directly on the streamed file objects."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({"value": list(range(50000))})
+        with s3_backend.open_file("mediaplans/plan.parquet", "wb") as f:
+            pq.write_table(table, f)
+        with s3_backend.open_file("mediaplans/plan.parquet", "rb") as f:
+            assert pq.read_table(f).equals(table)
+
+
+class TestS3DiskCache:
+    """Test the read-through disk cache of the S3 backend (storage.s3.cache_dir)."""
+
+    @staticmethod
+    def _config(cache_dir, cache_max_mb=1):
+        config = _local_config("", workspace_id="test_s3_backend")
+        config["storage"] = {
+            "mode": "s3",
+            "s3": {"bucket": "test-bucket", "region": "us-east-1", "prefix": "workspace",
+                   "cache_dir": cache_dir, "cache_max_mb": cache_max_mb}
+        }
+        return config
+
+    @pytest.fixture
+    def cached_backend(self, s3_backend, temp_dir):
+        from mediaplanpy.storage.s3 import S3StorageBackend
+        return S3StorageBackend(self._config(os.path.join(temp_dir, "cache")))
+
+    @staticmethod
+    def _record_get_object(backend, monkeypatch):
+        calls = []
+        original_get_object = backend.s3_client.get_object
+
+        def recording_get_object(**kwargs):
+            calls.append(kwargs)
+            return original_get_object(**kwargs)
+
+        monkeypatch.setattr(backend.s3_client, "get_object", recording_get_object)
+        return calls
+
+    def test_revalidation_and_refetch(self, s3_backend, cached_backend, monkeypatch):
+        """Unchanged objects are revalidated without a download; changed objects are fetched again."""
+        s3_backend.write_file("mediaplans/plan.json", '{"version": 1}')
+        calls = self._record_get_object(cached_backend, monkeypatch)
+
+        assert cached_backend.read_file("mediaplans/plan.json") == '{"version": 1}'
+        assert cached_backend.read_file("mediaplans/plan.json") == '{"version": 1}'
+        with cached_backend.open_file("mediaplans/plan.json", "r") as f:
+            assert f.read() == '{"version": 1}'
+
+        assert "IfNoneMatch" not in calls[0]
+        assert all("IfNoneMatch" in call for call in calls[1:]) and len(calls) == 3
+        stats = cached_backend.disk_cache.stats()
+        assert stats["stores"] == 1 and stats["hits"] == 2
+
+        # Another writer changes the object
+        s3_backend.write_file("mediaplans/plan.json", '{"version": 2}')
+        assert cached_backend.read_file("mediaplans/plan.json") == '{"version": 2}'
+        assert cached_backend.disk_cache.stats()["stores"] == 2
+
+        # A known ETag needs no request at all
+        versions = cached_backend.get_file_versions("mediaplans", "*.json")
+        del calls[:]
+        local_paths = cached_backend.cache_files(versions)
+        assert not calls
+        with open(local_paths["mediaplans/plan.json"]) as f:
+            assert f.read() == '{"version": 2}'
+
+    def test_write_through_and_delete(self, cached_backend, monkeypatch):
+        from mediaplanpy.exceptions import FileReadError
+
+        cached_backend.write_file("mediaplans/plan.parquet", b"PAR1")
+        versions = cached_backend.get_file_versions("mediaplans")
+        calls = self._record_get_object(cached_backend, monkeypatch)
+
+        assert cached_backend.cached_path("mediaplans/plan.parquet", versions["mediaplans/plan.parquet"]).endswith(".parquet")
+        assert not calls
+
+        cached_backend.delete_file("mediaplans/plan.parquet")
+        assert cached_backend.disk_cache.stats()["entries"] == 0
+        with pytest.raises(FileReadError):
+            cached_backend.read_file("mediaplans/plan.parquet")
+
+    def test_lru_eviction(self, s3_backend, cached_backend, temp_dir):
+        """Least recently used objects are evicted beyond cache_max_mb, and the index survives a restart."""
+        from mediaplanpy.storage.s3 import S3StorageBackend
+
+        content = os.urandom(400 * 1024)
+        for name in ("a", "b", "c"):
+            s3_backend.write_file(f"exports/{name}.bin", content)
+
+        cached_backend.read_file("exports/a.bin", binary=True)
+        cached_backend.read_file("exports/b.bin", binary=True)
+        cached_backend.read_file("exports/a.bin", binary=True)
+        cached_backend.read_file("exports/c.bin", binary=True)
+
+        cache = cached_backend.disk_cache
+        assert cache.stats()["evictions"] == 1
+        assert cache.lookup("test-bucket", "workspace/exports/b.bin") is None
+        assert cache.lookup("test-bucket", "workspace/exports/a.bin") is not None
+        assert cache.stats()["current_bytes"] <= cache.max_bytes
+
+        restarted = S3StorageBackend(self._config(cache.directory)).disk_cache
+        assert restarted.stats()["entries"] == 2
+
+    def test_workspace_loads_and_queries(self, s3_backend, temp_dir, mediaplan_v3_minimal, monkeypatch):
+        """Repeated loads and SQL queries against an S3 workspace download each file once."""
+        config = self._config(os.path.join(temp_dir, "cache"), cache_max_mb=64)
+        workspace_manager = WorkspaceManager()
+        workspace_manager.load(config_dict=config)
+        mediaplan_v3_minimal.save(workspace_manager, include_database=False)
+
+        backend = workspace_manager.get_storage_backend()
+        backend.disk_cache.clear()
+        query = "SELECT COUNT(*) AS n FROM {*}"
+        first = workspace_manager.sql_query(query, return_dataframe=True, use_cache=False)
+        MediaPlan.load(workspace_manager, media_plan_id=mediaplan_v3_minimal.meta.id)
+        stores = backend.disk_cache.stats()["stores"]
+
+        calls = self._record_get_object(backend, monkeypatch)
+        second = workspace_manager.sql_query(query, return_dataframe=True, use_cache=False)
+        loaded = MediaPlan.load(workspace_manager, media_plan_id=mediaplan_v3_minimal.meta.id)
+
+        assert second["n"].tolist() == first["n"].tolist()
+        assert loaded.meta.id == mediaplan_v3_minimal.meta.id
+        assert backend.disk_cache.stats()["stores"] == stores
+        # Only the plan JSON is revalidated; the Parquet copy matched the listing
+        assert all("IfNoneMatch" in call for call in calls) and len(calls) == 1
+
+
+class TestS3Listing:
+    """Test prefix-narrowed and cached S3 listings."""
+
+    @staticmethod
+    def _record_listings(backend, monkeypatch):
+        prefixes = []
+        original_get_paginator = backend.s3_client.get_paginator
+
+        def recording_get_paginator(name):
+            paginator = original_get_paginator(name)
+            original_paginate = paginator.paginate
+
+            def paginate(**kwargs):
+                prefixes.append(kwargs["Prefix"])
+                return original_paginate(**kwargs)
+
+            paginator.paginate = paginate
+            return paginator
+
+        monkeypatch.setattr(backend.s3_client, "get_paginator", recording_get_paginator)
+        return prefixes
+
+    def test_pattern_prefix_narrows_listing(self, s3_backend, monkeypatch):
+        for name in ("mediaplan_abc1.json", "mediaplan_abc2.json", "mediaplan_xyz.json"):
+            s3_backend.write_file(f"mediaplans/{name}", "{}")
+        s3_backend.list_cache_ttl = 0
+        prefixes = self._record_listings(s3_backend, monkeypatch)
+
+        assert s3_backend.list_files("mediaplans", "mediaplan_abc*") == [
+            "mediaplans/mediaplan_abc1.json", "mediaplans/mediaplan_abc2.json"]
+        assert s3_backend.list_files("", "mediaplans/*_xyz.json") == ["mediaplans/mediaplan_xyz.json"]
+        assert s3_backend.list_files("mediaplans", "*.json")[-1] == "mediaplans/mediaplan_xyz.json"
+        assert prefixes == ["workspace/mediaplans/mediaplan_abc", "workspace/mediaplans/", "workspace/mediaplans/"]
+
+    def test_listings_cached_and_written_through(self, s3_backend, monkeypatch):
+        from mediaplanpy.storage.s3 import S3StorageBackend
+
+        s3_backend.write_file("mediaplans/plan_a.json", "{}")
+        s3_backend.write_file("catalog/part-0.parquet", b"PAR1")
+        prefixes = self._record_listings(s3_backend, monkeypatch)
+
+        assert s3_backend.list_files("", "*.parquet") == ["catalog/part-0.parquet"]
+        assert s3_backend.list_files("mediaplans", "plan_*.json") == ["mediaplans/plan_a.json"]
+        assert prefixes == ["workspace/"]
+
+        # Writes and deletes through this backend update the cached listing
+        s3_backend.write_file("mediaplans/plan_b.json", "{}")
+        with s3_backend.open_file("mediaplans/plan_c.parquet", "wb") as f:
+            f.write(os.urandom(6 * 1024 * 1024))
+        s3_backend.delete_file("mediaplans/plan_a.json")
+        versions = s3_backend.get_file_versions("mediaplans")
+        assert list(versions) == ["mediaplans/plan_b.json", "mediaplans/plan_c.parquet"]
+        assert versions["mediaplans/plan_c.parquet"] == s3_backend.get_file_info("mediaplans/plan_c.parquet")["etag"]
+        assert prefixes == ["workspace/"]
+
+        # Other writers show up once the listing expires or is cleared
+        other = S3StorageBackend({"workspace_id": "test_s3_backend", "storage": {
+            "mode": "s3", "s3": {"bucket": "test-bucket", "region": "us-east-1", "prefix": "workspace"}}})
+        other.write_file("mediaplans/plan_d.json", "{}")
+        assert "mediaplans/plan_d.json" not in s3_backend.list_files("mediaplans")
+        s3_backend.clear_listing_cache()
+        assert "mediaplans/plan_d.json" in s3_backend.list_files("mediaplans")
+        assert prefixes == ["workspace/", "workspace/mediaplans/"]
+
+
+class TestBulkDeletes:
+    """Test StorageBackend.delete_files() on local storage and a local S3 stand-in."""
+
+    def test_local_deletes(self, temp_dir):
+        from mediaplanpy.storage.local import LocalStorageBackend
+
+        backend = LocalStorageBackend(_local_config(temp_dir))
+        paths = [f"mediaplans/plan_{i}.json" for i in range(20)]
+        for path in paths:
+            backend.write_file(path, "{}")
+
+        results = backend.delete_files(paths + ["mediaplans/missing.json"])
+
+        assert list(results) == paths + ["mediaplans/missing.json"]
+        assert all(error is None for error in results.values())
+        assert backend.list_files("mediaplans") == []
+
+    def test_s3_deletes_in_batches(self, s3_backend, monkeypatch):
+        from mediaplanpy.storage import s3
+
+        monkeypatch.setattr(s3, "MAX_DELETE_BATCH_SIZE", 10)
+        paths = [f"mediaplans/plan_{i:02d}.json" for i in range(25)]
+        for path in paths:
+            s3_backend.write_file(path, "{}")
+        assert len(s3_backend.list_files("mediaplans")) == 25
+
+        batches = []
+        original_delete_objects = s3_backend.s3_client.delete_objects
+
+        def recording_delete_objects(**kwargs):
+            batches.append(len(kwargs["Delete"]["Objects"]))
+            return original_delete_objects(**kwargs)
+
+        monkeypatch.setattr(s3_backend.s3_client, "delete_objects", recording_delete_objects)
+
+        results = s3_backend.delete_files(paths[:-1], max_workers=2)
+
+        assert sorted(batches) == [4, 10, 10]
+        assert list(results) == paths[:-1] and all(error is None for error in results.values())
+        # The cached listing is updated without listing again
+        assert s3_backend.list_files("mediaplans") == [paths[-1]]
+        s3_backend.clear_listing_cache()
+        assert s3_backend.list_files("mediaplans") == [paths[-1]]
+
+
+class TestS3Credentials:
+    """Test that DuckDB follows the S3 backend's current credentials."""
+
+    def test_get_credentials(self, s3_backend):
+        import boto3
+
+        expected = boto3.Session().get_credentials().get_frozen_credentials()
+        assert s3_backend.get_credentials() == expected
+
+    def test_duckdb_pool_reapplies_credentials(self, s3_backend, monkeypatch):
+        from botocore.credentials import ReadOnlyCredentials
+        from mediaplanpy.workspace import duckdb_pool
+
+        applied = []
+
+        def recording_configure(conn, backend, credentials=None):
+            credentials = credentials or backend.get_credentials()
+            applied.append(credentials.access_key)
+            return credentials
+
+        # httpfs cannot be installed offline; record what would be applied instead
+        monkeypatch.setattr(duckdb_pool, "configure_duckdb_s3", recording_configure)
+        monkeypatch.setattr(duckdb_pool, "configure_duckdb_credentials", recording_configure)
+        pool = duckdb_pool.DuckDBSessionPool(s3_backend)
+        initial = s3_backend.get_credentials().access_key
+
+        with pool.session():
+            pass
+        assert applied == [initial]
+
+        # Refreshed credentials are applied before the next query
+        rotated = ReadOnlyCredentials("rotated", "secret", "token")
+        monkeypatch.setattr(s3_backend, "get_credentials", lambda: rotated)
+        with pool.session():
+            pass
+        with pool.session():
+            pass
+        assert applied == [initial, "rotated"]
+
+        # Access denied: credentials are applied again even if unchanged
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                raise RuntimeError("HTTP Error: HTTP GET error (HTTP 403)")
+        with pool.session():
+            pass
+        assert applied == [initial, "rotated", "rotated"]
+        pool.close()
@@ -0,0 +1,106 @@
+"""
+Unit tests for flighting (pacing) expansion.
+
+Tests the vectorized expansion engine and MediaPlan.expand_flighting():
+- Even and weighted allocation of line item values over flight days
+- Weekly and monthly periods
+- Custom weighting curves
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from mediaplanpy.models import MediaPlan, Campaign, LineItem, Meta
+from mediaplanpy.models.flighting import expand_flights, register_flighting_curve, FLIGHTING_CURVES
+from mediaplanpy.exceptions import ValidationError
+
+
+@pytest.fixture
+def mediaplan():
+    return MediaPlan(
+        meta=Meta(id="mp_001", schema_version="v3.0", created_by_name="Test User"),
+        campaign=Campaign(
+            id="camp_001",
+            name="Test Campaign",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 12, 31),
+            budget_total=Decimal("100000")
+        ),
+        lineitems=[
+            LineItem(id="li_001", name="Ten days", start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+                     cost_total=Decimal("1000"), metric_impressions=Decimal("50000")),
+            LineItem(id="li_002", name="One day", start_date=date(2025, 2, 3), end_date=date(2025, 2, 3),
+                     cost_total=Decimal("70"))
+        ]
+    )
+
+
+class TestExpandFlights:
+    """Test the vectorized expansion engine."""
+
+    def test_even_daily_allocation(self, mediaplan):
+        """Even flighting gives every day the same share."""
+        daily = mediaplan.expand_flighting(measures=["cost_total", "metric_impressions"])
+
+        first = daily[daily["lineitem_id"] == "li_001"]
+        assert len(first) == 10
+        assert first["cost_total"].tolist() == pytest.approx([100.0] * 10)
+        assert first["metric_impressions"].sum() == pytest.approx(50000)
+        assert first["period"].iloc[0] == pd.Timestamp("2025-01-01")
+        assert (first["days_active"] == 1).all()
+
+        single = daily[daily["lineitem_id"] == "li_002"]
+        assert single["cost_total"].tolist() == pytest.approx([70.0])
+        assert single["metric_impressions"].isna().all()
+
+    def test_weekly_and_monthly_periods(self, mediaplan):
+        """Weeks start on Monday and periods keep the totals."""
+        weekly = mediaplan.expand_flighting(grain="week")
+        first = weekly[weekly["lineitem_id"] == "li_001"]
+
+        # 2025-01-01 is a Wednesday: Wed-Sun, then Mon 6th - Fri 10th
+        assert first["period"].tolist() == [pd.Timestamp("2024-12-30"), pd.Timestamp("2025-01-06")]
+        assert first["days_active"].tolist() == [5, 5]
+        assert first["cost_total"].tolist() == pytest.approx([500.0, 500.0])
+
+        monthly = mediaplan.expand_flighting(grain="month", curve="front_loaded")
+        assert monthly["cost_total"].sum() == pytest.approx(1070)
+
+    def test_weighted_curves(self, mediaplan):
+        """Front-loaded curves spend more early, and custom curves can be registered."""
+        daily = mediaplan.expand_flighting(curve="front_loaded")
+        first = daily[daily["lineitem_id"] == "li_001"]["cost_total"].tolist()
+        assert first[0] > first[-1]
+        assert sum(first) == pytest.approx(1000)
+
+        register_flighting_curve("test_last_half", lambda t: (t >= 0.5).astype(float))
+        try:
+            daily = mediaplan.expand_flighting(curve="test_last_half")
+        finally:
+            del FLIGHTING_CURVES["test_last_half"]
+        first = daily[daily["lineitem_id"] == "li_001"]["cost_total"].tolist()
+        assert first == pytest.approx([0.0] * 5 + [200.0] * 5)
+
+    def test_invalid_lineitems_skipped(self):
+        """Rows without dates or ending before they start are left out."""
+        lineitems = pd.DataFrame({
+            "lineitem_id": ["a", "b", "c"],
+            "start_date": [date(2025, 1, 1), None, date(2025, 1, 5)],
+            "end_date": [date(2025, 1, 2), date(2025, 1, 2), date(2025, 1, 1)],
+            "cost_total": [10.0, 10.0, 10.0]
+        })
+
+        expanded = expand_flights(lineitems, ["cost_total"])
+
+        assert expanded["lineitem_id"].tolist() == ["a", "a"]
+        assert np.allclose(expanded["cost_total"], [5.0, 5.0])
+
+    def test_invalid_grain_and_curve(self, mediaplan):
+        with pytest.raises(ValidationError):
+            mediaplan.expand_flighting(grain="hour")
+        with pytest.raises(ValidationError):
+            mediaplan.expand_flighting(curve="no_such_curve")
@@ -0,0 +1,117 @@
+"""
+Unit tests for the line item interval index.
+
+Tests LineItemIntervalIndex and the MediaPlan lookups built on it:
+- Range and single-day lookups against a brute-force scan
+- Counting without a scan
+- Overlapping flights per group
+- Index caching and invalidation on MediaPlan
+"""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from mediaplanpy.models import MediaPlan, Campaign, LineItem, Meta
+from mediaplanpy.models.interval_index import LineItemIntervalIndex
+
+
+@pytest.fixture
+def flights():
+    rng = np.random.default_rng(42)
+    starts = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 300, 2000), unit="D")
+    ends = starts + pd.to_timedelta(rng.integers(0, 45, 2000), unit="D")
+    groups = rng.integers(0, 10, 2000)
+    return starts, ends, groups
+
+
+@pytest.fixture
+def mediaplan():
+    return MediaPlan(
+        meta=Meta(id="mp_001", schema_version="v3.0", created_by_name="Test User"),
+        campaign=Campaign(
+            id="camp_001",
+            name="Test Campaign",
+            start_date=date(2025, 1, 1),
+            end_date=date(2025, 12, 31),
+            budget_total=Decimal("100000")
+        ),
+        lineitems=[
+            LineItem(id="li_001", name="Q1 Meta", start_date=date(2025, 1, 1), end_date=date(2025, 3, 31),
+                     cost_total=Decimal("1000"), vehicle="Meta"),
+            LineItem(id="li_002", name="March Meta", start_date=date(2025, 3, 1), end_date=date(2025, 3, 31),
+                     cost_total=Decimal("500"), vehicle="Meta"),
+            LineItem(id="li_003", name="March Google", start_date=date(2025, 3, 15), end_date=date(2025, 4, 15),
+                     cost_total=Decimal("500"), vehicle="Google"),
+            LineItem(id="li_004", name="Q4 Meta", start_date=date(2025, 10, 1), end_date=date(2025, 12, 31),
+                     cost_total=Decimal("800"), vehicle="Meta")
+        ]
+    )
+
+
+class TestLineItemIntervalIndex:
+    """Test the interval index against brute-force scans."""
+
+    def test_lookups_match_scan(self, flights):
+        starts, ends, _ = flights
+        index = LineItemIntervalIndex(starts, ends)
+
+        for first, last in [("2025-03-01", "2025-03-31"), ("2025-06-15", None), ("2024-01-01", "2024-12-31")]:
+            last_day = pd.Timestamp(last or first)
+            expected = np.flatnonzero((starts <= last_day) & (ends >= pd.Timestamp(first)))
+
+            assert index.positions_between(first, last).tolist() == expected.tolist()
+            assert index.count_active_between(first, last) == len(expected)
+
+    def test_invalid_flights_not_indexed(self):
+        items = ["a", "b", "c", "d"]
+        index = LineItemIntervalIndex(
+            [date(2025, 1, 1), None, date(2025, 1, 10), "2025-01-03"],
+            [date(2025, 1, 5), date(2025, 1, 5), date(2025, 1, 1), "2025-01-04"],
+            items=items
+        )
+
+        assert len(index) == 2
+        assert index.active_on(date(2025, 1, 3)) == ["a", "d"]
+        assert index.active_between("2025-02-01", "2025-01-01") == []
+
+    def test_overlapping_pairs_by_group(self, flights):
+        starts, ends, groups = flights
+        index = LineItemIntervalIndex(starts, ends, groups=groups)
+
+        pairs = {tuple(pair) for pair in index.overlapping_pairs()}
+
+        start_values, end_values = starts.to_numpy(), ends.to_numpy()
+        expected = set()
+        for i in range(len(starts)):
+            for j in np.flatnonzero((groups == groups[i]) & (start_values <= end_values[i])
+                                    & (end_values >= start_values[i])):
+                if j != i:
+                    expected.add((i, j) if (start_values[i], i) < (start_values[j], j) else (j, i))
+        assert pairs == expected
+
+
+class TestMediaPlanLineItemIndex:
+    """Test the MediaPlan lookups."""
+
+    def test_lineitems_active_between(self, mediaplan):
+        assert [li.id for li in mediaplan.lineitems_active_between("2025-03-20")] == ["li_001", "li_002", "li_003"]
+        assert [li.id for li in mediaplan.lineitems_active_between(date(2025, 4, 1), date(2025, 10, 1))] == \
+            ["li_003", "li_004"]
+
+    def test_overlapping_lineitems(self, mediaplan):
+        assert [(a.id, b.id) for a, b in mediaplan.overlapping_lineitems()] == [("li_001", "li_002")]
+        assert len(mediaplan.overlapping_lineitems(by=None)) == 3
+
+    def test_index_cached_until_lineitems_change(self, mediaplan):
+        index = mediaplan.get_lineitem_index()
+        assert mediaplan.get_lineitem_index() is index
+
+        mediaplan.lineitems[1].end_date = date(2025, 4, 30)
+        mediaplan.lineitems[1].start_date = date(2025, 4, 1)
+
+        assert mediaplan.get_lineitem_index() is not index
+        assert mediaplan.overlapping_lineitems() == []